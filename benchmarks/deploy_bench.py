@@ -0,0 +1,590 @@
+"""
+End-to-end deploy benchmarks against the local Railway stand-in.
+
+Runs :class:`cli.deploy.DeploymentOrchestrator` against
+:class:`benchmarks.fake_railway.FakeRailwayServer` across a fixed set of
+scenarios and records, per scenario, wall time of ``deploy_all`` /
+``verify_all`` / ``ensure_redis_service``, HTTP request count, bytes sent and
+received, and time spent waiting on the client-side rate limiter.
+
+The ``*_wait_8`` scenarios drive :class:`installer.railway_async.AsyncRailwayProvider`
+directly (the CLI deploys through the synchronous provider, which always
+polls) to compare deployment waits over websocket subscriptions, plain
+polling, and subscriptions that drop mid-wait and fall back to polling.
+
+Results are written as JSON so runs can be compared and regressions flagged:
+
+    # Record a baseline
+    python benchmarks/deploy_bench.py run --output bench-baseline.json
+
+    # Later: run again and compare against it (exit status 1 on regression)
+    python benchmarks/deploy_bench.py run --output bench-current.json --baseline bench-baseline.json
+
+    # Or compare two saved result files
+    python benchmarks/deploy_bench.py compare bench-baseline.json bench-current.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from cli import deploy  # noqa: E402
+from benchmarks.fake_railway import (  # noqa: E402
+    FakeRailwayBackend,
+    FakeRailwayServer,
+    FakeRailwayStats,
+    FakeRailwaySubscriptionServer,
+)
+from installer.id_cache import RailwayIDCache  # noqa: E402
+from installer.railway_async import AsyncRailwayProvider  # noqa: E402
+from shared import DeploymentSpec  # noqa: E402
+from shared.config import ServiceConfig  # noqa: E402
+
+logger = logging.getLogger("deploy_bench")
+
+RESULTS_VERSION = 1
+DEFAULT_SPEC = ROOT / "specs" / "production.yaml"
+
+# Metrics compared between runs; all are "lower is better"
+COMPARED_METRICS = (
+    "wall_seconds",
+    "http_requests",
+    "bytes_sent",
+    "bytes_received",
+    "throttle_wait_seconds",
+)
+# Absolute changes below these are noise, whatever the relative change
+NOISE_FLOORS = {
+    "wall_seconds": 0.25,
+    "http_requests": 2,
+    "bytes_sent": 2048,
+    "bytes_received": 2048,
+    "throttle_wait_seconds": 0.25,
+}
+
+
+@dataclass
+class Scenario:
+    """One benchmark case.
+
+    ``setup`` runs (unmeasured) against a fresh fake backend and ID cache,
+    then ``measure`` runs with freshly reset counters.
+    """
+
+    name: str
+    description: str
+    services: int = 8
+    rate_limit: Optional[float] = None
+    setup: Optional[Callable[[BenchContext], None]] = None
+    measure: Callable[[BenchContext], bool] = field(default=lambda ctx: ctx.deploy_and_verify())
+
+
+class BenchContext:
+    """Fake Railway server, project and credentials shared by one scenario run."""
+
+    def __init__(
+        self,
+        backend: FakeRailwayBackend,
+        server: FakeRailwayServer,
+        subscriptions: FakeRailwaySubscriptionServer,
+        spec: DeploymentSpec,
+        max_parallel: int,
+    ) -> None:
+        self.backend = backend
+        self.server = server
+        self.subscriptions = subscriptions
+        self.spec = spec
+        self.max_parallel = max_parallel
+        self.project_id = backend.add_project("budai-bench", environments=[spec.environment])
+        self.creds: Dict[str, Any] = {
+            "railway_token": "bench-token",
+            "railway_project_id": self.project_id,
+            "openai_api_key": "sk-bench",
+            "slack_bot_token": "xoxb-bench",
+            "slack_signing_secret": "bench-signing-secret",
+            "notion_token": "secret_bench",
+        }
+        self.phases: Dict[str, float] = {}
+        self.orchestrator: Optional[deploy.DeploymentOrchestrator] = None
+        self.async_provider: Optional[AsyncRailwayProvider] = None
+
+    def request_metrics(self) -> Dict[str, float]:
+        """Client-side counters of whichever provider the measured step used."""
+        if self.orchestrator is not None:
+            return self.orchestrator.provider.request_metrics()
+        if self.async_provider is not None:
+            return self.async_provider.request_metrics()
+        return {}
+
+    def new_orchestrator(self) -> deploy.DeploymentOrchestrator:
+        """Orchestrator as a fresh CLI invocation would build it (persisted ID cache, cold memory)."""
+        orchestrator = deploy.DeploymentOrchestrator(
+            self.spec, dict(self.creds), max_parallel=self.max_parallel
+        )
+        orchestrator.deployment_order = list(self.spec.services)
+        self._time_method(orchestrator.provider, "ensure_redis_service")
+        self.orchestrator = orchestrator
+        return orchestrator
+
+    def _time_method(self, obj: Any, name: str) -> None:
+        method = getattr(obj, name)
+
+        def _timed(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+        setattr(obj, name, _timed)
+
+    def timed(self, name: str, func: Callable[[], Any]) -> Any:
+        started = time.perf_counter()
+        try:
+            return func()
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    def deploy_and_verify(self) -> bool:
+        """Run ``deploy_all`` then ``verify_all`` on a new orchestrator."""
+        orchestrator = self.new_orchestrator()
+        deployed = self.timed("deploy_all", orchestrator.deploy_all)
+        verified = self.timed("verify_all", orchestrator.verify_all)
+        return bool(deployed and verified)
+
+    def reset_counters(self) -> None:
+        self.backend.stats = FakeRailwayStats()
+        self.phases = {}
+        self.orchestrator = None
+        self.async_provider = None
+
+
+# ---------------------------------------------------------------------------
+# Scenarios
+# ---------------------------------------------------------------------------
+
+
+def _deploy_once(ctx: BenchContext) -> None:
+    if not ctx.deploy_and_verify():
+        raise RuntimeError("setup deploy failed")
+
+
+def _deploy_then_change_variable(ctx: BenchContext) -> None:
+    _deploy_once(ctx)
+    ctx.creds["notion_token"] = "secret_bench_rotated"
+
+
+def _deploy_then_clear_id_cache(ctx: BenchContext) -> None:
+    _deploy_once(ctx)
+    RailwayIDCache().clear()
+
+
+def _inject_storm(ctx: BenchContext) -> None:
+    ctx.backend.inject_throttle(4, retry_after=1.0)
+
+
+def _measure_redis(ctx: BenchContext) -> bool:
+    orchestrator = ctx.new_orchestrator()
+    info = orchestrator.provider.ensure_redis_service(ctx.spec.environment, ctx.project_id)
+    return bool(info.get("redis_url"))
+
+
+def _seed_services(ctx: BenchContext) -> None:
+    for name in ctx.spec.services:
+        ctx.backend.add_service(ctx.project_id, name, environment=ctx.spec.environment, deployed=False)
+
+
+def _deploy_and_wait_async(ctx: BenchContext, *, use_subscriptions: bool, drop_after: Optional[float] = None) -> bool:
+    """Deploy every seeded service with the async provider and wait on all of them."""
+
+    async def _run() -> bool:
+        provider = AsyncRailwayProvider(
+            "bench-token",
+            ctx.project_id,
+            graphql_url=ctx.server.url,
+            ws_url=ctx.subscriptions.url,
+            use_subscriptions=use_subscriptions,
+        )
+        ctx.async_provider = provider
+        async with provider:
+            env_id = ctx.backend.environment_id(ctx.project_id, ctx.spec.environment)
+            services = {svc["name"]: svc["id"] for svc in await provider._list_services()}
+            deployments = await asyncio.gather(
+                *(provider.deploy_service(services[name], environment_id=env_id) for name in ctx.spec.services)
+            )
+            if drop_after is not None:
+                loop = asyncio.get_running_loop()
+                loop.call_later(drop_after, lambda: loop.run_in_executor(None, ctx.subscriptions.drop_connections))
+            outcomes = await asyncio.gather(
+                *(provider.wait_for_deployment(dep, timeout_seconds=60, poll_interval=1) for dep in deployments)
+            )
+            return all(outcomes)
+
+    return ctx.timed("wait_for_deployments", lambda: asyncio.run(_run()))
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario("cold_8", "Empty project, 8 services created from scratch"),
+    Scenario("warm_noop_8", "Second deploy of 8 unchanged services", setup=_deploy_once),
+    Scenario(
+        "warm_noop_8_no_local_cache",
+        "Second deploy of 8 unchanged services from a machine without the local ID cache",
+        setup=_deploy_then_clear_id_cache,
+    ),
+    Scenario(
+        "one_variable_8",
+        "Redeploy after rotating one service's secret",
+        setup=_deploy_then_change_variable,
+    ),
+    Scenario("cold_50", "Empty project, 50 services created from scratch", services=50),
+    Scenario("warm_noop_50", "Second deploy of 50 unchanged services", services=50, setup=_deploy_once),
+    Scenario("throttle_storm_8", "Cold deploy with four back-to-back 429s (Retry-After: 1)", setup=_inject_storm),
+    Scenario(
+        "rate_limited_8",
+        "Cold deploy against a server limit of 3 req/s (burst 3)",
+        rate_limit=3.0,
+    ),
+    Scenario("redis_bootstrap", "ensure_redis_service on an empty project", measure=_measure_redis),
+    Scenario(
+        "subscription_wait_8",
+        "Async provider deploys 8 services and waits over status subscriptions",
+        setup=_seed_services,
+        measure=lambda ctx: _deploy_and_wait_async(ctx, use_subscriptions=True),
+    ),
+    Scenario(
+        "polling_wait_8",
+        "Async provider deploys 8 services and polls their status",
+        setup=_seed_services,
+        measure=lambda ctx: _deploy_and_wait_async(ctx, use_subscriptions=False),
+    ),
+    Scenario(
+        "subscription_fallback_8",
+        "Subscription socket drops mid-wait; the async provider falls back to polling",
+        setup=_seed_services,
+        measure=lambda ctx: _deploy_and_wait_async(ctx, use_subscriptions=True, drop_after=0.1),
+    ),
+]
+
+
+# ---------------------------------------------------------------------------
+# Running
+# ---------------------------------------------------------------------------
+
+
+def build_spec(base: DeploymentSpec, services: int) -> DeploymentSpec:
+    """Base spec plus synthetic services up to ``services`` (enabled known services count first).
+
+    Synthetic services fan out as a tree (each depends on an earlier one) so
+    rollout exercises several dependency waves.
+    """
+    known = [
+        name
+        for name, config in base.services.items()
+        if name in deploy.SERVICE_REPOS and config.enabled
+    ]
+    spec = base.model_copy(deep=True)
+    spec.services = {name: base.services[name].model_copy(deep=True) for name in known}
+    for config in spec.services.values():
+        config.dependencies = [dep for dep in config.dependencies if dep in spec.services]
+    for index in range(max(0, services - len(known))):
+        name = f"bench-{index:03d}"
+        dependencies = [f"bench-{(index - 1) // 4:03d}"] if index else ["orchestrator"]
+        spec.services[name] = ServiceConfig(name=name, dependencies=dependencies)
+    return spec
+
+
+@contextlib.contextmanager
+def synthetic_repos(spec: DeploymentSpec) -> Iterator[None]:
+    """Register repositories for the spec's synthetic services for the duration of a run."""
+    added = []
+    for index, name in enumerate(spec.services):
+        if name not in deploy.SERVICE_REPOS:
+            deploy.SERVICE_REPOS[name] = {"repo": f"bench/{name}", "branch": "main", "port": 9000 + index}
+            added.append(name)
+    try:
+        yield
+    finally:
+        for name in added:
+            deploy.SERVICE_REPOS.pop(name, None)
+
+
+@contextlib.contextmanager
+def patched_env(values: Dict[str, str]) -> Iterator[None]:
+    previous = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def run_scenario(scenario: Scenario, args: argparse.Namespace, base_spec: DeploymentSpec) -> Dict[str, Any]:
+    """Run one scenario ``args.repeat`` times and summarize it.
+
+    Wall time is the median across repeats; counters come from the median run.
+    """
+    spec = build_spec(base_spec, scenario.services)
+    runs: List[Dict[str, Any]] = []
+    for _ in range(args.repeat):
+        backend = FakeRailwayBackend(
+            latency=args.latency,
+            build_seconds=args.build_seconds,
+            deploy_seconds=args.build_seconds,
+            rate_limit=scenario.rate_limit,
+            rate_burst=scenario.rate_limit or 10.0,
+        )
+        with tempfile.TemporaryDirectory(prefix="budai-bench-") as cache_dir, FakeRailwayServer(
+            backend
+        ) as server, FakeRailwaySubscriptionServer(backend) as subscriptions, patched_env(
+            {
+                "RAILWAY_GRAPHQL_URL": server.url,
+                "RAILWAY_WS_URL": subscriptions.url,
+                "BUDAI_DEPLOY_CACHE_DIR": cache_dir,
+                "RAILWAY_API_RATE": str(args.api_rate),
+                "RAILWAY_API_BURST": str(args.api_burst),
+            }
+        ), synthetic_repos(spec):
+            ctx = BenchContext(backend, server, subscriptions, spec, args.max_parallel)
+            if scenario.setup is not None:
+                scenario.setup(ctx)
+            ctx.reset_counters()
+
+            started = time.perf_counter()
+            success = scenario.measure(ctx)
+            wall = time.perf_counter() - started
+
+            client = ctx.request_metrics()
+            runs.append(
+                {
+                    "success": success,
+                    "wall_seconds": wall,
+                    "phases": {name: round(value, 4) for name, value in ctx.phases.items()},
+                    "http_requests": int(client.get("http_requests", 0)),
+                    "bytes_sent": int(client.get("bytes_sent", 0)),
+                    "bytes_received": int(client.get("bytes_received", 0)),
+                    "throttle_wait_seconds": round(client.get("throttle_wait_seconds", 0.0), 4),
+                    "throttled_responses": int(client.get("throttled_responses", 0)),
+                    "error_backoff_seconds": round(client.get("error_backoff_seconds", 0.0), 4),
+                    "server": backend.stats.as_dict(),
+                }
+            )
+
+    walls = [run["wall_seconds"] for run in runs]
+    median_wall = statistics.median(walls)
+    representative = min(runs, key=lambda run: abs(run["wall_seconds"] - median_wall))
+    return {
+        **representative,
+        "description": scenario.description,
+        "services": len(spec.services),
+        "success": all(run["success"] for run in runs),
+        "wall_seconds": round(median_wall, 4),
+        "wall_seconds_runs": [round(wall, 4) for wall in walls],
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(args: argparse.Namespace) -> Dict[str, Any]:
+    base_spec = DeploymentSpec.from_file(args.spec)
+    selected = [s for s in SCENARIOS if not args.scenario or s.name in args.scenario]
+    unknown = set(args.scenario or ()) - {s.name for s in SCENARIOS}
+    if unknown:
+        raise SystemExit(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    results: Dict[str, Any] = {}
+    for scenario in selected:
+        logger.info("Running %s: %s", scenario.name, scenario.description)
+        results[scenario.name] = run_scenario(scenario, args, base_spec)
+        summary = results[scenario.name]
+        logger.info(
+            "  %s in %.2fs, %d requests, %d B sent / %d B received, %.2fs throttled",
+            "ok" if summary["success"] else "FAILED",
+            summary["wall_seconds"],
+            summary["http_requests"],
+            summary["bytes_sent"],
+            summary["bytes_received"],
+            summary["throttle_wait_seconds"],
+        )
+
+    return {
+        "version": RESULTS_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "config": {
+            "spec": str(args.spec),
+            "repeat": args.repeat,
+            "latency": args.latency,
+            "build_seconds": args.build_seconds,
+            "api_rate": args.api_rate,
+            "api_burst": args.api_burst,
+            "max_parallel": args.max_parallel,
+        },
+        "scenarios": results,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Comparison
+# ---------------------------------------------------------------------------
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = 0.15,
+) -> List[Dict[str, Any]]:
+    """Compare two result documents scenario by scenario.
+
+    A metric regresses when it grew by more than ``threshold`` (relative)
+    and by more than its noise floor (absolute). A scenario that succeeded in
+    the baseline but fails now is always a regression.
+
+    Returns:
+        One row per compared metric with ``baseline``, ``current``, ``change``
+        and ``regression`` keys
+    """
+    rows: List[Dict[str, Any]] = []
+    for name, now in current.get("scenarios", {}).items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            continue
+        if before.get("success") and not now.get("success"):
+            rows.append(
+                {"scenario": name, "metric": "success", "baseline": True, "current": False, "change": None, "regression": True}
+            )
+        for metric in COMPARED_METRICS:
+            old, new = before.get(metric), now.get(metric)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old if old else (0.0 if new == old else float("inf"))
+            regression = change > threshold and (new - old) > NOISE_FLOORS[metric]
+            rows.append(
+                {
+                    "scenario": name,
+                    "metric": metric,
+                    "baseline": old,
+                    "current": new,
+                    "change": change,
+                    "regression": regression,
+                }
+            )
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, Any]]) -> None:
+    print(f"{'scenario':<18} {'metric':<22} {'baseline':>12} {'current':>12} {'change':>9}")
+    for row in rows:
+        change = row["change"]
+        change_text = "-" if change is None else ("new" if change == float("inf") else f"{change:+.1%}")
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['scenario']:<18} {row['metric']:<22} {row['baseline']!s:>12} {row['current']!s:>12} {change_text:>9}{flag}"
+        )
+
+
+def _load(path: str) -> Dict[str, Any]:
+    with open(path) as handle:
+        return json.load(handle)
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Deploy benchmarks against the local Railway stand-in")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    run = subcommands.add_parser("run", help="Run scenarios and write JSON results")
+    run.add_argument("--output", help="Write results to this JSON file (default: stdout)")
+    run.add_argument("--baseline", help="Compare against this results file; exit 1 on regression")
+    run.add_argument("--threshold", type=float, default=0.15, help="Relative growth flagged as regression")
+    run.add_argument("--scenario", action="append", help="Only run this scenario (repeatable)")
+    run.add_argument("--repeat", type=int, default=1, help="Runs per scenario; the median is reported")
+    run.add_argument("--spec", default=str(DEFAULT_SPEC), help="Base deployment spec")
+    run.add_argument("--latency", type=float, default=0.01, help="Fake API latency per request (s)")
+    run.add_argument("--build-seconds", type=float, default=0.1, help="Fake BUILDING/DEPLOYING phase length (s)")
+    run.add_argument("--api-rate", type=float, default=20.0, help="Client RAILWAY_API_RATE (req/s)")
+    run.add_argument("--api-burst", type=float, default=10.0, help="Client RAILWAY_API_BURST")
+    run.add_argument("--max-parallel", type=int, default=4, help="Services deployed concurrently")
+    run.add_argument("--list", action="store_true", help="List scenarios and exit")
+    run.add_argument("--verbose", action="store_true", help="Show orchestrator logs")
+
+    compare = subcommands.add_parser("compare", help="Compare two results files")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=0.15, help="Relative growth flagged as regression")
+
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        rows = compare_results(_load(args.baseline), _load(args.current), args.threshold)
+        print_comparison(rows)
+        sys.exit(1 if any(row["regression"] for row in rows) else 0)
+
+    if args.list:
+        for scenario in SCENARIOS:
+            print(f"{scenario.name:<18} {scenario.description}")
+        return
+
+    logging.getLogger().setLevel(logging.INFO if args.verbose else logging.WARNING)
+    logger.setLevel(logging.INFO)
+    results = run_benchmarks(args)
+
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+        logger.info("Results written to %s", args.output)
+    else:
+        print(text)
+
+    failed = [name for name, summary in results["scenarios"].items() if not summary["success"]]
+    if failed:
+        logger.error("Scenario(s) failed: %s", ", ".join(failed))
+
+    if args.baseline:
+        rows = compare_results(_load(args.baseline), results, args.threshold)
+        print_comparison(rows)
+        if any(row["regression"] for row in rows):
+            sys.exit(1)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
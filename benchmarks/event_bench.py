@@ -0,0 +1,680 @@
+"""
+Event bus throughput benchmarks against the local Redis stand-in.
+
+Runs :class:`shared.events.EventBus` publishers and consumers against
+:class:`benchmarks.fake_redis.FakeRedisServer` (or a real ``redis-server``) and
+records, per scenario, publish and end-to-end events/s, publish-to-handler
+latency percentiles, Redis commands per event and Redis memory per event.
+Scenarios sweep the knobs that matter for throughput: publish batching,
+XREADGROUP ``count`` / ``block_ms``, handler latency and concurrency,
+payload size and codec, and consumer / partition count.
+
+Results are written as JSON so runs can be compared and regressions flagged:
+
+    # Record a baseline
+    python benchmarks/event_bench.py run --output events-baseline.json
+
+    # Later: run again and compare against it (exit status 1 on regression)
+    python benchmarks/event_bench.py run --output events-current.json --baseline events-baseline.json
+
+    # Sweep one knob across values for the selected scenarios
+    python benchmarks/event_bench.py run --scenario handler_5ms_concurrent --set concurrency=1,4,16,64
+
+    # Same scenarios against a real server (spawned on a free port, or an existing one)
+    python benchmarks/event_bench.py run --redis-server "$(command -v redis-server)"
+    python benchmarks/event_bench.py run --redis-url redis://localhost:6379/15
+
+    # Or compare two saved result files
+    python benchmarks/event_bench.py compare events-baseline.json events-current.json
+
+The stand-in's ``used_memory`` is an estimate (entry bytes plus fixed
+per-entry overheads), so memory per event is only comparable between runs
+against the same backend.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import dataclasses
+import itertools
+import json
+import logging
+import platform
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import redis.asyncio as aioredis  # noqa: E402
+
+from shared.events import BaseEvent, BatchingPublisher, EventBus, EventType, SummaryGeneratedEvent  # noqa: E402
+from benchmarks.fake_redis import FakeRedisBackend, FakeRedisServer  # noqa: E402
+
+logger = logging.getLogger("event_bench")
+
+RESULTS_VERSION = 1
+
+# Metrics compared between runs and whether a larger value is better
+COMPARED_METRICS = {
+    "publish_eps": True,
+    "consume_eps": True,
+    "latency_p50_ms": False,
+    "latency_p99_ms": False,
+    "commands_per_event": False,
+    "memory_bytes_per_event": False,
+}
+# Absolute changes below these are noise, whatever the relative change
+NOISE_FLOORS = {
+    "publish_eps": 200.0,
+    "consume_eps": 200.0,
+    "latency_p50_ms": 2.0,
+    "latency_p99_ms": 5.0,
+    "commands_per_event": 0.05,
+    "memory_bytes_per_event": 32.0,
+}
+
+_WORDS = "meeting action owner risk follow up budget launch review customer deadline scope".split()
+
+
+@dataclass
+class Scenario:
+    """One benchmark case.
+
+    ``publish`` is ``"single"`` (one XADD per event), ``"pipeline"``
+    (``EventBus.publish_many`` in chunks of ``batch_size``) or
+    ``"batching"`` (a :class:`BatchingPublisher` with ``max_batch_size=batch_size``).
+    Events are spread over ``meetings`` meeting IDs, which is what the
+    default ordering and partition keys use.
+    """
+
+    name: str
+    description: str
+    events: int = 2000
+    publish: str = "single"
+    batch_size: int = 100
+    count: int = 10
+    block_ms: int = 100
+    handler_latency: float = 0.0
+    sync_handler: bool = False
+    concurrency: int = 1
+    payload_bytes: int = 256
+    consumers: int = 1
+    partitions: int = 1
+    meetings: int = 64
+    codec: str = "json"
+    compress_threshold: Optional[int] = None
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario("baseline", "One XADD per event, XREADGROUP count=10, instant handler"),
+    Scenario("pipeline_100", "publish_many in pipelines of 100", publish="pipeline"),
+    Scenario("batching_100", "BatchingPublisher, batches of up to 100", publish="batching", events=5000),
+    Scenario(
+        "batching_1000",
+        "BatchingPublisher, batches of up to 1000",
+        publish="batching",
+        batch_size=1000,
+        events=5000,
+    ),
+    Scenario("read_count_100", "Pipelined publish, XREADGROUP count=100", publish="pipeline", count=100, events=5000),
+    Scenario("block_10ms", "Pipelined publish, XREADGROUP block=10ms", publish="pipeline", block_ms=10),
+    Scenario(
+        "handler_5ms_sequential",
+        "5ms async handler, events handled one at a time",
+        publish="pipeline",
+        events=300,
+        handler_latency=0.005,
+    ),
+    Scenario(
+        "handler_5ms_concurrent",
+        "5ms async handler, concurrency=16, count=100",
+        publish="pipeline",
+        events=2000,
+        handler_latency=0.005,
+        concurrency=16,
+        count=100,
+    ),
+    Scenario(
+        "handler_5ms_sync_concurrent",
+        "5ms blocking handler in the thread pool, concurrency=16, count=100",
+        publish="pipeline",
+        events=2000,
+        handler_latency=0.005,
+        sync_handler=True,
+        concurrency=16,
+        count=100,
+    ),
+    Scenario("payload_16k_json", "16 KB summaries, JSON", publish="pipeline", events=1000, payload_bytes=16384),
+    Scenario(
+        "payload_16k_msgpack_zstd",
+        "16 KB summaries, msgpack, zstd above 1 KB",
+        publish="pipeline",
+        events=1000,
+        payload_bytes=16384,
+        codec="msgpack",
+        compress_threshold=1024,
+    ),
+    Scenario(
+        "consumers_4_shared",
+        "Four consumers sharing one stream through the group",
+        publish="pipeline",
+        events=4000,
+        consumers=4,
+        count=50,
+    ),
+    Scenario(
+        "consumers_4_partitioned",
+        "Four consumers, one of four hash partitions each",
+        publish="pipeline",
+        events=4000,
+        consumers=4,
+        partitions=4,
+        count=50,
+    ),
+]
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def redis_server_process(binary: str) -> Iterator[str]:
+    """Run a throwaway ``redis-server`` (no persistence) on a free port; yields its URL."""
+    path = shutil.which(binary) or binary
+    port = _free_port()
+    process = subprocess.Popen(
+        [path, "--port", str(port), "--bind", "127.0.0.1", "--save", "", "--appendonly", "no"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 10.0
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+                break
+            except OSError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f"redis-server did not start on port {port}")
+                time.sleep(0.05)
+        yield f"redis://127.0.0.1:{port}/0"
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+@contextlib.contextmanager
+def backend_url(args: argparse.Namespace) -> Iterator[tuple[str, Optional[FakeRedisBackend]]]:
+    """URL of the Redis to benchmark against, plus the stand-in backend when there is one."""
+    if args.redis_url:
+        yield args.redis_url, None
+    elif args.redis_server:
+        with redis_server_process(args.redis_server) as url:
+            yield url, None
+    else:
+        backend = FakeRedisBackend(latency=args.latency)
+        with FakeRedisServer(backend) as server:
+            yield server.url, backend
+
+
+# ---------------------------------------------------------------------------
+# Running
+# ---------------------------------------------------------------------------
+
+
+def _summary_text(size: int, rng: random.Random) -> str:
+    words: List[str] = []
+    length = 0
+    while length < size:
+        word = rng.choice(_WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:size]
+
+
+def _build_events(scenario: Scenario) -> List[BaseEvent]:
+    rng = random.Random(scenario.name)
+    # A handful of distinct texts keeps event building cheap without every payload being identical
+    texts = [_summary_text(scenario.payload_bytes, rng) for _ in range(8)]
+    return [
+        SummaryGeneratedEvent(
+            source_service="event-bench",
+            meeting_id=f"meeting-{index % scenario.meetings}",
+            summary=texts[index % len(texts)],
+            action_items=[{"owner": "bench", "task": f"item {index}"}],
+        )
+        for index in range(scenario.events)
+    ]
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+async def _redis_info(client: Any) -> Dict[str, int]:
+    info = await client.info()
+    return {
+        "used_memory": int(info.get("used_memory", 0)),
+        "total_commands_processed": int(info.get("total_commands_processed", 0)),
+    }
+
+
+def _new_bus(client: Any, scenario: Scenario, prefix: str) -> EventBus:
+    bus = EventBus(
+        client,
+        partitions=scenario.partitions,
+        codec=scenario.codec,
+        compress_threshold=scenario.compress_threshold,
+    )
+    bus.stream_name = prefix
+    bus.dead_letter_stream = f"{prefix}:dead-letter"
+    bus.consumer_group = "event-bench"
+    return bus
+
+
+async def _publish(bus: EventBus, scenario: Scenario, events: List[BaseEvent]) -> None:
+    """Publish every event, stamping ``metadata["sent"]`` just before it is handed over."""
+    if scenario.publish == "single":
+        for event in events:
+            event.metadata["sent"] = time.perf_counter()
+            await bus.publish(event)
+    elif scenario.publish == "pipeline":
+        for start in range(0, len(events), scenario.batch_size):
+            chunk = events[start : start + scenario.batch_size]
+            sent = time.perf_counter()
+            for event in chunk:
+                event.metadata["sent"] = sent
+            await bus.publish_many(chunk)
+    elif scenario.publish == "batching":
+        async with BatchingPublisher(bus, max_batch_size=scenario.batch_size) as publisher:
+            for event in events:
+                event.metadata["sent"] = time.perf_counter()
+                await publisher.submit(event)
+    else:
+        raise ValueError(f"Unknown publish mode: {scenario.publish}")
+
+
+async def _run_once(scenario: Scenario, url: str, timeout: float) -> Dict[str, Any]:
+    """Publish ``scenario.events`` events and wait until the consumers handled them all."""
+    prefix = f"bench:{uuid.uuid4().hex[:8]}"
+    events = _build_events(scenario)
+    clients = [aioredis.from_url(url) for _ in range(scenario.consumers + 1)]
+    publisher_bus = _new_bus(clients[0], scenario, prefix)
+    streams = publisher_bus.streams()
+
+    loop = asyncio.get_running_loop()
+    done = asyncio.Event()
+    latencies: List[float] = []
+    lock = threading.Lock()
+
+    def record(event: BaseEvent) -> None:
+        # Handlers may run on executor threads; the list append and the count must agree
+        with lock:
+            latencies.append(time.perf_counter() - event.metadata["sent"])
+            finished = len(latencies) >= scenario.events
+        if finished:
+            loop.call_soon_threadsafe(done.set)
+
+    async def async_handler(event: BaseEvent) -> None:
+        record(event)
+        if scenario.handler_latency:
+            await asyncio.sleep(scenario.handler_latency)
+
+    def sync_handler(event: BaseEvent) -> None:
+        record(event)
+        if scenario.handler_latency:
+            time.sleep(scenario.handler_latency)
+
+    consumers: List[asyncio.Task[None]] = []
+    try:
+        for stream in streams:
+            await clients[0].xgroup_create(stream, publisher_bus.consumer_group, id="0", mkstream=True)
+        before = await _redis_info(clients[0])
+
+        # With partitions, consumers split them statically; otherwise they share the stream via the group
+        replica_count = scenario.consumers if scenario.partitions > 1 else 1
+        for index in range(scenario.consumers):
+            bus = _new_bus(clients[index + 1], scenario, prefix)
+            bus.subscribe(EventType.SUMMARY_GENERATED, sync_handler if scenario.sync_handler else async_handler)
+            consumers.append(
+                asyncio.create_task(
+                    bus.start_consuming(
+                        f"consumer-{index}",
+                        scenario.block_ms,
+                        count=scenario.count,
+                        concurrency=scenario.concurrency,
+                        reclaim_interval=None,
+                        replica_index=index % replica_count,
+                        replica_count=replica_count,
+                    )
+                )
+            )
+        await asyncio.sleep(0.05)
+
+        started = time.perf_counter()
+        await _publish(publisher_bus, scenario, events)
+        publish_seconds = time.perf_counter() - started
+        try:
+            await asyncio.wait_for(done.wait(), timeout)
+            success = True
+        except asyncio.TimeoutError:
+            success = False
+        total_seconds = time.perf_counter() - started
+
+        after = await _redis_info(clients[0])
+    finally:
+        for task in consumers:
+            task.cancel()
+        await asyncio.gather(*consumers, return_exceptions=True)
+        with contextlib.suppress(Exception):
+            await clients[0].delete(*streams, publisher_bus.dead_letter_stream)
+        for client in clients:
+            await client.aclose()
+
+    handled = len(latencies)
+    ordered = sorted(latencies)
+    # INFO itself is one of the commands counted between the two snapshots
+    commands = after["total_commands_processed"] - before["total_commands_processed"] - 1
+    return {
+        "success": success,
+        "handled": handled,
+        "publish_seconds": round(publish_seconds, 4),
+        "total_seconds": round(total_seconds, 4),
+        "publish_eps": round(scenario.events / publish_seconds, 1) if publish_seconds else 0.0,
+        "consume_eps": round(handled / total_seconds, 1) if total_seconds else 0.0,
+        "latency_p50_ms": round(_percentile(ordered, 0.50) * 1000, 3),
+        "latency_p99_ms": round(_percentile(ordered, 0.99) * 1000, 3),
+        "latency_max_ms": round((ordered[-1] if ordered else 0.0) * 1000, 3),
+        "commands_per_event": round(commands / scenario.events, 3),
+        # Acknowledged entries stay in the stream until trimmed, so this is the retained cost per event
+        "memory_bytes_per_event": round((after["used_memory"] - before["used_memory"]) / scenario.events, 1),
+    }
+
+
+def run_scenario(scenario: Scenario, args: argparse.Namespace) -> Dict[str, Any]:
+    """Run one scenario ``args.repeat`` times and summarize it.
+
+    Throughput is the median across repeats; the other metrics come from the median run.
+    """
+    runs: List[Dict[str, Any]] = []
+    for _ in range(args.repeat):
+        with backend_url(args) as (url, backend):
+            runs.append(asyncio.run(_run_once(scenario, url, args.timeout)))
+            if backend is not None:
+                runs[-1]["server"] = backend.stats.as_dict()
+
+    rates = [run["consume_eps"] for run in runs]
+    median_rate = statistics.median(rates)
+    representative = min(runs, key=lambda run: abs(run["consume_eps"] - median_rate))
+    return {
+        **representative,
+        "description": scenario.description,
+        "parameters": {
+            key: value
+            for key, value in dataclasses.asdict(scenario).items()
+            if key not in ("name", "description")
+        },
+        "success": all(run["success"] for run in runs),
+        "consume_eps": median_rate,
+        "consume_eps_runs": rates,
+    }
+
+
+def _parse_value(field: dataclasses.Field, raw: str) -> Any:
+    if raw.lower() in ("none", "null"):
+        return None
+    kind = field.type if isinstance(field.type, str) else getattr(field.type, "__name__", "")
+    if "bool" in kind:
+        return raw.lower() in ("1", "true", "yes", "on")
+    if "int" in kind:
+        return int(raw)
+    if "float" in kind:
+        return float(raw)
+    return raw
+
+
+def expand_sweeps(scenarios: List[Scenario], settings: List[str]) -> List[Scenario]:
+    """Apply ``--set key=v1,v2`` overrides; several values expand each scenario into variants."""
+    fields = {f.name: f for f in dataclasses.fields(Scenario) if f.name not in ("name", "description")}
+    sweeps: List[tuple[str, List[Any]]] = []
+    for setting in settings:
+        key, _, raw = setting.partition("=")
+        key = key.strip().replace("-", "_")
+        if key not in fields or not raw:
+            raise SystemExit(f"Invalid --set {setting!r}; keys: {', '.join(fields)}")
+        sweeps.append((key, [_parse_value(fields[key], value.strip()) for value in raw.split(",")]))
+    if not sweeps:
+        return scenarios
+
+    expanded: List[Scenario] = []
+    for scenario in scenarios:
+        for combination in itertools.product(*(values for _, values in sweeps)):
+            overrides = {key: value for (key, _), value in zip(sweeps, combination)}
+            label = ",".join(f"{key}={value}" for key, value in overrides.items())
+            expanded.append(dataclasses.replace(scenario, name=f"{scenario.name}[{label}]", **overrides))
+    return expanded
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(args: argparse.Namespace) -> Dict[str, Any]:
+    selected = [s for s in SCENARIOS if not args.scenario or s.name in args.scenario]
+    unknown = set(args.scenario or ()) - {s.name for s in SCENARIOS}
+    if unknown:
+        raise SystemExit(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    results: Dict[str, Any] = {}
+    for scenario in expand_sweeps(selected, args.set or []):
+        logger.info("Running %s: %s", scenario.name, scenario.description)
+        results[scenario.name] = run_scenario(scenario, args)
+        summary = results[scenario.name]
+        logger.info(
+            "  %s: publish %.0f ev/s, end-to-end %.0f ev/s, p50 %.2fms / p99 %.2fms, "
+            "%.2f commands and %.0f B per event",
+            "ok" if summary["success"] else f"FAILED ({summary['handled']} handled)",
+            summary["publish_eps"],
+            summary["consume_eps"],
+            summary["latency_p50_ms"],
+            summary["latency_p99_ms"],
+            summary["commands_per_event"],
+            summary["memory_bytes_per_event"],
+        )
+
+    if args.redis_url:
+        backend = "redis-url"
+    elif args.redis_server:
+        backend = "redis-server"
+    else:
+        backend = "fake"
+    return {
+        "version": RESULTS_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "config": {
+            "backend": backend,
+            "repeat": args.repeat,
+            "latency": args.latency if backend == "fake" else None,
+            "timeout": args.timeout,
+            "set": args.set or [],
+        },
+        "scenarios": results,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Comparison
+# ---------------------------------------------------------------------------
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = 0.15,
+) -> List[Dict[str, Any]]:
+    """Compare two result documents scenario by scenario.
+
+    A metric regresses when it moved the wrong way (down for throughput, up
+    for everything else) by more than ``threshold`` (relative) and by more
+    than its noise floor (absolute). A scenario that succeeded in the
+    baseline but fails now is always a regression.
+
+    Returns:
+        One row per compared metric with ``baseline``, ``current``, ``change``
+        and ``regression`` keys
+    """
+    rows: List[Dict[str, Any]] = []
+    for name, now in current.get("scenarios", {}).items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            continue
+        if before.get("success") and not now.get("success"):
+            rows.append(
+                {"scenario": name, "metric": "success", "baseline": True, "current": False, "change": None, "regression": True}
+            )
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = before.get(metric), now.get(metric)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old if old else (0.0 if new == old else float("inf"))
+            worse = -change if higher_is_better else change
+            regression = worse > threshold and abs(new - old) > NOISE_FLOORS[metric]
+            rows.append(
+                {
+                    "scenario": name,
+                    "metric": metric,
+                    "baseline": old,
+                    "current": new,
+                    "change": change,
+                    "regression": regression,
+                }
+            )
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, Any]]) -> None:
+    print(f"{'scenario':<28} {'metric':<24} {'baseline':>12} {'current':>12} {'change':>9}")
+    for row in rows:
+        change = row["change"]
+        change_text = "-" if change is None else ("new" if change == float("inf") else f"{change:+.1%}")
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['scenario']:<28} {row['metric']:<24} {row['baseline']!s:>12} {row['current']!s:>12} {change_text:>9}{flag}"
+        )
+
+
+def _load(path: str) -> Dict[str, Any]:
+    with open(path) as handle:
+        return json.load(handle)
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Event bus throughput benchmarks against Redis Streams")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    run = subcommands.add_parser("run", help="Run scenarios and write JSON results")
+    run.add_argument("--output", help="Write results to this JSON file (default: stdout)")
+    run.add_argument("--baseline", help="Compare against this results file; exit 1 on regression")
+    run.add_argument("--threshold", type=float, default=0.15, help="Relative change flagged as regression")
+    run.add_argument("--scenario", action="append", help="Only run this scenario (repeatable)")
+    run.add_argument(
+        "--set",
+        action="append",
+        metavar="KEY=V1[,V2...]",
+        help="Override a scenario parameter; several values sweep it (repeatable)",
+    )
+    run.add_argument("--repeat", type=int, default=1, help="Runs per scenario; the median is reported")
+    run.add_argument("--latency", type=float, default=0.0, help="Stand-in latency per command (s)")
+    run.add_argument("--timeout", type=float, default=120.0, help="Seconds to wait for consumers per run")
+    target = run.add_mutually_exclusive_group()
+    target.add_argument("--redis-server", metavar="PATH", help="Spawn this redis-server binary instead of the stand-in")
+    target.add_argument("--redis-url", help="Use an existing Redis (only the benchmark's own keys are touched)")
+    run.add_argument("--list", action="store_true", help="List scenarios and exit")
+    run.add_argument("--verbose", action="store_true", help="Show event bus logs")
+
+    compare = subcommands.add_parser("compare", help="Compare two results files")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=0.15, help="Relative change flagged as regression")
+
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        rows = compare_results(_load(args.baseline), _load(args.current), args.threshold)
+        print_comparison(rows)
+        sys.exit(1 if any(row["regression"] for row in rows) else 0)
+
+    if args.list:
+        for scenario in SCENARIOS:
+            print(f"{scenario.name:<28} {scenario.description}")
+        return
+
+    logging.getLogger().setLevel(logging.INFO if args.verbose else logging.WARNING)
+    logger.setLevel(logging.INFO)
+    results = run_benchmarks(args)
+
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+        logger.info("Results written to %s", args.output)
+    else:
+        print(text)
+
+    failed = [name for name, summary in results["scenarios"].items() if not summary["success"]]
+    if failed:
+        logger.error("Scenario(s) failed: %s", ", ".join(failed))
+
+    if args.baseline:
+        rows = compare_results(_load(args.baseline), results, args.threshold)
+        print_comparison(rows)
+        if any(row["regression"] for row in rows):
+            sys.exit(1)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1024 @@
+"""
+In-process stand-in for the Railway GraphQL API.
+
+Covers the queries and mutations :class:`installer.railway.RailwayProvider`
+issues (projects, environments, services, service instances, variables,
+deployments), including aliased batch documents. Latency, 429 responses with
+``Retry-After`` and server-side rate limits can be injected, and deployments
+walk a timed ``INITIALIZING -> BUILDING -> DEPLOYING -> SUCCESS`` state
+machine so waiting code behaves as it does against Railway.
+
+:class:`FakeRailwaySubscriptionServer` serves the ``deployment`` and
+``deploymentLogs`` subscriptions over ``graphql-transport-ws`` websockets;
+:meth:`FakeRailwaySubscriptionServer.drop_connections` simulates a socket
+failure so polling fallbacks can be exercised.
+
+Usage::
+
+    with FakeRailwayServer(FakeRailwayBackend(latency=0.02)) as server:
+        project_id = server.backend.add_project("budai", environments=["production"])
+        provider = RailwayProvider("fake-token", project_id, graphql_url=server.url)
+
+``FakeRailwayBackend.mock_transport()`` serves the same backend to an
+``httpx`` client without opening a socket. Subscriptions share the backend::
+
+    with FakeRailwayServer(backend) as server, FakeRailwaySubscriptionServer(backend) as ws:
+        provider = AsyncRailwayProvider("fake-token", project_id, graphql_url=server.url, ws_url=ws.url)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import math
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+import httpx
+import websockets
+from websockets.asyncio.server import Server, ServerConnection, serve
+
+# ---------------------------------------------------------------------------
+# Minimal GraphQL document parser
+# ---------------------------------------------------------------------------
+
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<ignored>[\s,]+|\#[^\n]*)
+  | (?P<string>"(?:[^"\\]|\\.)*")
+  | (?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+  | (?P<name>[_A-Za-z][_0-9A-Za-z]*)
+  | (?P<punct>\.\.\.|[{}()\[\]:$!=@])
+    """,
+    re.VERBOSE,
+)
+
+
+class GraphQLSyntaxError(ValueError):
+    """Raised for documents the fake server cannot parse."""
+
+
+class _Variable:
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+
+class _Field:
+    """One selection: ``alias: name(arguments) { selections }``."""
+
+    def __init__(
+        self,
+        name: str,
+        alias: Optional[str],
+        arguments: Dict[str, Any],
+        selections: Optional[List[_Field]],
+    ) -> None:
+        self.name = name
+        self.key = alias or name
+        self.arguments = arguments
+        self.selections = selections
+
+
+def _tokenize(document: str) -> List[Tuple[str, str]]:
+    tokens: List[Tuple[str, str]] = []
+    position = 0
+    while position < len(document):
+        match = _TOKEN_RE.match(document, position)
+        if not match:
+            raise GraphQLSyntaxError(f"Unexpected character {document[position]!r} at {position}")
+        position = match.end()
+        kind = match.lastgroup
+        if kind != "ignored":
+            tokens.append((kind, match.group()))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, document: str) -> None:
+        self.tokens = _tokenize(document)
+        self.position = 0
+
+    def peek(self) -> Tuple[str, str]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else ("eof", "")
+
+    def take(self, value: Optional[str] = None) -> str:
+        kind, text = self.peek()
+        if kind == "eof" or (value is not None and text != value):
+            raise GraphQLSyntaxError(f"Expected {value or 'token'}, found {text or 'end of document'}")
+        self.position += 1
+        return text
+
+    def parse_operation(self) -> Tuple[str, List[_Field]]:
+        kind, text = self.peek()
+        operation = "query"
+        if kind == "name" and text in ("query", "mutation", "subscription"):
+            operation = self.take()
+            if self.peek()[0] == "name":
+                self.take()
+            if self.peek()[1] == "(":
+                self.skip_variable_definitions()
+        return operation, self.parse_selection_set()
+
+    def skip_variable_definitions(self) -> None:
+        depth = 0
+        while True:
+            text = self.take()
+            if text == "(":
+                depth += 1
+            elif text == ")":
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def parse_selection_set(self) -> List[_Field]:
+        self.take("{")
+        fields: List[_Field] = []
+        while self.peek()[1] != "}":
+            fields.append(self.parse_field())
+        self.take("}")
+        return fields
+
+    def parse_field(self) -> _Field:
+        name = self.take()
+        alias = None
+        if self.peek()[1] == ":":
+            self.take(":")
+            alias, name = name, self.take()
+        arguments: Dict[str, Any] = {}
+        if self.peek()[1] == "(":
+            self.take("(")
+            while self.peek()[1] != ")":
+                arg_name = self.take()
+                self.take(":")
+                arguments[arg_name] = self.parse_value()
+            self.take(")")
+        selections = self.parse_selection_set() if self.peek()[1] == "{" else None
+        return _Field(name, alias, arguments, selections)
+
+    def parse_value(self) -> Any:
+        kind, text = self.peek()
+        if text == "$":
+            self.take()
+            return _Variable(self.take())
+        if text == "[":
+            self.take()
+            items = []
+            while self.peek()[1] != "]":
+                items.append(self.parse_value())
+            self.take("]")
+            return items
+        if text == "{":
+            self.take()
+            fields = {}
+            while self.peek()[1] != "}":
+                key = self.take()
+                self.take(":")
+                fields[key] = self.parse_value()
+            self.take("}")
+            return fields
+        self.take()
+        if kind == "string":
+            return json.loads(text)
+        if kind == "number":
+            return float(text) if any(c in text for c in ".eE") else int(text)
+        return {"true": True, "false": False, "null": None}.get(text, text)
+
+
+def _bind(value: Any, variables: Dict[str, Any]) -> Any:
+    """Substitute ``$variable`` references with their values."""
+    if isinstance(value, _Variable):
+        return variables.get(value.name)
+    if isinstance(value, list):
+        return [_bind(item, variables) for item in value]
+    if isinstance(value, dict):
+        return {key: _bind(item, variables) for key, item in value.items()}
+    return value
+
+
+def _project(value: Any, selections: Optional[List[_Field]], variables: Dict[str, Any]) -> Any:
+    """Shape a resolved value by a selection set (callables resolve nested fields)."""
+    if selections is None or value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, list):
+        return [_project(item, selections, variables) for item in value]
+    result: Dict[str, Any] = {}
+    for field in selections:
+        if field.name == "__typename":
+            result[field.key] = value.get("__typename", "Object")
+            continue
+        item = value.get(field.name)
+        if callable(item):
+            item = item(**{k: _bind(v, variables) for k, v in field.arguments.items()})
+        result[field.key] = _project(item, field.selections, variables)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Backend state
+# ---------------------------------------------------------------------------
+
+
+class FakeRailwayError(Exception):
+    """GraphQL-level error raised by a resolver."""
+
+
+def _edges(nodes: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    return {"edges": [{"node": node} for node in nodes]}
+
+
+def _timestamp(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class FakeDeployment:
+    """Deployment whose status advances with wall-clock time."""
+
+    def __init__(
+        self,
+        deployment_id: str,
+        service_id: str,
+        environment_id: str,
+        *,
+        phases: Sequence[Tuple[str, float]],
+        final_status: str,
+    ) -> None:
+        self.id = deployment_id
+        self.service_id = service_id
+        self.environment_id = environment_id
+        self.created_at = time.time()
+        self._started = time.monotonic()
+        self.phases = list(phases)
+        self.final_status = final_status
+        self.superseded = False
+
+    @property
+    def status(self) -> str:
+        elapsed = time.monotonic() - self._started
+        for status, duration in self.phases:
+            if elapsed < duration:
+                return "REMOVED" if self.superseded else status
+            elapsed -= duration
+        return self.final_status
+
+    @property
+    def terminal(self) -> bool:
+        return self.status in ("SUCCESS", "FAILED", "CRASHED", "REMOVED")
+
+    def node(self) -> Dict[str, Any]:
+        status = self.status
+        completed = self.created_at + sum(d for _, d in self.phases)
+        return {
+            "id": self.id,
+            "status": status,
+            "createdAt": _timestamp(self.created_at),
+            "completedAt": _timestamp(completed) if status in ("SUCCESS", "FAILED", "CRASHED") else None,
+            "meta": {"serviceId": self.service_id, "environmentId": self.environment_id},
+        }
+
+
+class FakeRailwayStats:
+    """Request accounting for a :class:`FakeRailwayBackend`."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.throttled = 0
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.subscriptions = 0
+        self.operations: Counter = Counter()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "bytes_received": self.bytes_received,
+            "bytes_sent": self.bytes_sent,
+            "subscriptions": self.subscriptions,
+            "operations": dict(self.operations),
+        }
+
+
+class FakeRailwayBackend:
+    """Thread-safe Railway project state plus a GraphQL executor over it."""
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        build_seconds: float = 0.2,
+        deploy_seconds: float = 0.2,
+        rate_limit: Optional[float] = None,
+        rate_burst: float = 10.0,
+        retry_after: float = 1.0,
+        fail_services: Iterable[str] = (),
+    ) -> None:
+        """Initialize backend.
+
+        Args:
+            latency: Seconds added to every request
+            build_seconds: Time a deployment spends BUILDING
+            deploy_seconds: Time a deployment spends DEPLOYING
+            rate_limit: Server-side requests per second before answering 429 (None: unlimited)
+            rate_burst: Requests allowed back-to-back under ``rate_limit``
+            retry_after: ``Retry-After`` seconds sent with injected 429s
+            fail_services: Service names whose deployments end FAILED
+        """
+        self.latency = latency
+        self.build_seconds = build_seconds
+        self.deploy_seconds = deploy_seconds
+        self.rate_limit = rate_limit
+        self.rate_burst = rate_burst
+        self.retry_after = retry_after
+        self.fail_services = set(fail_services)
+        self.stats = FakeRailwayStats()
+
+        self.projects: Dict[str, Dict[str, Any]] = {}
+        self.environments: Dict[str, Dict[str, Any]] = {}
+        self.services: Dict[str, Dict[str, Any]] = {}
+        self.instances: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.variables: Dict[Tuple[str, str, Optional[str]], Dict[str, str]] = {}
+        self.deployments: Dict[str, FakeDeployment] = {}
+
+        self._lock = threading.RLock()
+        self._ids = itertools.count(1)
+        self._forced_throttles: List[float] = []
+        self._tokens = rate_burst
+        self._refilled = time.monotonic()
+
+        self._queries: Dict[str, Callable[..., Any]] = {
+            "project": self._q_project,
+            "service": self._q_service,
+            "deployment": self._q_deployment,
+            "variables": self._q_variables,
+        }
+        self._mutations: Dict[str, Callable[..., Any]] = {
+            "projectCreate": self._m_project_create,
+            "environmentCreate": self._m_environment_create,
+            "serviceCreate": self._m_service_create,
+            "serviceConnect": self._m_service_connect,
+            "variableUpsert": self._m_variable_upsert,
+            "variableCollectionUpsert": self._m_variable_collection_upsert,
+            "serviceInstanceDeploy": self._m_service_instance_deploy,
+            "serviceInstanceRedeploy": self._m_service_instance_deploy,
+            "serviceInstanceUpdate": self._m_service_instance_update,
+        }
+        self._subscriptions: Dict[str, Callable[..., Iterator[Any]]] = {
+            "deployment": self._s_deployment,
+            "deploymentLogs": self._s_deployment_logs,
+        }
+
+    # -- seeding -------------------------------------------------------------
+
+    def _new_id(self, prefix: str) -> str:
+        return f"{prefix}-{next(self._ids):04d}-{uuid.uuid4().hex[:8]}"
+
+    def add_project(self, name: str = "budai", environments: Iterable[str] = ("production",)) -> str:
+        """Create a project with the given environments; returns its ID."""
+        with self._lock:
+            project_id = self._new_id("prj")
+            self.projects[project_id] = {"id": project_id, "name": name}
+            for env_name in environments:
+                self._create_environment(project_id, env_name)
+            return project_id
+
+    def add_service(
+        self,
+        project_id: str,
+        name: str,
+        *,
+        variables: Optional[Dict[str, str]] = None,
+        environment: Optional[str] = None,
+        deployed: bool = True,
+    ) -> str:
+        """Seed an existing service (optionally with a finished deployment); returns its ID."""
+        with self._lock:
+            env_id = self.environment_id(project_id, environment) if environment else None
+            service_id = self._create_service(project_id, name, {"repo": f"example/{name}"}, env_id, variables)
+            if deployed:
+                for (svc_id, instance_env), _ in list(self.instances.items()):
+                    if svc_id == service_id:
+                        self._deploy(service_id, instance_env, instant=True)
+            return service_id
+
+    def environment_id(self, project_id: str, name: str) -> str:
+        """Look up an environment ID by name."""
+        for env in self.environments.values():
+            if env["projectId"] == project_id and env["name"] == name:
+                return env["id"]
+        raise KeyError(name)
+
+    def inject_throttle(self, count: int, retry_after: Optional[float] = None) -> None:
+        """Answer the next ``count`` requests with 429 and ``Retry-After``."""
+        with self._lock:
+            self._forced_throttles.extend([self.retry_after if retry_after is None else retry_after] * count)
+
+    # -- transport -------------------------------------------------------------
+
+    def handle_http(self, body: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        """Serve one POSTed GraphQL request.
+
+        Returns:
+            Tuple of (status code, headers, response body)
+        """
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.bytes_received += len(body)
+            retry_after = self._throttle()
+        if retry_after is not None:
+            payload = json.dumps({"errors": [{"message": "Too Many Requests"}]}).encode()
+            with self._lock:
+                self.stats.throttled += 1
+                self.stats.bytes_sent += len(payload)
+            return 429, {"Retry-After": str(max(1, math.ceil(retry_after)))}, payload
+
+        try:
+            request = json.loads(body or b"{}")
+            response = self.execute(request.get("query", ""), request.get("variables") or {})
+        except (ValueError, GraphQLSyntaxError) as exc:
+            response = {"errors": [{"message": f"Invalid request: {exc}"}]}
+        payload = json.dumps(response).encode()
+        with self._lock:
+            self.stats.bytes_sent += len(payload)
+        return 200, {}, payload
+
+    def _throttle(self) -> Optional[float]:
+        """Retry-After seconds if this request must be rejected (caller holds the lock)."""
+        if self._forced_throttles:
+            return self._forced_throttles.pop(0)
+        if self.rate_limit is None:
+            return None
+        now = time.monotonic()
+        self._tokens = min(self.rate_burst, self._tokens + (now - self._refilled) * self.rate_limit)
+        self._refilled = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return None
+        return (1.0 - self._tokens) / self.rate_limit
+
+    def mock_transport(self) -> httpx.MockTransport:
+        """``httpx`` transport answering from this backend without a socket."""
+
+        def _handle(request: httpx.Request) -> httpx.Response:
+            status, headers, payload = self.handle_http(request.content)
+            return httpx.Response(status, headers=headers, content=payload)
+
+        return httpx.MockTransport(_handle)
+
+    # -- execution -------------------------------------------------------------
+
+    def execute(self, document: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a GraphQL document; per-field errors carry the field's alias as ``path``."""
+        operation, fields = _Parser(document).parse_operation()
+        resolvers = self._mutations if operation == "mutation" else self._queries
+        data: Dict[str, Any] = {}
+        errors: List[Dict[str, Any]] = []
+        for field in fields:
+            with self._lock:
+                self.stats.operations[field.name] += 1
+            resolver = resolvers.get(field.name)
+            if resolver is None:
+                errors.append({"message": f"Cannot query field \"{field.name}\"", "path": [field.key]})
+                data[field.key] = None
+                continue
+            try:
+                with self._lock:
+                    value = resolver(**{k: _bind(v, variables) for k, v in field.arguments.items()})
+                    data[field.key] = _project(value, field.selections, variables)
+            except FakeRailwayError as exc:
+                errors.append({"message": str(exc), "path": [field.key]})
+                data[field.key] = None
+        response: Dict[str, Any] = {"data": data}
+        if errors:
+            response["errors"] = errors
+        return response
+
+    def subscribe(self, document: str, variables: Dict[str, Any]) -> Iterator[Optional[Dict[str, Any]]]:
+        """Run a subscription document.
+
+        Each step yields the next ``{"data": ...}`` payload, or None when
+        nothing changed since the previous step; the iterator ends when the
+        server would send ``complete``.
+
+        Raises:
+            FakeRailwayError: If the subscription is unknown or its resolver fails
+            GraphQLSyntaxError: If the document cannot be parsed
+        """
+        operation, fields = _Parser(document).parse_operation()
+        if operation != "subscription" or len(fields) != 1:
+            raise FakeRailwayError("Subscriptions must select exactly one field")
+        field = fields[0]
+        resolver = self._subscriptions.get(field.name)
+        if resolver is None:
+            raise FakeRailwayError(f"Cannot query field \"{field.name}\" on type \"Subscription\"")
+        with self._lock:
+            self.stats.subscriptions += 1
+            self.stats.operations[field.name] += 1
+        arguments = {k: _bind(v, variables) for k, v in field.arguments.items()}
+        for value in resolver(**arguments):
+            if value is None:
+                yield None
+                continue
+            with self._lock:
+                yield {"data": {field.key: _project(value, field.selections, variables)}}
+
+    # -- model helpers -------------------------------------------------------
+
+    def _create_environment(self, project_id: str, name: str) -> str:
+        env_id = self._new_id("env")
+        self.environments[env_id] = {"id": env_id, "name": name, "projectId": project_id}
+        for service in self.services.values():
+            if service["projectId"] == project_id:
+                self._create_instance(service["id"], env_id)
+        return env_id
+
+    def _create_instance(self, service_id: str, env_id: str) -> None:
+        self.instances[(service_id, env_id)] = {
+            "id": self._new_id("si"),
+            "serviceId": service_id,
+            "environmentId": env_id,
+            "latestDeploymentId": None,
+        }
+
+    def _create_service(
+        self,
+        project_id: str,
+        name: str,
+        source: Optional[Dict[str, Any]],
+        env_id: Optional[str],
+        variables: Optional[Dict[str, str]],
+    ) -> str:
+        if project_id not in self.projects:
+            raise FakeRailwayError("Project not found")
+        if any(s["projectId"] == project_id and s["name"] == name for s in self.services.values()):
+            raise FakeRailwayError(f"Service {name} already exists")
+        service_id = self._new_id("svc")
+        self.services[service_id] = {
+            "id": service_id,
+            "name": name,
+            "projectId": project_id,
+            "source": source,
+            "domains": [f"{name}-production.up.railway.app"],
+        }
+        env_ids = [e["id"] for e in self.environments.values() if e["projectId"] == project_id]
+        for instance_env in env_ids:
+            self._create_instance(service_id, instance_env)
+        for target_env in [env_id] if env_id else env_ids:
+            if variables:
+                self.variables.setdefault((project_id, target_env, service_id), {}).update(variables)
+        return service_id
+
+    def _deploy(self, service_id: str, env_id: str, *, instant: bool = False) -> str:
+        instance = self.instances.get((service_id, env_id))
+        if instance is None:
+            raise FakeRailwayError("ServiceInstance not found")
+        previous = self.deployments.get(instance["latestDeploymentId"] or "")
+        if previous is not None and not previous.terminal:
+            previous.superseded = True
+        service = self.services[service_id]
+        phases = [] if instant else [
+            ("INITIALIZING", 0.0),
+            ("BUILDING", self.build_seconds),
+            ("DEPLOYING", self.deploy_seconds),
+        ]
+        final_status = "FAILED" if service["name"] in self.fail_services else "SUCCESS"
+        deployment = FakeDeployment(
+            self._new_id("dep"), service_id, env_id, phases=phases, final_status=final_status
+        )
+        self.deployments[deployment.id] = deployment
+        instance["latestDeploymentId"] = deployment.id
+        return deployment.id
+
+    def _service_node(self, service: Dict[str, Any]) -> Dict[str, Any]:
+        service_id = service["id"]
+
+        def instances(first: int = 100) -> Dict[str, Any]:
+            nodes = []
+            for (svc_id, env_id), instance in self.instances.items():
+                if svc_id != service_id:
+                    continue
+                latest = self.deployments.get(instance["latestDeploymentId"] or "")
+                nodes.append(
+                    {
+                        "id": instance["id"],
+                        "serviceId": service_id,
+                        "environmentId": env_id,
+                        "latestDeployment": latest.node() if latest else None,
+                    }
+                )
+            return _edges(nodes[:first])
+
+        return {
+            "id": service_id,
+            "name": service["name"],
+            "templateServiceId": None,
+            "source": service["source"],
+            "domains": {"serviceDomains": [{"domain": d} for d in service["domains"]]},
+            "serviceInstances": instances,
+        }
+
+    # -- queries -------------------------------------------------------------
+
+    def _q_project(self, id: str) -> Dict[str, Any]:
+        project = self.projects.get(id)
+        if project is None:
+            raise FakeRailwayError("Project not found")
+        environments = [
+            {"id": e["id"], "name": e["name"]} for e in self.environments.values() if e["projectId"] == id
+        ]
+        services = [self._service_node(s) for s in self.services.values() if s["projectId"] == id]
+        return {
+            "id": id,
+            "name": project["name"],
+            "environments": _edges(environments),
+            "services": lambda first=100: _edges(services[:first]),
+        }
+
+    def _q_service(self, id: str) -> Dict[str, Any]:
+        service = self.services.get(id)
+        if service is None:
+            raise FakeRailwayError("Service not found")
+        return self._service_node(service)
+
+    def _q_deployment(self, id: str) -> Dict[str, Any]:
+        deployment = self.deployments.get(id)
+        if deployment is None:
+            raise FakeRailwayError("Deployment not found")
+        return deployment.node()
+
+    def _q_variables(
+        self, projectId: str, environmentId: str, serviceId: Optional[str] = None
+    ) -> Dict[str, str]:
+        if environmentId not in self.environments:
+            raise FakeRailwayError("Environment not found")
+        return dict(self.variables.get((projectId, environmentId, serviceId), {}))
+
+    # -- subscriptions ---------------------------------------------------------
+
+    def _s_deployment(self, id: str) -> Iterator[Optional[Dict[str, Any]]]:
+        last_status = None
+        while True:
+            with self._lock:
+                deployment = self.deployments.get(id)
+                if deployment is None:
+                    raise FakeRailwayError("Deployment not found")
+                node = deployment.node()
+            if node["status"] == last_status:
+                yield None
+                continue
+            last_status = node["status"]
+            yield node
+            if node["status"] in ("SUCCESS", "FAILED", "CRASHED", "REMOVED"):
+                return
+
+    def _s_deployment_logs(
+        self, deploymentId: str, filter: Optional[str] = None, limit: Optional[int] = None
+    ) -> Iterator[Optional[List[Dict[str, Any]]]]:
+        sent = 0
+        for node in self._s_deployment(deploymentId):
+            if node is None:
+                yield None
+                continue
+            status = node["status"]
+            line = {
+                "message": f"Deployment {deploymentId} is {status}",
+                "severity": "error" if status in ("FAILED", "CRASHED") else "info",
+                "timestamp": _timestamp(time.time()),
+            }
+            if filter and filter not in line["message"]:
+                continue
+            yield [line]
+            sent += 1
+            if limit is not None and sent >= limit:
+                return
+
+    # -- mutations -------------------------------------------------------------
+
+    def _m_project_create(self, input: Dict[str, Any]) -> Dict[str, Any]:
+        project_id = self.add_project(input.get("name") or "project", environments=("production",))
+        return {"id": project_id, "name": self.projects[project_id]["name"]}
+
+    def _m_environment_create(self, input: Dict[str, Any]) -> Dict[str, Any]:
+        project_id, name = input.get("projectId"), input.get("name")
+        if project_id not in self.projects:
+            raise FakeRailwayError("Project not found")
+        if any(e["projectId"] == project_id and e["name"] == name for e in self.environments.values()):
+            raise FakeRailwayError(f"Environment {name} already exists")
+        env_id = self._create_environment(project_id, name)
+        return {"id": env_id, "name": name}
+
+    def _m_service_create(self, input: Dict[str, Any]) -> Dict[str, Any]:
+        env_id = input.get("environmentId")
+        service_id = self._create_service(
+            input["projectId"], input["name"], input.get("source"), env_id, input.get("variables")
+        )
+        if input.get("source"):
+            targets = [env_id] if env_id else [e for (s, e) in self.instances if s == service_id]
+            for target_env in targets:
+                self._deploy(service_id, target_env)
+        return {"id": service_id, "name": input["name"]}
+
+    def _m_service_connect(self, id: str, input: Dict[str, Any]) -> Dict[str, Any]:
+        service = self.services.get(id)
+        if service is None:
+            raise FakeRailwayError("Service not found")
+        service["source"] = {"repo": input.get("repo"), "branch": input.get("branch")}
+        for svc_id, env_id in list(self.instances):
+            if svc_id == id:
+                self._deploy(id, env_id)
+        return {"id": id}
+
+    def _upsert(self, scope: Dict[str, Any], values: Dict[str, str]) -> bool:
+        service_id, env_id = scope.get("serviceId"), scope.get("environmentId")
+        if service_id not in self.services:
+            raise FakeRailwayError("Service not found")
+        if env_id not in self.environments:
+            raise FakeRailwayError("Environment not found")
+        self.variables.setdefault((scope.get("projectId"), env_id, service_id), {}).update(values)
+        if not scope.get("skipDeploys"):
+            self._deploy(service_id, env_id)
+        return True
+
+    def _m_variable_upsert(self, input: Dict[str, Any]) -> bool:
+        return self._upsert(input, {input["name"]: input["value"]})
+
+    def _m_variable_collection_upsert(self, input: Dict[str, Any]) -> bool:
+        return self._upsert(input, dict(input.get("variables") or {}))
+
+    def _m_service_instance_deploy(
+        self, serviceId: str, environmentId: str, latestCommit: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        return {"id": self._deploy(serviceId, environmentId)}
+
+    def _m_service_instance_update(
+        self, serviceId: str, environmentId: str, input: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        instance = self.instances.get((serviceId, environmentId))
+        if instance is None:
+            raise FakeRailwayError("ServiceInstance not found")
+        instance.setdefault("settings", {}).update(input)
+        return {"id": instance["id"]}
+
+
+# ---------------------------------------------------------------------------
+# HTTP server
+# ---------------------------------------------------------------------------
+
+
+class FakeRailwayServer:
+    """Serves a :class:`FakeRailwayBackend` over HTTP on a background thread."""
+
+    def __init__(
+        self,
+        backend: Optional[FakeRailwayBackend] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        """Initialize server.
+
+        Args:
+            backend: Backend to serve (a default one is created if omitted)
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+        """
+        self.backend = backend or FakeRailwayBackend()
+        backend_ref = self.backend
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self) -> None:  # noqa: N802 - http.server naming
+                length = int(self.headers.get("Content-Length") or 0)
+                status, headers, payload = backend_ref.handle_http(self.rfile.read(length))
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """GraphQL endpoint URL."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/graphql/v2"
+
+    def start(self) -> FakeRailwayServer:
+        """Start serving in a daemon thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever, name="fake-railway", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> FakeRailwayServer:
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+# ---------------------------------------------------------------------------
+# Websocket subscription server
+# ---------------------------------------------------------------------------
+
+GRAPHQL_TRANSPORT_WS = "graphql-transport-ws"
+
+
+class FakeRailwaySubscriptionServer:
+    """Serves a backend's subscriptions over ``graphql-transport-ws`` on a background thread."""
+
+    def __init__(
+        self,
+        backend: Optional[FakeRailwayBackend] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        poll_interval: float = 0.02,
+    ) -> None:
+        """Initialize server.
+
+        Args:
+            backend: Backend to serve (a default one is created if omitted)
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            poll_interval: Seconds between checks of a subscribed resource for changes
+        """
+        self.backend = backend or FakeRailwayBackend()
+        self.host = host
+        self.port = port
+        self.poll_interval = poll_interval
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[Server] = None
+        self._thread: Optional[threading.Thread] = None
+        self._connections: Set[ServerConnection] = set()
+
+    @property
+    def url(self) -> str:
+        """Websocket endpoint URL."""
+        if self._server is None:
+            raise RuntimeError("Subscription server is not running")
+        host, port = next(iter(self._server.sockets)).getsockname()[:2]
+        return f"ws://{host}:{port}/graphql/v2"
+
+    def start(self) -> FakeRailwaySubscriptionServer:
+        """Start serving in a daemon thread."""
+        if self._thread is not None:
+            return self
+        ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+
+        async def _serve() -> None:
+            self._server = await serve(
+                self._handle, self.host, self.port, subprotocols=[GRAPHQL_TRANSPORT_WS]
+            )
+            ready.set()
+            await self._server.wait_closed()
+
+        self._thread = threading.Thread(
+            target=self._loop.run_until_complete, args=(_serve(),), name="fake-railway-ws", daemon=True
+        )
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving, closing every open socket."""
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._server.close)
+        self._thread.join()
+        self._thread = None
+        self._loop.close()
+        self._loop = None
+
+    def drop_connections(self) -> None:
+        """Abruptly close every open socket, as a network failure would."""
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._drop(), self._loop).result()
+
+    async def _drop(self) -> None:
+        for connection in list(self._connections):
+            connection.transport.abort()
+
+    async def _handle(self, connection: ServerConnection) -> None:
+        self._connections.add(connection)
+        streams: Dict[str, asyncio.Task] = {}
+        acknowledged = False
+        try:
+            async for raw in connection:
+                message = json.loads(raw)
+                kind, sub_id = message.get("type"), message.get("id")
+                if kind == "connection_init":
+                    acknowledged = True
+                    await connection.send(json.dumps({"type": "connection_ack"}))
+                elif kind == "ping":
+                    await connection.send(json.dumps({"type": "pong"}))
+                elif kind == "subscribe":
+                    if not acknowledged:
+                        await connection.close(4401, "Unauthorized")
+                        return
+                    if sub_id in streams:
+                        await connection.close(4409, f"Subscriber for {sub_id} already exists")
+                        return
+                    streams[sub_id] = asyncio.ensure_future(
+                        self._stream(connection, sub_id, message.get("payload") or {})
+                    )
+                elif kind == "complete":
+                    stream = streams.pop(sub_id, None)
+                    if stream is not None:
+                        stream.cancel()
+        except (ValueError, websockets.ConnectionClosed):
+            pass
+        finally:
+            self._connections.discard(connection)
+            for stream in streams.values():
+                stream.cancel()
+
+    async def _stream(self, connection: ServerConnection, sub_id: str, payload: Dict[str, Any]) -> None:
+        events = self.backend.subscribe(payload.get("query", ""), payload.get("variables") or {})
+        try:
+            while True:
+                try:
+                    event = next(events)
+                except StopIteration:
+                    break
+                except (FakeRailwayError, GraphQLSyntaxError) as exc:
+                    await connection.send(
+                        json.dumps({"id": sub_id, "type": "error", "payload": [{"message": str(exc)}]})
+                    )
+                    return
+                if event is None:
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+                await connection.send(json.dumps({"id": sub_id, "type": "next", "payload": event}))
+            await connection.send(json.dumps({"id": sub_id, "type": "complete"}))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            events.close()
+
+    def __enter__(self) -> FakeRailwaySubscriptionServer:
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+def main() -> None:
+    """Run a standalone fake Railway API (``python -m benchmarks.fake_railway``)."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local stand-in for the Railway GraphQL API")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--ws-port", type=int, default=8788, help="Websocket subscription port")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to each request")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Requests/sec before 429s")
+    parser.add_argument("--environment", action="append", default=None, help="Environment to create")
+    args = parser.parse_args()
+
+    backend = FakeRailwayBackend(latency=args.latency, rate_limit=args.rate_limit)
+    project_id = backend.add_project(environments=args.environment or ["production"])
+    server = FakeRailwayServer(backend, port=args.port)
+    subscriptions = FakeRailwaySubscriptionServer(backend, port=args.ws_port)
+    server.start()
+    subscriptions.start()
+    print(f"Fake Railway API at {server.url}, subscriptions at {subscriptions.url} (project ID: {project_id})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        subscriptions.stop()
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
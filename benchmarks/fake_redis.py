@@ -0,0 +1,722 @@
+"""
+In-process stand-in for the Redis Streams commands the event bus uses.
+
+Speaks RESP2 and RESP3 (after ``HELLO 3``) over TCP, so :class:`shared.events.EventBus` runs against it
+through an unmodified ``redis.asyncio`` client, wire protocol included.
+Covers XADD (MAXLEN/MINID trimming), XREADGROUP (blocking, ``>`` and
+pending history), XACK, XGROUP CREATE, XAUTOCLAIM, XPENDING, XRANGE, XTRIM
+and XLEN, plus the connection housekeeping redis-py sends and ``INFO`` with
+``used_memory`` (an estimate of stream and pending-list size) and
+``total_commands_processed``.
+
+Usage::
+
+    with FakeRedisServer() as server:
+        client = redis.asyncio.from_url(server.url)
+        bus = EventBus(client)
+
+It is a benchmarking and development aid, not a Redis: there is one
+database, no persistence, no expiry and no transactions.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+StreamID = Tuple[int, int]
+
+# Rough per-item overheads used by the used_memory estimate
+_BASE_MEMORY = 1 << 20
+_ENTRY_OVERHEAD = 24
+_PENDING_OVERHEAD = 48
+
+# Approximate (~) trimming only removes whole chunks of this many entries
+_APPROXIMATE_TRIM_CHUNK = 100
+
+
+class FakeRedisError(Exception):
+    """Error reply (``-<code> <message>``)."""
+
+    def __init__(self, message: str, code: str = "ERR") -> None:
+        super().__init__(message)
+        self.code = code
+
+
+class _Status(str):
+    """Simple-string reply (``+OK``)."""
+
+
+class _NullArray:
+    """Null array reply (``*-1``)."""
+
+
+NULL_ARRAY = _NullArray()
+
+
+class _Map(dict):
+    """Map reply: a RESP3 map, or a flat key/value array in RESP2."""
+
+
+class _KeyedReply(list):
+    """``[[key, value], ...]`` reply that RESP3 sends as a map (e.g. XREADGROUP)."""
+
+
+def _encode(value: Any, resp3: bool = False) -> bytes:
+    if value is None:
+        return b"_\r\n" if resp3 else b"$-1\r\n"
+    if isinstance(value, _NullArray):
+        return b"_\r\n" if resp3 else b"*-1\r\n"
+    if isinstance(value, _Status):
+        return b"+" + value.encode("utf-8") + b"\r\n"
+    if isinstance(value, FakeRedisError):
+        return f"-{value.code} {value}\r\n".encode("utf-8")
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    if isinstance(value, _KeyedReply) and resp3:
+        value = _Map((key, item) for key, item in value)
+    if isinstance(value, _Map):
+        if resp3:
+            return b"%%%d\r\n" % len(value) + b"".join(
+                _encode(key, resp3) + _encode(item, resp3) for key, item in value.items()
+            )
+        value = [part for pair in value.items() for part in pair]
+    if isinstance(value, (list, tuple)):
+        return b"*%d\r\n" % len(value) + b"".join(_encode(item, resp3) for item in value)
+    raise TypeError(f"Cannot encode {type(value).__name__} as RESP")
+
+
+def _format_id(stream_id: StreamID) -> bytes:
+    return b"%d-%d" % stream_id
+
+
+def _parse_id(raw: bytes, *, default_seq: int = 0) -> StreamID:
+    text = raw.decode("utf-8")
+    if text == "-":
+        return (0, 0)
+    if text == "+":
+        return (2**64 - 1, 2**64 - 1)
+    ms, _, seq = text.partition("-")
+    try:
+        return int(ms), int(seq) if seq else default_seq
+    except ValueError:
+        raise FakeRedisError("Invalid stream ID specified as stream command argument") from None
+
+
+def _int(raw: bytes) -> int:
+    try:
+        return int(raw)
+    except ValueError:
+        raise FakeRedisError("value is not an integer or out of range") from None
+
+
+class _Group:
+    def __init__(self, last_delivered: StreamID) -> None:
+        self.last_delivered = last_delivered
+        # Entry ID -> [consumer, delivery time (ms), delivery count]
+        self.pending: Dict[StreamID, List[Any]] = {}
+
+
+class _Stream:
+    def __init__(self) -> None:
+        self.ids: List[StreamID] = []
+        self.fields: List[List[bytes]] = []
+        self.last_id: StreamID = (0, 0)
+        self.groups: Dict[bytes, _Group] = {}
+        self.memory = 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def index(self, stream_id: StreamID) -> int:
+        """Position of the first entry with an ID >= ``stream_id``."""
+        return bisect.bisect_left(self.ids, stream_id)
+
+    def get(self, stream_id: StreamID) -> Optional[List[bytes]]:
+        position = self.index(stream_id)
+        if position < len(self.ids) and self.ids[position] == stream_id:
+            return self.fields[position]
+        return None
+
+    def drop_first(self, count: int) -> int:
+        count = min(count, len(self.ids))
+        for fields in self.fields[:count]:
+            self.memory -= _ENTRY_OVERHEAD + sum(len(item) for item in fields)
+        del self.ids[:count]
+        del self.fields[:count]
+        return count
+
+
+class FakeRedisStats:
+    """Command accounting for a :class:`FakeRedisBackend`."""
+
+    def __init__(self) -> None:
+        self.commands = 0
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.operations: Counter = Counter()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "commands": self.commands,
+            "bytes_received": self.bytes_received,
+            "bytes_sent": self.bytes_sent,
+            "operations": dict(self.operations),
+        }
+
+
+class FakeRedisBackend:
+    """Stream state plus a command executor over it.
+
+    Commands run on the server's event loop, one at a time, so the state
+    needs no locking.
+    """
+
+    def __init__(self, *, latency: float = 0.0) -> None:
+        """Initialize backend.
+
+        Args:
+            latency: Seconds added before every reply (simulates network distance)
+        """
+        self.latency = latency
+        self.streams: Dict[bytes, _Stream] = {}
+        self.stats = FakeRedisStats()
+        self._changed: Optional[asyncio.Event] = None
+
+    # -- helpers ---------------------------------------------------------
+
+    def used_memory(self) -> int:
+        """Estimated bytes held by streams and pending lists."""
+        pending = sum(len(group.pending) for s in self.streams.values() for group in s.groups.values())
+        return _BASE_MEMORY + sum(s.memory for s in self.streams.values()) + pending * _PENDING_OVERHEAD
+
+    def _stream(self, key: bytes, *, create: bool = False) -> Optional[_Stream]:
+        stream = self.streams.get(key)
+        if stream is None and create:
+            stream = self.streams[key] = _Stream()
+        return stream
+
+    def _group(self, key: bytes, group: bytes, command: str) -> Tuple[_Stream, _Group]:
+        stream = self.streams.get(key)
+        if stream is None or group not in stream.groups:
+            raise FakeRedisError(
+                f"No such key '{key.decode()}' or consumer group '{group.decode()}' in {command}",
+                code="NOGROUP",
+            )
+        return stream, stream.groups[group]
+
+    def _notify(self) -> None:
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = None
+
+    @staticmethod
+    def _entry(stream: _Stream, position: int) -> List[Any]:
+        return [_format_id(stream.ids[position]), list(stream.fields[position])]
+
+    @staticmethod
+    def _parse_trim(args: List[bytes], position: int) -> Tuple[str, bool, bytes, int]:
+        """Parse ``MAXLEN|MINID [=|~] threshold [LIMIT n]``; returns (strategy, approximate, threshold, next)."""
+        strategy = args[position].upper().decode()
+        position += 1
+        approximate = False
+        if args[position] in (b"~", b"="):
+            approximate = args[position] == b"~"
+            position += 1
+        threshold = args[position]
+        position += 1
+        if position < len(args) and args[position].upper() == b"LIMIT":
+            position += 2
+        return strategy, approximate, threshold, position
+
+    @staticmethod
+    def _trim(stream: _Stream, strategy: str, approximate: bool, threshold: bytes) -> int:
+        if strategy == "MAXLEN":
+            excess = len(stream) - _int(threshold)
+        else:
+            excess = stream.index(_parse_id(threshold))
+        if approximate:
+            excess -= excess % _APPROXIMATE_TRIM_CHUNK
+        return stream.drop_first(excess) if excess > 0 else 0
+
+    # -- dispatch --------------------------------------------------------
+
+    async def execute(self, args: List[bytes]) -> Any:
+        """Run one command and return its reply value."""
+        if not args:
+            raise FakeRedisError("empty command")
+        name = args[0].upper().decode("utf-8", "replace")
+        self.stats.commands += 1
+        self.stats.operations[name] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if name == "XREADGROUP":
+            return await self._xreadgroup(args[1:])
+        handler = getattr(self, f"_cmd_{name.lower()}", None)
+        if handler is None:
+            raise FakeRedisError(f"unknown command '{name}'")
+        return handler(args[1:])
+
+    # -- connection / server --------------------------------------------
+
+    def _cmd_ping(self, args: List[bytes]) -> Any:
+        return args[0] if args else _Status("PONG")
+
+    def _cmd_client(self, args: List[bytes]) -> Any:
+        return _Status("OK")
+
+    def _cmd_select(self, args: List[bytes]) -> Any:
+        if args and args[0] != b"0":
+            raise FakeRedisError("DB index is out of range")
+        return _Status("OK")
+
+    def _cmd_flushall(self, args: List[bytes]) -> Any:
+        self.streams.clear()
+        return _Status("OK")
+
+    _cmd_flushdb = _cmd_flushall
+
+    def _cmd_dbsize(self, args: List[bytes]) -> Any:
+        return len(self.streams)
+
+    def _cmd_del(self, args: List[bytes]) -> Any:
+        return sum(self.streams.pop(key, None) is not None for key in args)
+
+    def _cmd_exists(self, args: List[bytes]) -> Any:
+        return sum(key in self.streams for key in args)
+
+    def _cmd_info(self, args: List[bytes]) -> Any:
+        return (
+            "# Server\r\nredis_version:7.2.0-fake\r\n"
+            f"# Memory\r\nused_memory:{self.used_memory()}\r\n"
+            f"# Stats\r\ntotal_commands_processed:{self.stats.commands}\r\n"
+            f"# Keyspace\r\ndb0:keys={len(self.streams)},expires=0\r\n"
+        )
+
+    def _cmd_memory(self, args: List[bytes]) -> Any:
+        if not args or args[0].upper() != b"USAGE" or len(args) < 2:
+            raise FakeRedisError("syntax error")
+        stream = self.streams.get(args[1])
+        return None if stream is None else _ENTRY_OVERHEAD + stream.memory
+
+    # -- streams ---------------------------------------------------------
+
+    def _cmd_xadd(self, args: List[bytes]) -> Any:
+        key, position = args[0], 1
+        nomkstream = False
+        trim: Optional[Tuple[str, bool, bytes]] = None
+        while True:
+            option = args[position].upper()
+            if option == b"NOMKSTREAM":
+                nomkstream = True
+                position += 1
+            elif option in (b"MAXLEN", b"MINID"):
+                strategy, approximate, threshold, position = self._parse_trim(args, position)
+                trim = (strategy, approximate, threshold)
+            else:
+                break
+        raw_id, fields = args[position], args[position + 1 :]
+        if not fields or len(fields) % 2:
+            raise FakeRedisError("wrong number of arguments for 'xadd' command")
+
+        stream = self._stream(key, create=not nomkstream)
+        if stream is None:
+            return None
+        if raw_id == b"*":
+            now = int(time.time() * 1000)
+            ms, seq = stream.last_id
+            new_id = (now, 0) if now > ms else (ms, seq + 1)
+        else:
+            new_id = _parse_id(raw_id)
+            if new_id <= stream.last_id:
+                raise FakeRedisError(
+                    "The ID specified in XADD is equal or smaller than the target stream top item"
+                )
+        stream.ids.append(new_id)
+        stream.fields.append(list(fields))
+        stream.last_id = new_id
+        stream.memory += _ENTRY_OVERHEAD + sum(len(item) for item in fields)
+        if trim is not None:
+            self._trim(stream, *trim)
+        self._notify()
+        return _format_id(new_id)
+
+    def _cmd_xlen(self, args: List[bytes]) -> Any:
+        stream = self.streams.get(args[0])
+        return len(stream) if stream else 0
+
+    def _cmd_xrange(self, args: List[bytes]) -> Any:
+        stream = self.streams.get(args[0])
+        if stream is None:
+            return []
+        start_raw, end_raw = args[1], args[2]
+        start = _parse_id(start_raw.lstrip(b"("))
+        end = _parse_id(end_raw.lstrip(b"("), default_seq=2**64 - 1)
+        count = _int(args[4]) if len(args) > 4 and args[3].upper() == b"COUNT" else None
+        position = stream.index(start)
+        if start_raw.startswith(b"(") and position < len(stream) and stream.ids[position] == start:
+            position += 1
+        entries = []
+        while position < len(stream) and (count is None or len(entries) < count):
+            entry_id = stream.ids[position]
+            if entry_id > end or (end_raw.startswith(b"(") and entry_id == end):
+                break
+            entries.append(self._entry(stream, position))
+            position += 1
+        return entries
+
+    def _cmd_xtrim(self, args: List[bytes]) -> Any:
+        stream = self.streams.get(args[0])
+        strategy, approximate, threshold, _ = self._parse_trim(args, 1)
+        return self._trim(stream, strategy, approximate, threshold) if stream else 0
+
+    def _cmd_xgroup(self, args: List[bytes]) -> Any:
+        subcommand = args[0].upper()
+        if subcommand == b"CREATE":
+            key, group, raw_id = args[1], args[2], args[3]
+            mkstream = any(arg.upper() == b"MKSTREAM" for arg in args[4:])
+            stream = self._stream(key, create=mkstream)
+            if stream is None:
+                raise FakeRedisError(
+                    "The XGROUP subcommand requires the key to exist. "
+                    "Note that for CREATE you may want to use the MKSTREAM option to create an empty stream automatically."
+                )
+            if group in stream.groups:
+                raise FakeRedisError("Consumer Group name already exists", code="BUSYGROUP")
+            stream.groups[group] = _Group(stream.last_id if raw_id == b"$" else _parse_id(raw_id))
+            return _Status("OK")
+        if subcommand == b"DESTROY":
+            stream = self.streams.get(args[1])
+            return int(bool(stream and stream.groups.pop(args[2], None) is not None))
+        raise FakeRedisError(f"unknown subcommand '{subcommand.decode()}'")
+
+    def _read_group(
+        self, key: bytes, group_name: bytes, consumer: bytes, raw_id: bytes, count: Optional[int], noack: bool
+    ) -> List[Any]:
+        stream, group = self._group(key, group_name, "XREADGROUP")
+        entries: List[Any] = []
+        if raw_id != b">":
+            # History: this consumer's pending entries after the given ID
+            after = _parse_id(raw_id)
+            for entry_id in sorted(group.pending):
+                if entry_id > after and group.pending[entry_id][0] == consumer:
+                    fields = stream.get(entry_id)
+                    entries.append([_format_id(entry_id), list(fields) if fields is not None else None])
+                    if count is not None and len(entries) >= count:
+                        break
+            return entries
+        position = bisect.bisect_right(stream.ids, group.last_delivered)
+        now = int(time.time() * 1000)
+        while position < len(stream) and (count is None or len(entries) < count):
+            entry_id = stream.ids[position]
+            entries.append(self._entry(stream, position))
+            group.last_delivered = entry_id
+            if not noack:
+                group.pending[entry_id] = [consumer, now, 1]
+            position += 1
+        return entries
+
+    async def _xreadgroup(self, args: List[bytes]) -> Any:
+        if len(args) < 3 or args[0].upper() != b"GROUP":
+            raise FakeRedisError("syntax error")
+        group, consumer = args[1], args[2]
+        count: Optional[int] = None
+        block: Optional[int] = None
+        noack = False
+        position = 3
+        while position < len(args) and args[position].upper() != b"STREAMS":
+            option = args[position].upper()
+            if option == b"COUNT":
+                count = _int(args[position + 1])
+                position += 2
+            elif option == b"BLOCK":
+                block = _int(args[position + 1])
+                position += 2
+            elif option == b"NOACK":
+                noack = True
+                position += 1
+            else:
+                raise FakeRedisError("syntax error")
+        rest = args[position + 1 :]
+        if not rest or len(rest) % 2:
+            raise FakeRedisError(
+                "Unbalanced 'xreadgroup' list of streams: for each stream key an ID or '>' must be specified."
+            )
+        keys, ids = rest[: len(rest) // 2], rest[len(rest) // 2 :]
+
+        deadline = None if not block else time.monotonic() + block / 1000
+        while True:
+            reply = _KeyedReply()
+            for key, raw_id in zip(keys, ids):
+                entries = self._read_group(key, group, consumer, raw_id, count, noack)
+                if entries or raw_id != b">":
+                    reply.append([key, entries])
+            if reply or block is None:
+                return reply or NULL_ARRAY
+            if self._changed is None:
+                self._changed = asyncio.Event()
+            changed = self._changed
+            try:
+                if deadline is None:
+                    await changed.wait()
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return NULL_ARRAY
+                    await asyncio.wait_for(changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return NULL_ARRAY
+
+    def _cmd_xack(self, args: List[bytes]) -> Any:
+        stream = self.streams.get(args[0])
+        if stream is None or args[1] not in stream.groups:
+            return 0
+        pending = stream.groups[args[1]].pending
+        acked = 0
+        for raw_id in args[2:]:
+            if pending.pop(_parse_id(raw_id), None) is not None:
+                acked += 1
+        return acked
+
+    def _cmd_xautoclaim(self, args: List[bytes]) -> Any:
+        key, group_name, consumer = args[0], args[1], args[2]
+        min_idle, start = _int(args[3]), _parse_id(args[4])
+        count, justid = 100, False
+        position = 5
+        while position < len(args):
+            option = args[position].upper()
+            if option == b"COUNT":
+                count = _int(args[position + 1])
+                position += 2
+            elif option == b"JUSTID":
+                justid = True
+                position += 1
+            else:
+                raise FakeRedisError("syntax error")
+        stream, group = self._group(key, group_name, "XAUTOCLAIM")
+
+        now = int(time.time() * 1000)
+        candidates = [entry_id for entry_id in sorted(group.pending) if entry_id >= start]
+        claimed: List[Any] = []
+        deleted: List[bytes] = []
+        cursor: StreamID = (0, 0)
+        for index, entry_id in enumerate(candidates):
+            if len(claimed) + len(deleted) >= count:
+                cursor = entry_id
+                break
+            record = group.pending[entry_id]
+            if now - record[1] < min_idle:
+                continue
+            fields = stream.get(entry_id)
+            if fields is None:
+                del group.pending[entry_id]
+                deleted.append(_format_id(entry_id))
+                continue
+            record[0], record[1] = consumer, now
+            if not justid:
+                record[2] += 1
+                claimed.append([_format_id(entry_id), list(fields)])
+            else:
+                claimed.append(_format_id(entry_id))
+        return [_format_id(cursor), claimed, deleted]
+
+    def _cmd_xpending(self, args: List[bytes]) -> Any:
+        stream, group = self._group(args[0], args[1], "XPENDING")
+        ids = sorted(group.pending)
+        if len(args) == 2:
+            if not ids:
+                return [0, None, None, NULL_ARRAY]
+            per_consumer = Counter(group.pending[entry_id][0] for entry_id in ids)
+            return [
+                len(ids),
+                _format_id(ids[0]),
+                _format_id(ids[-1]),
+                [[consumer, str(total).encode()] for consumer, total in sorted(per_consumer.items())],
+            ]
+        position = 2
+        min_idle = 0
+        if args[position].upper() == b"IDLE":
+            min_idle = _int(args[position + 1])
+            position += 2
+        start = _parse_id(args[position].lstrip(b"("))
+        end = _parse_id(args[position + 1].lstrip(b"("), default_seq=2**64 - 1)
+        count = _int(args[position + 2])
+        consumer = args[position + 3] if len(args) > position + 3 else None
+        now = int(time.time() * 1000)
+        rows: List[Any] = []
+        for entry_id in ids:
+            if entry_id < start or entry_id > end:
+                continue
+            owner, delivered_at, deliveries = group.pending[entry_id]
+            idle = now - delivered_at
+            if idle < min_idle or (consumer is not None and owner != consumer):
+                continue
+            rows.append([_format_id(entry_id), owner, idle, deliveries])
+            if len(rows) >= count:
+                break
+        return rows
+
+
+# ---------------------------------------------------------------------------
+# RESP server
+# ---------------------------------------------------------------------------
+
+
+class FakeRedisServer:
+    """Serves a :class:`FakeRedisBackend` over RESP on a background event loop thread."""
+
+    def __init__(
+        self,
+        backend: Optional[FakeRedisBackend] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        """Initialize server.
+
+        Args:
+            backend: Backend to serve (a default one is created if omitted)
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+        """
+        self.backend = backend or FakeRedisBackend()
+        self.host = host
+        self.port = port
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+    @property
+    def url(self) -> str:
+        """Connection URL for ``redis.asyncio.from_url``."""
+        return f"redis://{self.host}:{self.port}/0"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        stats = self.backend.stats
+        resp3 = False
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                stats.bytes_received += len(line)
+                if line[:1] != b"*":
+                    args = line.split()  # inline command
+                else:
+                    args = []
+                    for _ in range(int(line[1:-2])):
+                        header = await reader.readline()
+                        payload = await reader.readexactly(int(header[1:-2]) + 2)
+                        stats.bytes_received += len(header) + len(payload)
+                        args.append(payload[:-2])
+                if args and args[0].upper() == b"QUIT":
+                    writer.write(b"+OK\r\n")
+                    break
+                try:
+                    if args and args[0].upper() == b"HELLO":
+                        resp3, result = self._hello(args[1:], resp3)
+                    else:
+                        result = await self.backend.execute(args)
+                    reply = _encode(result, resp3)
+                except FakeRedisError as exc:
+                    reply = _encode(exc)
+                except Exception as exc:  # malformed arguments
+                    reply = _encode(FakeRedisError(f"{type(exc).__name__}: {exc}"))
+                stats.bytes_sent += len(reply)
+                writer.write(reply)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass  # client went away, or the server is stopping
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _hello(args: List[bytes], resp3: bool) -> Tuple[bool, Any]:
+        """Negotiate the connection's protocol; returns (uses RESP3, reply)."""
+        protocol = 3 if resp3 else 2
+        if args:
+            protocol = _int(args[0])
+            if protocol not in (2, 3):
+                raise FakeRedisError("unsupported protocol version", code="NOPROTO")
+        return protocol == 3, _Map(
+            server="redis",
+            version="7.2.0",
+            proto=protocol,
+            id=1,
+            mode="standalone",
+            role="master",
+            modules=[],
+        )
+
+    def _serve(self) -> None:
+        loop = asyncio.new_event_loop()
+        self._loop = loop
+        asyncio.set_event_loop(loop)
+        self._server = loop.run_until_complete(asyncio.start_server(self._handle, self.host, self.port))
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            self._server.close()
+            loop.run_until_complete(self._server.wait_closed())
+            for task in asyncio.all_tasks(loop):
+                task.cancel()
+            loop.run_until_complete(asyncio.sleep(0))
+            loop.close()
+
+    def start(self) -> FakeRedisServer:
+        """Start serving in a daemon thread."""
+        if self._thread is None:
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._serve, name="fake-redis", daemon=True)
+            self._thread.start()
+            self._ready.wait()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the socket."""
+        if self._thread is not None and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._thread = None
+            self._loop = None
+
+    def __enter__(self) -> FakeRedisServer:
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+def main() -> None:
+    """Run a standalone fake Redis (``python -m benchmarks.fake_redis``)."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local stand-in for Redis Streams")
+    parser.add_argument("--port", type=int, default=6390)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to each command")
+    args = parser.parse_args()
+
+    server = FakeRedisServer(FakeRedisBackend(latency=args.latency), port=args.port)
+    server.start()
+    print(f"Fake Redis at {server.url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -28,16 +28,29 @@ from __future__ import annotations
 
 import os
 import argparse
+import hashlib
 import json
 import logging
 import sys
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from installer import DeploymentReport
-from installer.railway import RailwayProvider
+from installer.graph import CycleError, DependencyGraph
+from installer.id_cache import RailwayIDCache
+from installer.journal import (
+    COMPLETED,
+    DEPLOY_TRIGGERED,
+    REPO_CONNECTED,
+    SERVICE_CREATED,
+    VARIABLES_APPLIED,
+    JournalError,
+    RunJournal,
+)
+from installer.railway import DEPLOYMENT_FAILURE_STATUSES, RailwayProvider
 from shared import DeploymentSpec
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -88,19 +101,51 @@ SERVICE_REPOS = {
 }
 
 
+# Railway variable recording the desired-state fingerprint a service was last deployed with
+FINGERPRINT_VARIABLE = "BUDAI_DEPLOY_FINGERPRINT"
+
+
+def desired_state_fingerprint(state: Dict[str, Any]) -> str:
+    """Stable sha256 of a service's desired state, independent of key order."""
+    canonical = json.dumps(state, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
 class DeploymentOrchestrator:
     """Orchestrates multi-service deployments with dependency management."""
 
-    def __init__(self, spec: DeploymentSpec, creds: Dict[str, any]) -> None:
+    def __init__(
+        self,
+        spec: DeploymentSpec,
+        creds: Dict[str, any],
+        *,
+        use_id_cache: bool = True,
+        max_parallel: Optional[int] = None,
+        force: bool = False,
+        journal: Optional[RunJournal] = None,
+    ) -> None:
         """Initialize deployment orchestrator.
 
         Args:
             spec: Deployment specification
             creds: Credentials dictionary
+            use_id_cache: Persist Railway environment/service IDs between runs
+            max_parallel: Services deployed concurrently (defaults to
+                BUDAI_DEPLOY_MAX_PARALLEL or 4; 1 deploys one at a time)
+            force: Deploy every service even if its desired-state fingerprint is unchanged
+            journal: Journal of an interrupted run to resume (a new one is started if None)
+
+        Raises:
+            JournalError: If ``journal`` belongs to another project or environment
         """
         self.spec = spec
         self.creds = creds
         self.environment = os.getenv("BUDAI_TARGET_ENV", self.spec.environment)
+        if max_parallel is None:
+            max_parallel = int(os.getenv("BUDAI_DEPLOY_MAX_PARALLEL", "4"))
+        self.max_parallel = max(1, max_parallel)
+        self.force = force
+        self.journal = journal
         
         # Initialize Railway provider
         required_keys = {"railway_token", "railway_project_id"}
@@ -110,12 +155,22 @@ class DeploymentOrchestrator:
                 f"Railway credentials required (missing: {missing})"
             )
         
+        if journal is not None and (
+            journal.project_id != self.creds["railway_project_id"]
+            or journal.environment != self.environment
+        ):
+            raise JournalError(
+                f"Run {journal.run_id} targeted {journal.project_id}/{journal.environment}, "
+                f"not {self.creds['railway_project_id']}/{self.environment}"
+            )
+        
         self.provider = RailwayProvider(
             api_token=self.creds["railway_token"],
             project_id=self.creds["railway_project_id"],
+            id_cache=RailwayIDCache() if use_id_cache else None,
         )
         
-        # Deployment order (respecting dependencies)
+        # Known services; rollout order comes from spec dependencies, ties keep this order
         self.deployment_order = [
             "orchestrator",      # Deploy first (other services depend on it)
             "agent-summarizer",  # Deploy agents
@@ -130,14 +185,22 @@ class DeploymentOrchestrator:
         
         self.reports: List[DeploymentReport] = []
         self.infra_artifacts: Dict[str, Any] = {}
+        # Fingerprints deployed this run, awaiting a successful deployment
+        self.deployed_fingerprints: Dict[str, str] = {}
 
     def _prepare_infrastructure(self) -> None:
         """Ensure shared infrastructure resources are provisioned."""
         if "redis_url" in self.creds and self.creds.get("redis_url"):
             return
 
-        logger.info("Ensuring Redis instance for environment '%s'...", self.environment)
-        redis_info = self.provider.ensure_redis_service(self.environment)
+        redis_info = self.journal.get_infrastructure("redis") if self.journal else None
+        if redis_info:
+            logger.info("Reusing Redis recorded by run %s", self.journal.run_id)
+        else:
+            logger.info("Ensuring Redis instance for environment '%s'...", self.environment)
+            redis_info = self.provider.ensure_redis_service(self.environment)
+            if self.journal:
+                self.journal.set_infrastructure("redis", redis_info)
         self.creds["redis_url"] = redis_info["redis_url"]
         self.creds["redis_password"] = redis_info["password"]
         self.creds["redis_host"] = redis_info["host"]
@@ -151,6 +214,16 @@ class DeploymentOrchestrator:
             redis_info["service_id"],
         )
 
+    def _warm_provider_caches(self) -> None:
+        """Load the project snapshot so per-service lookups are served from cache."""
+        try:
+            self.provider.load_project_snapshot(
+                self.creds["railway_project_id"],
+                environment=self.environment,
+            )
+        except Exception as exc:
+            logger.warning("Could not load project snapshot, falling back to per-service lookups: %s", exc)
+
     def explain_requirements(self) -> None:
         """Explain requirements for all services."""
         logger.info("=" * 80)
@@ -175,6 +248,8 @@ class DeploymentOrchestrator:
             logger.info("  Repository: https://github.com/%s", service_info["repo"])
             logger.info("  Branch: %s", service_info["branch"])
             logger.info("  Port: %d", service_info["port"])
+            if service_config and service_config.dependencies:
+                logger.info("  Depends on: %s", ", ".join(service_config.dependencies))
             
             if service_config:
                 logger.info("  Resources:")
@@ -186,196 +261,480 @@ class DeploymentOrchestrator:
         
         logger.info("=" * 80)
 
-    def deploy_all(self) -> bool:
-        """Deploy all services to Railway.
+    def build_dependency_graph(self) -> DependencyGraph:
+        """Build the rollout graph from the spec's per-service ``dependencies``.
 
-        Returns:
-            True if all deployments succeeded, False otherwise
+        Only enabled services with a known repository become nodes; dependencies
+        on anything else (disabled or unmanaged services) are ignored.
+
+        Raises:
+            CycleError: If the declared dependencies contain a cycle
         """
-        logger.info("\nDeploying services...")
-        
-        # Ensure Redis is available
-        self._prepare_infrastructure()
-        
-        all_success = True
-        
+        services: List[str] = []
         for service_name in self.deployment_order:
             if service_name not in SERVICE_REPOS:
                 continue
-            
             service_config = self.spec.services.get(service_name)
             if service_config and not service_config.enabled:
                 logger.info("⊘ %s: Disabled, skipping", service_name)
                 continue
-            
-            logger.info("\n--- Deploying %s ---", service_name)
-            
+            services.append(service_name)
+
+        dependencies = {
+            name: config.dependencies for name, config in self.spec.services.items()
+        }
+        return DependencyGraph.from_dependencies(dependencies, nodes=services)
+
+    def _rollout(self, graph: DependencyGraph) -> Dict[str, str]:
+        """Deploy every service in ``graph``, running independent services concurrently.
+
+        A service starts as soon as all of its dependencies succeeded. When a
+        service fails, everything that depends on it is marked blocked while
+        unrelated branches carry on.
+
+        Returns:
+            Service name -> 'succeeded', 'failed' or 'blocked'
+        """
+        order = graph.topological_order()
+        outcomes: Dict[str, str] = {}
+        running: Dict[Future, str] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_parallel, thread_name_prefix="deploy") as pool:
+            while True:
+                for service_name in order:
+                    if service_name in outcomes or service_name in running.values():
+                        continue
+                    dependency_states = [outcomes.get(dep) for dep in graph.dependencies(service_name)]
+                    if any(state in ("failed", "blocked") for state in dependency_states):
+                        outcomes[service_name] = "blocked"
+                        logger.error("⊘ %s: Blocked by failed dependency", service_name)
+                    elif all(state == "succeeded" for state in dependency_states):
+                        running[pool.submit(self._deploy_service, service_name)] = service_name
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    service_name = running.pop(future)
+                    try:
+                        future.result()
+                        outcomes[service_name] = "succeeded"
+                    except Exception as exc:
+                        logger.exception("✗ %s: Deployment exception: %s", service_name, exc)
+                        outcomes[service_name] = "failed"
+
+        return outcomes
+
+    def _desired_state(self, service_name: str) -> Dict[str, Any]:
+        """Everything a deploy applies to a service, used for fingerprinting.
+
+        Args:
+            service_name: Service key in SERVICE_REPOS
+
+        Returns:
+            Repo/branch, static and dynamic variables, and spec resources
+
+        Raises:
+            RuntimeError: If credentials the service requires are missing
+        """
+        service_info = SERVICE_REPOS[service_name]
+        slack_internal_url = f"http://budai-slack-integration.railway.internal:{SERVICE_REPOS['slack-integration']['port']}"
+        voice_internal_url = f"http://budai-voice-realtime.railway.internal:{SERVICE_REPOS['voice-realtime']['port']}"
+        api_gateway_internal_url = f"http://budai-api-gateway.railway.internal:{SERVICE_REPOS['api-gateway']['port']}"
+        
+        # Prepare static variables (never change for a service)
+        static_vars = {
+            "BUDAI_SERVICE_NAME": service_name,
+            "BUDAI_SERVICE_VERSION": "1.0.0",
+            "PORT": str(service_info["port"]),
+        }
+        
+        # Add service-specific static variables (internal URLs)
+        if service_name == "api-gateway":
+            static_vars.update({
+                "BUDAI_ORCHESTRATOR_URL": f"http://budai-orchestrator.railway.internal:{SERVICE_REPOS['orchestrator']['port']}",
+                "BUDAI_NOTION_AGENT_URL": f"http://budai-agent-notion.railway.internal:{SERVICE_REPOS['agent-notion']['port']}",
+            })
+        elif service_name == "orchestrator":
+            static_vars.update({
+                "BUDAI_AGENT_SUMMARIZER_URL": f"http://budai-agent-summarizer.railway.internal:{SERVICE_REPOS['agent-summarizer']['port']}",
+            })
+        elif service_name == "slack-integration":
+            static_vars.update({
+                "BUDAI_API_GATEWAY_URL": f"http://budai-api-gateway.railway.internal:{SERVICE_REPOS['api-gateway']['port']}",
+            })
+        
+        # Prepare dynamic variables (change between deployments/environments)
+        dynamic_vars = {
+            "BUDAI_ENVIRONMENT": self.environment,
+            "BUDAI_REDIS_URL": self.creds["redis_url"],
+            "BUDAI_OPENAI_API_KEY": self.creds.get("openai_api_key", ""),
+        }
+
+        if service_name in {"api-gateway", "orchestrator"}:
+            dynamic_vars["BUDAI_SLACK_INTEGRATION_URL"] = slack_internal_url
+        if service_name in {"api-gateway", "slack-integration"}:
+            dynamic_vars["BUDAI_VOICE_REALTIME_URL"] = voice_internal_url
+        if service_name == "voice-frontend":
+            dynamic_vars.update({
+                "BUDAI_API_GATEWAY_BASE_URL": api_gateway_internal_url,
+                "BUDAI_VOICE_SERVICE_BASE_URL": voice_internal_url,
+            })
+            assistant_base_url = self.creds.get("assistant_api_base_url", "")
+            if assistant_base_url:
+                dynamic_vars["BUDAI_ASSISTANT_API_BASE_URL"] = assistant_base_url
+        
+        # Add service-specific dynamic variables (secrets)
+        if service_name == "api-gateway":
+            dynamic_vars.update({
+                "BUDAI_SLACK_SIGNING_SECRET": self.creds.get("slack_signing_secret", ""),
+                "BUDAI_SLACK_BOT_TOKEN": self.creds.get("slack_bot_token", ""),
+            })
+        elif service_name == "orchestrator":
+            dynamic_vars.update({
+                "BUDAI_SLACK_SIGNING_SECRET": self.creds.get("slack_signing_secret", ""),
+            })
+        elif service_name == "slack-integration":
+            slack_bot_token = self.creds.get("slack_bot_token", "")
+            slack_signing_secret = self.creds.get("slack_signing_secret", "")
+            if not slack_bot_token or not slack_signing_secret:
+                raise RuntimeError(
+                    "Slack integration requires both slack_bot_token and slack_signing_secret credentials."
+                )
+            dynamic_vars.update({
+                "SLACK_BOT_TOKEN": slack_bot_token,
+                "SLACK_SIGNING_SECRET": slack_signing_secret,
+                "BUDAI_SLACK_BOT_TOKEN": slack_bot_token,
+                "BUDAI_SLACK_SIGNING_SECRET": slack_signing_secret,
+            })
+        elif service_name == "agent-notion":
+            notion_token = self.creds.get("notion_token") or self.creds.get("BUDAI_NOTION_TOKEN", "")
+            if not notion_token:
+                raise RuntimeError("Notion agent requires 'notion_token' credential.")
+            dynamic_vars.update({
+                "NOTION_TOKEN": notion_token,
+                "BUDAI_NOTION_TOKEN": notion_token,
+            })
+
+        service_config = self.spec.services.get(service_name)
+        return {
+            "repo": service_info["repo"],
+            "branch": service_info["branch"],
+            "static_vars": static_vars,
+            "dynamic_vars": dynamic_vars,
+            "resources": service_config.resources.model_dump() if service_config else None,
+        }
+
+    def _fingerprint_unchanged(self, service_name: str, fingerprint: str, service_id: str) -> bool:
+        """Whether ``fingerprint`` matches the one recorded at the last successful deploy.
+
+        The local ID cache is checked first; it only holds fingerprints whose
+        deployment was seen succeeding. On a miss (fresh machine, cache
+        disabled or expired) the ``BUDAI_DEPLOY_FINGERPRINT`` variable on the
+        Railway service is used if its variables were already fetched. That
+        variable is written together with the change that triggers the deploy,
+        so it only counts when the service's latest deployment succeeded; a
+        match is then copied into the local cache.
+        """
+        if self.force:
+            return False
+        project_id = self.creds["railway_project_id"]
+        id_cache = self.provider.id_cache
+        if id_cache is not None and id_cache.get_fingerprint(project_id, self.environment, service_name) == fingerprint:
+            return True
+        env_id = self.provider._env_cache.get((project_id, self.environment))
+        variables = self.provider.cached_service_variables(project_id, env_id, service_id) if env_id else None
+        if (variables or {}).get(FINGERPRINT_VARIABLE) != fingerprint:
+            return False
+        if not self._deployment_succeeded(service_id, env_id):
+            return False
+        self._record_fingerprint(service_name, fingerprint)
+        return True
+
+    def _deployment_succeeded(self, service_id: str, env_id: str) -> bool:
+        """Whether the loaded project snapshot shows the service's latest deployment succeeded."""
+        snapshot = self.provider.project_snapshot(self.creds["railway_project_id"])
+        deployment = snapshot.latest_deployment(service_id, env_id) if snapshot else None
+        return ((deployment or {}).get("status") or "").upper() == "SUCCESS"
+
+    def _record_fingerprint(self, service_name: str, fingerprint: str) -> None:
+        if self.provider.id_cache is not None:
+            self.provider.id_cache.set_fingerprint(
+                self.creds["railway_project_id"], self.environment, service_name, fingerprint
+            )
+
+    def _forget_fingerprint(self, service_name: str) -> None:
+        if self.provider.id_cache is not None:
+            self.provider.id_cache.forget_fingerprint(
+                self.creds["railway_project_id"], self.environment, service_name
+            )
+
+    def _journaled(self, service_name: str, step: str) -> bool:
+        return self.journal is not None and self.journal.completed(service_name, step)
+
+    def _journal(self, service_name: str, step: str, **fields: Any) -> None:
+        if self.journal is not None:
+            self.journal.record(service_name, step, **fields)
+
+    def _pending_services(self, graph: DependencyGraph) -> List[str]:
+        """Services in ``graph`` the current run journal has not marked completed."""
+        return [name for name in graph if not self._journaled(name, COMPLETED)]
+
+    def _prefetch_stale_variables(self, graph: DependencyGraph) -> None:
+        """Read variables in one batch for existing services whose fingerprint changed.
+
+        Unchanged services are skipped by ``_deploy_service`` without any
+        variable reads, so only the stale ones are fetched here.
+        """
+        project_id = self.creds["railway_project_id"]
+        stale_ids: List[str] = []
+        for service_name in self._pending_services(graph):
+            if self._journaled(service_name, VARIABLES_APPLIED):
+                continue
+            service = self.provider._get_service_by_name(f"budai-{service_name}", project_id)
+            if not service:
+                continue
             try:
-                service_info = SERVICE_REPOS[service_name]
-                slack_internal_url = f"http://budai-slack-integration.railway.internal:{SERVICE_REPOS['slack-integration']['port']}"
-                voice_internal_url = f"http://budai-voice-realtime.railway.internal:{SERVICE_REPOS['voice-realtime']['port']}"
-                api_gateway_internal_url = f"http://budai-api-gateway.railway.internal:{SERVICE_REPOS['api-gateway']['port']}"
-                
-                # Check if service already exists
-                existing_service = self.provider._get_service_by_name(
-                    f"budai-{service_name}",
-                    self.creds["railway_project_id"]
+                fingerprint = desired_state_fingerprint(self._desired_state(service_name))
+            except RuntimeError:
+                continue  # reported when the service itself is deployed
+            if not self._fingerprint_unchanged(service_name, fingerprint, service["id"]):
+                stale_ids.append(service["id"])
+
+        if not stale_ids:
+            return
+        try:
+            env_id = self.provider._get_environment_id(project_id, self.environment)
+            self.provider.prefetch_service_variables(project_id, env_id, stale_ids)
+        except Exception as exc:
+            logger.warning("Could not prefetch service variables, reading per service: %s", exc)
+
+    def _deploy_service(self, service_name: str) -> str:
+        """Create or update a single service and push its variables.
+
+        Args:
+            service_name: Service key in SERVICE_REPOS
+
+        Returns:
+            Railway service ID
+
+        Raises:
+            Exception: Any provider or credential error for this service
+        """
+        logger.info("\n--- Deploying %s ---", service_name)
+        
+        state = self._desired_state(service_name)
+        fingerprint = desired_state_fingerprint(state)
+        service_info = SERVICE_REPOS[service_name]
+        static_vars = state["static_vars"]
+        dynamic_vars = state["dynamic_vars"]
+        
+        # Resume from the run journal: steps already recorded are not repeated
+        journaled = self.journal.service(service_name) if self.journal else {}
+        if journaled.get("fingerprint") not in (None, fingerprint):
+            logger.info("%s: Desired state changed since the journaled attempt, starting over", service_name)
+            self.journal.reset_service(service_name)
+            journaled = {}
+        if COMPLETED in journaled.get("steps", {}):
+            logger.info("↻ %s: Already deployed in run %s", service_name, self.journal.run_id)
+            self.deployed_fingerprints[service_name] = fingerprint
+            return journaled["service_id"]
+        
+        if journaled.get("service_id"):
+            service_id = journaled["service_id"]
+            is_new_service = bool(journaled.get("created"))
+            logger.info("↻ %s: Resuming service %s from run journal", service_name, service_id)
+        else:
+            # Check if service already exists
+            existing_service = self.provider._get_service_by_name(
+                f"budai-{service_name}",
+                self.creds["railway_project_id"]
+            )
+            is_new_service = existing_service is None
+            
+            if existing_service and self._fingerprint_unchanged(service_name, fingerprint, existing_service["id"]):
+                logger.info(
+                    "= %s: Desired state unchanged (fingerprint %s), skipping",
+                    service_name,
+                    fingerprint[:12],
                 )
-                is_new_service = existing_service is None
-                
-                # Prepare static variables (never change for a service)
-                static_vars = {
-                    "BUDAI_SERVICE_NAME": service_name,
-                    "BUDAI_SERVICE_VERSION": "1.0.0",
-                    "PORT": str(service_info["port"]),
-                }
-                
-                # Add service-specific static variables (internal URLs)
-                if service_name == "api-gateway":
-                    static_vars.update({
-                        "BUDAI_ORCHESTRATOR_URL": f"http://budai-orchestrator.railway.internal:{SERVICE_REPOS['orchestrator']['port']}",
-                        "BUDAI_NOTION_AGENT_URL": f"http://budai-agent-notion.railway.internal:{SERVICE_REPOS['agent-notion']['port']}",
-                    })
-                elif service_name == "orchestrator":
-                    static_vars.update({
-                        "BUDAI_AGENT_SUMMARIZER_URL": f"http://budai-agent-summarizer.railway.internal:{SERVICE_REPOS['agent-summarizer']['port']}",
-                    })
-                elif service_name == "slack-integration":
-                    static_vars.update({
-                        "BUDAI_API_GATEWAY_URL": f"http://budai-api-gateway.railway.internal:{SERVICE_REPOS['api-gateway']['port']}",
-                    })
-                
-                # Prepare dynamic variables (change between deployments/environments)
-                dynamic_vars = {
-                    "BUDAI_ENVIRONMENT": self.environment,
-                    "BUDAI_REDIS_URL": self.creds["redis_url"],
-                    "BUDAI_OPENAI_API_KEY": self.creds.get("openai_api_key", ""),
-                }
-
-                if service_name in {"api-gateway", "orchestrator"}:
-                    dynamic_vars["BUDAI_SLACK_INTEGRATION_URL"] = slack_internal_url
-                if service_name in {"api-gateway", "slack-integration"}:
-                    dynamic_vars["BUDAI_VOICE_REALTIME_URL"] = voice_internal_url
-                if service_name == "voice-frontend":
-                    dynamic_vars.update({
-                        "BUDAI_API_GATEWAY_BASE_URL": api_gateway_internal_url,
-                        "BUDAI_VOICE_SERVICE_BASE_URL": voice_internal_url,
-                    })
-                    assistant_base_url = self.creds.get("assistant_api_base_url", "")
-                    if assistant_base_url:
-                        dynamic_vars["BUDAI_ASSISTANT_API_BASE_URL"] = assistant_base_url
-                
-                # Add service-specific dynamic variables (secrets)
-                if service_name == "api-gateway":
-                    dynamic_vars.update({
-                        "BUDAI_SLACK_SIGNING_SECRET": self.creds.get("slack_signing_secret", ""),
-                        "BUDAI_SLACK_BOT_TOKEN": self.creds.get("slack_bot_token", ""),
-                    })
-                elif service_name == "orchestrator":
-                    dynamic_vars.update({
-                        "BUDAI_SLACK_SIGNING_SECRET": self.creds.get("slack_signing_secret", ""),
-                    })
-                elif service_name == "slack-integration":
-                    slack_bot_token = self.creds.get("slack_bot_token", "")
-                    slack_signing_secret = self.creds.get("slack_signing_secret", "")
-                    if not slack_bot_token or not slack_signing_secret:
-                        raise RuntimeError(
-                            "Slack integration requires both slack_bot_token and slack_signing_secret credentials."
-                        )
-                    dynamic_vars.update({
-                        "SLACK_BOT_TOKEN": slack_bot_token,
-                        "SLACK_SIGNING_SECRET": slack_signing_secret,
-                        "BUDAI_SLACK_BOT_TOKEN": slack_bot_token,
-                        "BUDAI_SLACK_SIGNING_SECRET": slack_signing_secret,
-                    })
-                elif service_name == "agent-notion":
-                    notion_token = self.creds.get("notion_token") or self.creds.get("BUDAI_NOTION_TOKEN", "")
-                    if not notion_token:
-                        raise RuntimeError("Notion agent requires 'notion_token' credential.")
-                    dynamic_vars.update({
-                        "NOTION_TOKEN": notion_token,
-                        "BUDAI_NOTION_TOKEN": notion_token,
-                    })
-                
-                # For NEW services: combine all variables and pass during creation
-                # This sets everything atomically in one operation
-                initial_vars = None
-                if is_new_service:
-                    initial_vars = {**static_vars, **{k: v for k, v in dynamic_vars.items() if v}}
-                    logger.info("Creating new service with %d variables", len(initial_vars))
-                
-                # Create or get the service connected to GitHub repo
-                # Railway will automatically read railway.json from the repo for build/deploy config
-                service_id = self.provider.create_service(
-                    name=f"budai-{service_name}",
-                    project_id=self.creds["railway_project_id"],
-                    source_repo=service_info["repo"],
-                    source_branch=service_info["branch"],
+                self._journal(service_name, COMPLETED, service_id=existing_service["id"], fingerprint=fingerprint)
+                return existing_service["id"]
+            
+            # For NEW services: combine all variables and pass during creation
+            # This sets everything atomically in one operation
+            initial_vars = None
+            if is_new_service:
+                initial_vars = {**static_vars, **{k: v for k, v in dynamic_vars.items() if v}}
+                initial_vars[FINGERPRINT_VARIABLE] = fingerprint
+                logger.info("Creating new service with %d variables", len(initial_vars))
+            
+            # Create or get the service connected to GitHub repo
+            # Railway will automatically read railway.json from the repo for build/deploy config
+            service_id = self.provider.create_service(
+                name=f"budai-{service_name}",
+                project_id=self.creds["railway_project_id"],
+                source_repo=service_info["repo"],
+                source_branch=service_info["branch"],
+                environment=self.environment,
+                variables=initial_vars,
+            )
+            self._journal(
+                service_name,
+                SERVICE_CREATED,
+                service_id=service_id,
+                created=is_new_service,
+                fingerprint=fingerprint,
+            )
+            if is_new_service:
+                self._journal(service_name, VARIABLES_APPLIED)
+        
+        # For NEW services, explicitly connect the repo with branch once instances exist
+        if is_new_service and not self._journaled(service_name, REPO_CONNECTED):
+            logger.info(
+                "Connecting new service to repo %s (branch %s)",
+                service_info["repo"],
+                service_info["branch"],
+            )
+            self.provider._connect_service_repo(
+                service_id=service_id,
+                repo=service_info["repo"],
+                branch=service_info["branch"],
+                environment=self.environment,
+            )
+            # Connecting the repo kicks off the first deployment
+            self._journal(service_name, REPO_CONNECTED)
+            self._journal(service_name, DEPLOY_TRIGGERED)
+        
+        # For EXISTING services: only update variables that have changed
+        # For NEW services: skip this (all vars already set during creation)
+        if not is_new_service and not self._journaled(service_name, VARIABLES_APPLIED):
+            # Filter out empty values
+            non_empty_vars = {k: v for k, v in dynamic_vars.items() if v}
+            
+            env_id = self.provider._get_environment_id(
+                self.creds["railway_project_id"],
+                self.environment
+            )
+            existing_vars = self.provider.get_service_variables(
+                self.creds["railway_project_id"],
+                env_id,
+                service_id
+            )
+            # Only update variables that have changed
+            changed_vars = {
+                k: v for k, v in non_empty_vars.items()
+                if k not in existing_vars or existing_vars[k] != v
+            }
+            
+            if changed_vars:
+                logger.info("Updating %d changed variable(s): %s", 
+                          len(changed_vars), ", ".join(changed_vars.keys()))
+                # Set all changed variables (and the new fingerprint) in one bulk upsert
+                # Note: The batch triggers a single deployment automatically
+                self.provider.set_environment_variables(
+                    service_id=service_id,
                     environment=self.environment,
-                    variables=initial_vars,
+                    variables={**changed_vars, FINGERPRINT_VARIABLE: fingerprint},
+                    project_id=self.creds["railway_project_id"]
                 )
-                
-                # For NEW services, explicitly connect the repo with branch once instances exist
-                if is_new_service:
-                    logger.info(
-                        "Connecting new service to repo %s (branch %s)",
-                        service_info["repo"],
-                        service_info["branch"],
-                    )
-                    self.provider._connect_service_repo(
+                self._journal(service_name, VARIABLES_APPLIED)
+                self._journal(service_name, DEPLOY_TRIGGERED)
+                logger.info("Variable update will trigger one deployment automatically")
+            else:
+                logger.info("No variables changed, no deployment needed")
+                if existing_vars.get(FINGERPRINT_VARIABLE) != fingerprint:
+                    # Record the fingerprint without redeploying an unchanged service
+                    self.provider.set_environment_variables(
                         service_id=service_id,
-                        repo=service_info["repo"],
-                        branch=service_info["branch"],
                         environment=self.environment,
+                        variables={FINGERPRINT_VARIABLE: fingerprint},
+                        project_id=self.creds["railway_project_id"],
+                        skip_deploys=True,
                     )
-                
-                # For EXISTING services: only update variables that have changed
-                # For NEW services: skip this (all vars already set during creation)
-                if not is_new_service:
-                    # Filter out empty values
-                    non_empty_vars = {k: v for k, v in dynamic_vars.items() if v}
-                    
-                    if non_empty_vars:
-                        env_id = self.provider._get_environment_id(
-                            self.creds["railway_project_id"],
-                            self.environment
-                        )
-                        existing_vars = self.provider.get_service_variables(
-                            self.creds["railway_project_id"],
-                            env_id,
-                            service_id
-                        )
-                        # Only update variables that have changed
-                        changed_vars = {
-                            k: v for k, v in non_empty_vars.items()
-                            if k not in existing_vars or existing_vars[k] != v
-                        }
-                        
-                        if changed_vars:
-                            logger.info("Updating %d changed variable(s): %s", 
-                                      len(changed_vars), ", ".join(changed_vars.keys()))
-                            # Set environment variables
-                            # Note: Each variable change triggers a deployment automatically
-                            self.provider.set_environment_variables(
-                                service_id=service_id,
-                                environment=self.environment,
-                                variables=changed_vars,
-                                project_id=self.creds["railway_project_id"]
-                            )
-                            logger.info("Variable updates will trigger deployment automatically")
-                        else:
-                            logger.info("No variables changed, no deployment needed")
-                else:
-                    # New service - Railway will auto-deploy when service instance is ready
-                    logger.info("New service created. Railway will auto-deploy when ready.")
-                    logger.info("Monitor deployment status at: https://railway.com/project/%s/service/%s",
-                              self.creds["railway_project_id"], service_id)
-                
-                logger.info("✓ %s: Deployed successfully (service ID: %s)", service_name, service_id)
-                
-            except Exception as exc:
-                logger.exception("✗ %s: Deployment exception: %s", service_name, exc)
-                all_success = False
+                self._journal(service_name, VARIABLES_APPLIED)
+        elif is_new_service:
+            # New service - Railway will auto-deploy when service instance is ready
+            logger.info("New service created. Railway will auto-deploy when ready.")
+            logger.info("Monitor deployment status at: https://railway.com/project/%s/service/%s",
+                      self.creds["railway_project_id"], service_id)
+        
+        # Recorded locally once verify_all sees the deployment succeed
+        self.deployed_fingerprints[service_name] = fingerprint
+        self._journal(service_name, COMPLETED)
+        logger.info("✓ %s: Deployed successfully (service ID: %s)", service_name, service_id)
+        return service_id
+
+    def deploy_all(self) -> bool:
+        """Deploy all services to Railway.
+
+        Services are rolled out in dependency order, with up to
+        ``max_parallel`` independent services deploying at once. Progress is
+        recorded in a run journal; when resuming one, finished steps are
+        skipped without touching the API.
+
+        Returns:
+            True if all deployments succeeded, False otherwise
+        """
+        logger.info("\nDeploying services...")
+        
+        if self.journal is None:
+            self.journal = RunJournal.create(self.creds["railway_project_id"], self.environment)
+            logger.info("Run ID: %s", self.journal.run_id)
+        else:
+            logger.info("Resuming run %s (previous status: %s)", self.journal.run_id, self.journal.status)
+            self.journal.set_status("running")
+        
+        try:
+            all_success = self._deploy_all()
+        except KeyboardInterrupt:
+            self.journal.set_status("interrupted")
+            logger.error("Deployment interrupted; resume with: --resume %s", self.journal.run_id)
+            raise
+        except BaseException:
+            self.journal.set_status("failed")
+            logger.error("Deployment aborted; resume with: --resume %s", self.journal.run_id)
+            raise
+        
+        self.journal.set_status("succeeded" if all_success else "failed")
+        if not all_success:
+            logger.info("Resume the remaining services with: --resume %s", self.journal.run_id)
+        return all_success
+
+    def _deploy_all(self) -> bool:
+        try:
+            graph = self.build_dependency_graph()
+        except CycleError as exc:
+            logger.error("✗ Invalid service dependencies: %s", exc)
+            return False
+        
+        pending = self._pending_services(graph)
+        if not pending:
+            logger.info("Every service already completed in run %s", self.journal.run_id)
+            return True
+        
+        # Warm provider caches with one topology query, unless the journal already
+        # has everything a resumed run needs
+        redis_known = bool(self.creds.get("redis_url")) or self.journal.get_infrastructure("redis") is not None
+        needs_lookups = not redis_known or any(
+            not self.journal.service(name).get("service_id") for name in pending
+        )
+        if needs_lookups:
+            self._warm_provider_caches()
+        
+        # Ensure Redis is available
+        self._prepare_infrastructure()
+        
+        # Variables are only read (in one batch) for services whose fingerprint changed
+        self._prefetch_stale_variables(graph)
+        
+        waves = graph.waves()
+        for index, wave in enumerate(waves, start=1):
+            logger.info("Rollout wave %d: %s", index, ", ".join(wave))
+        
+        outcomes = self._rollout(graph)
+        all_success = all(outcome == "succeeded" for outcome in outcomes.values())
         
         if "redis" in self.infra_artifacts:
             redis_info = self.infra_artifacts["redis"]
@@ -390,11 +749,28 @@ class DeploymentOrchestrator:
     def verify_all(self) -> bool:
         """Verify all deployments are healthy.
 
+        Every service's latest deployment is read from a single project
+        snapshot query rather than one lookup per service. Fingerprints
+        deployed this run are recorded once their deployment succeeded, and a
+        failed service's recorded fingerprint is dropped so the next run
+        redeploys it.
+
         Returns:
             True if all verifications passed, False otherwise
         """
         logger.info("\nVerifying deployments...")
         
+        try:
+            snapshot = self.provider.load_project_snapshot(self.creds["railway_project_id"])
+        except Exception as exc:
+            logger.exception("✗ Verification failed: %s", exc)
+            return False
+        
+        env_id = snapshot.environment_id(self.environment)
+        if not env_id:
+            logger.error("✗ Environment '%s' not found in Railway project", self.environment)
+            return False
+        
         all_healthy = True
         
         for service_name in self.deployment_order:
@@ -405,15 +781,25 @@ class DeploymentOrchestrator:
             if service_config and not service_config.enabled:
                 continue
             
-            try:
-                service_full_name = f"budai-{service_name}"
-                # Check if service exists and is deployed
-                # In a real implementation, you'd check the deployment status via Railway API
-                logger.info("✓ %s: Service configured", service_name)
-                
-            except Exception as exc:
-                logger.exception("✗ %s: Verification failed: %s", service_name, exc)
+            service = snapshot.service_by_name(f"budai-{service_name}")
+            if not service:
+                logger.error("✗ %s: Service not found in Railway project", service_name)
+                all_healthy = False
+                continue
+            
+            deployment = snapshot.latest_deployment(service["id"], env_id) or {}
+            status = (deployment.get("status") or "").upper()
+            if status in DEPLOYMENT_FAILURE_STATUSES:
+                logger.error("✗ %s: Latest deployment %s", service_name, status)
+                # Make the next run redeploy instead of skipping on a stale fingerprint
+                self._forget_fingerprint(service_name)
                 all_healthy = False
+            elif status == "SUCCESS":
+                logger.info("✓ %s: Deployed", service_name)
+                if service_name in self.deployed_fingerprints:
+                    self._record_fingerprint(service_name, self.deployed_fingerprints.pop(service_name))
+            else:
+                logger.info("✓ %s: Service configured (latest deployment: %s)", service_name, status or "none")
         
         return all_healthy
 
@@ -444,6 +830,28 @@ def main() -> None:
         default="assisted",
         help="Deployment mode (default: assisted)",
     )
+    parser.add_argument(
+        "--max-parallel",
+        type=int,
+        default=None,
+        help="Maximum services deployed concurrently (default: BUDAI_DEPLOY_MAX_PARALLEL or 4)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Redeploy services even when their desired-state fingerprint is unchanged",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore the on-disk Railway ID cache (see BUDAI_DEPLOY_CACHE_DIR)",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        default=None,
+        help="Resume an interrupted deploy run from its journal (run IDs are logged at start)",
+    )
     
     args = parser.parse_args()
     
@@ -462,9 +870,24 @@ def main() -> None:
         logger.error("Failed to load credentials: %s", exc)
         sys.exit(1)
     
+    journal = None
+    if args.resume:
+        try:
+            journal = RunJournal.load(args.resume)
+        except JournalError as exc:
+            logger.error("Cannot resume: %s", exc)
+            sys.exit(1)
+    
     # Create orchestrator
     try:
-        orchestrator = DeploymentOrchestrator(spec, creds)
+        orchestrator = DeploymentOrchestrator(
+            spec,
+            creds,
+            use_id_cache=not args.no_cache,
+            max_parallel=args.max_parallel,
+            force=args.force,
+            journal=journal,
+        )
     except Exception as exc:
         logger.error("Failed to initialize orchestrator: %s", exc)
         sys.exit(1)
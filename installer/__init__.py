@@ -6,8 +6,24 @@ self-deploying capabilities that can explain, plan, apply, verify,
 and rollback their own deployments.
 """
 
-from .base import Installer
+from .base import Installer, PlanStepInstaller
+from .executor import PlanExecutor, StepTimeoutError
+from .fleet import FleetRunner
+from .graph import CycleError, DependencyGraph
+from .graphql_batch import AsyncGraphQLBatcher, GraphQLBatcher, GraphQLOperation
+from .id_cache import RailwayIDCache
+from .journal import JournalError, RunJournal
+from .plan_cache import PlanCache
+from .plan_diff import PlanDiff, diff_plans
 from .railway import RailwayAPIError, RailwayProvider
+from .railway_async import AsyncRailwayProvider, AsyncRequestBudget
+from .ratelimit import (
+    AdaptiveRateLimiter,
+    FileTokenBucketRateLimiter,
+    RateLimiter,
+    TokenBucketRateLimiter,
+    create_rate_limiter_from_env,
+)
 from .schemas import (
     ApplyResult,
     ApplyStatus,
@@ -15,6 +31,7 @@ from .schemas import (
     DeploymentPlan,
     DeploymentReport,
     DeploymentStep,
+    FleetReport,
     HealthCheckResult,
     PermissionScope,
     Requirements,
@@ -25,10 +42,39 @@ from .schemas import (
     ValidationStatus,
     VerificationReport,
 )
+from .snapshot import ProjectSnapshot
+from .subscriptions import GraphQLSubscriptionClient, SubscriptionError
+from .watcher import DeploymentWatcher
 
 __all__ = [
     "Installer",
+    "PlanStepInstaller",
     "RailwayProvider",
+    "AsyncRailwayProvider",
+    "AsyncRequestBudget",
+    "RateLimiter",
+    "TokenBucketRateLimiter",
+    "FileTokenBucketRateLimiter",
+    "AdaptiveRateLimiter",
+    "create_rate_limiter_from_env",
+    "GraphQLOperation",
+    "GraphQLBatcher",
+    "AsyncGraphQLBatcher",
+    "ProjectSnapshot",
+    "RailwayIDCache",
+    "RunJournal",
+    "JournalError",
+    "PlanCache",
+    "PlanDiff",
+    "diff_plans",
+    "DependencyGraph",
+    "CycleError",
+    "PlanExecutor",
+    "StepTimeoutError",
+    "FleetRunner",
+    "DeploymentWatcher",
+    "GraphQLSubscriptionClient",
+    "SubscriptionError",
     "RailwayAPIError",
     "ApplyResult",
     "ApplyStatus",
@@ -36,6 +82,7 @@ __all__ = [
     "DeploymentPlan",
     "DeploymentReport",
     "DeploymentStep",
+    "FleetReport",
     "HealthCheckResult",
     "PermissionScope",
     "Requirements",
@@ -10,15 +10,19 @@ from __future__ import annotations
 import logging
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional
 
+from .executor import PlanExecutor
+from .plan_cache import PlanCache
 from .schemas import (
     ApplyResult,
     ApplyStatus,
     DeploymentPlan,
     DeploymentReport,
+    DeploymentStep,
     Requirements,
     RollbackResult,
+    RollbackStep,
     ValidationResult,
     VerificationReport,
 )
@@ -37,12 +41,24 @@ class Installer(ABC):
     - verify: Run health checks and validate deployment
     - rollback: Revert changes if needed
     - report: Generate machine + human readable report
+
+    Capabilities whose plans are made of individually executable steps can
+    derive from :class:`PlanStepInstaller` instead, which implements
+    ``apply`` and ``rollback`` on top of per-step handlers.
     """
 
-    def __init__(self, capability_name: str, version: str) -> None:
-        """Initialize installer with capability identity."""
+    def __init__(self, capability_name: str, version: str, *, plan_cache: Optional[PlanCache] = None) -> None:
+        """Initialize installer with capability identity.
+
+        Args:
+            capability_name: Capability identifier
+            version: Capability version
+            plan_cache: Applied-plan cache; when set, re-deploying a plan whose checksum
+                already succeeded in the environment skips apply
+        """
         self.capability_name = capability_name
         self.version = version
+        self.plan_cache = plan_cache
         self.logger = logging.getLogger(f"{__name__}.{capability_name}")
         self._last_apply_result: Optional[ApplyResult] = None
         self._last_verification: Optional[VerificationReport] = None
@@ -140,6 +156,35 @@ class Installer(ABC):
         """
         pass
 
+    def apply_cached(self, plan: DeploymentPlan, creds: Dict[str, Any], env: str) -> ApplyResult:
+        """Apply ``plan`` unless the plan cache shows it is the last plan applied in ``env``.
+
+        Successful applies are recorded in the cache; any other outcome drops
+        the capability's cached plan, since the environment may no longer match it.
+
+        Returns:
+            The fresh ApplyResult, or the cached one (duration 0) on a hit
+        """
+        if self.plan_cache is not None:
+            cached = self.plan_cache.applied_result(plan, env)
+            if cached is not None:
+                self.logger.info(
+                    "Plan %s already applied to %s, skipping apply", plan.checksum[:8], env
+                )
+                return cached
+        result = self.apply(plan, creds)
+        if self.plan_cache is not None:
+            if result.status == ApplyStatus.SUCCESS:
+                self.plan_cache.record(plan, env, result)
+            else:
+                self.plan_cache.forget(plan.capability, env)
+        return result
+
+    def _forget_plan(self, plan: DeploymentPlan, env: str) -> None:
+        """Drop a plan from the cache after a failed verification or rollback."""
+        if self.plan_cache is not None:
+            self.plan_cache.invalidate(plan.checksum, env)
+
     def report(self) -> DeploymentReport:
         """Generate comprehensive deployment report.
 
@@ -225,12 +270,12 @@ class Installer(ABC):
                 plan.checksum[:8],
             )
 
-            # Step 4: Apply changes (Apply)
+            # Step 4: Apply changes (Apply); skipped when this exact plan already succeeded
             self.logger.info("Applying deployment plan...")
-            self._last_apply_result = self.apply(plan, creds)
+            self._last_apply_result = self.apply_cached(plan, creds, env)
 
-            if self._last_apply_result.status == ApplyStatus.FAILED:
-                if auto_rollback:
+            if self._last_apply_result.status in (ApplyStatus.FAILED, ApplyStatus.ROLLED_BACK):
+                if auto_rollback and not self._last_apply_result.rollback_executed:
                     self.logger.warning("Deployment failed, executing automatic rollback...")
                     rollback_result = self.rollback(plan, creds)
                     if rollback_result.status == ApplyStatus.SUCCESS:
@@ -246,6 +291,7 @@ class Installer(ABC):
             self._last_verification = self.verify(env)
             if self._last_verification.overall_status == "unhealthy":
                 self.logger.warning("Verification failed, deployment is unhealthy")
+                self._forget_plan(plan, env)
                 if auto_rollback:
                     self.logger.warning("Executing automatic rollback...")
                     rollback_result = self.rollback(plan, creds)
@@ -266,3 +312,115 @@ class Installer(ABC):
                 return self.report()
             raise
 
+
+class PlanStepInstaller(Installer):
+    """Installer that applies and rolls back plans one step at a time.
+
+    Subclasses implement :meth:`execute_step` and :meth:`execute_rollback_step`;
+    ``apply`` and ``rollback`` then run the plan's steps as a dependency graph
+    with timeouts, retries and ordered rollback (:meth:`apply_plan` /
+    :meth:`rollback_plan`).
+    """
+
+    # PlanExecutor settings used by apply_plan/rollback_plan
+    max_parallel_steps: int = 4
+    max_step_attempts: int = 3
+    step_retry_backoff_seconds: float = 1.0
+
+    @abstractmethod
+    def execute_step(self, step: DeploymentStep, creds: Dict[str, Any]) -> Optional[Dict[str, str]]:
+        """Perform a single plan step (used by :meth:`apply_plan`).
+
+        Must be safe to call concurrently for steps that do not depend on
+        each other, and idempotent for retriable steps.
+
+        Args:
+            step: Step to perform
+            creds: Credentials for making changes
+
+        Returns:
+            Optional artifacts (name -> value) merged into the ApplyResult
+        """
+        pass
+
+    @abstractmethod
+    def execute_rollback_step(self, step: RollbackStep, creds: Dict[str, Any]) -> None:
+        """Undo one step (used by :meth:`apply_plan` and :meth:`rollback_plan`).
+
+        Only called for the ``RollbackStep``s a plan declares.
+
+        Args:
+            step: Rollback step to perform
+            creds: Credentials for making changes
+        """
+        pass
+
+    def apply(self, plan: DeploymentPlan, creds: Dict[str, Any]) -> ApplyResult:
+        """Apply the plan step by step (see :meth:`apply_plan`)."""
+        return self.apply_plan(plan, creds)
+
+    def rollback(self, plan: DeploymentPlan, creds: Dict[str, Any]) -> RollbackResult:
+        """Undo the last apply step by step (see :meth:`rollback_plan`)."""
+        return self.rollback_plan(plan, creds)
+
+    def _plan_executor(self, creds: Dict[str, Any]) -> PlanExecutor:
+        return PlanExecutor(
+            lambda step: self.execute_step(step, creds),
+            lambda step: self.execute_rollback_step(step, creds),
+            max_workers=self.max_parallel_steps,
+            max_attempts=self.max_step_attempts,
+            backoff_seconds=self.step_retry_backoff_seconds,
+        )
+
+    def apply_plan(
+        self,
+        plan: DeploymentPlan,
+        creds: Dict[str, Any],
+        *,
+        rollback_on_failure: bool = True,
+        only: Optional[Iterable[str]] = None,
+    ) -> ApplyResult:
+        """Apply ``plan`` by running :meth:`execute_step` over its step graph.
+
+        Independent steps run concurrently; on failure the rollback steps of
+        everything that ran are executed in reverse dependency order.
+
+        Args:
+            plan: Validated deployment plan
+            creds: Credentials for making changes
+            rollback_on_failure: Roll back automatically when a step fails
+            only: Run just these steps (e.g. ``diff_plans(previous, plan).to_apply``)
+
+        Returns:
+            ApplyResult (``ROLLED_BACK`` if a failure was rolled back)
+        """
+        result = self._plan_executor(creds).execute(
+            plan, rollback_on_failure=rollback_on_failure, only=only
+        )
+        self._last_apply_result = result
+        return result
+
+    def rollback_plan(
+        self,
+        plan: DeploymentPlan,
+        creds: Dict[str, Any],
+        step_ids: Optional[Iterable[str]] = None,
+    ) -> RollbackResult:
+        """Run the plan's rollback steps via :meth:`execute_rollback_step`.
+
+        Args:
+            plan: Plan whose rollback steps to run
+            creds: Credentials for making changes
+            step_ids: Steps to undo (defaults to the last apply's applied and failed steps,
+                or every step if nothing was applied through this installer)
+
+        Returns:
+            RollbackResult
+        """
+        if step_ids is None:
+            last = self._last_apply_result
+            if last is not None:
+                step_ids = list(last.applied_steps) + ([last.failed_step] if last.failed_step else [])
+            else:
+                step_ids = [step.id for step in plan.steps]
+        return self._plan_executor(creds).rollback(plan, step_ids)
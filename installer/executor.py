@@ -0,0 +1,303 @@
+"""
+Dependency-aware executor for DeploymentPlan steps.
+
+Schedules ``DeploymentPlan.steps`` on a worker pool in ``depends_on`` order:
+a step starts as soon as every step it depends on has succeeded, so
+independent steps run in parallel. Each step gets its ``timeout_seconds``,
+retriable steps that fail are retried with exponential backoff, and when a step fails
+for good the plan's ``RollbackStep``s for everything that ran are executed in
+reverse dependency order.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .graph import DependencyGraph
+from .schemas import (
+    ApplyResult,
+    ApplyStatus,
+    DeploymentPlan,
+    DeploymentStep,
+    RollbackResult,
+    RollbackStep,
+)
+
+logger = logging.getLogger(__name__)
+
+# Runs one step; may return artifacts (name -> value) to merge into the ApplyResult
+StepHandler = Callable[[DeploymentStep], Optional[Dict[str, str]]]
+RollbackHandler = Callable[[RollbackStep], None]
+
+
+class StepTimeoutError(TimeoutError):
+    """Raised (as a step's error) when a step attempt exceeds its timeout."""
+
+    def __init__(self, step_id: str, timeout_seconds: float) -> None:
+        self.step_id = step_id
+        self.timeout_seconds = timeout_seconds
+        super().__init__(f"Step {step_id} timed out after {timeout_seconds:g}s")
+
+
+def plan_graph(plan: DeploymentPlan) -> DependencyGraph:
+    """Dependency graph of a plan's steps.
+
+    Raises:
+        ValueError: If step IDs repeat or a step depends on an unknown step
+        CycleError: If ``depends_on`` contains a cycle
+    """
+    ids = [step.id for step in plan.steps]
+    duplicates = sorted({step_id for step_id in ids if ids.count(step_id) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate step IDs in plan: {', '.join(duplicates)}")
+    known = set(ids)
+    for step in plan.steps:
+        unknown = [dep for dep in step.depends_on if dep not in known]
+        if unknown:
+            raise ValueError(f"Step {step.id} depends on unknown step(s): {', '.join(unknown)}")
+    return DependencyGraph.from_dependencies({step.id: step.depends_on for step in plan.steps}, nodes=ids)
+
+
+class PlanExecutor:
+    """Runs a plan's steps as a DAG on a thread pool.
+
+    Usage::
+
+        executor = PlanExecutor(run_step, run_rollback_step, max_workers=4)
+        result = executor.execute(plan)
+
+    Step timeouts are enforced by the scheduler: an attempt that overruns is
+    abandoned (its thread cannot be killed, so handlers should also honour
+    their own I/O timeouts) and the step fails for good, even if retriable,
+    since a retry would run alongside the abandoned attempt. After the first
+    permanent failure no new steps start; steps already running are allowed
+    to finish and are rolled back with the rest.
+    """
+
+    def __init__(
+        self,
+        handler: StepHandler,
+        rollback_handler: Optional[RollbackHandler] = None,
+        *,
+        max_workers: int = 4,
+        max_attempts: int = 3,
+        backoff_seconds: float = 1.0,
+        backoff_factor: float = 2.0,
+        max_backoff_seconds: float = 30.0,
+        default_timeout_seconds: Optional[float] = None,
+    ) -> None:
+        """Initialize executor.
+
+        Args:
+            handler: Runs one step, returning optional artifacts
+            rollback_handler: Runs one rollback step (rollback is skipped if None)
+            max_workers: Steps run concurrently
+            max_attempts: Attempts per retriable step (non-retriable steps run once)
+            backoff_seconds: Delay before the first retry
+            backoff_factor: Delay multiplier per further retry
+            max_backoff_seconds: Upper bound on the retry delay
+            default_timeout_seconds: Timeout for steps without ``timeout_seconds`` (None: unbounded)
+        """
+        self.handler = handler
+        self.rollback_handler = rollback_handler
+        self.max_workers = max(1, max_workers)
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_seconds = backoff_seconds
+        self.backoff_factor = max(1.0, backoff_factor)
+        self.max_backoff_seconds = max_backoff_seconds
+        self.default_timeout_seconds = default_timeout_seconds
+
+    def _timeout(self, step: DeploymentStep) -> Optional[float]:
+        return step.timeout_seconds if step.timeout_seconds is not None else self.default_timeout_seconds
+
+    def _retry_delay(self, attempt: int) -> float:
+        return min(self.max_backoff_seconds, self.backoff_seconds * self.backoff_factor ** (attempt - 1))
+
+    def execute(
+        self,
+        plan: DeploymentPlan,
+        *,
+        rollback_on_failure: bool = True,
+        only: Optional[Iterable[str]] = None,
+    ) -> ApplyResult:
+        """Run every step of ``plan`` (or the ``only`` subset).
+
+        Args:
+            plan: Plan to execute
+            rollback_on_failure: Run rollback steps for applied steps if a step fails
+            only: Step IDs to run, e.g. ``PlanDiff.to_apply``; dependencies outside the
+                subset are treated as already applied
+
+        Returns:
+            ApplyResult; ``applied_steps`` lists steps in completion order
+
+        Raises:
+            ValueError: If the plan (or ``only``) references unknown or duplicate step IDs
+            CycleError: If step dependencies contain a cycle
+        """
+        started = time.monotonic()
+        graph = plan_graph(plan)
+        if only is not None:
+            selected = set(only)
+            unknown = sorted(selected - set(graph))
+            if unknown:
+                raise ValueError(f"Unknown step(s) requested: {', '.join(unknown)}")
+            graph = graph.subgraph(selected)
+        steps = {step.id: step for step in plan.steps}
+        order = graph.topological_order()
+
+        applied: List[str] = []
+        artifacts: Dict[str, str] = {}
+        attempts: Dict[str, int] = {}
+        retry_at: Dict[str, float] = {}
+        running: Dict[Future, Tuple[str, Optional[float]]] = {}
+        failed: Optional[Tuple[str, BaseException]] = None
+
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="plan-step")
+        try:
+            while True:
+                now = time.monotonic()
+                if failed is None:
+                    in_flight = {step_id for step_id, _ in running.values()}
+                    for step_id in order:
+                        if step_id in applied or step_id in in_flight:
+                            continue
+                        if step_id in retry_at and retry_at[step_id] > now:
+                            continue
+                        if not all(dep in applied for dep in graph.dependencies(step_id)):
+                            continue
+                        retry_at.pop(step_id, None)
+                        attempts[step_id] = attempts.get(step_id, 0) + 1
+                        timeout = self._timeout(steps[step_id])
+                        deadline = now + timeout if timeout is not None else None
+                        logger.info(
+                            "Starting step %s (%s), attempt %d",
+                            step_id,
+                            steps[step_id].action,
+                            attempts[step_id],
+                        )
+                        running[pool.submit(self.handler, steps[step_id])] = (step_id, deadline)
+                        in_flight.add(step_id)
+
+                if not running and (failed is not None or not retry_at):
+                    break
+
+                wakeups = [deadline for _, deadline in running.values() if deadline is not None]
+                if failed is None:
+                    wakeups.extend(retry_at.values())
+                timeout = max(0.0, min(wakeups) - time.monotonic()) if wakeups else None
+                if running:
+                    done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                else:
+                    time.sleep(timeout or 0.0)
+                    done = set()
+
+                now = time.monotonic()
+                outcomes: List[Tuple[str, Optional[BaseException], Optional[Dict[str, str]]]] = []
+                for future in done:
+                    step_id, _ = running.pop(future)
+                    error = future.exception()
+                    outcomes.append((step_id, error, None if error else future.result()))
+                for future, (step_id, deadline) in list(running.items()):
+                    if deadline is not None and deadline <= now:
+                        del running[future]
+                        timeout_seconds = self._timeout(steps[step_id]) or 0.0
+                        outcomes.append((step_id, StepTimeoutError(step_id, timeout_seconds), None))
+
+                for step_id, error, step_artifacts in outcomes:
+                    if error is None:
+                        applied.append(step_id)
+                        artifacts.update({k: str(v) for k, v in (step_artifacts or {}).items()})
+                        logger.info("Step %s succeeded", step_id)
+                        continue
+                    step = steps[step_id]
+                    # A timed-out attempt may still be running, so retrying could run the step twice
+                    retriable = step.retriable and not isinstance(error, StepTimeoutError)
+                    if failed is None and retriable and attempts[step_id] < self.max_attempts:
+                        delay = self._retry_delay(attempts[step_id])
+                        retry_at[step_id] = now + delay
+                        logger.warning("Step %s failed (%s); retrying in %.1fs", step_id, error, delay)
+                    else:
+                        logger.error("Step %s failed: %s", step_id, error)
+                        if failed is None:
+                            failed = (step_id, error)
+                            retry_at.clear()
+        finally:
+            # Abandoned (timed-out) attempts may still be running; don't block on them
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        if failed is None:
+            return ApplyResult(
+                status=ApplyStatus.SUCCESS,
+                applied_steps=applied,
+                duration_seconds=time.monotonic() - started,
+                artifacts=artifacts,
+            )
+
+        failed_step, error = failed
+        status = ApplyStatus.FAILED
+        rollback_executed = False
+        messages = [f"{failed_step}: {error}"]
+        if rollback_on_failure and self.rollback_handler is not None:
+            rollback = self.rollback(plan, applied + [failed_step])
+            rollback_executed = bool(rollback.rolled_back_steps) or rollback.failed_rollback_step is not None
+            if rollback.status == ApplyStatus.SUCCESS:
+                status = ApplyStatus.ROLLED_BACK if rollback_executed else ApplyStatus.FAILED
+            elif rollback.error_message:
+                messages.append(f"rollback: {rollback.error_message}")
+
+        return ApplyResult(
+            status=status,
+            applied_steps=applied,
+            failed_step=failed_step,
+            error_message="\n".join(messages),
+            rollback_executed=rollback_executed,
+            duration_seconds=time.monotonic() - started,
+            artifacts=artifacts,
+        )
+
+    def rollback(self, plan: DeploymentPlan, step_ids: Iterable[str]) -> RollbackResult:
+        """Run the rollback steps for ``step_ids``, dependents before their dependencies.
+
+        Several rollback steps for one step run in reverse declaration order.
+        Stops at the first rollback step that fails.
+
+        Returns:
+            RollbackResult; ``rolled_back_steps`` lists the step IDs undone
+        """
+        started = time.monotonic()
+        if self.rollback_handler is None:
+            raise RuntimeError("PlanExecutor has no rollback handler")
+
+        targets: Set[str] = set(step_ids)
+        by_step: Dict[str, List[RollbackStep]] = {}
+        for rollback_step in plan.rollback:
+            if rollback_step.on_fail_of in targets:
+                by_step.setdefault(rollback_step.on_fail_of, []).append(rollback_step)
+
+        rolled_back: List[str] = []
+        for step_id in reversed(plan_graph(plan).topological_order()):
+            for rollback_step in reversed(by_step.get(step_id, [])):
+                logger.info("Rolling back step %s (%s)", step_id, rollback_step.action)
+                try:
+                    self.rollback_handler(rollback_step)
+                except Exception as exc:
+                    logger.error("Rollback of step %s failed: %s", step_id, exc)
+                    return RollbackResult(
+                        status=ApplyStatus.FAILED,
+                        rolled_back_steps=rolled_back,
+                        failed_rollback_step=step_id,
+                        error_message=f"{rollback_step.action} for {step_id}: {exc}",
+                        duration_seconds=time.monotonic() - started,
+                    )
+            if step_id in by_step:
+                rolled_back.append(step_id)
+
+        return RollbackResult(
+            status=ApplyStatus.SUCCESS,
+            rolled_back_steps=rolled_back,
+            duration_seconds=time.monotonic() - started,
+        )
@@ -0,0 +1,322 @@
+"""
+Fleet-wide lifecycle runner.
+
+Runs ``Installer.deploy_full_lifecycle``'s phases across many installers at
+once: requirements, permission validation and planning fan out in parallel,
+apply follows the service dependency graph declared through
+``Requirements.dependencies`` (``type: "service"``), and verification fans out
+again. The whole fleet then takes as long as its critical path rather than
+the sum of every installer.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Set, Tuple, TypeVar
+
+from .base import Installer
+from .graph import DependencyGraph
+from .schemas import (
+    ApplyStatus,
+    DeploymentPlan,
+    DeploymentReport,
+    FleetReport,
+    Requirements,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class FleetRunner:
+    """Runs the installer lifecycle for many capabilities concurrently.
+
+    Usage::
+
+        runner = FleetRunner([gateway_installer, orchestrator_installer, ...])
+        fleet_report = runner.run(specs, creds, "production")
+
+    An installer that fails a phase drops out of the later phases, and every
+    installer depending on it (directly or transitively) is reported as
+    blocked instead of applied. Unrelated installers carry on.
+    """
+
+    def __init__(self, installers: Sequence[Installer], *, max_workers: Optional[int] = None) -> None:
+        """Initialize runner.
+
+        Args:
+            installers: Installers to run, identified by ``capability_name``
+            max_workers: Installers processed concurrently per phase (defaults to all of them)
+
+        Raises:
+            ValueError: If two installers share a capability name
+        """
+        names = [installer.capability_name for installer in installers]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate installer capabilities: {', '.join(duplicates)}")
+        self.installers: Dict[str, Installer] = {i.capability_name: i for i in installers}
+        self.max_workers = max(1, max_workers or len(self.installers) or 1)
+
+    def dependency_graph(self, requirements: Mapping[str, Requirements]) -> DependencyGraph:
+        """Graph of installers from their ``service`` dependencies on each other.
+
+        Dependencies on services outside the fleet are ignored.
+
+        Raises:
+            CycleError: If the installers depend on each other in a cycle
+        """
+        dependencies = {
+            name: [dep.name for dep in reqs.dependencies if dep.type == "service" and dep.name]
+            for name, reqs in requirements.items()
+        }
+        return DependencyGraph.from_dependencies(dependencies, nodes=list(self.installers))
+
+    def run(
+        self,
+        specs: Mapping[str, Dict[str, Any]],
+        creds: Dict[str, Any],
+        env: str,
+        *,
+        auto_rollback: bool = True,
+    ) -> FleetReport:
+        """Run every lifecycle phase across the fleet.
+
+        Args:
+            specs: Capability name -> deployment spec (missing entries get ``{}``)
+            creds: Credentials shared by all installers
+            env: Target environment
+            auto_rollback: Roll back an installer whose apply or verification fails
+
+        Returns:
+            FleetReport with per-installer reports, errors and phase timings
+
+        Raises:
+            CycleError: If installer service dependencies contain a cycle
+        """
+        started_at = datetime.utcnow()
+        timings: Dict[str, Dict[str, float]] = {name: {} for name in self.installers}
+        phase_durations: Dict[str, float] = {}
+        errors: Dict[str, str] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="fleet") as pool:
+
+            def fan_out(phase: str, names: List[str], func: Callable[[Installer], T]) -> Dict[str, T]:
+                phase_started = time.monotonic()
+                futures = {
+                    name: pool.submit(self._timed, timings[name], phase, func, self.installers[name])
+                    for name in names
+                }
+                results: Dict[str, T] = {}
+                for name, future in futures.items():
+                    try:
+                        results[name] = future.result()
+                    except Exception as exc:
+                        logger.error("%s: %s failed: %s", name, phase, exc)
+                        errors[name] = f"{phase}: {exc}"
+                phase_durations[phase] = time.monotonic() - phase_started
+                return results
+
+            for installer in self.installers.values():
+                installer._deployment_start = started_at
+
+            requirements = fan_out("explain", list(self.installers), lambda i: i.describe_requirements(env))
+            graph = self.dependency_graph(
+                {name: requirements.get(name, Requirements(capability=name, version="")) for name in self.installers}
+            )
+
+            fan_out("validate", self._healthy(graph, errors), lambda i: self._validate(i, creds, env))
+            plans = fan_out(
+                "plan",
+                self._healthy(graph, errors),
+                lambda i: i.plan(specs.get(i.capability_name, {}), env),
+            )
+
+            phase_started = time.monotonic()
+            blocked = self._apply(pool, graph, plans, creds, env, timings, errors, auto_rollback)
+            phase_durations["apply"] = time.monotonic() - phase_started
+
+            fan_out(
+                "verify",
+                [name for name in graph if name in plans and name not in errors and name not in blocked],
+                lambda i: self._verify(i, plans[i.capability_name], creds, env, auto_rollback),
+            )
+
+        reports: Dict[str, DeploymentReport] = {}
+        phase_started = time.monotonic()
+        for name, installer in self.installers.items():
+            if installer._last_apply_result is None or name in blocked or name not in plans:
+                continue
+            report = installer.report()
+            if name in errors and errors[name] not in report.errors:
+                report.errors.append(errors[name])
+            reports[name] = report
+        phase_durations["report"] = time.monotonic() - phase_started
+
+        succeeded = [name for name in self.installers if name not in errors and name not in blocked]
+        if len(succeeded) == len(self.installers):
+            result = ApplyStatus.SUCCESS
+        elif succeeded:
+            result = ApplyStatus.PARTIAL
+        else:
+            result = ApplyStatus.FAILED
+
+        critical_path, critical_seconds = self._critical_path(graph, timings)
+        completed_at = datetime.utcnow()
+        logger.info(
+            "Fleet %s: %d/%d succeeded in %.2fs (critical path %s, %.2fs)",
+            result.value,
+            len(succeeded),
+            len(self.installers),
+            (completed_at - started_at).total_seconds(),
+            " -> ".join(critical_path) or "none",
+            critical_seconds,
+        )
+        return FleetReport(
+            id=f"fleet-{env}-{started_at.isoformat()}",
+            environment=env,
+            result=result,
+            started_at=started_at,
+            completed_at=completed_at,
+            duration_sec=(completed_at - started_at).total_seconds(),
+            reports=reports,
+            errors=errors,
+            blocked=sorted(blocked),
+            phase_durations=phase_durations,
+            installer_phase_durations=timings,
+            critical_path=critical_path,
+            critical_path_seconds=critical_seconds,
+        )
+
+    @staticmethod
+    def _timed(timings: Dict[str, float], phase: str, func: Callable[[Installer], T], installer: Installer) -> T:
+        started = time.monotonic()
+        try:
+            return func(installer)
+        finally:
+            timings[phase] = timings.get(phase, 0.0) + time.monotonic() - started
+
+    @staticmethod
+    def _healthy(graph: DependencyGraph, errors: Mapping[str, str]) -> List[str]:
+        return [name for name in graph if name not in errors]
+
+    @staticmethod
+    def _validate(installer: Installer, creds: Dict[str, Any], env: str) -> None:
+        validation = installer.validate_permissions(creds, env)
+        if validation.status != "valid":
+            raise RuntimeError(f"Permission validation failed: {', '.join(validation.validation_errors)}")
+
+    def _apply(
+        self,
+        pool: ThreadPoolExecutor,
+        graph: DependencyGraph,
+        plans: Mapping[str, DeploymentPlan],
+        creds: Dict[str, Any],
+        env: str,
+        timings: Dict[str, Dict[str, float]],
+        errors: Dict[str, str],
+        auto_rollback: bool,
+    ) -> Set[str]:
+        """Apply plans along the dependency graph; returns the names blocked by failures."""
+        order = graph.topological_order()
+        finished: Dict[str, bool] = {}
+        blocked: Set[str] = set()
+        running: Dict[Future, str] = {}
+
+        while True:
+            for name in order:
+                if name in finished or name in running.values():
+                    continue
+                if name in errors or name not in plans:
+                    finished[name] = False
+                    continue
+                dependency_states = [finished.get(dep) for dep in graph.dependencies(name)]
+                if any(state is False for state in dependency_states):
+                    finished[name] = False
+                    blocked.add(name)
+                    logger.error("%s: blocked by failed dependency", name)
+                elif all(state for state in dependency_states):
+                    apply = partial(
+                        self._apply_one, plan=plans[name], creds=creds, env=env, auto_rollback=auto_rollback
+                    )
+                    future = pool.submit(self._timed, timings[name], "apply", apply, self.installers[name])
+                    running[future] = name
+
+            if not running:
+                return blocked
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    future.result()
+                    finished[name] = True
+                except Exception as exc:
+                    logger.error("%s: apply failed: %s", name, exc)
+                    errors[name] = f"apply: {exc}"
+                    finished[name] = False
+
+    @staticmethod
+    def _apply_one(
+        installer: Installer,
+        plan: DeploymentPlan,
+        creds: Dict[str, Any],
+        env: str,
+        auto_rollback: bool,
+    ) -> None:
+        result = installer.apply_cached(plan, creds, env)
+        installer._last_apply_result = result
+        if result.status in (ApplyStatus.FAILED, ApplyStatus.ROLLED_BACK):
+            if auto_rollback and not result.rollback_executed:
+                rollback = installer.rollback(plan, creds)
+                if rollback.status != ApplyStatus.SUCCESS:
+                    logger.error("%s: rollback failed: %s", installer.capability_name, rollback.error_message)
+            raise RuntimeError(result.error_message or f"apply finished with status {result.status.value}")
+
+    @staticmethod
+    def _verify(
+        installer: Installer,
+        plan: DeploymentPlan,
+        creds: Dict[str, Any],
+        env: str,
+        auto_rollback: bool,
+    ) -> None:
+        installer._last_verification = installer.verify(env)
+        if installer._last_verification.overall_status == "unhealthy":
+            installer._forget_plan(plan, env)
+            if auto_rollback:
+                installer.rollback(plan, creds)
+            raise RuntimeError(
+                f"Deployment verification failed: {', '.join(installer._last_verification.errors)}"
+            )
+
+    @staticmethod
+    def _critical_path(
+        graph: DependencyGraph, timings: Mapping[str, Mapping[str, float]]
+    ) -> Tuple[List[str], float]:
+        """Longest chain of installers through the graph, weighted by apply time.
+
+        Apply is the only phase ordered by dependencies, so this chain bounds
+        the apply phase's wall time.
+        """
+        best: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        for name in graph.topological_order():
+            own = timings.get(name, {}).get("apply", 0.0)
+            parent = max(graph.dependencies(name), key=lambda dep: best[dep], default=None)
+            best[name] = own + (best[parent] if parent else 0.0)
+            previous[name] = parent
+        if not best:
+            return [], 0.0
+        node: Optional[str] = max(best, key=best.get)
+        total = best[node]
+        path: List[str] = []
+        while node is not None:
+            path.append(node)
+            node = previous[node]
+        return list(reversed(path)), total
@@ -0,0 +1,188 @@
+"""
+Dependency graph utilities for ordering deployments.
+
+Nodes are identified by name and edges point from a node to the nodes it
+depends on. Used to roll services out in dependency order and to schedule
+independent work concurrently.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Set
+
+
+class CycleError(ValueError):
+    """Raised when a dependency graph contains a cycle."""
+
+    def __init__(self, cycle: List[str]) -> None:
+        self.cycle = cycle
+        super().__init__(f"Dependency cycle detected: {' -> '.join(cycle)}")
+
+
+class DependencyGraph:
+    """Directed acyclic graph of named nodes and their dependencies.
+
+    Insertion order is preserved and used to break ties, so waves and
+    topological orders are deterministic.
+    """
+
+    def __init__(self) -> None:
+        self._dependencies: Dict[str, List[str]] = {}
+        self._dependents: Dict[str, List[str]] = {}
+
+    @classmethod
+    def from_dependencies(
+        cls,
+        dependencies: Mapping[str, Iterable[str]],
+        *,
+        nodes: Optional[Iterable[str]] = None,
+    ) -> DependencyGraph:
+        """Build a graph from a node -> dependencies mapping.
+
+        Args:
+            dependencies: Node name -> names it depends on
+            nodes: Restrict the graph to these nodes (in this order); edges to
+                nodes outside the set are dropped
+
+        Returns:
+            DependencyGraph instance
+
+        Raises:
+            CycleError: If the dependencies contain a cycle
+        """
+        graph = cls()
+        names = list(nodes) if nodes is not None else list(dependencies)
+        for name in names:
+            graph.add_node(name)
+        for name in names:
+            for dependency in dependencies.get(name, ()):
+                if dependency in graph:
+                    graph.add_edge(name, dependency)
+        graph.check_acyclic()
+        return graph
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._dependencies
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._dependencies)
+
+    def __len__(self) -> int:
+        return len(self._dependencies)
+
+    @property
+    def nodes(self) -> List[str]:
+        """All node names in insertion order."""
+        return list(self._dependencies)
+
+    def add_node(self, name: str) -> None:
+        """Add a node (no-op if it already exists)."""
+        self._dependencies.setdefault(name, [])
+        self._dependents.setdefault(name, [])
+
+    def add_edge(self, name: str, depends_on: str) -> None:
+        """Record that ``name`` depends on ``depends_on``."""
+        self.add_node(name)
+        self.add_node(depends_on)
+        if depends_on not in self._dependencies[name]:
+            self._dependencies[name].append(depends_on)
+            self._dependents[depends_on].append(name)
+
+    def dependencies(self, name: str) -> List[str]:
+        """Direct dependencies of a node."""
+        return list(self._dependencies[name])
+
+    def dependents(self, name: str) -> List[str]:
+        """Nodes that directly depend on a node."""
+        return list(self._dependents[name])
+
+    def descendants(self, name: str) -> Set[str]:
+        """Every node that transitively depends on a node."""
+        seen: Set[str] = set()
+        stack = list(self._dependents[name])
+        while stack:
+            node = stack.pop()
+            if node not in seen:
+                seen.add(node)
+                stack.extend(self._dependents[node])
+        return seen
+
+    def ancestors(self, name: str) -> Set[str]:
+        """Every node a node transitively depends on."""
+        seen: Set[str] = set()
+        stack = list(self._dependencies[name])
+        while stack:
+            node = stack.pop()
+            if node not in seen:
+                seen.add(node)
+                stack.extend(self._dependencies[node])
+        return seen
+
+    def find_cycle(self) -> Optional[List[str]]:
+        """Return one dependency cycle (first node repeated at the end), or None."""
+        visiting: Set[str] = set()
+        done: Set[str] = set()
+        path: List[str] = []
+
+        def visit(node: str) -> Optional[List[str]]:
+            visiting.add(node)
+            path.append(node)
+            for dependency in self._dependencies[node]:
+                if dependency in visiting:
+                    return path[path.index(dependency):] + [dependency]
+                if dependency not in done:
+                    cycle = visit(dependency)
+                    if cycle:
+                        return cycle
+            visiting.discard(node)
+            done.add(node)
+            path.pop()
+            return None
+
+        for node in self._dependencies:
+            if node not in done:
+                cycle = visit(node)
+                if cycle:
+                    return cycle
+        return None
+
+    def check_acyclic(self) -> None:
+        """Raise :class:`CycleError` if the graph contains a cycle."""
+        cycle = self.find_cycle()
+        if cycle:
+            raise CycleError(cycle)
+
+    def waves(self) -> List[List[str]]:
+        """Group nodes into waves whose members only depend on earlier waves.
+
+        Raises:
+            CycleError: If the graph contains a cycle
+        """
+        remaining = {name: len(deps) for name, deps in self._dependencies.items()}
+        waves: List[List[str]] = []
+        current = [name for name, count in remaining.items() if count == 0]
+        while current:
+            waves.append(current)
+            for name in current:
+                del remaining[name]
+            ready: List[str] = []
+            for name in current:
+                for dependent in self._dependents[name]:
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0:
+                        ready.append(dependent)
+            current = [name for name in self._dependencies if name in ready]
+        if remaining:
+            self.check_acyclic()
+        return waves
+
+    def topological_order(self) -> List[str]:
+        """Nodes ordered so every node follows its dependencies."""
+        return [name for wave in self.waves() for name in wave]
+
+    def subgraph(self, names: Iterable[str]) -> DependencyGraph:
+        """Graph restricted to ``names``, keeping edges between them."""
+        keep = set(names)
+        return DependencyGraph.from_dependencies(
+            self._dependencies, nodes=[name for name in self if name in keep]
+        )
@@ -0,0 +1,309 @@
+"""
+Request coalescing for independent Railway GraphQL lookups.
+
+Operations are single root-field selections (``deployment(id: ...)``,
+``service(id: ...)``, ``variables(...)``). Queued operations are merged into
+one aliased document, sent in one HTTP round trip, and the per-alias results
+(or errors) are fanned back out to each caller.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (data, errors) as returned by a provider's raw GraphQL request
+GraphQLResponse = Tuple[Dict[str, Any], List[Dict[str, Any]]]
+
+
+class GraphQLOperation:
+    """A single root-field selection that can be merged into a batched document."""
+
+    def __init__(
+        self,
+        field: str,
+        arguments: Optional[Dict[str, Tuple[str, Any]]] = None,
+        selection: str = "",
+        *,
+        transform: Optional[Callable[[Any], Any]] = None,
+    ) -> None:
+        """Initialize operation.
+
+        Args:
+            field: Root field name (e.g., 'deployment')
+            arguments: Argument name -> (GraphQL type, value), e.g. {"id": ("String!", "abc")}
+            selection: Sub-selection body without braces (empty for scalar/JSON fields)
+            transform: Optional post-processing applied to the field's result
+        """
+        self.field = field
+        self.arguments = arguments or {}
+        self.selection = selection.strip()
+        self.transform = transform
+
+    def render(self, alias: str) -> Tuple[str, List[str], Dict[str, Any]]:
+        """Render this operation under ``alias``.
+
+        Returns:
+            Tuple of (field text, variable definitions, variable values)
+        """
+        definitions: List[str] = []
+        values: Dict[str, Any] = {}
+        args: List[str] = []
+        for name, (type_name, value) in self.arguments.items():
+            var_name = f"{alias}_{name}"
+            definitions.append(f"${var_name}: {type_name}")
+            values[var_name] = value
+            args.append(f"{name}: ${var_name}")
+        text = f"{alias}: {self.field}"
+        if args:
+            text += f"({', '.join(args)})"
+        if self.selection:
+            text += f" {{ {self.selection} }}"
+        return text, definitions, values
+
+    def resolve(self, value: Any) -> Any:
+        """Apply the operation's transform to its raw result."""
+        return self.transform(value) if self.transform else value
+
+
+def build_batched_document(
+    operations: Sequence[GraphQLOperation], *, kind: str = "query"
+) -> Tuple[str, Dict[str, Any]]:
+    """Merge operations into one aliased GraphQL document.
+
+    Args:
+        operations: Operations to merge (aliased ``o0``, ``o1``, ...)
+        kind: 'query' or 'mutation'
+
+    Returns:
+        Tuple of (document, variables)
+    """
+    fields: List[str] = []
+    definitions: List[str] = []
+    variables: Dict[str, Any] = {}
+    for index, operation in enumerate(operations):
+        text, op_definitions, op_values = operation.render(f"o{index}")
+        fields.append(text)
+        definitions.extend(op_definitions)
+        variables.update(op_values)
+    signature = f"({', '.join(definitions)})" if definitions else ""
+    document = f"{kind} Batched{signature} {{\n    " + "\n    ".join(fields) + "\n}"
+    return document, variables
+
+
+def split_batched_response(
+    operations: Sequence[GraphQLOperation],
+    data: Dict[str, Any],
+    errors: List[Dict[str, Any]],
+    error_factory: Callable[[str], Exception],
+) -> List[Any]:
+    """Fan a batched response back out to its operations.
+
+    Errors whose ``path`` starts with an alias fail only that operation;
+    errors without a path fail every operation in the batch.
+
+    Returns:
+        Per-operation result, or an exception instance for failed operations
+    """
+    per_alias: Dict[str, List[str]] = {}
+    global_errors: List[str] = []
+    for error in errors:
+        message = error.get("message", str(error))
+        path = error.get("path") or []
+        if path and isinstance(path[0], str):
+            per_alias.setdefault(path[0], []).append(message)
+        else:
+            global_errors.append(message)
+
+    results: List[Any] = []
+    for index, operation in enumerate(operations):
+        alias = f"o{index}"
+        messages = global_errors + per_alias.get(alias, [])
+        if messages:
+            results.append(error_factory(f"GraphQL errors: {'; '.join(messages)}"))
+            continue
+        try:
+            results.append(operation.resolve((data or {}).get(alias)))
+        except Exception as exc:  # transform failures belong to that caller only
+            results.append(exc)
+    return results
+
+
+class GraphQLBatcher:
+    """Thread-safe coalescer for synchronous providers.
+
+    ``submit`` queues an operation and returns a future; queued operations
+    are flushed as one document when ``window_seconds`` elapses or
+    ``max_batch_size`` is reached, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        request: Callable[[str, Dict[str, Any]], GraphQLResponse],
+        error_factory: Callable[[str], Exception],
+        *,
+        window_seconds: float = 0.05,
+        max_batch_size: int = 25,
+    ) -> None:
+        """Initialize batcher.
+
+        Args:
+            request: Callable executing a document and returning (data, errors)
+            error_factory: Builds the exception raised for failed operations
+            window_seconds: How long to collect operations before flushing
+            max_batch_size: Flush immediately once this many operations are queued
+        """
+        self._request = request
+        self._error_factory = error_factory
+        self.window_seconds = window_seconds
+        self.max_batch_size = max(1, max_batch_size)
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[GraphQLOperation, Future]] = []
+        self._timer: Optional[threading.Timer] = None
+
+    def submit(self, operation: GraphQLOperation) -> Future:
+        """Queue an operation for the next batch.
+
+        Returns:
+            Future resolved with the operation's result
+        """
+        future: Future = Future()
+        flush_now = False
+        with self._lock:
+            self._pending.append((operation, future))
+            if len(self._pending) >= self.max_batch_size or self.window_seconds <= 0:
+                flush_now = True
+            elif self._timer is None:
+                self._timer = threading.Timer(self.window_seconds, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if flush_now:
+            self.flush()
+        return future
+
+    def flush(self) -> None:
+        """Send every queued operation now."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        for start in range(0, len(pending), self.max_batch_size):
+            self._dispatch(pending[start : start + self.max_batch_size])
+
+    def execute_many(self, operations: Sequence[GraphQLOperation]) -> List[Any]:
+        """Run operations immediately, one round trip per ``max_batch_size``.
+
+        Returns:
+            Per-operation result, or an exception instance for failed operations
+        """
+        results: List[Any] = []
+        for start in range(0, len(operations), self.max_batch_size):
+            chunk = list(operations[start : start + self.max_batch_size])
+            try:
+                data, errors = self._request(*build_batched_document(chunk))
+            except Exception as exc:
+                results.extend(exc for _ in chunk)
+                continue
+            results.extend(split_batched_response(chunk, data, errors, self._error_factory))
+        return results
+
+    def _dispatch(self, batch: List[Tuple[GraphQLOperation, Future]]) -> None:
+        if not batch:
+            return
+        logger.debug("Dispatching batched GraphQL document with %d operations", len(batch))
+        results = self.execute_many([operation for operation, _ in batch])
+        for (_, future), result in zip(batch, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+class AsyncGraphQLBatcher:
+    """Coalescer for asyncio providers; see :class:`GraphQLBatcher`."""
+
+    def __init__(
+        self,
+        request: Callable[[str, Dict[str, Any]], Awaitable[GraphQLResponse]],
+        error_factory: Callable[[str], Exception],
+        *,
+        window_seconds: float = 0.05,
+        max_batch_size: int = 25,
+    ) -> None:
+        """Initialize batcher.
+
+        Args:
+            request: Coroutine function executing a document and returning (data, errors)
+            error_factory: Builds the exception raised for failed operations
+            window_seconds: How long to collect operations before flushing
+            max_batch_size: Flush immediately once this many operations are queued
+        """
+        self._request = request
+        self._error_factory = error_factory
+        self.window_seconds = window_seconds
+        self.max_batch_size = max(1, max_batch_size)
+        self._pending: List[Tuple[GraphQLOperation, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, operation: GraphQLOperation) -> Any:
+        """Queue an operation and wait for its result."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        self._pending.append((operation, future))
+        if len(self._pending) >= self.max_batch_size or self.window_seconds <= 0:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_seconds, self.flush)
+        return await future
+
+    def flush(self) -> None:
+        """Schedule every queued operation to be sent now."""
+        pending, self._pending = self._pending, []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for start in range(0, len(pending), self.max_batch_size):
+            task = asyncio.ensure_future(self._dispatch(pending[start : start + self.max_batch_size]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def execute_many(self, operations: Sequence[GraphQLOperation]) -> List[Any]:
+        """Run operations immediately, one round trip per ``max_batch_size``.
+
+        Returns:
+            Per-operation result, or an exception instance for failed operations
+        """
+        chunks = [
+            list(operations[start : start + self.max_batch_size])
+            for start in range(0, len(operations), self.max_batch_size)
+        ]
+
+        async def _run(chunk: List[GraphQLOperation]) -> List[Any]:
+            try:
+                data, errors = await self._request(*build_batched_document(chunk))
+            except Exception as exc:
+                return [exc for _ in chunk]
+            return split_batched_response(chunk, data, errors, self._error_factory)
+
+        results: List[Any] = []
+        for chunk_results in await asyncio.gather(*(_run(chunk) for chunk in chunks)):
+            results.extend(chunk_results)
+        return results
+
+    async def _dispatch(self, batch: List[Tuple[GraphQLOperation, asyncio.Future]]) -> None:
+        logger.debug("Dispatching batched GraphQL document with %d operations", len(batch))
+        results = await self.execute_many([operation for operation, _ in batch])
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -0,0 +1,246 @@
+"""
+Persistent on-disk cache for Railway ID lookups.
+
+Environment and service IDs rarely change, so they are kept in a small JSON
+store keyed by project ID and shared between CLI invocations. Every entry
+carries its own expiry; provider mutations (``serviceCreate``,
+``environmentCreate``) and "<kind> not found" errors invalidate the affected entries.
+
+The same store records the desired-state fingerprint last applied to each
+service, which lets unchanged services be skipped without any API reads.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Generator, Optional
+
+try:  # POSIX only; without it concurrent writers rely on atomic replace alone
+    import fcntl
+except ImportError:  # pragma: no cover - exercised on Windows only
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+
+def default_cache_dir() -> Path:
+    """Directory for budai-deploy state (BUDAI_DEPLOY_CACHE_DIR or ~/.cache/budai-deploy)."""
+    configured = os.getenv("BUDAI_DEPLOY_CACHE_DIR")
+    if configured:
+        return Path(configured)
+    return Path(os.getenv("XDG_CACHE_HOME", Path.home() / ".cache")) / "budai-deploy"
+
+
+class JSONFileStore:
+    """A small JSON document on disk, read and replaced under a lock.
+
+    Writers take an in-process lock plus (on POSIX) an exclusive ``flock`` on
+    a sidecar ``.lock`` file, and replace the document atomically, so several
+    threads and CLI processes can share one store.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _locked(self) -> Generator[None, None, None]:
+        """Hold the in-process lock and, where available, an exclusive file lock."""
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if fcntl is None:
+                yield
+                return
+            with open(self.path.with_suffix(".lock"), "a", encoding="utf-8") as handle:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+            return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning("Ignoring unreadable cache file %s: %s", self.path, exc)
+            return {}
+
+    def _store(self, data: Dict[str, Any]) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.stem}-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(data, handle, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+
+class RailwayIDCache(JSONFileStore):
+    """JSON-backed cache of environment and service IDs per Railway project.
+
+    Layout::
+
+        {
+          "<project_id>": {
+            "environments": {"<name>": {"id": "...", "expires_at": 1700000000.0}},
+            "services": {"expires_at": 1700000000.0, "items": {"<name>": {...}}},
+            "fingerprints": {"<environment>/<service>": "<sha256>"}
+          }
+        }
+
+    Services are cached as a complete listing so that a name missing from a
+    fresh listing is an authoritative miss.
+    """
+
+    def __init__(self, path: Optional[Path | str] = None, default_ttl: Optional[float] = None) -> None:
+        """Initialize cache.
+
+        Args:
+            path: JSON file path (defaults to <cache dir>/railway-ids.json)
+            default_ttl: Entry lifetime in seconds (defaults to RAILWAY_ID_CACHE_TTL or 3600)
+        """
+        super().__init__(Path(path) if path else default_cache_dir() / "railway-ids.json")
+        if default_ttl is None:
+            default_ttl = float(os.getenv("RAILWAY_ID_CACHE_TTL", "3600"))
+        self.default_ttl = default_ttl
+
+    def _expiry(self, ttl: Optional[float]) -> float:
+        return time.time() + (self.default_ttl if ttl is None else ttl)
+
+    def get_environment_id(self, project_id: str, name: str) -> Optional[str]:
+        """Cached environment ID, or None if missing or expired."""
+        with self._locked():
+            entry = self._load().get(project_id, {}).get("environments", {}).get(name)
+        if entry and entry.get("expires_at", 0) > time.time():
+            return entry.get("id")
+        return None
+
+    def set_environments(
+        self, project_id: str, environments: Dict[str, str], ttl: Optional[float] = None
+    ) -> None:
+        """Record environment name -> ID mappings for a project."""
+        if not environments:
+            return
+        expires_at = self._expiry(ttl)
+        with self._locked():
+            data = self._load()
+            cached = data.setdefault(project_id, {}).setdefault("environments", {})
+            for name, env_id in environments.items():
+                cached[name] = {"id": env_id, "expires_at": expires_at}
+            self._store(data)
+
+    def get_services(self, project_id: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Cached complete service listing (name -> node), or None if missing or expired."""
+        with self._locked():
+            entry = self._load().get(project_id, {}).get("services")
+        if entry and entry.get("expires_at", 0) > time.time():
+            return dict(entry.get("items") or {})
+        return None
+
+    def set_services(
+        self, project_id: str, services: Dict[str, Dict[str, Any]], ttl: Optional[float] = None
+    ) -> None:
+        """Record a complete service listing for a project."""
+        with self._locked():
+            data = self._load()
+            data.setdefault(project_id, {})["services"] = {
+                "expires_at": self._expiry(ttl),
+                "items": services,
+            }
+            self._store(data)
+
+    def get_fingerprint(self, project_id: str, environment: str, service: str) -> Optional[str]:
+        """Fingerprint last applied to a service in an environment, if recorded."""
+        with self._locked():
+            fingerprints = self._load().get(project_id, {}).get("fingerprints", {})
+        return fingerprints.get(f"{environment}/{service}")
+
+    def set_fingerprint(self, project_id: str, environment: str, service: str, fingerprint: str) -> None:
+        """Record the fingerprint just applied to a service (kept until invalidated)."""
+        with self._locked():
+            data = self._load()
+            fingerprints = data.setdefault(project_id, {}).setdefault("fingerprints", {})
+            fingerprints[f"{environment}/{service}"] = fingerprint
+            self._store(data)
+
+    def forget_fingerprint(self, project_id: str, environment: str, service: str) -> None:
+        """Drop the fingerprint recorded for a service, e.g. after its deployment failed."""
+        with self._locked():
+            data = self._load()
+            fingerprints = data.get(project_id, {}).get("fingerprints", {})
+            if fingerprints.pop(f"{environment}/{service}", None) is not None:
+                self._store(data)
+
+    def forget_service(self, project_id: str, service_id: str) -> None:
+        """Drop the service listing after ``service_id`` went missing.
+
+        Fingerprints of the service(s) that had that ID are dropped too; other
+        services' fingerprints stay valid.
+        """
+        with self._locked():
+            data = self._load()
+            project = data.get(project_id)
+            if not project or "services" not in project:
+                return
+            items = project.pop("services").get("items") or {}
+            names = {name for name, node in items.items() if (node or {}).get("id") == service_id}
+            fingerprints = project.get("fingerprints", {})
+            for key in [k for k in fingerprints if k.split("/", 1)[-1] in names]:
+                del fingerprints[key]
+            self._store(data)
+        logger.debug("Forgot stale service %s of project %s", service_id, project_id)
+
+    def forget_environment(self, project_id: str, environment_id: str) -> None:
+        """Drop the environment(s) mapped to ``environment_id`` and their services' fingerprints."""
+        with self._locked():
+            data = self._load()
+            project = data.get(project_id)
+            if not project:
+                return
+            environments = project.get("environments", {})
+            names = {name for name, entry in environments.items() if entry.get("id") == environment_id}
+            if not names:
+                return
+            for name in names:
+                del environments[name]
+            fingerprints = project.get("fingerprints", {})
+            for key in [k for k in fingerprints if k.split("/", 1)[0] in names]:
+                del fingerprints[key]
+            self._store(data)
+        logger.debug("Forgot stale environment %s of project %s", environment_id, project_id)
+
+    def invalidate(self, project_id: str, kind: Optional[str] = None) -> None:
+        """Drop cached entries for a project.
+
+        Args:
+            project_id: Railway project ID
+            kind: 'environments', 'services' or 'fingerprints' (None drops everything
+                for the project)
+        """
+        with self._locked():
+            data = self._load()
+            if project_id not in data:
+                return
+            if kind is None:
+                data.pop(project_id)
+            else:
+                data[project_id].pop(kind, None)
+            self._store(data)
+        logger.debug("Invalidated Railway ID cache for project %s (%s)", project_id, kind or "all")
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        with self._locked():
+            self._store({})
@@ -0,0 +1,229 @@
+"""
+Run journal for checkpointed, resumable deploys.
+
+Every ``deploy`` run writes a small JSON journal recording which per-service
+steps have completed and the Railway IDs they produced. If the run dies
+partway (interrupt, exhausted retries), ``deploy --resume <run-id>`` replays
+the journal and continues from the first unfinished step of each service
+instead of re-listing and re-diffing everything that already finished.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import secrets
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .id_cache import default_cache_dir
+
+logger = logging.getLogger(__name__)
+
+# Per-service steps, in the order a deploy performs them
+SERVICE_CREATED = "service_created"
+REPO_CONNECTED = "repo_connected"
+VARIABLES_APPLIED = "variables_applied"
+DEPLOY_TRIGGERED = "deploy_triggered"
+COMPLETED = "completed"
+
+STEPS = (SERVICE_CREATED, REPO_CONNECTED, VARIABLES_APPLIED, DEPLOY_TRIGGERED, COMPLETED)
+
+
+class JournalError(Exception):
+    """Raised when a run journal is missing, unreadable or does not match the run."""
+
+
+def default_journal_dir() -> Path:
+    """Directory holding run journals (<cache dir>/runs)."""
+    return default_cache_dir() / "runs"
+
+
+def new_run_id() -> str:
+    """Sortable, collision-resistant run identifier (``YYYYmmdd-HHMMSS-xxxxxx``)."""
+    return f"{datetime.now(timezone.utc):%Y%m%d-%H%M%S}-{secrets.token_hex(3)}"
+
+
+class RunJournal:
+    """Per-run record of completed deploy steps, persisted after every update.
+
+    Layout::
+
+        {
+          "run_id": "20250101-120000-a1b2c3",
+          "project_id": "...",
+          "environment": "production",
+          "status": "running" | "succeeded" | "failed" | "interrupted",
+          "infrastructure": {"redis": {...}},
+          "services": {
+            "<name>": {
+              "service_id": "...",
+              "created": true,
+              "fingerprint": "<sha256>",
+              "steps": {"service_created": 1700000000.0, ...}
+            }
+          }
+        }
+
+    The file holds credentials-derived values (e.g. the Redis URL), so it is
+    written with owner-only permissions.
+    """
+
+    def __init__(self, path: Path, data: Dict[str, Any]) -> None:
+        self.path = path
+        self._data = data
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(
+        cls,
+        project_id: str,
+        environment: str,
+        *,
+        run_id: Optional[str] = None,
+        directory: Optional[Path | str] = None,
+    ) -> RunJournal:
+        """Start a new journal and write it to disk.
+
+        Args:
+            project_id: Railway project the run deploys to
+            environment: Target environment name
+            run_id: Identifier to use (generated if omitted)
+            directory: Journal directory (defaults to <cache dir>/runs)
+        """
+        run_id = run_id or new_run_id()
+        now = time.time()
+        journal = cls(
+            Path(directory or default_journal_dir()) / f"{run_id}.json",
+            {
+                "run_id": run_id,
+                "project_id": project_id,
+                "environment": environment,
+                "status": "running",
+                "started_at": now,
+                "updated_at": now,
+                "infrastructure": {},
+                "services": {},
+            },
+        )
+        with journal._lock:
+            journal._store()
+        return journal
+
+    @classmethod
+    def load(cls, run_id: str, *, directory: Optional[Path | str] = None) -> RunJournal:
+        """Open an existing journal.
+
+        Raises:
+            JournalError: If the journal does not exist or cannot be parsed
+        """
+        path = Path(directory or default_journal_dir()) / f"{run_id}.json"
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except FileNotFoundError as exc:
+            raise JournalError(f"No run journal for '{run_id}' in {path.parent}") from exc
+        except (OSError, json.JSONDecodeError) as exc:
+            raise JournalError(f"Unreadable run journal {path}: {exc}") from exc
+        if not isinstance(data, dict) or data.get("run_id") != run_id:
+            raise JournalError(f"Run journal {path} does not describe run '{run_id}'")
+        return cls(path, data)
+
+    @staticmethod
+    def list_runs(directory: Optional[Path | str] = None) -> List[Dict[str, Any]]:
+        """Summaries (run_id, status, project_id, environment, updated_at) of stored runs, newest first."""
+        runs: List[Dict[str, Any]] = []
+        for path in sorted(Path(directory or default_journal_dir()).glob("*.json"), reverse=True):
+            try:
+                with open(path, "r", encoding="utf-8") as handle:
+                    data = json.load(handle)
+            except (OSError, json.JSONDecodeError):
+                continue
+            runs.append({key: data.get(key) for key in ("run_id", "status", "project_id", "environment", "updated_at")})
+        return runs
+
+    def _store(self) -> None:
+        """Atomically persist the journal (caller holds the lock)."""
+        self._data["updated_at"] = time.time()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".run-", suffix=".tmp")
+        try:
+            os.chmod(tmp_path, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(self._data, handle, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    @property
+    def run_id(self) -> str:
+        return self._data["run_id"]
+
+    @property
+    def project_id(self) -> str:
+        return self._data["project_id"]
+
+    @property
+    def environment(self) -> str:
+        return self._data["environment"]
+
+    @property
+    def status(self) -> str:
+        return self._data["status"]
+
+    def set_status(self, status: str) -> None:
+        """Record the run outcome ('running', 'succeeded', 'failed' or 'interrupted')."""
+        with self._lock:
+            self._data["status"] = status
+            self._store()
+
+    def get_infrastructure(self, name: str) -> Optional[Dict[str, Any]]:
+        """Shared resource details recorded by :meth:`set_infrastructure`."""
+        with self._lock:
+            value = self._data["infrastructure"].get(name)
+        return dict(value) if value else None
+
+    def set_infrastructure(self, name: str, details: Dict[str, Any]) -> None:
+        """Record a provisioned shared resource (e.g. Redis connection details)."""
+        with self._lock:
+            self._data["infrastructure"][name] = dict(details)
+            self._store()
+
+    def record(self, service: str, step: str, **fields: Any) -> None:
+        """Mark a service step complete, storing any IDs produced alongside it.
+
+        Args:
+            service: Service name
+            step: One of :data:`STEPS`
+            **fields: Values to keep on the service entry (``service_id``, ``created``, ...)
+        """
+        if step not in STEPS:
+            raise ValueError(f"Unknown journal step: {step}")
+        with self._lock:
+            entry = self._data["services"].setdefault(service, {"steps": {}})
+            entry["steps"][step] = time.time()
+            entry.update(fields)
+            self._store()
+
+    def completed(self, service: str, step: str) -> bool:
+        """Whether ``step`` was recorded for ``service``."""
+        with self._lock:
+            return step in self._data["services"].get(service, {}).get("steps", {})
+
+    def service(self, service: str) -> Dict[str, Any]:
+        """Copy of a service's journal entry (empty if nothing was recorded)."""
+        with self._lock:
+            entry = self._data["services"].get(service, {})
+            return {**entry, "steps": dict(entry.get("steps", {}))}
+
+    def reset_service(self, service: str) -> None:
+        """Forget a service's progress so it is deployed from scratch."""
+        with self._lock:
+            if self._data["services"].pop(service, None) is not None:
+                self._store()
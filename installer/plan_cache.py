@@ -0,0 +1,173 @@
+"""
+Content-addressed cache of applied deployment plans.
+
+``DeploymentPlan.checksum`` hashes everything a plan would do, so a plan
+whose checksum is the one last applied successfully to an environment has
+nothing left to change there. The cache keeps, per environment and
+capability, the last applied plan and its outcome; ``deploy_full_lifecycle``
+consults it to turn an unchanged re-deploy into a verification-only pass.
+Applying any other plan for the capability replaces (or, if the apply
+fails, drops) that entry, so going back to an earlier plan applies it again.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .id_cache import JSONFileStore, default_cache_dir
+from .schemas import ApplyResult, ApplyStatus, DeploymentPlan
+
+logger = logging.getLogger(__name__)
+
+
+class PlanCache(JSONFileStore):
+    """On-disk store of the last applied plan per environment and capability.
+
+    Layout::
+
+        {
+          "<environment>/<capability>": {
+            "checksum": "...",
+            "capability": "...",
+            "version": "...",
+            "status": "success",
+            "applied_steps": [...],
+            "artifacts": {...},
+            "applied_at": 1700000000.0,
+            "expires_at": 1700086400.0,
+            "plan": {...}
+          }
+        }
+    """
+
+    def __init__(self, path: Optional[Path | str] = None, default_ttl: Optional[float] = None) -> None:
+        """Initialize cache.
+
+        Args:
+            path: JSON file path (defaults to <cache dir>/plans.json)
+            default_ttl: Seconds an applied plan is trusted (defaults to BUDAI_PLAN_CACHE_TTL
+                or 86400); after that it is applied again
+        """
+        super().__init__(Path(path) if path else default_cache_dir() / "plans.json")
+        if default_ttl is None:
+            default_ttl = float(os.getenv("BUDAI_PLAN_CACHE_TTL", "86400"))
+        self.default_ttl = default_ttl
+
+    @staticmethod
+    def _key(capability: str, environment: str) -> str:
+        return f"{environment}/{capability}"
+
+    @staticmethod
+    def _drop_capability(data: Dict[str, Any], capability: str, environment: str) -> bool:
+        """Remove every entry for ``capability`` in ``environment`` (including pre-capability-key ones)."""
+        stale = [
+            key
+            for key, entry in data.items()
+            if key.startswith(f"{environment}/") and entry.get("capability") == capability
+        ]
+        for key in stale:
+            del data[key]
+        return bool(stale)
+
+    def get(self, checksum: str, environment: str) -> Optional[Dict[str, Any]]:
+        """Entry for a plan checksum if it is the latest one applied in an environment.
+
+        Returns None if missing, superseded by another plan, or expired.
+        """
+        with self._locked():
+            data = self._load()
+        for key, entry in data.items():
+            if (
+                key.startswith(f"{environment}/")
+                and entry.get("checksum") == checksum
+                and entry.get("expires_at", 0) > time.time()
+            ):
+                return entry
+        return None
+
+    def applied_result(self, plan: DeploymentPlan, environment: str) -> Optional[ApplyResult]:
+        """ApplyResult to reuse if this exact plan is the capability's last successful apply."""
+        with self._locked():
+            entry = self._load().get(self._key(plan.capability, environment))
+        if (
+            not entry
+            or entry.get("checksum") != plan.checksum
+            or entry.get("status") != ApplyStatus.SUCCESS.value
+            or entry.get("expires_at", 0) <= time.time()
+        ):
+            return None
+        return ApplyResult(
+            status=ApplyStatus.SUCCESS,
+            applied_steps=list(entry.get("applied_steps") or []),
+            duration_seconds=0.0,
+            artifacts=dict(entry.get("artifacts") or {}),
+        )
+
+    def record(
+        self,
+        plan: DeploymentPlan,
+        environment: str,
+        result: ApplyResult,
+        ttl: Optional[float] = None,
+    ) -> None:
+        """Store a plan and the outcome of applying it, replacing the capability's previous plan."""
+        now = time.time()
+        with self._locked():
+            data = self._load()
+            self._drop_capability(data, plan.capability, environment)
+            data[self._key(plan.capability, environment)] = {
+                "checksum": plan.checksum,
+                "capability": plan.capability,
+                "version": plan.version,
+                "status": result.status.value,
+                "applied_steps": list(result.applied_steps),
+                "artifacts": dict(result.artifacts),
+                "applied_at": now,
+                "expires_at": now + (self.default_ttl if ttl is None else ttl),
+                "plan": plan.model_dump(mode="json"),
+            }
+            self._store(data)
+
+    def forget(self, capability: str, environment: str) -> None:
+        """Drop a capability's applied plan, e.g. after an apply that left it in an unknown state."""
+        with self._locked():
+            data = self._load()
+            if self._drop_capability(data, capability, environment):
+                self._store(data)
+        logger.debug("Forgot applied plan of %s in %s", capability, environment)
+
+    def invalidate(self, checksum: str, environment: str) -> None:
+        """Forget a plan so the next run applies it again."""
+        with self._locked():
+            data = self._load()
+            stale = [
+                key
+                for key, entry in data.items()
+                if key.startswith(f"{environment}/")
+                and (entry.get("checksum") == checksum or key == f"{environment}/{checksum}")
+            ]
+            for key in stale:
+                del data[key]
+            if stale:
+                self._store(data)
+        logger.debug("Invalidated cached plan %s for %s", checksum[:8], environment)
+
+    def prune(self) -> int:
+        """Drop expired entries; returns how many were removed."""
+        now = time.time()
+        with self._locked():
+            data = self._load()
+            expired = [key for key, entry in data.items() if entry.get("expires_at", 0) <= now]
+            for key in expired:
+                del data[key]
+            if expired:
+                self._store(data)
+        return len(expired)
+
+    def clear(self) -> None:
+        """Remove every cached plan."""
+        with self._locked():
+            self._store({})
@@ -0,0 +1,175 @@
+"""
+Structural diff between two DeploymentPlans.
+
+Steps are matched by ``id`` and compared by their content digests, giving
+the added, removed and changed steps plus every step downstream of a change
+through ``depends_on``. ``PlanDiff.to_apply`` is the minimal step set to run
+(``PlanExecutor.execute(plan, only=diff.to_apply)``) and ``render()`` is the
+reviewer-facing change set.
+
+Run as a script to diff two plans saved as JSON::
+
+    python -m installer.plan_diff old-plan.json new-plan.json
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from typing import Dict, List, Optional, Set
+
+from pydantic import BaseModel, Field, PrivateAttr
+
+from .executor import plan_graph
+from .schemas import DeploymentPlan
+
+
+class PlanDiff(BaseModel):
+    """Step-level difference between an old and a new plan.
+
+    Step lists follow the new plan's dependency order (removed steps follow
+    the old plan's).
+    """
+
+    old_checksum: Optional[str] = None
+    new_checksum: str
+    added: List[str] = Field(default_factory=list)
+    removed: List[str] = Field(default_factory=list)
+    changed: List[str] = Field(default_factory=list)
+    affected: List[str] = Field(
+        default_factory=list, description="Unchanged steps downstream of an added or changed step"
+    )
+    unchanged: List[str] = Field(default_factory=list)
+    header_changed: bool = Field(
+        False, description="target_env, capability, version or invariants differ"
+    )
+    rollback_changed: bool = False
+
+    # New plan's steps in dependency order
+    _order: List[str] = PrivateAttr(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether the plans are equivalent."""
+        return self.old_checksum == self.new_checksum
+
+    @property
+    def to_apply(self) -> List[str]:
+        """Steps of the new plan that must run: added, changed and their dependents."""
+        selected = set(self.added) | set(self.changed) | set(self.affected)
+        return [step_id for step_id in self._order if step_id in selected]
+
+    def render(self) -> str:
+        """Human-readable change set."""
+        if self.is_empty:
+            return f"No changes (checksum {self.new_checksum[:12]})"
+        lines = [f"Plan {(self.old_checksum or 'none')[:12]} -> {self.new_checksum[:12]}"]
+        if self.header_changed:
+            lines.append("  ~ plan header (environment, capability, version or invariants)")
+        lines.extend(f"  + {step_id}" for step_id in self.added)
+        lines.extend(f"  - {step_id}" for step_id in self.removed)
+        lines.extend(f"  ~ {step_id}" for step_id in self.changed)
+        lines.extend(f"  > {step_id} (depends on a change)" for step_id in self.affected)
+        if self.rollback_changed:
+            lines.append("  ~ rollback steps")
+        lines.append(
+            f"{len(self.to_apply)} of {len(self._order)} steps to apply "
+            f"({len(self.unchanged)} unchanged, {len(self.removed)} removed)"
+        )
+        return "\n".join(lines)
+
+
+def diff_plans(old: Optional[DeploymentPlan], new: DeploymentPlan) -> PlanDiff:
+    """Compare ``new`` against ``old`` (None means nothing was applied yet).
+
+    A plan for another environment or capability shares no state with
+    ``new``, so every step of ``new`` is reported as added.
+
+    Raises:
+        ValueError: If either plan has duplicate or unknown step IDs
+        CycleError: If either plan's dependencies contain a cycle
+    """
+    new_graph = plan_graph(new)
+    order = new_graph.topological_order()
+    new_digests = new.step_digests()
+    comparable = old is not None and (old.target_env, old.capability) == (
+        new.target_env,
+        new.capability,
+    )
+    old_digests: Dict[str, str] = old.step_digests() if comparable else {}
+
+    added = [step_id for step_id in order if step_id not in old_digests]
+    changed = [
+        step_id
+        for step_id in order
+        if step_id in old_digests and old_digests[step_id] != new_digests[step_id]
+    ]
+    downstream: Set[str] = set()
+    for step_id in added + changed:
+        downstream |= new_graph.descendants(step_id)
+    direct = set(added) | set(changed)
+    affected = [step_id for step_id in order if step_id in downstream and step_id not in direct]
+    touched = direct | set(affected)
+
+    removed: List[str] = []
+    header_changed = old is None
+    rollback_changed = bool(new.rollback)
+    if old is not None:
+        # Nothing carries over from an incomparable plan, so all of its steps are removed
+        removed = [
+            step_id
+            for step_id in plan_graph(old).topological_order()
+            if not comparable or step_id not in new_digests
+        ]
+        header_changed = (old.target_env, old.capability, old.version, old.invariants) != (
+            new.target_env,
+            new.capability,
+            new.version,
+            new.invariants,
+        )
+        rollback_changed = [r.digest for r in old.rollback] != [r.digest for r in new.rollback]
+
+    diff = PlanDiff(
+        old_checksum=old.checksum if old is not None else None,
+        new_checksum=new.checksum,
+        added=added,
+        removed=removed,
+        changed=changed,
+        affected=affected,
+        unchanged=[step_id for step_id in order if step_id not in touched],
+        header_changed=header_changed,
+        rollback_changed=rollback_changed,
+    )
+    diff._order = order
+    return diff
+
+
+def main() -> None:
+    """Print the change set between two plan JSON files (exit 1 if they differ)."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Show the step-level diff between two deployment plans"
+    )
+    parser.add_argument("old", help="Previously applied plan (JSON)")
+    parser.add_argument("new", help="Proposed plan (JSON)")
+    parser.add_argument("--json", action="store_true", help="Emit the diff as JSON")
+    args = parser.parse_args()
+
+    plans = []
+    for path in (args.old, args.new):
+        with open(path) as handle:
+            data = json.load(handle)
+        data.pop("checksum", None)  # recompute rather than trust the file
+        plans.append(DeploymentPlan(**data))
+
+    diff = diff_plans(plans[0], plans[1])
+    if args.json:
+        print(json.dumps({**diff.model_dump(), "to_apply": diff.to_apply}, indent=2))
+    else:
+        print(diff.render())
+    sys.exit(0 if diff.is_empty else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,15 +9,231 @@ from __future__ import annotations
 
 import logging
 import os
+import threading
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
 import secrets
 import string
 
 import httpx
 
+from .graphql_batch import GraphQLBatcher, GraphQLOperation
+from .id_cache import RailwayIDCache
+from .ratelimit import RateLimiter, create_rate_limiter_from_env, parse_retry_after
+from .snapshot import PROJECT_SNAPSHOT_QUERY, ProjectSnapshot
+
+if TYPE_CHECKING:
+    from .watcher import DeploymentWatcher
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_GRAPHQL_URL = "https://backboard.railway.app/graphql/v2"
+
+# Deployment statuses that will never transition to SUCCESS
+DEPLOYMENT_FAILURE_STATUSES = frozenset({"FAILED", "CRASHED", "REMOVED"})
+
+# GraphQL documents shared by the sync and async providers
+
+CREATE_PROJECT_MUTATION = """
+    mutation CreateProject($name: String!, $description: String) {
+        projectCreate(input: {
+            name: $name
+            description: $description
+        }) {
+            id
+            name
+        }
+    }
+"""
+
+CREATE_SERVICE_MUTATION = """
+    mutation CreateService(
+        $projectId: String!,
+        $name: String!,
+        $source: ServiceSourceInput,
+        $environmentId: String,
+        $variables: EnvironmentVariables
+    ) {
+        serviceCreate(input: {
+            projectId: $projectId
+            name: $name
+            source: $source
+            environmentId: $environmentId
+            variables: $variables
+        }) {
+            id
+            name
+        }
+    }
+"""
+
+LIST_SERVICES_QUERY = """
+    query ListServices($projectId: String!) {
+        project(id: $projectId) {
+            services(first: 100) {
+                edges {
+                    node {
+                        id
+                        name
+                        templateServiceId
+                    }
+                }
+            }
+        }
+    }
+"""
+
+GET_SERVICE_INSTANCE_QUERY = """
+    query GetServiceInstance($serviceId: String!) {
+        service(id: $serviceId) {
+            serviceInstances(first: 5) {
+                edges {
+                    node {
+                        id
+                        environmentId
+                        latestDeployment {
+                            id
+                            status
+                        }
+                    }
+                }
+            }
+        }
+    }
+"""
+
+CONNECT_SERVICE_MUTATION = """
+    mutation ConnectService($serviceId: String!, $input: ServiceConnectInput!) {
+        serviceConnect(id: $serviceId, input: $input) {
+            id
+        }
+    }
+"""
+
+GET_VARIABLES_QUERY = """
+    query GetVariables($projectId: String!, $environmentId: String!, $serviceId: String) {
+        variables(projectId: $projectId, environmentId: $environmentId, serviceId: $serviceId)
+    }
+"""
+
+UPSERT_VARIABLE_MUTATION = """
+    mutation SetVariable($projectId: String!, $environmentId: String!, $serviceId: String!, $name: String!, $value: String!, $skipDeploys: Boolean) {
+        variableUpsert(input: {
+            projectId: $projectId
+            environmentId: $environmentId
+            serviceId: $serviceId
+            name: $name
+            value: $value
+            skipDeploys: $skipDeploys
+        })
+    }
+"""
+
+UPSERT_VARIABLE_COLLECTION_MUTATION = """
+    mutation SetVariables(
+        $projectId: String!,
+        $environmentId: String!,
+        $serviceId: String!,
+        $variables: EnvironmentVariables!,
+        $skipDeploys: Boolean
+    ) {
+        variableCollectionUpsert(input: {
+            projectId: $projectId
+            environmentId: $environmentId
+            serviceId: $serviceId
+            variables: $variables
+            skipDeploys: $skipDeploys
+        })
+    }
+"""
+
+# Maximum variableUpsert aliases packed into one fallback document
+VARIABLE_UPSERT_BATCH_SIZE = 50
+
+GET_ENVIRONMENTS_QUERY = """
+    query GetEnvironments($projectId: String!) {
+        project(id: $projectId) {
+            environments {
+                edges {
+                    node {
+                        id
+                        name
+                    }
+                }
+            }
+        }
+    }
+"""
+
+CREATE_ENVIRONMENT_MUTATION = """
+    mutation CreateEnvironment($projectId: String!, $name: String!) {
+        environmentCreate(input: {
+            projectId: $projectId
+            name: $name
+        }) {
+            id
+            name
+        }
+    }
+"""
+
+DEPLOY_SERVICE_MUTATION = """
+    mutation TriggerDeploy($serviceId: String!, $environmentId: String!, $latestCommit: Boolean) {
+        serviceInstanceDeploy(
+            serviceId: $serviceId
+            environmentId: $environmentId
+            latestCommit: $latestCommit
+        ) {
+            id
+        }
+    }
+"""
+
+REDEPLOY_SERVICE_MUTATION = """
+    mutation Redeploy($serviceId: String!, $environmentId: String!) {
+        serviceInstanceRedeploy(serviceId: $serviceId, environmentId: $environmentId) {
+            id
+        }
+    }
+"""
+
+GET_DEPLOYMENT_QUERY = """
+    query GetDeployment($id: String!) {
+        deployment(id: $id) {
+            id
+            status
+            createdAt
+            completedAt
+            meta
+        }
+    }
+"""
+
+GET_SERVICE_DOMAIN_QUERY = """
+    query GetServiceDomain($id: String!) {
+        service(id: $id) {
+            id
+            domains {
+                serviceDomains {
+                    domain
+                }
+            }
+        }
+    }
+"""
+
+UPDATE_SERVICE_INSTANCE_MUTATION = """
+    mutation UpdateInstance($serviceId: String!, $environmentId: String!, $input: ServiceInstanceUpdateInput!) {
+        serviceInstanceUpdate(serviceId: $serviceId, environmentId: $environmentId, input: $input) { id }
+    }
+"""
+
+DEPLOY_IN_ENVIRONMENT_MUTATION = """
+    mutation Deploy($serviceId: String!, $environmentId: String!) {
+        serviceInstanceDeploy(serviceId: $serviceId, environmentId: $environmentId, latestCommit: true) { id }
+    }
+"""
+
 
 class RailwayAPIError(Exception):
     """Raised when Railway API calls fail."""
@@ -25,6 +241,253 @@ class RailwayAPIError(Exception):
     pass
 
 
+class RequestStats:
+    """Thread-safe counters for the HTTP traffic a provider sends.
+
+    Throttle waits live in the rate limiter's metrics; these cover what went
+    over the wire and the backoff slept after transport errors.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Zero every counter."""
+        with self._lock:
+            self.http_requests = 0
+            self.bytes_sent = 0
+            self.bytes_received = 0
+            self.throttled_responses = 0
+            self.error_retries = 0
+            self.error_backoff_seconds = 0.0
+
+    def record_response(self, response: httpx.Response) -> None:
+        """Count one request/response exchange."""
+        with self._lock:
+            self.http_requests += 1
+            self.bytes_sent += len(response.request.content)
+            self.bytes_received += len(response.content)
+            if response.status_code == 429:
+                self.throttled_responses += 1
+
+    def record_backoff(self, seconds: float) -> None:
+        """Count a retry after a transport error and the time slept before it."""
+        with self._lock:
+            self.error_retries += 1
+            self.error_backoff_seconds += seconds
+
+    def as_dict(self) -> Dict[str, float]:
+        """Return a snapshot of the counters."""
+        with self._lock:
+            return {
+                "http_requests": float(self.http_requests),
+                "bytes_sent": float(self.bytes_sent),
+                "bytes_received": float(self.bytes_received),
+                "throttled_responses": float(self.throttled_responses),
+                "error_retries": float(self.error_retries),
+                "error_backoff_seconds": self.error_backoff_seconds,
+            }
+
+
+def _first_service_domain(service: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Extract the first public domain from a ``service { domains }`` selection."""
+    domains = ((service or {}).get("domains") or {}).get("serviceDomains") or []
+    return domains[0].get("domain") if domains else None
+
+
+def _instance_for_environment(
+    service: Optional[Dict[str, Any]], environment_id: str
+) -> Optional[Dict[str, Any]]:
+    """Pick the service instance for an environment from a ``serviceInstances`` selection."""
+    edges = ((service or {}).get("serviceInstances") or {}).get("edges") or []
+    for edge in edges:
+        node = edge.get("node") or {}
+        if node.get("environmentId") == environment_id:
+            return node
+    return None
+
+
+def deployment_status_operation(deployment_id: str) -> GraphQLOperation:
+    """Batchable equivalent of ``GET_DEPLOYMENT_QUERY``."""
+    return GraphQLOperation(
+        "deployment",
+        {"id": ("String!", deployment_id)},
+        "id status createdAt completedAt meta",
+        transform=lambda value: value or {},
+    )
+
+
+def service_domain_operation(service_id: str) -> GraphQLOperation:
+    """Batchable equivalent of ``GET_SERVICE_DOMAIN_QUERY``."""
+    return GraphQLOperation(
+        "service",
+        {"id": ("String!", service_id)},
+        "id domains { serviceDomains { domain } }",
+        transform=_first_service_domain,
+    )
+
+
+def service_instance_operation(service_id: str, environment_id: str) -> GraphQLOperation:
+    """Batchable equivalent of ``GET_SERVICE_INSTANCE_QUERY``."""
+    return GraphQLOperation(
+        "service",
+        {"id": ("String!", service_id)},
+        "serviceInstances(first: 5) { edges { node { id environmentId latestDeployment { id status } } } }",
+        transform=lambda value: _instance_for_environment(value, environment_id),
+    )
+
+
+def service_variables_operation(
+    project_id: str, environment_id: str, service_id: Optional[str]
+) -> GraphQLOperation:
+    """Batchable equivalent of ``GET_VARIABLES_QUERY``."""
+    return GraphQLOperation(
+        "variables",
+        {
+            "projectId": ("String!", project_id),
+            "environmentId": ("String!", environment_id),
+            "serviceId": ("String", service_id),
+        },
+        transform=lambda value: value or {},
+    )
+
+
+def _normalize_repo(source_repo: str) -> str:
+    """Normalize a GitHub URL or slug to the ``owner/name`` form Railway expects."""
+    repo_value = source_repo.strip()
+    if repo_value.startswith("https://github.com/"):
+        repo_value = repo_value.split("https://github.com/", 1)[1]
+    elif repo_value.startswith("http://github.com/"):
+        repo_value = repo_value.split("http://github.com/", 1)[1]
+    if repo_value.endswith(".git"):
+        repo_value = repo_value[:-4]
+    return repo_value
+
+
+def _build_aliased_variable_upsert(count: int) -> str:
+    """Build one mutation document holding ``count`` aliased ``variableUpsert`` fields.
+
+    Variables are named ``$name{i}``/``$value{i}``/``$skip{i}`` so a single
+    request can carry every upsert for a service.
+    """
+    definitions = ["$projectId: String!", "$environmentId: String!", "$serviceId: String!"]
+    fields = []
+    for index in range(count):
+        definitions.append(f"$name{index}: String!, $value{index}: String!, $skip{index}: Boolean")
+        fields.append(
+            f"v{index}: variableUpsert(input: {{"
+            f" projectId: $projectId environmentId: $environmentId serviceId: $serviceId"
+            f" name: $name{index} value: $value{index} skipDeploys: $skip{index} }})"
+        )
+    return "mutation SetVariablesAliased({}) {{\n    {}\n}}".format(
+        ", ".join(definitions), "\n    ".join(fields)
+    )
+
+
+def _aliased_variable_upsert_batches(
+    variables: Dict[str, str], skip_deploys: bool
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """Split variables into aliased-upsert documents with their GraphQL variables.
+
+    Every upsert except the final one skips deploys, so the whole map
+    triggers at most one redeploy (none when ``skip_deploys`` is set).
+    """
+    items = list(variables.items())
+    batches: List[Tuple[str, Dict[str, Any]]] = []
+    for start in range(0, len(items), VARIABLE_UPSERT_BATCH_SIZE):
+        chunk = items[start : start + VARIABLE_UPSERT_BATCH_SIZE]
+        payload: Dict[str, Any] = {}
+        for index, (name, value) in enumerate(chunk):
+            is_last = start + index == len(items) - 1
+            payload[f"name{index}"] = name
+            payload[f"value{index}"] = value
+            payload[f"skip{index}"] = skip_deploys or not is_last
+        batches.append((_build_aliased_variable_upsert(len(chunk)), payload))
+    return batches
+
+
+def _stale_id_kinds(message: str) -> Set[str]:
+    """Which cached ID kinds ('project', 'service', 'environment') a GraphQL error reports missing.
+
+    Service instances routinely report "not found" while a freshly created
+    service is provisioning, and variable/deployment misses say nothing about
+    cached IDs, so those map to no kind at all.
+    """
+    lowered = message.lower()
+    return {kind for kind in ("project", "service", "environment") if f"{kind} not found" in lowered}
+
+
+def _is_schema_error(exc: Exception) -> bool:
+    """Whether a GraphQL error means the API does not expose the requested field/argument."""
+    message = str(exc).lower()
+    return any(
+        marker in message
+        for marker in ("cannot query field", "unknown argument", "unknown type", "is not defined by type")
+    )
+
+
+def _generate_password(length: int) -> str:
+    """Generate an alphanumeric password suitable for Redis."""
+    return "".join(secrets.choice(string.ascii_letters + string.digits) for _ in range(length))
+
+
+def _redis_connection_variables(password: str, host: str, port: str, user: str) -> Dict[str, str]:
+    """Build the full set of Redis connection variables Railway integrations expect."""
+    redis_url = f"redis://:{password}@{host}:{port}/0"
+    return {
+        "ALLOW_EMPTY_PASSWORD": "no",
+        "REDIS_PASSWORD": password,
+        "REDIS_HOST": host,
+        "REDIS_PORT": port,
+        "REDIS_URL": redis_url,
+        "REDIS_USERNAME": user,
+        "REDISHOST": host,
+        "REDISPORT": port,
+        "REDISPASSWORD": password,
+        "REDISUSER": user,
+    }
+
+
+def _resolve_redis_connection(
+    vars_payload: Dict[str, str],
+    *,
+    seeded_password: Optional[str],
+    inferred_host: str,
+    default_port: str,
+    default_user: str,
+    password_length: int,
+) -> Dict[str, str]:
+    """Derive Redis connection details from a service's current variables."""
+    password = vars_payload.get("REDIS_PASSWORD") or seeded_password
+    if not password:
+        password = _generate_password(password_length)
+
+    host = (
+        vars_payload.get("RAILWAY_PRIVATE_DOMAIN")
+        or vars_payload.get("REDIS_HOST")
+        or vars_payload.get("REDISHOST")
+        or inferred_host
+    )
+    port = str(
+        vars_payload.get("REDIS_PORT")
+        or vars_payload.get("REDISPORT")
+        or default_port
+    )
+    redis_user = (
+        vars_payload.get("REDISUSER")
+        or vars_payload.get("REDIS_USERNAME")
+        or default_user
+    )
+    return {
+        "password": password,
+        "host": host,
+        "port": port,
+        "user": redis_user,
+        "redis_url": f"redis://:{password}@{host}:{port}/0",
+    }
+
+
 class RailwayProvider:
     """Railway cloud provider for automated deployments.
 
@@ -35,12 +498,26 @@ class RailwayProvider:
     - Health check monitoring
     """
 
-    def __init__(self, api_token: Optional[str] = None, project_id: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        api_token: Optional[str] = None,
+        project_id: Optional[str] = None,
+        *,
+        rate_limiter: Optional[RateLimiter] = None,
+        batch_window_ms: Optional[float] = None,
+        id_cache: Optional[RailwayIDCache] = None,
+        graphql_url: Optional[str] = None,
+    ) -> None:
         """Initialize Railway provider.
 
         Args:
             api_token: Railway API token (defaults to RAILWAY_TOKEN env var)
             project_id: Railway project ID (defaults to RAILWAY_PROJECT_ID env var)
+            rate_limiter: Request rate limiter (defaults to one built from RAILWAY_API_* env vars)
+            batch_window_ms: Coalesce concurrent lookups arriving within this window into one
+                request (defaults to RAILWAY_API_BATCH_WINDOW_MS; 0 disables coalescing)
+            id_cache: Persistent environment/service ID cache shared across runs (disabled if None)
+            graphql_url: API endpoint (defaults to RAILWAY_GRAPHQL_URL or Railway's endpoint)
         """
         self.api_token = api_token or os.getenv("RAILWAY_TOKEN")
         if not self.api_token:
@@ -49,7 +526,7 @@ class RailwayProvider:
             )
 
         self.project_id = project_id or os.getenv("RAILWAY_PROJECT_ID")
-        self.graphql_url = "https://backboard.railway.app/graphql/v2"
+        self.graphql_url = graphql_url or os.getenv("RAILWAY_GRAPHQL_URL", DEFAULT_GRAPHQL_URL)
         self.client = httpx.Client(
             headers={
                 "Authorization": f"Bearer {self.api_token}",
@@ -57,19 +534,54 @@ class RailwayProvider:
             },
             timeout=30.0,
         )
-        # Basic throttling to keep Cloudflare happy
-        self._min_request_interval = float(os.getenv("RAILWAY_API_MIN_INTERVAL", "0.75"))
-        self._last_request_ts = 0.0
+        # Client-side throttling to keep Cloudflare happy
+        self.rate_limiter = rate_limiter or create_rate_limiter_from_env()
+        self.request_stats = RequestStats()
 
         # Simple caches to avoid redundant lookups
         self._env_cache: Dict[Tuple[str, str], str] = {}
         self._services_cache: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._variables_cache: Dict[Tuple[str, str, Optional[str]], Dict[str, str]] = {}
+        self._snapshots: Dict[str, ProjectSnapshot] = {}
+        self.id_cache = id_cache
+        # Flipped off the first time the API rejects variableCollectionUpsert
+        self._collection_upsert_supported = True
+
+        # Request coalescing for independent lookups
+        if batch_window_ms is None:
+            batch_window_ms = float(os.getenv("RAILWAY_API_BATCH_WINDOW_MS", "0"))
+        self._coalesce_lookups = batch_window_ms > 0
+        self.batcher = GraphQLBatcher(
+            self._graphql_request,
+            RailwayAPIError,
+            window_seconds=batch_window_ms / 1000.0,
+        )
+        self._watcher: Optional[DeploymentWatcher] = None
 
     def __del__(self) -> None:
         """Clean up HTTP client."""
         if hasattr(self, "client"):
             self.client.close()
 
+    def rate_limit_metrics(self) -> Dict[str, float]:
+        """Return the request rate limiter's current state."""
+        return self.rate_limiter.metrics()
+
+    def request_metrics(self) -> Dict[str, float]:
+        """Return HTTP traffic counters plus time spent waiting on the rate limiter."""
+        metrics = self.request_stats.as_dict()
+        metrics["throttle_wait_seconds"] = self.rate_limiter.metrics()["total_wait_seconds"]
+        return metrics
+
+    @property
+    def watcher(self) -> DeploymentWatcher:
+        """Shared watcher that multiplexes every pending deployment wait."""
+        if self._watcher is None:
+            from .watcher import DeploymentWatcher  # watcher imports this module
+
+            self._watcher = DeploymentWatcher(self)
+        return self._watcher
+
     def _graphql_query(
         self,
         query: str,
@@ -89,29 +601,86 @@ class RailwayProvider:
         Raises:
             RailwayAPIError: If query fails
         """
+        data, errors = self._graphql_request(query, variables, retries=retries)
+        if errors:
+            messages = [e.get("message", str(e)) for e in errors]
+            self._invalidate_stale_ids(variables, messages)
+            raise RailwayAPIError(f"GraphQL errors: {'; '.join(messages)}")
+        return data
+
+    def _invalidate_stale_ids(self, variables: Optional[Dict[str, Any]], messages: List[str]) -> None:
+        """Drop cached IDs of the kind the API reports missing.
+
+        Only the service/environment referenced by the failed request is
+        forgotten; fingerprints of other services survive.
+        """
+        kinds: Set[str] = set().union(*(_stale_id_kinds(m) for m in messages))
+        variables = variables or {}
+        proj_id = variables.get("projectId") or self.project_id
+        if not kinds or not proj_id:
+            return
+        if "project" in kinds:
+            self._services_cache.pop(proj_id, None)
+            for key in [k for k in self._env_cache if k[0] == proj_id]:
+                del self._env_cache[key]
+            if self.id_cache is not None:
+                self.id_cache.invalidate(proj_id)
+            return
+        if "service" in kinds:
+            self._services_cache.pop(proj_id, None)
+            if self.id_cache is not None:
+                if variables.get("serviceId"):
+                    self.id_cache.forget_service(proj_id, variables["serviceId"])
+                else:
+                    self.id_cache.invalidate(proj_id, "services")
+        if "environment" in kinds:
+            env_id = variables.get("environmentId")
+            stale = [k for k, v in self._env_cache.items() if k[0] == proj_id and (env_id is None or v == env_id)]
+            for key in stale:
+                del self._env_cache[key]
+            if self.id_cache is not None:
+                if env_id:
+                    self.id_cache.forget_environment(proj_id, env_id)
+                else:
+                    self.id_cache.invalidate(proj_id, "environments")
+
+    def _graphql_request(
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]] = None,
+        *,
+        retries: int = 5,
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Send a GraphQL document, retrying transport failures and rate limits.
+
+        Unlike :meth:`_graphql_query`, GraphQL errors are returned rather than
+        raised so batched documents can attribute them to individual aliases.
+
+        Returns:
+            Tuple of (data, errors)
+
+        Raises:
+            RailwayAPIError: If the request fails at the HTTP level
+        """
         attempt = 0
         delay = 2.0
 
         while attempt <= retries:
             attempt += 1
 
-            # Throttle client-side
-            if self._min_request_interval > 0:
-                elapsed = time.time() - self._last_request_ts
-                if elapsed < self._min_request_interval:
-                    time.sleep(self._min_request_interval - elapsed)
+            # Throttle client-side; 429 pauses are enforced by the limiter on the next acquire
+            self.rate_limiter.acquire()
 
             try:
                 response = self.client.post(
                     self.graphql_url,
                     json={"query": query, "variables": variables or {}},
                 )
-                self._last_request_ts = time.time()
+                self.request_stats.record_response(response)
 
                 if response.status_code == 429:
-                    retry_after = response.headers.get("Retry-After")
-                    sleep_for = float(retry_after) if retry_after else delay
-                    time.sleep(sleep_for)
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    self.rate_limiter.record_throttle(retry_after or delay)
                     delay = min(delay * 1.5, 60.0)
                     continue
 
@@ -122,16 +691,18 @@ class RailwayProvider:
                     joined = "; ".join(messages)
 
                     if "Too Many Requests" in joined and attempt <= retries:
-                        time.sleep(delay)
+                        self.rate_limiter.record_throttle(delay)
                         delay = min(delay * 1.5, 60.0)
                         continue
 
-                    raise RailwayAPIError(f"GraphQL errors: {joined}")
+                    self.rate_limiter.record_success()
+                    return data.get("data") or {}, data["errors"]
 
                 # Only raise for non-200 status if we didn't get JSON errors
                 response.raise_for_status()
 
-                return data.get("data", {})
+                self.rate_limiter.record_success()
+                return data.get("data") or {}, []
 
             except httpx.HTTPError as exc:
                 detail = ""
@@ -139,9 +710,8 @@ class RailwayProvider:
                 if getattr(exc, "response", None) is not None:
                     status_code = exc.response.status_code
                     if status_code == 429 and attempt <= retries:
-                        retry_after = exc.response.headers.get("Retry-After")
-                        sleep_for = float(retry_after) if retry_after else delay
-                        time.sleep(sleep_for)
+                        retry_after = parse_retry_after(exc.response.headers.get("Retry-After"))
+                        self.rate_limiter.record_throttle(retry_after or delay)
                         delay = min(delay * 1.5, 60.0)
                         continue
                     try:
@@ -161,6 +731,7 @@ class RailwayProvider:
                 
                 if attempt > retries:
                     raise RailwayAPIError(f"Railway API request failed: {exc} :: {detail}") from exc
+                self.request_stats.record_backoff(delay)
                 time.sleep(delay)
                 delay = min(delay * 1.5, 60.0)
 
@@ -176,17 +747,7 @@ class RailwayProvider:
         Returns:
             Created project ID
         """
-        query = """
-        mutation CreateProject($name: String!, $description: String) {
-            projectCreate(input: {
-                name: $name
-                description: $description
-            }) {
-                id
-                name
-            }
-        }
-        """
+        query = CREATE_PROJECT_MUTATION
         
         result = self._graphql_query(query, {"name": name, "description": description})
         project = result.get("projectCreate", {})
@@ -233,26 +794,7 @@ class RailwayProvider:
             logger.info("Service %s already exists (ID: %s)", name, existing["id"])
             return existing["id"]
 
-        query = """
-        mutation CreateService(
-            $projectId: String!,
-            $name: String!,
-            $source: ServiceSourceInput,
-            $environmentId: String,
-            $variables: EnvironmentVariables
-        ) {
-            serviceCreate(input: {
-                projectId: $projectId
-                name: $name
-                source: $source
-                environmentId: $environmentId
-                variables: $variables
-            }) {
-                id
-                name
-            }
-        }
-        """
+        query = CREATE_SERVICE_MUTATION
 
         env_id = environment_id
         if environment and not env_id:
@@ -261,13 +803,7 @@ class RailwayProvider:
         processed_repo = None
         source_payload: Optional[Dict[str, Any]] = None
         if source_repo:
-            repo_value = source_repo.strip()
-            if repo_value.startswith("https://github.com/"):
-                repo_value = repo_value.split("https://github.com/", 1)[1]
-            elif repo_value.startswith("http://github.com/"):
-                repo_value = repo_value.split("http://github.com/", 1)[1]
-            if repo_value.endswith(".git"):
-                repo_value = repo_value[:-4]
+            repo_value = _normalize_repo(source_repo)
             processed_repo = repo_value
             source_payload = {"repo": repo_value}
             if source_branch:
@@ -301,10 +837,85 @@ class RailwayProvider:
 
         proj_cache = self._services_cache.setdefault(proj_id, {})
         proj_cache[name] = {"id": service_id, "name": name}
+        if self.id_cache is not None:
+            self.id_cache.invalidate(proj_id, "services")
 
         logger.info("Created Railway service: %s (ID: %s)", name, service_id)
         return service_id
 
+    def load_project_snapshot(
+        self,
+        project_id: Optional[str] = None,
+        *,
+        environment: Optional[str] = None,
+        include_variables: bool = False,
+    ) -> ProjectSnapshot:
+        """Fetch a project's whole topology in one query and warm every cache.
+
+        Args:
+            project_id: Project ID (uses instance default if not provided)
+            environment: Environment whose variables to prefetch
+            include_variables: Also fetch variables for every service in ``environment``
+                (one additional batched request)
+
+        Returns:
+            ProjectSnapshot with O(1) lookups by name and ID
+        """
+        proj_id = project_id or self.project_id
+        if not proj_id:
+            raise ValueError("Project ID required")
+
+        result = self._graphql_query(PROJECT_SNAPSHOT_QUERY, {"projectId": proj_id})
+        snapshot = ProjectSnapshot.from_response(proj_id, result)
+        self._apply_snapshot(snapshot)
+
+        env_id = snapshot.environment_id(environment) if environment else None
+        if include_variables and env_id and snapshot.services:
+            service_ids = [svc["id"] for svc in snapshot.services.values()]
+            fetched = self.get_services_variables(proj_id, env_id, service_ids)
+            for service_id, values in fetched.items():
+                snapshot.variables[(service_id, env_id)] = values
+                self._variables_cache[(proj_id, env_id, service_id)] = dict(values)
+
+        logger.info(
+            "Loaded Railway project snapshot: %d environment(s), %d service(s)",
+            len(snapshot.environments),
+            len(snapshot.services),
+        )
+        return snapshot
+
+    def project_snapshot(self, project_id: Optional[str] = None) -> Optional[ProjectSnapshot]:
+        """Return the most recent snapshot loaded for a project, if any."""
+        return self._snapshots.get(project_id or self.project_id or "")
+
+    def _apply_snapshot(self, snapshot: ProjectSnapshot) -> None:
+        """Replace the provider's lookup caches with a snapshot's contents."""
+        proj_id = snapshot.project_id
+        self._snapshots[proj_id] = snapshot
+        self._services_cache[proj_id] = {
+            name: dict(service) for name, service in snapshot.services.items()
+        }
+        for name, env_id in snapshot.environments.items():
+            self._env_cache[(proj_id, name)] = env_id
+        if self.id_cache is not None:
+            self.id_cache.set_environments(proj_id, snapshot.environments)
+            self.id_cache.set_services(proj_id, self._services_cache[proj_id])
+        self._variables_cache = {
+            key: value for key, value in self._variables_cache.items() if key[0] != proj_id
+        }
+
+    def _remember_variables(
+        self,
+        project_id: str,
+        environment_id: str,
+        service_id: Optional[str],
+        variables: Dict[str, str],
+    ) -> None:
+        """Keep cached variables in step with a successful upsert."""
+        cached = self._variables_cache.get((project_id, environment_id, service_id))
+        if cached is not None:
+            cached.update(variables)
+
     def _list_services(self, project_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """List services for a project."""
         proj_id = project_id or self.project_id
@@ -312,28 +923,20 @@ class RailwayProvider:
             raise ValueError("Project ID required")
 
         cached = self._services_cache.get(proj_id)
+        if cached is None and self.id_cache is not None:
+            cached = self.id_cache.get_services(proj_id)
+            if cached is not None:
+                self._services_cache[proj_id] = cached
         if cached is not None:
             return list(cached.values())
 
-        query = """
-        query ListServices($projectId: String!) {
-            project(id: $projectId) {
-                services(first: 100) {
-                    edges {
-                        node {
-                            id
-                            name
-                            templateServiceId
-                        }
-                    }
-                }
-            }
-        }
-        """
+        query = LIST_SERVICES_QUERY
         result = self._graphql_query(query, {"projectId": proj_id})
         edges = result.get("project", {}).get("services", {}).get("edges", [])
         services = [edge.get("node", {}) for edge in edges]
         self._services_cache[proj_id] = {svc.get("name"): svc for svc in services if svc.get("name")}
+        if self.id_cache is not None:
+            self.id_cache.set_services(proj_id, self._services_cache[proj_id])
         return services
 
     def _get_service_by_name(self, name: str, project_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
@@ -353,24 +956,10 @@ class RailwayProvider:
         self, service_id: str, environment_id: str
     ) -> Optional[Dict[str, Any]]:
         """Fetch a single service instance for a service/environment."""
-        query = """
-        query GetServiceInstance($serviceId: String!) {
-            service(id: $serviceId) {
-                serviceInstances(first: 5) {
-                    edges {
-                        node {
-                            id
-                            environmentId
-                            latestDeployment {
-                                id
-                                status
-                            }
-                        }
-                    }
-                }
-            }
-        }
-        """
+        if self._coalesce_lookups:
+            return self.batcher.submit(service_instance_operation(service_id, environment_id)).result()
+
+        query = GET_SERVICE_INSTANCE_QUERY
         result = self._graphql_query(query, {"serviceId": service_id})
         edges = result.get("service", {}).get("serviceInstances", {}).get("edges", [])
         for edge in edges:
@@ -389,13 +978,7 @@ class RailwayProvider:
         environment: Optional[str] = None,
     ) -> None:
         """Associate a Git repository (or container image) with a service."""
-        query = """
-        mutation ConnectService($serviceId: String!, $input: ServiceConnectInput!) {
-            serviceConnect(id: $serviceId, input: $input) {
-                id
-            }
-        }
-        """
+        query = CONNECT_SERVICE_MUTATION
         input_payload: Dict[str, Any] = {"repo": repo}
         if branch:
             input_payload["branch"] = branch
@@ -443,24 +1026,18 @@ class RailwayProvider:
         timeout_seconds: int = 600,
         poll_interval: int = 5,
     ) -> bool:
-        """Wait for a service instance deployment to succeed."""
-        start = time.time()
-        while (time.time() - start) < timeout_seconds:
-            instance = self._get_service_instance(service_id, environment_id)
-            if instance:
-                deployment = instance.get("latestDeployment")
-                if deployment:
-                    status = (deployment.get("status") or "").upper()
-                    if status == "SUCCESS":
-                        return True
-                    if status in {"FAILED", "CRASHED", "REMOVED"}:
-                        raise RailwayAPIError(
-                            f"Service {service_id} deployment failed with status {status}"
-                        )
-            time.sleep(poll_interval)
-        raise RailwayAPIError(
-            f"Timed out waiting for service {service_id} deployment in environment {environment_id}"
-        )
+        """Wait for a service instance deployment to succeed.
+
+        Polling is delegated to the shared :attr:`watcher`; ``poll_interval``
+        is kept for compatibility and no longer used.
+        """
+        deployment = self.watcher.watch_service_instance(
+            service_id, environment_id, timeout_seconds=timeout_seconds
+        ).result()
+        status = (deployment.get("status") or "").upper()
+        if status in DEPLOYMENT_FAILURE_STATUSES:
+            raise RailwayAPIError(f"Service {service_id} deployment failed with status {status}")
+        return True
 
     def get_service_variables(
         self,
@@ -469,11 +1046,16 @@ class RailwayProvider:
         service_id: Optional[str] = None,
     ) -> Dict[str, str]:
         """Retrieve environment variables for a service/environment."""
-        query = """
-        query GetVariables($projectId: String!, $environmentId: String!, $serviceId: String) {
-            variables(projectId: $projectId, environmentId: $environmentId, serviceId: $serviceId)
-        }
-        """
+        cached = self._variables_cache.get((project_id, environment_id, service_id))
+        if cached is not None:
+            return dict(cached)
+
+        if self._coalesce_lookups:
+            return self.batcher.submit(
+                service_variables_operation(project_id, environment_id, service_id)
+            ).result()
+
+        query = GET_VARIABLES_QUERY
         result = self._graphql_query(
             query,
             {
@@ -484,6 +1066,20 @@ class RailwayProvider:
         )
         return result.get("variables", {}) or {}
 
+    def cached_service_variables(
+        self,
+        project_id: str,
+        environment_id: str,
+        service_id: Optional[str] = None,
+    ) -> Optional[Dict[str, str]]:
+        """Variables already loaded by a snapshot or prefetch, without issuing a request.
+
+        Returns:
+            Copy of the cached variables, or None if they have not been fetched
+        """
+        cached = self._variables_cache.get((project_id, environment_id, service_id))
+        return dict(cached) if cached is not None else None
+
     def ensure_redis_service(
         self,
         environment: str,
@@ -508,22 +1104,10 @@ class RailwayProvider:
         if service:
             service_id = service["id"]
         else:
-            seeded_password = "".join(
-                secrets.choice(string.ascii_letters + string.digits) for _ in range(password_length)
+            seeded_password = _generate_password(password_length)
+            initial_vars = _redis_connection_variables(
+                seeded_password, inferred_host, default_port, default_user
             )
-            redis_url_guess = f"redis://:{seeded_password}@{inferred_host}:{default_port}/0"
-            initial_vars = {
-                "ALLOW_EMPTY_PASSWORD": "no",
-                "REDIS_PASSWORD": seeded_password,
-                "REDIS_HOST": inferred_host,
-                "REDIS_PORT": default_port,
-                "REDIS_URL": redis_url_guess,
-                "REDIS_USERNAME": default_user,
-                "REDISHOST": inferred_host,
-                "REDISPORT": default_port,
-                "REDISPASSWORD": seeded_password,
-                "REDISUSER": default_user,
-            }
             logger.info(
                 "Creating Redis service %s with %d variables",
                 service_name,
@@ -543,49 +1127,25 @@ class RailwayProvider:
 
         vars_payload = self.get_service_variables(proj_id, env_id, service_id)
 
-        password = vars_payload.get("REDIS_PASSWORD") or seeded_password
-        if not password:
-            password = "".join(
-                secrets.choice(string.ascii_letters + string.digits) for _ in range(password_length)
-            )
-
-        host = (
-            vars_payload.get("RAILWAY_PRIVATE_DOMAIN")
-            or vars_payload.get("REDIS_HOST")
-            or vars_payload.get("REDISHOST")
-            or inferred_host
-        )
-        port = (
-            vars_payload.get("REDIS_PORT")
-            or vars_payload.get("REDISPORT")
-            or default_port
-        )
-        redis_user = (
-            vars_payload.get("REDISUSER")
-            or vars_payload.get("REDIS_USERNAME")
-            or default_user
+        connection = _resolve_redis_connection(
+            vars_payload,
+            seeded_password=seeded_password,
+            inferred_host=inferred_host,
+            default_port=default_port,
+            default_user=default_user,
+            password_length=password_length,
         )
-
-        if not password or not host:
+        if not connection["password"] or not connection["host"]:
             raise RailwayAPIError(
                 f"Redis service {service_name} missing required connection variables"
             )
-        port = str(port)
-        redis_url = f"redis://:{password}@{host}:{port}/0"
+        password = connection["password"]
+        host = connection["host"]
+        port = connection["port"]
+        redis_url = connection["redis_url"]
 
         # Ensure all expected connection variables are present for Railway UI integrations
-        desired_vars = {
-            "ALLOW_EMPTY_PASSWORD": "no",
-            "REDIS_PASSWORD": password,
-            "REDIS_HOST": host,
-            "REDIS_PORT": port,
-            "REDIS_URL": redis_url,
-            "REDIS_USERNAME": redis_user,
-            "REDISHOST": host,
-            "REDISPORT": port,
-            "REDISPASSWORD": password,
-            "REDISUSER": redis_user,
-        }
+        desired_vars = _redis_connection_variables(password, host, port, connection["user"])
         to_update = {
             key: value
             for key, value in desired_vars.items()
@@ -620,86 +1180,107 @@ class RailwayProvider:
         environment: str,
         variables: Dict[str, str],
         project_id: Optional[str] = None,
+        *,
+        bulk: bool = True,
+        skip_deploys: bool = False,
     ) -> None:
         """Set environment variables for a service.
 
+        In bulk mode the whole map is sent in one ``variableCollectionUpsert``
+        round trip (falling back to aliased ``variableUpsert`` mutations in a
+        single document), so a batch causes at most one redeploy.
+
         Args:
             service_id: Service ID
             environment: Environment name (e.g., 'production')
             variables: Dictionary of variable names to values
             project_id: Project ID (uses instance default if not provided)
+            bulk: Send all variables in one request instead of one mutation each
+            skip_deploys: Don't trigger a redeploy for this change
         """
         proj_id = project_id or self.project_id
         if not proj_id:
             raise ValueError("Project ID required")
+        if not variables:
+            return
 
-        # Railway API uses a mutation per variable
-        query = """
-        mutation SetVariable($projectId: String!, $environmentId: String!, $serviceId: String!, $name: String!, $value: String!) {
-            variableUpsert(input: {
-                projectId: $projectId
-                environmentId: $environmentId
-                serviceId: $serviceId
-                name: $name
-                value: $value
-            })
-        }
-        """
-
-        # Get environment ID (simplified - in reality you'd query for it)
         env_id = self._get_environment_id(proj_id, environment)
+        scope = {"projectId": proj_id, "environmentId": env_id, "serviceId": service_id}
+
+        if bulk:
+            self._upsert_variables_bulk(scope, variables, skip_deploys)
+        else:
+            for index, (name, value) in enumerate(variables.items()):
+                try:
+                    self._graphql_query(
+                        UPSERT_VARIABLE_MUTATION,
+                        {
+                            **scope,
+                            "name": name,
+                            "value": value,
+                            "skipDeploys": skip_deploys or index < len(variables) - 1,
+                        },
+                    )
+                    logger.debug("Set variable %s for service %s", name, service_id)
+                except RailwayAPIError as exc:
+                    logger.error("Failed to set variable %s: %s", name, exc)
+                    raise
+
+        self._remember_variables(proj_id, env_id, service_id, variables)
+        logger.info("Set %d environment variables for service %s", len(variables), service_id)
 
-        for name, value in variables.items():
+    def _upsert_variables_bulk(
+        self, scope: Dict[str, str], variables: Dict[str, str], skip_deploys: bool
+    ) -> None:
+        """Upsert a variable map in as few requests as the API allows."""
+        if self._collection_upsert_supported:
             try:
                 self._graphql_query(
-                    query,
-                    {
-                        "projectId": proj_id,
-                        "environmentId": env_id,
-                        "serviceId": service_id,
-                        "name": name,
-                        "value": value,
-                    },
+                    UPSERT_VARIABLE_COLLECTION_MUTATION,
+                    {**scope, "variables": variables, "skipDeploys": skip_deploys},
                 )
-                logger.debug("Set variable %s for service %s", name, service_id)
+                return
             except RailwayAPIError as exc:
-                logger.error("Failed to set variable %s: %s", name, exc)
-                raise
+                if not _is_schema_error(exc):
+                    logger.error("Failed to set variables for service %s: %s", scope["serviceId"], exc)
+                    raise
+                logger.info("variableCollectionUpsert unavailable, using aliased variableUpsert batches")
+                self._collection_upsert_supported = False
 
-        logger.info("Set %d environment variables for service %s", len(variables), service_id)
+        for document, payload in _aliased_variable_upsert_batches(variables, skip_deploys):
+            try:
+                self._graphql_query(document, {**scope, **payload})
+            except RailwayAPIError as exc:
+                logger.error("Failed to set variables for service %s: %s", scope["serviceId"], exc)
+                raise
 
     def _find_environment_id(self, project_id: str, environment_name: str) -> Optional[str]:
         """Look up an environment ID by name (returns None if not found)."""
         cache_key = (project_id, environment_name)
         if cache_key in self._env_cache:
             return self._env_cache[cache_key]
+        if self.id_cache is not None:
+            persisted = self.id_cache.get_environment_id(project_id, environment_name)
+            if persisted:
+                self._env_cache[cache_key] = persisted
+                return persisted
 
-        query = """
-        query GetEnvironments($projectId: String!) {
-            project(id: $projectId) {
-                environments {
-                    edges {
-                        node {
-                            id
-                            name
-                        }
-                    }
-                }
-            }
-        }
-        """
+        query = GET_ENVIRONMENTS_QUERY
 
         result = self._graphql_query(query, {"projectId": project_id})
         project = result.get("project", {})
         environments = project.get("environments", {}).get("edges", [])
 
+        found: Dict[str, str] = {}
         for edge in environments:
             node = edge.get("node", {})
-            if node.get("name") == environment_name:
-                self._env_cache[cache_key] = node["id"]
-                return node["id"]
+            if node.get("name") and node.get("id"):
+                found[node["name"]] = node["id"]
+                self._env_cache[(project_id, node["name"])] = node["id"]
+        if self.id_cache is not None:
+            self.id_cache.set_environments(project_id, found)
 
-        return None
+        return found.get(environment_name)
 
     def _get_environment_id(self, project_id: str, environment_name: str) -> str:
         """Get environment ID by name, creating it if necessary."""
@@ -720,17 +1301,9 @@ class RailwayProvider:
         Returns:
             Created environment ID
         """
-        query = """
-        mutation CreateEnvironment($projectId: String!, $name: String!) {
-            environmentCreate(input: {
-                projectId: $projectId
-                name: $name
-            }) {
-                id
-                name
-            }
-        }
-        """
+        query = CREATE_ENVIRONMENT_MUTATION
+        if self.id_cache is not None:
+            self.id_cache.invalidate(project_id, "environments")
 
         try:
             result = self._graphql_query(query, {"projectId": project_id, "name": name})
@@ -784,17 +1357,7 @@ class RailwayProvider:
                 raise ValueError("environment or environment_id required to deploy service")
             env_id = self._get_environment_id(proj_id, environment)
 
-        query = """
-        mutation TriggerDeploy($serviceId: String!, $environmentId: String!, $latestCommit: Boolean) {
-            serviceInstanceDeploy(
-                serviceId: $serviceId
-                environmentId: $environmentId
-                latestCommit: $latestCommit
-            ) {
-                id
-            }
-        }
-        """
+        query = DEPLOY_SERVICE_MUTATION
 
         variables: Dict[str, Any] = {
             "serviceId": service_id,
@@ -816,13 +1379,7 @@ class RailwayProvider:
                     service_id,
                     env_id,
                 )
-                fallback_query = """
-                mutation Redeploy($serviceId: String!, $environmentId: String!) {
-                    serviceInstanceRedeploy(serviceId: $serviceId, environmentId: $environmentId) {
-                        id
-                    }
-                }
-                """
+                fallback_query = REDEPLOY_SERVICE_MUTATION
                 result = self._graphql_query(
                     fallback_query,
                     {"serviceId": service_id, "environmentId": env_id},
@@ -852,17 +1409,10 @@ class RailwayProvider:
         Returns:
             Deployment status information
         """
-        query = """
-        query GetDeployment($id: String!) {
-            deployment(id: $id) {
-                id
-                status
-                createdAt
-                completedAt
-                meta
-            }
-        }
-        """
+        if self._coalesce_lookups:
+            return self.batcher.submit(deployment_status_operation(deployment_id)).result()
+
+        query = GET_DEPLOYMENT_QUERY
 
         result = self._graphql_query(query, {"id": deployment_id})
         return result.get("deployment", {})
@@ -875,29 +1425,39 @@ class RailwayProvider:
         Args:
             deployment_id: Deployment ID to wait for
             timeout_seconds: Maximum time to wait
-            poll_interval: Seconds between status checks
+            poll_interval: Unused; the shared :attr:`watcher` adapts its own interval
 
         Returns:
             True if deployment succeeded, False otherwise
         """
-        start_time = time.time()
-        
-        while (time.time() - start_time) < timeout_seconds:
-            status_info = self.get_deployment_status(deployment_id)
-            status = status_info.get("status", "").upper()
-
-            if status == "SUCCESS":
-                logger.info("Deployment %s completed successfully", deployment_id)
-                return True
-            elif status in ("FAILED", "CRASHED", "REMOVED"):
-                logger.error("Deployment %s failed with status: %s", deployment_id, status)
-                return False
-            
-            logger.debug("Deployment %s status: %s", deployment_id, status)
-            time.sleep(poll_interval)
-
-        logger.error("Deployment %s timed out after %ds", deployment_id, timeout_seconds)
-        return False
+        return self.wait_for_deployments([deployment_id], timeout_seconds)[deployment_id]
+
+    def wait_for_deployments(
+        self, deployment_ids: List[str], timeout_seconds: int = 600
+    ) -> Dict[str, bool]:
+        """Wait for several deployments, polling them together.
+
+        Args:
+            deployment_ids: Deployment IDs to wait for
+            timeout_seconds: Maximum time to wait for each deployment
+
+        Returns:
+            Deployment ID -> True if it succeeded, False if it failed or timed out
+        """
+        futures = {
+            deployment_id: self.watcher.watch_deployment(deployment_id, timeout_seconds=timeout_seconds)
+            for deployment_id in deployment_ids
+        }
+        outcomes: Dict[str, bool] = {}
+        for deployment_id, future in futures.items():
+            try:
+                deployment = future.result()
+            except RailwayAPIError as exc:
+                logger.error("Deployment %s did not complete: %s", deployment_id, exc)
+                outcomes[deployment_id] = False
+                continue
+            outcomes[deployment_id] = (deployment.get("status") or "").upper() == "SUCCESS"
+        return outcomes
 
     def get_service_domain(self, service_id: str) -> Optional[str]:
         """Get the public domain for a service.
@@ -908,18 +1468,10 @@ class RailwayProvider:
         Returns:
             Service domain URL or None if not available
         """
-        query = """
-        query GetServiceDomain($id: String!) {
-            service(id: $id) {
-                id
-                domains {
-                    serviceDomains {
-                        domain
-                    }
-                }
-            }
-        }
-        """
+        if self._coalesce_lookups:
+            return self.batcher.submit(service_domain_operation(service_id)).result()
+
+        query = GET_SERVICE_DOMAIN_QUERY
 
         result = self._graphql_query(query, {"id": service_id})
         service = result.get("service", {})
@@ -931,6 +1483,77 @@ class RailwayProvider:
         return None
 
 
+    def _run_batched(self, keys: List[Any], operations: List[GraphQLOperation]) -> Dict[Any, Any]:
+        """Run lookups in one round trip; failed lookups are logged and omitted."""
+        results: Dict[Any, Any] = {}
+        for key, result in zip(keys, self.batcher.execute_many(operations)):
+            if isinstance(result, Exception):
+                logger.warning("Batched Railway lookup for %s failed: %s", key, result)
+                continue
+            results[key] = result
+        return results
+
+    def get_deployment_statuses(self, deployment_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get status of many deployments in a single request.
+
+        Args:
+            deployment_ids: Deployment IDs
+
+        Returns:
+            Mapping of deployment ID to status information (failed lookups omitted)
+        """
+        return self._run_batched(
+            list(deployment_ids), [deployment_status_operation(d) for d in deployment_ids]
+        )
+
+    def get_service_domains(self, service_ids: List[str]) -> Dict[str, Optional[str]]:
+        """Get the public domain for many services in a single request."""
+        return self._run_batched(
+            list(service_ids), [service_domain_operation(s) for s in service_ids]
+        )
+
+    def get_service_instances(
+        self, service_ids: List[str], environment_id: str
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Fetch the service instance of many services for one environment in a single request."""
+        return self._run_batched(
+            list(service_ids),
+            [service_instance_operation(s, environment_id) for s in service_ids],
+        )
+
+    def get_services_variables(
+        self, project_id: str, environment_id: str, service_ids: List[str]
+    ) -> Dict[str, Dict[str, str]]:
+        """Retrieve variables for many services of one environment in a single request."""
+        return self._run_batched(
+            list(service_ids),
+            [service_variables_operation(project_id, environment_id, s) for s in service_ids],
+        )
+
+    def prefetch_service_variables(
+        self, project_id: str, environment_id: str, service_ids: List[str]
+    ) -> Dict[str, Dict[str, str]]:
+        """Load variables for services not already cached, in one batched request.
+
+        Later :meth:`get_service_variables` calls for these services are
+        served from cache.
+
+        Returns:
+            Mapping of service ID to variables for every service now cached
+        """
+        missing = [
+            s for s in service_ids if (project_id, environment_id, s) not in self._variables_cache
+        ]
+        if missing:
+            fetched = self.get_services_variables(project_id, environment_id, missing)
+            for service_id, values in fetched.items():
+                self._variables_cache[(project_id, environment_id, service_id)] = dict(values)
+        return {
+            s: dict(self._variables_cache[(project_id, environment_id, s)])
+            for s in service_ids
+            if (project_id, environment_id, s) in self._variables_cache
+        }
+
     def service_instance_update(
         self,
         service_id: str,
@@ -944,11 +1567,7 @@ class RailwayProvider:
         healthcheck_timeout: Optional[int] = None,
     ) -> None:
         """Update a service instance configuration (builder, start command, root directory, etc)."""
-        query = """
-        mutation UpdateInstance($serviceId: String!, $environmentId: String!, $input: ServiceInstanceUpdateInput!) {
-            serviceInstanceUpdate(serviceId: $serviceId, environmentId: $environmentId, input: $input) { id }
-        }
-        """
+        query = UPDATE_SERVICE_INSTANCE_MUTATION
         input_payload: Dict[str, Any] = {}
         if start_command:
             input_payload["startCommand"] = start_command
@@ -991,11 +1610,7 @@ class RailwayProvider:
 
     def deploy_service_in_environment(self, service_id: str, environment_id: str) -> str:
         """Trigger a deployment for a service in a specific environment."""
-        query = """
-        mutation Deploy($serviceId: String!, $environmentId: String!) {
-            serviceInstanceDeploy(serviceId: $serviceId, environmentId: $environmentId, latestCommit: true) { id }
-        }
-        """
+        query = DEPLOY_IN_ENVIRONMENT_MUTATION
         result = self._graphql_query(query, {"serviceId": service_id, "environmentId": environment_id})
         deployment = result.get("serviceInstanceDeploy", {})
         dep_id = deployment.get("id")
@@ -0,0 +1,1278 @@
+"""
+Asynchronous Railway deployment provider.
+
+Mirrors the public surface of :class:`installer.railway.RailwayProvider` on top
+of ``httpx.AsyncClient`` so many services can be provisioned concurrently while
+sharing a single in-flight limit and request-rate budget.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+import httpx
+
+from .graphql_batch import AsyncGraphQLBatcher, GraphQLOperation
+from .id_cache import RailwayIDCache
+from .railway import (
+    CONNECT_SERVICE_MUTATION,
+    CREATE_ENVIRONMENT_MUTATION,
+    CREATE_PROJECT_MUTATION,
+    CREATE_SERVICE_MUTATION,
+    DEFAULT_GRAPHQL_URL,
+    DEPLOY_IN_ENVIRONMENT_MUTATION,
+    DEPLOY_SERVICE_MUTATION,
+    DEPLOYMENT_FAILURE_STATUSES,
+    GET_DEPLOYMENT_QUERY,
+    GET_ENVIRONMENTS_QUERY,
+    GET_SERVICE_DOMAIN_QUERY,
+    GET_SERVICE_INSTANCE_QUERY,
+    GET_VARIABLES_QUERY,
+    LIST_SERVICES_QUERY,
+    REDEPLOY_SERVICE_MUTATION,
+    UPDATE_SERVICE_INSTANCE_MUTATION,
+    UPSERT_VARIABLE_COLLECTION_MUTATION,
+    UPSERT_VARIABLE_MUTATION,
+    RailwayAPIError,
+    RequestStats,
+    _aliased_variable_upsert_batches,
+    _generate_password,
+    _is_schema_error,
+    _normalize_repo,
+    _redis_connection_variables,
+    _resolve_redis_connection,
+    _stale_id_kinds,
+    deployment_status_operation,
+    service_domain_operation,
+    service_instance_operation,
+    service_variables_operation,
+)
+from .ratelimit import RateLimiter, create_rate_limiter_from_env, parse_retry_after
+from .snapshot import PROJECT_SNAPSHOT_QUERY, ProjectSnapshot
+from .subscriptions import (
+    DEPLOYMENT_STATUS_SUBSCRIPTION,
+    GraphQLSubscriptionClient,
+    SubscriptionError,
+)
+
+logger = logging.getLogger(__name__)
+
+# How long to stick with polling after the subscription socket fails
+SUBSCRIPTION_RETRY_SECONDS = 60.0
+
+
+class AsyncRequestBudget:
+    """Shared in-flight limit and request rate for concurrent API calls.
+
+    Every request first takes a slot from the in-flight semaphore, then
+    waits on the shared :class:`RateLimiter`, so no matter how many
+    coroutines are queued the overall send rate stays within budget.
+    """
+
+    def __init__(self, max_in_flight: int = 4, rate_limiter: Optional[RateLimiter] = None) -> None:
+        """Initialize the budget.
+
+        Args:
+            max_in_flight: Maximum concurrent HTTP requests
+            rate_limiter: Request rate limiter (defaults to one built from RAILWAY_API_* env vars)
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        self.max_in_flight = max_in_flight
+        self.rate_limiter = rate_limiter or create_rate_limiter_from_env()
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+
+    async def __aenter__(self) -> AsyncRequestBudget:
+        await self._semaphore.acquire()
+        try:
+            await self.rate_limiter.acquire_async()
+        except BaseException:
+            self._semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self._semaphore.release()
+
+
+class AsyncRailwayProvider:
+    """Asynchronous Railway cloud provider for concurrent deployments.
+
+    Exposes the same operations as :class:`RailwayProvider` as coroutines.
+    All calls made through one instance share an :class:`AsyncRequestBudget`,
+    so callers may ``asyncio.gather`` across services freely.
+    """
+
+    def __init__(
+        self,
+        api_token: Optional[str] = None,
+        project_id: Optional[str] = None,
+        *,
+        max_in_flight: Optional[int] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        batch_window_ms: Optional[float] = None,
+        id_cache: Optional[RailwayIDCache] = None,
+        graphql_url: Optional[str] = None,
+        use_subscriptions: Optional[bool] = None,
+        ws_url: Optional[str] = None,
+    ) -> None:
+        """Initialize async Railway provider.
+
+        Args:
+            api_token: Railway API token (defaults to RAILWAY_TOKEN env var)
+            project_id: Railway project ID (defaults to RAILWAY_PROJECT_ID env var)
+            max_in_flight: Concurrent request limit (defaults to RAILWAY_API_MAX_IN_FLIGHT or 4)
+            rate_limiter: Request rate limiter; pass the same instance to several
+                providers to share one budget (defaults to RAILWAY_API_* env vars)
+            batch_window_ms: Coalesce concurrent lookups arriving within this window into one
+                request (defaults to RAILWAY_API_BATCH_WINDOW_MS; 0 disables coalescing)
+            id_cache: Persistent environment/service ID cache shared across runs (disabled if None)
+            graphql_url: API endpoint (defaults to RAILWAY_GRAPHQL_URL or Railway's endpoint)
+            use_subscriptions: Wait on deployments via websocket subscriptions, polling only
+                as a fallback (defaults to RAILWAY_API_SUBSCRIPTIONS, on unless "0")
+            ws_url: Subscription endpoint (defaults to RAILWAY_WS_URL or Railway's endpoint)
+        """
+        self.api_token = api_token or os.getenv("RAILWAY_TOKEN")
+        if not self.api_token:
+            raise ValueError(
+                "Railway API token required. Set RAILWAY_TOKEN env var or pass api_token."
+            )
+
+        self.project_id = project_id or os.getenv("RAILWAY_PROJECT_ID")
+        self.graphql_url = graphql_url or os.getenv("RAILWAY_GRAPHQL_URL", DEFAULT_GRAPHQL_URL)
+        if use_subscriptions is None:
+            use_subscriptions = os.getenv("RAILWAY_API_SUBSCRIPTIONS", "1") != "0"
+        self.subscriptions: Optional[GraphQLSubscriptionClient] = (
+            GraphQLSubscriptionClient(self.api_token, ws_url) if use_subscriptions else None
+        )
+        self._subscriptions_down_until = 0.0
+        if max_in_flight is None:
+            max_in_flight = int(os.getenv("RAILWAY_API_MAX_IN_FLIGHT", "4"))
+        self.client = httpx.AsyncClient(
+            headers={
+                "Authorization": f"Bearer {self.api_token}",
+                "Content-Type": "application/json",
+            },
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=max_in_flight),
+        )
+        self.budget = AsyncRequestBudget(max_in_flight, rate_limiter)
+        self.request_stats = RequestStats()
+
+        # Simple caches to avoid redundant lookups
+        self._env_cache: Dict[Tuple[str, str], str] = {}
+        self._services_cache: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._variables_cache: Dict[Tuple[str, str, Optional[str]], Dict[str, str]] = {}
+        self._snapshots: Dict[str, ProjectSnapshot] = {}
+        self.id_cache = id_cache
+        # Flipped off the first time the API rejects variableCollectionUpsert
+        self._collection_upsert_supported = True
+        # Serializes environment resolution so concurrent callers never race environmentCreate
+        self._env_lock = asyncio.Lock()
+
+        # Request coalescing for independent lookups
+        if batch_window_ms is None:
+            batch_window_ms = float(os.getenv("RAILWAY_API_BATCH_WINDOW_MS", "0"))
+        self._coalesce_lookups = batch_window_ms > 0
+        self.batcher = AsyncGraphQLBatcher(
+            self._graphql_request,
+            RailwayAPIError,
+            window_seconds=batch_window_ms / 1000.0,
+        )
+
+    async def __aenter__(self) -> AsyncRailwayProvider:
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client and subscription socket."""
+        if self.subscriptions is not None:
+            await self.subscriptions.close()
+        await self.client.aclose()
+
+    def rate_limit_metrics(self) -> Dict[str, float]:
+        """Return the shared request rate limiter's current state."""
+        return self.budget.rate_limiter.metrics()
+
+    def request_metrics(self) -> Dict[str, float]:
+        """Return HTTP traffic counters plus time spent waiting on the rate limiter."""
+        metrics = self.request_stats.as_dict()
+        metrics["throttle_wait_seconds"] = self.budget.rate_limiter.metrics()["total_wait_seconds"]
+        return metrics
+
+    async def _graphql_query(
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]] = None,
+        *,
+        retries: int = 5,
+    ) -> Dict[str, Any]:
+        """Execute a GraphQL query against Railway API.
+
+        Args:
+            query: GraphQL query string
+            variables: Query variables
+
+        Returns:
+            Query result data
+
+        Raises:
+            RailwayAPIError: If query fails
+        """
+        data, errors = await self._graphql_request(query, variables, retries=retries)
+        if errors:
+            messages = [e.get("message", str(e)) for e in errors]
+            self._invalidate_stale_ids(variables, messages)
+            raise RailwayAPIError(f"GraphQL errors: {'; '.join(messages)}")
+        return data
+
+    def _invalidate_stale_ids(self, variables: Optional[Dict[str, Any]], messages: List[str]) -> None:
+        """Drop cached IDs of the kind the API reports missing.
+
+        Only the service/environment referenced by the failed request is
+        forgotten; fingerprints of other services survive.
+        """
+        kinds: Set[str] = set().union(*(_stale_id_kinds(m) for m in messages))
+        variables = variables or {}
+        proj_id = variables.get("projectId") or self.project_id
+        if not kinds or not proj_id:
+            return
+        if "project" in kinds:
+            self._services_cache.pop(proj_id, None)
+            for key in [k for k in self._env_cache if k[0] == proj_id]:
+                del self._env_cache[key]
+            if self.id_cache is not None:
+                self.id_cache.invalidate(proj_id)
+            return
+        if "service" in kinds:
+            self._services_cache.pop(proj_id, None)
+            if self.id_cache is not None:
+                if variables.get("serviceId"):
+                    self.id_cache.forget_service(proj_id, variables["serviceId"])
+                else:
+                    self.id_cache.invalidate(proj_id, "services")
+        if "environment" in kinds:
+            env_id = variables.get("environmentId")
+            stale = [k for k, v in self._env_cache.items() if k[0] == proj_id and (env_id is None or v == env_id)]
+            for key in stale:
+                del self._env_cache[key]
+            if self.id_cache is not None:
+                if env_id:
+                    self.id_cache.forget_environment(proj_id, env_id)
+                else:
+                    self.id_cache.invalidate(proj_id, "environments")
+
+    async def _graphql_request(
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]] = None,
+        *,
+        retries: int = 5,
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Send a GraphQL document, retrying transport failures and rate limits.
+
+        Returns:
+            Tuple of (data, errors); GraphQL errors are returned, not raised
+
+        Raises:
+            RailwayAPIError: If the request fails at the HTTP level
+        """
+        attempt = 0
+        delay = 2.0
+
+        while attempt <= retries:
+            attempt += 1
+
+            try:
+                async with self.budget:
+                    response = await self.client.post(
+                        self.graphql_url,
+                        json={"query": query, "variables": variables or {}},
+                    )
+                self.request_stats.record_response(response)
+
+                if response.status_code == 429:
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    self.budget.rate_limiter.record_throttle(retry_after or delay)
+                    delay = min(delay * 1.5, 60.0)
+                    continue
+
+                data = response.json()
+
+                if "errors" in data:
+                    messages = [e.get("message", str(e)) for e in data["errors"]]
+                    joined = "; ".join(messages)
+
+                    if "Too Many Requests" in joined and attempt <= retries:
+                        self.budget.rate_limiter.record_throttle(delay)
+                        delay = min(delay * 1.5, 60.0)
+                        continue
+
+                    self.budget.rate_limiter.record_success()
+                    return data.get("data") or {}, data["errors"]
+
+                # Only raise for non-200 status if we didn't get JSON errors
+                response.raise_for_status()
+
+                self.budget.rate_limiter.record_success()
+                return data.get("data") or {}, []
+
+            except httpx.HTTPError as exc:
+                detail = ""
+                status_code = None
+                if getattr(exc, "response", None) is not None:
+                    status_code = exc.response.status_code
+                    if status_code == 429 and attempt <= retries:
+                        retry_after = parse_retry_after(exc.response.headers.get("Retry-After"))
+                        self.budget.rate_limiter.record_throttle(retry_after or delay)
+                        delay = min(delay * 1.5, 60.0)
+                        continue
+                    try:
+                        detail = exc.response.text
+                    except Exception:
+                        detail = ""
+
+                logger.error("Railway API HTTP error (status %s, attempt %d/%d): %s",
+                            status_code, attempt, retries + 1, detail)
+
+                # Don't retry on 400 Bad Request - these indicate invalid parameters
+                if status_code == 400:
+                    raise RailwayAPIError(
+                        f"Railway API request failed (400 Bad Request - invalid parameters): {detail}"
+                    ) from exc
+
+                if attempt > retries:
+                    raise RailwayAPIError(f"Railway API request failed: {exc} :: {detail}") from exc
+                self.request_stats.record_backoff(delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 1.5, 60.0)
+
+        raise RailwayAPIError("Railway API request exhausted retries")
+
+    async def create_project(self, name: str, description: Optional[str] = None) -> str:
+        """Create a new Railway project.
+
+        Args:
+            name: Project name
+            description: Optional project description
+
+        Returns:
+            Created project ID
+        """
+        result = await self._graphql_query(
+            CREATE_PROJECT_MUTATION, {"name": name, "description": description}
+        )
+        project_id = result.get("projectCreate", {}).get("id")
+
+        if not project_id:
+            raise RailwayAPIError(f"Failed to create project '{name}'")
+
+        logger.info("Created Railway project: %s (ID: %s)", name, project_id)
+        return project_id
+
+    async def create_service(
+        self,
+        name: str,
+        project_id: Optional[str] = None,
+        source_repo: Optional[str] = None,
+        source_branch: Optional[str] = None,
+        source_image: Optional[str] = None,
+        environment_id: Optional[str] = None,
+        variables: Optional[Dict[str, str]] = None,
+        environment: Optional[str] = None,
+    ) -> str:
+        """Create a new service in a Railway project.
+
+        See :meth:`RailwayProvider.create_service` for argument semantics.
+
+        Returns:
+            Created (or existing) service ID
+        """
+        proj_id = project_id or self.project_id
+        if not proj_id:
+            raise ValueError("Project ID required. Set project_id or RAILWAY_PROJECT_ID.")
+
+        existing = await self._get_service_by_name(name, proj_id)
+        if existing:
+            logger.info("Service %s already exists (ID: %s)", name, existing["id"])
+            return existing["id"]
+
+        env_id = environment_id
+        if environment and not env_id:
+            env_id = await self._get_environment_id(proj_id, environment)
+
+        source_payload: Optional[Dict[str, Any]] = None
+        if source_repo:
+            source_payload = {"repo": _normalize_repo(source_repo)}
+            if source_branch:
+                logger.debug(
+                    "Railway GraphQL API does not support setting branch '%s' during serviceCreate; using repo default",
+                    source_branch,
+                )
+        elif source_image:
+            source_payload = {"image": source_image}
+
+        result = await self._graphql_query(
+            CREATE_SERVICE_MUTATION,
+            {
+                "projectId": proj_id,
+                "name": name,
+                "source": source_payload,
+                "environmentId": env_id,
+                "variables": variables or None,
+            },
+        )
+        service_id = result.get("serviceCreate", {}).get("id")
+
+        if not service_id:
+            raise RailwayAPIError(f"Failed to create service '{name}'")
+
+        proj_cache = self._services_cache.setdefault(proj_id, {})
+        proj_cache[name] = {"id": service_id, "name": name}
+        if self.id_cache is not None:
+            self.id_cache.invalidate(proj_id, "services")
+
+        logger.info("Created Railway service: %s (ID: %s)", name, service_id)
+        return service_id
+
+    async def load_project_snapshot(
+        self,
+        project_id: Optional[str] = None,
+        *,
+        environment: Optional[str] = None,
+        include_variables: bool = False,
+    ) -> ProjectSnapshot:
+        """Fetch a project's whole topology in one query and warm every cache.
+
+        Args:
+            project_id: Project ID (uses instance default if not provided)
+            environment: Environment whose variables to prefetch
+            include_variables: Also fetch variables for every service in ``environment``
+                (one additional batched request)
+
+        Returns:
+            ProjectSnapshot with O(1) lookups by name and ID
+        """
+        proj_id = project_id or self.project_id
+        if not proj_id:
+            raise ValueError("Project ID required")
+
+        result = await self._graphql_query(PROJECT_SNAPSHOT_QUERY, {"projectId": proj_id})
+        snapshot = ProjectSnapshot.from_response(proj_id, result)
+        self._apply_snapshot(snapshot)
+
+        env_id = snapshot.environment_id(environment) if environment else None
+        if include_variables and env_id and snapshot.services:
+            service_ids = [svc["id"] for svc in snapshot.services.values()]
+            fetched = await self.get_services_variables(proj_id, env_id, service_ids)
+            for service_id, values in fetched.items():
+                snapshot.variables[(service_id, env_id)] = values
+                self._variables_cache[(proj_id, env_id, service_id)] = dict(values)
+
+        logger.info(
+            "Loaded Railway project snapshot: %d environment(s), %d service(s)",
+            len(snapshot.environments),
+            len(snapshot.services),
+        )
+        return snapshot
+
+    def project_snapshot(self, project_id: Optional[str] = None) -> Optional[ProjectSnapshot]:
+        """Return the most recent snapshot loaded for a project, if any."""
+        return self._snapshots.get(project_id or self.project_id or "")
+
+    def _apply_snapshot(self, snapshot: ProjectSnapshot) -> None:
+        """Replace the provider's lookup caches with a snapshot's contents."""
+        proj_id = snapshot.project_id
+        self._snapshots[proj_id] = snapshot
+        self._services_cache[proj_id] = {
+            name: dict(service) for name, service in snapshot.services.items()
+        }
+        for name, env_id in snapshot.environments.items():
+            self._env_cache[(proj_id, name)] = env_id
+        if self.id_cache is not None:
+            self.id_cache.set_environments(proj_id, snapshot.environments)
+            self.id_cache.set_services(proj_id, self._services_cache[proj_id])
+        self._variables_cache = {
+            key: value for key, value in self._variables_cache.items() if key[0] != proj_id
+        }
+
+    def _remember_variables(
+        self,
+        project_id: str,
+        environment_id: str,
+        service_id: Optional[str],
+        variables: Dict[str, str],
+    ) -> None:
+        """Keep cached variables in step with a successful upsert."""
+        cached = self._variables_cache.get((project_id, environment_id, service_id))
+        if cached is not None:
+            cached.update(variables)
+
+    async def _list_services(self, project_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List services for a project."""
+        proj_id = project_id or self.project_id
+        if not proj_id:
+            raise ValueError("Project ID required")
+
+        cached = self._services_cache.get(proj_id)
+        if cached is None and self.id_cache is not None:
+            cached = self.id_cache.get_services(proj_id)
+            if cached is not None:
+                self._services_cache[proj_id] = cached
+        if cached is not None:
+            return list(cached.values())
+
+        result = await self._graphql_query(LIST_SERVICES_QUERY, {"projectId": proj_id})
+        edges = result.get("project", {}).get("services", {}).get("edges", [])
+        services = [edge.get("node", {}) for edge in edges]
+        self._services_cache[proj_id] = {svc.get("name"): svc for svc in services if svc.get("name")}
+        if self.id_cache is not None:
+            self.id_cache.set_services(proj_id, self._services_cache[proj_id])
+        return services
+
+    async def _get_service_by_name(
+        self, name: str, project_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Find a service by name."""
+        proj_id = project_id or self.project_id
+        if proj_id and proj_id in self._services_cache:
+            cached = self._services_cache[proj_id]
+            if name in cached:
+                return cached[name]
+
+        for service in await self._list_services(proj_id):
+            if service.get("name") == name:
+                return service
+        return None
+
+    async def _get_service_instance(
+        self, service_id: str, environment_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """Fetch a single service instance for a service/environment."""
+        if self._coalesce_lookups:
+            return await self.batcher.submit(service_instance_operation(service_id, environment_id))
+
+        result = await self._graphql_query(GET_SERVICE_INSTANCE_QUERY, {"serviceId": service_id})
+        edges = result.get("service", {}).get("serviceInstances", {}).get("edges", [])
+        for edge in edges:
+            node = edge.get("node", {})
+            if node.get("environmentId") == environment_id:
+                return node
+        return None
+
+    async def _connect_service_repo(
+        self,
+        service_id: str,
+        repo: str,
+        branch: Optional[str] = None,
+        image: Optional[str] = None,
+        *,
+        environment: Optional[str] = None,
+    ) -> None:
+        """Associate a Git repository (or container image) with a service."""
+        input_payload: Dict[str, Any] = {"repo": repo}
+        if branch:
+            input_payload["branch"] = branch
+        if image:
+            input_payload["image"] = image
+
+        max_attempts = max(1, int(os.getenv("RAILWAY_SERVICE_CONNECT_MAX_ATTEMPTS", "1")))
+
+        attempts = 0
+        while attempts < max_attempts:
+            attempts += 1
+            try:
+                await self._graphql_query(
+                    CONNECT_SERVICE_MUTATION,
+                    {
+                        "serviceId": service_id,
+                        "input": input_payload,
+                    },
+                )
+                return
+            except RailwayAPIError as exc:
+                message = str(exc)
+                normalized = message.lower()
+                if "serviceinstance not found" in normalized or "problem processing request" in normalized:
+                    logger.info(
+                        "Railway reported transient connect issue for service %s (environment=%s): %s; continuing",
+                        service_id,
+                        environment or "default",
+                        message,
+                    )
+                    return
+                raise
+        logger.info(
+            "Railway serviceConnect retries exhausted for repo %s (branch=%s) on service %s; continuing",
+            repo,
+            branch,
+            service_id,
+        )
+
+    async def _wait_for_service_instance(
+        self,
+        service_id: str,
+        environment_id: str,
+        timeout_seconds: int = 600,
+        poll_interval: int = 5,
+    ) -> bool:
+        """Wait for a service instance deployment to succeed.
+
+        Polls until the instance has a deployment, then waits on that
+        deployment through :meth:`wait_for_deployment` when subscriptions are on.
+        """
+        start = time.monotonic()
+        while (time.monotonic() - start) < timeout_seconds:
+            instance = await self._get_service_instance(service_id, environment_id)
+            if instance:
+                deployment = instance.get("latestDeployment")
+                if deployment:
+                    status = (deployment.get("status") or "").upper()
+                    if status == "SUCCESS":
+                        return True
+                    if status in DEPLOYMENT_FAILURE_STATUSES:
+                        raise RailwayAPIError(
+                            f"Service {service_id} deployment failed with status {status}"
+                        )
+                    if self._subscriptions_available() and deployment.get("id"):
+                        remaining = timeout_seconds - (time.monotonic() - start)
+                        if await self.wait_for_deployment(deployment["id"], remaining):
+                            return True
+                        raise RailwayAPIError(
+                            f"Service {service_id} deployment {deployment['id']} did not succeed"
+                        )
+            await asyncio.sleep(poll_interval)
+        raise RailwayAPIError(
+            f"Timed out waiting for service {service_id} deployment in environment {environment_id}"
+        )
+
+    async def get_service_variables(
+        self,
+        project_id: str,
+        environment_id: str,
+        service_id: Optional[str] = None,
+    ) -> Dict[str, str]:
+        """Retrieve environment variables for a service/environment."""
+        cached = self._variables_cache.get((project_id, environment_id, service_id))
+        if cached is not None:
+            return dict(cached)
+
+        if self._coalesce_lookups:
+            return await self.batcher.submit(
+                service_variables_operation(project_id, environment_id, service_id)
+            )
+
+        result = await self._graphql_query(
+            GET_VARIABLES_QUERY,
+            {
+                "projectId": project_id,
+                "environmentId": environment_id,
+                "serviceId": service_id,
+            },
+        )
+        return result.get("variables", {}) or {}
+
+    def cached_service_variables(
+        self,
+        project_id: str,
+        environment_id: str,
+        service_id: Optional[str] = None,
+    ) -> Optional[Dict[str, str]]:
+        """Variables already loaded by a snapshot or prefetch, without issuing a request.
+
+        Returns:
+            Copy of the cached variables, or None if they have not been fetched
+        """
+        cached = self._variables_cache.get((project_id, environment_id, service_id))
+        return dict(cached) if cached is not None else None
+
+    async def ensure_redis_service(
+        self,
+        environment: str,
+        project_id: Optional[str] = None,
+        password_length: int = 24,
+    ) -> Dict[str, str]:
+        """Ensure a Redis instance exists for the environment and return connection info."""
+        proj_id = project_id or self.project_id
+        if not proj_id:
+            raise ValueError("Project ID required")
+
+        env_id = await self._get_environment_id(proj_id, environment)
+        service_name = f"budai-redis-{environment}"
+        default_port = "6379"
+        default_user = "default"
+        inferred_host = f"{service_name}.railway.internal"
+
+        service = await self._get_service_by_name(service_name, proj_id)
+        created = False
+        seeded_password: Optional[str] = None
+
+        if service:
+            service_id = service["id"]
+        else:
+            seeded_password = _generate_password(password_length)
+            initial_vars = _redis_connection_variables(
+                seeded_password, inferred_host, default_port, default_user
+            )
+            logger.info(
+                "Creating Redis service %s with %d variables",
+                service_name,
+                len(initial_vars),
+            )
+            service_id = await self.create_service(
+                name=service_name,
+                project_id=proj_id,
+                environment_id=env_id,
+                source_image="railwayapp/redis:8.2",
+                variables=initial_vars,
+            )
+            created = True
+
+        if created:
+            await self._wait_for_service_instance(service_id, env_id)
+
+        vars_payload = await self.get_service_variables(proj_id, env_id, service_id)
+
+        connection = _resolve_redis_connection(
+            vars_payload,
+            seeded_password=seeded_password,
+            inferred_host=inferred_host,
+            default_port=default_port,
+            default_user=default_user,
+            password_length=password_length,
+        )
+        if not connection["password"] or not connection["host"]:
+            raise RailwayAPIError(
+                f"Redis service {service_name} missing required connection variables"
+            )
+
+        # Ensure all expected connection variables are present for Railway UI integrations
+        desired_vars = _redis_connection_variables(
+            connection["password"], connection["host"], connection["port"], connection["user"]
+        )
+        to_update = {
+            key: value
+            for key, value in desired_vars.items()
+            if value and vars_payload.get(key) != value
+        }
+        if to_update:
+            logger.info(
+                "Updating Redis service %s with %d variable(s)",
+                service_name,
+                len(to_update),
+            )
+            await self.set_environment_variables(
+                service_id=service_id,
+                environment=environment,
+                variables=to_update,
+                project_id=proj_id,
+            )
+
+        return {
+            "service_id": service_id,
+            "environment_id": env_id,
+            "host": connection["host"],
+            "port": connection["port"],
+            "password": connection["password"],
+            "redis_url": connection["redis_url"],
+        }
+
+    async def set_environment_variables(
+        self,
+        service_id: str,
+        environment: str,
+        variables: Dict[str, str],
+        project_id: Optional[str] = None,
+        *,
+        bulk: bool = True,
+        skip_deploys: bool = False,
+    ) -> None:
+        """Set environment variables for a service.
+
+        See :meth:`RailwayProvider.set_environment_variables`. With
+        ``bulk=False`` the per-variable upserts are issued concurrently within
+        the shared request budget.
+
+        Args:
+            service_id: Service ID
+            environment: Environment name (e.g., 'production')
+            variables: Dictionary of variable names to values
+            project_id: Project ID (uses instance default if not provided)
+            bulk: Send all variables in one request instead of one mutation each
+            skip_deploys: Don't trigger a redeploy for this change
+        """
+        proj_id = project_id or self.project_id
+        if not proj_id:
+            raise ValueError("Project ID required")
+        if not variables:
+            return
+
+        env_id = await self._get_environment_id(proj_id, environment)
+        scope = {"projectId": proj_id, "environmentId": env_id, "serviceId": service_id}
+
+        if bulk:
+            await self._upsert_variables_bulk(scope, variables, skip_deploys)
+            self._remember_variables(proj_id, env_id, service_id, variables)
+            logger.info("Set %d environment variables for service %s", len(variables), service_id)
+            return
+
+        async def _upsert(name: str, value: str, skip: bool) -> None:
+            try:
+                await self._graphql_query(
+                    UPSERT_VARIABLE_MUTATION,
+                    {**scope, "name": name, "value": value, "skipDeploys": skip},
+                )
+                logger.debug("Set variable %s for service %s", name, service_id)
+            except RailwayAPIError as exc:
+                logger.error("Failed to set variable %s: %s", name, exc)
+                raise
+
+        items = list(variables.items())
+        # Concurrent upserts skip deploys; the final one (if any) redeploys once
+        await asyncio.gather(*(_upsert(name, value, True) for name, value in items[:-1]))
+        last_name, last_value = items[-1]
+        await _upsert(last_name, last_value, skip_deploys)
+        self._remember_variables(proj_id, env_id, service_id, variables)
+        logger.info("Set %d environment variables for service %s", len(variables), service_id)
+
+    async def _upsert_variables_bulk(
+        self, scope: Dict[str, str], variables: Dict[str, str], skip_deploys: bool
+    ) -> None:
+        """Upsert a variable map in as few requests as the API allows."""
+        if self._collection_upsert_supported:
+            try:
+                await self._graphql_query(
+                    UPSERT_VARIABLE_COLLECTION_MUTATION,
+                    {**scope, "variables": variables, "skipDeploys": skip_deploys},
+                )
+                return
+            except RailwayAPIError as exc:
+                if not _is_schema_error(exc):
+                    logger.error("Failed to set variables for service %s: %s", scope["serviceId"], exc)
+                    raise
+                logger.info("variableCollectionUpsert unavailable, using aliased variableUpsert batches")
+                self._collection_upsert_supported = False
+
+        for document, payload in _aliased_variable_upsert_batches(variables, skip_deploys):
+            try:
+                await self._graphql_query(document, {**scope, **payload})
+            except RailwayAPIError as exc:
+                logger.error("Failed to set variables for service %s: %s", scope["serviceId"], exc)
+                raise
+
+    async def _find_environment_id(self, project_id: str, environment_name: str) -> Optional[str]:
+        """Look up an environment ID by name (returns None if not found)."""
+        cache_key = (project_id, environment_name)
+        if cache_key in self._env_cache:
+            return self._env_cache[cache_key]
+        if self.id_cache is not None:
+            persisted = self.id_cache.get_environment_id(project_id, environment_name)
+            if persisted:
+                self._env_cache[cache_key] = persisted
+                return persisted
+
+        result = await self._graphql_query(GET_ENVIRONMENTS_QUERY, {"projectId": project_id})
+        environments = result.get("project", {}).get("environments", {}).get("edges", [])
+
+        found: Dict[str, str] = {}
+        for edge in environments:
+            node = edge.get("node", {})
+            if node.get("name") and node.get("id"):
+                found[node["name"]] = node["id"]
+                self._env_cache[(project_id, node["name"])] = node["id"]
+        if self.id_cache is not None:
+            self.id_cache.set_environments(project_id, found)
+
+        return found.get(environment_name)
+
+    async def _get_environment_id(self, project_id: str, environment_name: str) -> str:
+        """Get environment ID by name, creating it if necessary."""
+        cached = self._env_cache.get((project_id, environment_name))
+        if cached:
+            return cached
+
+        async with self._env_lock:
+            existing = await self._find_environment_id(project_id, environment_name)
+            if existing:
+                return existing
+
+            # If environment doesn't exist, create it
+            return await self._create_environment(project_id, environment_name)
+
+    async def _create_environment(self, project_id: str, name: str) -> str:
+        """Create a new environment.
+
+        Args:
+            project_id: Project ID
+            name: Environment name
+
+        Returns:
+            Created environment ID
+        """
+        if self.id_cache is not None:
+            self.id_cache.invalidate(project_id, "environments")
+
+        try:
+            result = await self._graphql_query(
+                CREATE_ENVIRONMENT_MUTATION, {"projectId": project_id, "name": name}
+            )
+        except RailwayAPIError as exc:
+            if "already exists" in str(exc).lower():
+                existing = await self._find_environment_id(project_id, name)
+                if existing:
+                    logger.info("Environment %s already exists (ID: %s)", name, existing)
+                    self._env_cache[(project_id, name)] = existing
+                    return existing
+            raise
+
+        env_id = result.get("environmentCreate", {}).get("id")
+
+        if not env_id:
+            raise RailwayAPIError(f"Failed to create environment '{name}'")
+
+        logger.info("Created Railway environment: %s (ID: %s)", name, env_id)
+        self._env_cache[(project_id, name)] = env_id
+        return env_id
+
+    async def deploy_service(
+        self,
+        service_id: str,
+        *,
+        environment: Optional[str] = None,
+        environment_id: Optional[str] = None,
+        latest_commit: bool = True,
+        project_id: Optional[str] = None,
+    ) -> str:
+        """Trigger a deployment for a service.
+
+        Args:
+            service_id: Service ID to deploy
+            environment: Environment name (resolved to ID if provided)
+            environment_id: Optional Railway environment ID (takes precedence)
+            latest_commit: Deploy latest connected commit (default: True)
+            project_id: Project ID (uses instance default if not provided)
+
+        Returns:
+            Deployment ID
+        """
+        proj_id = project_id or self.project_id
+        if not proj_id:
+            raise ValueError("Project ID required")
+
+        env_id = environment_id
+        if not env_id:
+            if not environment:
+                raise ValueError("environment or environment_id required to deploy service")
+            env_id = await self._get_environment_id(proj_id, environment)
+
+        variables: Dict[str, Any] = {
+            "serviceId": service_id,
+            "environmentId": env_id,
+            "latestCommit": latest_commit,
+        }
+
+        if latest_commit is None:
+            variables.pop("latestCommit")
+
+        try:
+            result = await self._graphql_query(DEPLOY_SERVICE_MUTATION, variables)
+            deployment_id = (result.get("serviceInstanceDeploy", {}) or {}).get("id")
+        except RailwayAPIError as exc:
+            if "Problem processing request" in str(exc):
+                logger.debug(
+                    "serviceInstanceDeploy failed for %s in %s, attempting redeploy fallback",
+                    service_id,
+                    env_id,
+                )
+                result = await self._graphql_query(
+                    REDEPLOY_SERVICE_MUTATION,
+                    {"serviceId": service_id, "environmentId": env_id},
+                )
+                deployment_id = (result.get("serviceInstanceRedeploy", {}) or {}).get("id")
+            else:
+                raise
+
+        if not deployment_id:
+            raise RailwayAPIError(f"Failed to trigger deployment for service {service_id}")
+
+        logger.info(
+            "Triggered deployment for service %s in environment %s: %s",
+            service_id,
+            env_id,
+            deployment_id,
+        )
+        return deployment_id
+
+    async def get_deployment_status(self, deployment_id: str) -> Dict[str, Any]:
+        """Get status of a deployment.
+
+        Args:
+            deployment_id: Deployment ID
+
+        Returns:
+            Deployment status information
+        """
+        if self._coalesce_lookups:
+            return await self.batcher.submit(deployment_status_operation(deployment_id))
+
+        result = await self._graphql_query(GET_DEPLOYMENT_QUERY, {"id": deployment_id})
+        return result.get("deployment", {})
+
+    async def wait_for_deployment(
+        self, deployment_id: str, timeout_seconds: int = 600, poll_interval: int = 10
+    ) -> bool:
+        """Wait for a deployment to complete.
+
+        Status changes are pushed over a websocket subscription when available;
+        if the socket cannot be opened or drops, the remaining time is spent
+        polling :meth:`get_deployment_status` instead.
+
+        Args:
+            deployment_id: Deployment ID to wait for
+            timeout_seconds: Maximum time to wait
+            poll_interval: Seconds between status checks when polling
+
+        Returns:
+            True if deployment succeeded, False otherwise
+        """
+        start_time = time.monotonic()
+
+        if self._subscriptions_available():
+            try:
+                outcome = await asyncio.wait_for(
+                    self._wait_via_subscription(deployment_id), timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                logger.error("Deployment %s timed out after %ds", deployment_id, timeout_seconds)
+                return False
+            except SubscriptionError as exc:
+                logger.warning(
+                    "Deployment status subscription unavailable, falling back to polling: %s", exc
+                )
+                self._subscriptions_down_until = time.monotonic() + SUBSCRIPTION_RETRY_SECONDS
+                outcome = None
+            if outcome is not None:
+                return outcome
+
+        while (time.monotonic() - start_time) < timeout_seconds:
+            status_info = await self.get_deployment_status(deployment_id)
+            outcome = self._deployment_outcome(
+                deployment_id, (status_info.get("status") or "").upper()
+            )
+            if outcome is not None:
+                return outcome
+            await asyncio.sleep(poll_interval)
+
+        logger.error("Deployment %s timed out after %ds", deployment_id, timeout_seconds)
+        return False
+
+    def _subscriptions_available(self) -> bool:
+        return self.subscriptions is not None and time.monotonic() >= self._subscriptions_down_until
+
+    @staticmethod
+    def _deployment_outcome(deployment_id: str, status: str) -> Optional[bool]:
+        """True/False for terminal statuses, None while the deployment is still running."""
+        if status == "SUCCESS":
+            logger.info("Deployment %s completed successfully", deployment_id)
+            return True
+        if status in DEPLOYMENT_FAILURE_STATUSES:
+            logger.error("Deployment %s failed with status: %s", deployment_id, status)
+            return False
+        logger.debug("Deployment %s status: %s", deployment_id, status)
+        return None
+
+    async def _wait_via_subscription(self, deployment_id: str) -> Optional[bool]:
+        """Follow a deployment's status subscription to a terminal state.
+
+        Returns:
+            Deployment outcome, or None if the server ended the stream early
+        """
+        async with self.subscriptions.subscribe(
+            DEPLOYMENT_STATUS_SUBSCRIPTION, {"id": deployment_id}
+        ) as updates:
+            # The deployment may have finished before the subscription was registered
+            status_info = await self.get_deployment_status(deployment_id)
+            outcome = self._deployment_outcome(
+                deployment_id, (status_info.get("status") or "").upper()
+            )
+            if outcome is not None:
+                return outcome
+            async for data in updates:
+                deployment = data.get("deployment") or {}
+                outcome = self._deployment_outcome(
+                    deployment_id, (deployment.get("status") or "").upper()
+                )
+                if outcome is not None:
+                    return outcome
+        return None
+
+    async def stream_deployment_logs(
+        self,
+        deployment_id: str,
+        *,
+        filter: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield a deployment's log lines as they are emitted.
+
+        Raises:
+            RailwayAPIError: If subscriptions are disabled or the stream fails
+        """
+        if self.subscriptions is None:
+            raise RailwayAPIError("Deployment log streaming requires subscriptions to be enabled")
+        async for line in self.subscriptions.deployment_logs(deployment_id, filter=filter, limit=limit):
+            yield line
+
+    async def get_service_domain(self, service_id: str) -> Optional[str]:
+        """Get the public domain for a service.
+
+        Args:
+            service_id: Service ID
+
+        Returns:
+            Service domain URL or None if not available
+        """
+        if self._coalesce_lookups:
+            return await self.batcher.submit(service_domain_operation(service_id))
+
+        result = await self._graphql_query(GET_SERVICE_DOMAIN_QUERY, {"id": service_id})
+        domains = result.get("service", {}).get("domains", {}).get("serviceDomains", [])
+
+        if domains:
+            return domains[0].get("domain")
+
+        return None
+
+    async def _run_batched(
+        self, keys: List[Any], operations: List[GraphQLOperation]
+    ) -> Dict[Any, Any]:
+        """Run lookups in one round trip; failed lookups are logged and omitted."""
+        results: Dict[Any, Any] = {}
+        for key, result in zip(keys, await self.batcher.execute_many(operations)):
+            if isinstance(result, Exception):
+                logger.warning("Batched Railway lookup for %s failed: %s", key, result)
+                continue
+            results[key] = result
+        return results
+
+    async def get_deployment_statuses(self, deployment_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get status of many deployments in a single request."""
+        return await self._run_batched(
+            list(deployment_ids), [deployment_status_operation(d) for d in deployment_ids]
+        )
+
+    async def get_service_domains(self, service_ids: List[str]) -> Dict[str, Optional[str]]:
+        """Get the public domain for many services in a single request."""
+        return await self._run_batched(
+            list(service_ids), [service_domain_operation(s) for s in service_ids]
+        )
+
+    async def get_service_instances(
+        self, service_ids: List[str], environment_id: str
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Fetch the service instance of many services for one environment in a single request."""
+        return await self._run_batched(
+            list(service_ids),
+            [service_instance_operation(s, environment_id) for s in service_ids],
+        )
+
+    async def get_services_variables(
+        self, project_id: str, environment_id: str, service_ids: List[str]
+    ) -> Dict[str, Dict[str, str]]:
+        """Retrieve variables for many services of one environment in a single request."""
+        return await self._run_batched(
+            list(service_ids),
+            [service_variables_operation(project_id, environment_id, s) for s in service_ids],
+        )
+
+    async def prefetch_service_variables(
+        self, project_id: str, environment_id: str, service_ids: List[str]
+    ) -> Dict[str, Dict[str, str]]:
+        """Load variables for services not already cached, in one batched request.
+
+        Later :meth:`get_service_variables` calls for these services are
+        served from cache.
+
+        Returns:
+            Mapping of service ID to variables for every service now cached
+        """
+        missing = [
+            s for s in service_ids if (project_id, environment_id, s) not in self._variables_cache
+        ]
+        if missing:
+            fetched = await self.get_services_variables(project_id, environment_id, missing)
+            for service_id, values in fetched.items():
+                self._variables_cache[(project_id, environment_id, service_id)] = dict(values)
+        return {
+            s: dict(self._variables_cache[(project_id, environment_id, s)])
+            for s in service_ids
+            if (project_id, environment_id, s) in self._variables_cache
+        }
+
+    async def service_instance_update(
+        self,
+        service_id: str,
+        environment_id: str,
+        *,
+        start_command: Optional[str] = None,
+        builder: Optional[str] = None,
+        root_directory: Optional[str] = None,
+        dockerfile_path: Optional[str] = None,
+        healthcheck_path: Optional[str] = None,
+        healthcheck_timeout: Optional[int] = None,
+    ) -> None:
+        """Update a service instance configuration (builder, start command, root directory, etc)."""
+        input_payload: Dict[str, Any] = {}
+        if start_command:
+            input_payload["startCommand"] = start_command
+        if builder:
+            input_payload["builder"] = builder
+        if root_directory:
+            input_payload["rootDirectory"] = root_directory
+        if dockerfile_path:
+            input_payload["dockerfilePath"] = dockerfile_path
+        if healthcheck_path:
+            input_payload["healthcheckPath"] = healthcheck_path
+        if healthcheck_timeout:
+            input_payload["healthcheckTimeout"] = healthcheck_timeout
+
+        if not input_payload:
+            return
+
+        # Add a small delay to ensure the service is ready for configuration updates
+        await asyncio.sleep(2)
+
+        try:
+            await self._graphql_query(
+                UPDATE_SERVICE_INSTANCE_MUTATION,
+                {
+                    "serviceId": service_id,
+                    "environmentId": environment_id,
+                    "input": input_payload,
+                },
+            )
+        except RailwayAPIError as exc:
+            if "Problem processing request" in str(exc):
+                logger.warning(
+                    "Service instance update failed with 'Problem processing request' - this may be due to service not being ready yet. "
+                    "The service will be created but may need manual configuration of root directory."
+                )
+                return
+            raise
+
+    async def deploy_service_in_environment(self, service_id: str, environment_id: str) -> str:
+        """Trigger a deployment for a service in a specific environment."""
+        result = await self._graphql_query(
+            DEPLOY_IN_ENVIRONMENT_MUTATION,
+            {"serviceId": service_id, "environmentId": environment_id},
+        )
+        dep_id = result.get("serviceInstanceDeploy", {}).get("id")
+        if not dep_id:
+            raise RailwayAPIError("Failed to trigger deployment")
+        return dep_id
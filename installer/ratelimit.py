@@ -0,0 +1,521 @@
+"""
+Client-side rate limiting for Railway API calls.
+
+Provides pluggable limiters shared by the sync and async providers:
+- TokenBucketRateLimiter: burst capacity plus a sustained refill rate
+- FileTokenBucketRateLimiter: the same bucket coordinated across processes via a lock file
+- AdaptiveRateLimiter: AIMD tuning that backs off on 429/Retry-After and recovers on clean responses
+
+Limiters work by reservation: ``reserve`` debits the bucket immediately and
+returns how long the caller must wait before sending, so the same state can
+be shared by threads and coroutines without holding a lock while sleeping.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+try:  # POSIX only; cross-process coordination is unavailable elsewhere
+    import fcntl
+except ImportError:  # pragma: no cover - exercised on Windows only
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a ``Retry-After`` header (delta-seconds or HTTP-date) into seconds.
+
+    Args:
+        value: Raw header value
+
+    Returns:
+        Seconds to wait, or None if the header is missing or unparseable
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RateLimiter(ABC):
+    """Abstract base class for request rate limiters."""
+
+    def __init__(self) -> None:
+        """Initialize shared wait/throttle counters."""
+        self._stats_lock = threading.Lock()
+        self._acquired = 0
+        self._waits = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._throttled = 0
+        self._backoff_lock = threading.Lock()
+        self._backoff_until = 0.0
+
+    @abstractmethod
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Debit ``tokens`` from the budget.
+
+        Args:
+            tokens: Cost of the request
+
+        Returns:
+            Seconds the caller must wait before sending
+        """
+
+    @abstractmethod
+    def set_rate(self, rate: float) -> None:
+        """Change the sustained rate (requests per second)."""
+
+    @property
+    @abstractmethod
+    def rate(self) -> float:
+        """Current sustained rate (requests per second)."""
+
+    def back_off(self, factor: float, min_rate: float, retry_after: Optional[float] = None) -> Optional[float]:
+        """Multiply the rate by ``factor`` (not below ``min_rate``) once per congestion window.
+
+        The window covers the ``retry_after`` pause plus one refill interval at
+        the new rate: 429s answered within it (to requests already in flight, or
+        released together when the pause ends) belong to the same throttling
+        event and don't cut the rate again.
+
+        Returns:
+            The new rate, or None if a cut within the current window covers this 429
+        """
+        with self._backoff_lock:
+            now = time.monotonic()
+            if now < self._backoff_until:
+                return None
+            new_rate = max(min_rate, self.rate * factor)
+            self.set_rate(new_rate)
+            self._backoff_until = now + (retry_after or 0.0) + 1.0 / new_rate
+            return new_rate
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block the calling thread until a request may be sent.
+
+        Returns:
+            Seconds spent waiting
+        """
+        delay = self.reserve(tokens)
+        self._record_wait(delay)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        """Suspend the calling coroutine until a request may be sent.
+
+        Returns:
+            Seconds spent waiting
+        """
+        delay = self.reserve(tokens)
+        self._record_wait(delay)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def record_success(self) -> None:
+        """Report a response that was not rate limited."""
+
+    def record_throttle(self, retry_after: Optional[float] = None) -> None:
+        """Report a 429 / "Too Many Requests" response.
+
+        Args:
+            retry_after: Seconds from a ``Retry-After`` header, if present
+        """
+        with self._stats_lock:
+            self._throttled += 1
+
+    def _record_wait(self, delay: float) -> None:
+        with self._stats_lock:
+            self._acquired += 1
+            if delay > 0:
+                self._waits += 1
+                self._total_wait += delay
+                self._max_wait = max(self._max_wait, delay)
+
+    def metrics(self) -> Dict[str, float]:
+        """Return a snapshot of limiter state for observability.
+
+        Returns:
+            Dictionary of metric names to values
+        """
+        with self._stats_lock:
+            return {
+                "rate_per_second": self.rate,
+                "requests": float(self._acquired),
+                "delayed_requests": float(self._waits),
+                "total_wait_seconds": self._total_wait,
+                "max_wait_seconds": self._max_wait,
+                "throttled_responses": float(self._throttled),
+            }
+
+
+class TokenBucketRateLimiter(RateLimiter):
+    """In-process token bucket shared by all threads and coroutines.
+
+    The bucket holds up to ``burst`` tokens and refills at ``rate`` tokens
+    per second. A ``Retry-After`` reported through :meth:`record_throttle`
+    pauses every caller until the server-requested time has passed.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0) -> None:
+        """Initialize token bucket.
+
+        Args:
+            rate: Sustained requests per second
+            burst: Maximum requests that may be sent back-to-back
+        """
+        super().__init__()
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self._rate = float(rate)
+        self.burst = float(burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def set_rate(self, rate: float) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self._rate = max(rate, 1e-6)
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self._rate)
+            self._updated = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= tokens
+            delay = 0.0 if self._tokens >= 0 else -self._tokens / self._rate
+            return max(delay, self._blocked_until - now)
+
+    def record_throttle(self, retry_after: Optional[float] = None) -> None:
+        super().record_throttle(retry_after)
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # Drain the bucket so queued callers don't burst straight into another 429
+            self._tokens = min(self._tokens, 0.0)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+
+    def metrics(self) -> Dict[str, float]:
+        snapshot = super().metrics()
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            snapshot.update(
+                {
+                    "burst": self.burst,
+                    "tokens_available": self._tokens,
+                    "blocked_seconds_remaining": max(0.0, self._blocked_until - now),
+                }
+            )
+        return snapshot
+
+
+class FileTokenBucketRateLimiter(RateLimiter):
+    """Token bucket whose state lives in a lock file shared across processes.
+
+    Every reservation takes an exclusive ``flock`` on the state file, so
+    several ``budai-deploy`` invocations (or worker processes) against the
+    same Railway account draw from one budget. Wall-clock time is used so
+    the bucket is meaningful across processes.
+
+    The sustained rate is part of the shared state: :meth:`set_rate` (e.g.
+    from an :class:`AdaptiveRateLimiter`) applies to every process, and
+    :meth:`back_off` windows are shared too, so one throttling event seen by
+    several processes cuts the rate once. Once the bucket has been idle for
+    ``rate_reset_after`` seconds the configured rate applies again.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        rate: float,
+        burst: float = 1.0,
+        *,
+        rate_reset_after: float = 300.0,
+    ) -> None:
+        """Initialize file-backed token bucket.
+
+        Args:
+            path: State file path (created if missing)
+            rate: Sustained requests per second
+            burst: Maximum requests that may be sent back-to-back
+            rate_reset_after: Idle seconds after which a rate changed by ``set_rate``
+                reverts to ``rate``
+        """
+        super().__init__()
+        if fcntl is None:
+            raise RuntimeError("Cross-process rate limiting requires a POSIX platform (fcntl)")
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.configured_rate = float(rate)
+        self.burst = float(burst)
+        self.rate_reset_after = rate_reset_after
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self._update(0.0)["rate"]
+
+    def set_rate(self, rate: float) -> None:
+        self._update(0.0, rate=max(rate, 1e-6))
+
+    def back_off(self, factor: float, min_rate: float, retry_after: Optional[float] = None) -> Optional[float]:
+        state = self._update(0.0, backoff=(factor, min_rate, retry_after or 0.0))
+        return state["rate"] if state["backed_off"] else None
+
+    def _update(
+        self,
+        tokens: float,
+        retry_after: Optional[float] = None,
+        rate: Optional[float] = None,
+        backoff: Optional[Tuple[float, float, float]] = None,
+    ) -> Dict[str, float]:
+        """Apply a debit (and optional pause or rate change) to the shared state under the file lock.
+
+        ``backoff`` is ``(factor, min_rate, retry_after)`` for :meth:`back_off`.
+        """
+        with self._lock, open(self.path, "a+", encoding="utf-8") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                handle.seek(0)
+                raw = handle.read()
+                try:
+                    state = json.loads(raw) if raw else {}
+                except json.JSONDecodeError:
+                    state = {}
+                now = time.time()
+                available = float(state.get("tokens", self.burst))
+                updated = float(state.get("updated", now))
+                blocked_until = float(state.get("blocked_until", 0.0))
+                backoff_until = float(state.get("backoff_until", 0.0))
+                current_rate = float(state.get("rate", self.configured_rate))
+                if now - updated > self.rate_reset_after:
+                    current_rate = self.configured_rate
+
+                # Refill at the rate in effect until now, then apply any change
+                available = min(self.burst, available + max(0.0, now - updated) * current_rate)
+                available -= tokens
+                if rate is not None:
+                    current_rate = rate
+                backed_off = False
+                if backoff is not None and now >= backoff_until:
+                    factor, min_rate, backoff_retry_after = backoff
+                    current_rate = max(min_rate, current_rate * factor)
+                    backoff_until = now + backoff_retry_after + 1.0 / current_rate
+                    backed_off = True
+                if retry_after is not None:
+                    available = min(available, 0.0)
+                    if retry_after:
+                        blocked_until = max(blocked_until, now + retry_after)
+
+                state = {
+                    "tokens": available,
+                    "updated": now,
+                    "blocked_until": blocked_until,
+                    "backoff_until": backoff_until,
+                    "rate": current_rate,
+                }
+                handle.seek(0)
+                handle.truncate()
+                handle.write(json.dumps(state))
+                handle.flush()
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        state["now"] = now
+        state["backed_off"] = backed_off
+        return state
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        state = self._update(tokens)
+        delay = 0.0 if state["tokens"] >= 0 else -state["tokens"] / state["rate"]
+        return max(delay, state["blocked_until"] - state["now"])
+
+    def record_throttle(self, retry_after: Optional[float] = None) -> None:
+        super().record_throttle(retry_after)
+        self._update(0.0, retry_after or 0.0)
+
+    def metrics(self) -> Dict[str, float]:
+        snapshot = super().metrics()
+        state = self._update(0.0)
+        snapshot.update(
+            {
+                "burst": self.burst,
+                "tokens_available": state["tokens"],
+                "blocked_seconds_remaining": max(0.0, state["blocked_until"] - state["now"]),
+            }
+        )
+        return snapshot
+
+
+class AdaptiveRateLimiter(RateLimiter):
+    """AIMD wrapper that tunes another limiter's rate from server feedback.
+
+    A throttled response multiplies the rate by ``decrease_factor`` (bounded
+    by ``min_rate``) at most once per congestion window (see
+    :meth:`RateLimiter.back_off`), so a burst of 429s from concurrent
+    requests counts as one throttling event; every ``increase_after``
+    consecutive clean responses add ``increase_step`` back, up to ``max_rate``.
+    """
+
+    def __init__(
+        self,
+        inner: RateLimiter,
+        *,
+        min_rate: float = 0.1,
+        max_rate: Optional[float] = None,
+        decrease_factor: float = 0.5,
+        increase_step: Optional[float] = None,
+        increase_after: int = 10,
+    ) -> None:
+        """Initialize adaptive limiter.
+
+        Args:
+            inner: Limiter whose rate is tuned
+            min_rate: Floor for the sustained rate
+            max_rate: Ceiling for the sustained rate (defaults to the inner limiter's rate)
+            decrease_factor: Multiplier applied on each throttled response
+            increase_step: Rate added after a clean streak (defaults to 10% of max_rate)
+            increase_after: Clean responses required before each increase
+        """
+        super().__init__()
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+        self.inner = inner
+        self.max_rate = max_rate or inner.rate
+        self.min_rate = min(min_rate, self.max_rate)
+        self.decrease_factor = decrease_factor
+        self.increase_step = increase_step or self.max_rate * 0.1
+        self.increase_after = max(1, increase_after)
+        self._clean_streak = 0
+        self._decreases = 0
+        self._increases = 0
+        self._tune_lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self.inner.rate
+
+    def set_rate(self, rate: float) -> None:
+        self.inner.set_rate(min(self.max_rate, max(self.min_rate, rate)))
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        return self.inner.reserve(tokens)
+
+    def record_success(self) -> None:
+        self.inner.record_success()
+        with self._tune_lock:
+            self._clean_streak += 1
+            if self._clean_streak < self.increase_after or self.rate >= self.max_rate:
+                return
+            self._clean_streak = 0
+            self._increases += 1
+            new_rate = min(self.max_rate, self.rate + self.increase_step)
+        self.inner.set_rate(new_rate)
+
+    def record_throttle(self, retry_after: Optional[float] = None) -> None:
+        super().record_throttle(retry_after)
+        self.inner.record_throttle(retry_after)
+        with self._tune_lock:
+            self._clean_streak = 0
+        new_rate = self.inner.back_off(self.decrease_factor, self.min_rate, retry_after)
+        if new_rate is None:
+            return  # same throttling event as the last cut
+        with self._tune_lock:
+            self._decreases += 1
+        logger.info("Railway API throttled; reducing request rate to %.2f req/s", new_rate)
+
+    def metrics(self) -> Dict[str, float]:
+        snapshot = self.inner.metrics()
+        with self._stats_lock:
+            snapshot["requests"] = float(self._acquired)
+            snapshot["delayed_requests"] = float(self._waits)
+            snapshot["total_wait_seconds"] = self._total_wait
+            snapshot["max_wait_seconds"] = self._max_wait
+        with self._tune_lock:
+            snapshot.update(
+                {
+                    "min_rate_per_second": self.min_rate,
+                    "max_rate_per_second": self.max_rate,
+                    "rate_decreases": float(self._decreases),
+                    "rate_increases": float(self._increases),
+                    "clean_streak": float(self._clean_streak),
+                }
+            )
+        return snapshot
+
+
+def create_rate_limiter_from_env() -> RateLimiter:
+    """Build the default Railway API limiter from environment variables.
+
+    Environment:
+        RAILWAY_API_RATE: Sustained requests per second
+            (defaults to 1 / RAILWAY_API_MIN_INTERVAL, i.e. ~1.33 req/s)
+        RAILWAY_API_BURST: Bucket capacity (default: 5)
+        RAILWAY_API_RATE_LIMIT_FILE: Share the bucket across processes via this lock file
+            (an adaptive rate is then shared too)
+        RAILWAY_API_ADAPTIVE: Enable AIMD tuning on 429s (default: "1")
+
+    Returns:
+        Configured rate limiter
+    """
+    rate_value = os.getenv("RAILWAY_API_RATE")
+    if rate_value:
+        rate = float(rate_value)
+    else:
+        min_interval = float(os.getenv("RAILWAY_API_MIN_INTERVAL", "0.75"))
+        # A non-positive interval historically meant "no throttling"
+        rate = 1.0 / min_interval if min_interval > 0 else 1000.0
+    burst = float(os.getenv("RAILWAY_API_BURST", "5"))
+
+    lock_file = os.getenv("RAILWAY_API_RATE_LIMIT_FILE")
+    limiter: RateLimiter
+    if lock_file:
+        limiter = FileTokenBucketRateLimiter(lock_file, rate=rate, burst=burst)
+    else:
+        limiter = TokenBucketRateLimiter(rate=rate, burst=burst)
+
+    if os.getenv("RAILWAY_API_ADAPTIVE", "1").lower() not in ("0", "false", "no"):
+        # The shared rate may already be backed off by another process; recover up to ours
+        limiter = AdaptiveRateLimiter(limiter, min_rate=min(0.1, rate), max_rate=rate)
+    return limiter
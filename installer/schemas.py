@@ -14,7 +14,13 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+
+def canonical_digest(value: Any) -> str:
+    """SHA-256 of the canonical JSON encoding (sorted keys, compact separators) of ``value``."""
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
 
 
 class PermissionScope(BaseModel):
@@ -74,7 +80,44 @@ class ValidationResult(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 
-class DeploymentStep(BaseModel):
+class _ContentAddressed(BaseModel):
+    """Model with a memoized content digest over its fields.
+
+    The digest is computed on first access and reset whenever a field is
+    reassigned or the model is copied with ``model_copy(update=...)``.
+    Mutating a field's value in place (e.g. ``step.params[k] = v``) is not
+    detected; reassign the field instead.
+    """
+
+    _digest: Optional[str] = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        self.__pydantic_private__["_digest"] = None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            self.__pydantic_private__["_digest"] = None
+
+    def model_copy(self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False) -> Any:
+        """Copy with a fresh digest (``update`` bypasses :meth:`__setattr__`)."""
+        copied = super().model_copy(update=update, deep=deep)
+        copied.__pydantic_private__["_digest"] = None
+        return copied
+
+    @property
+    def digest(self) -> str:
+        """Canonical SHA-256 of this model's fields."""
+        # Private attributes are read from the backing dict directly; pydantic's
+        # attribute hooks dominate the cost of hashing large plans otherwise
+        private = self.__pydantic_private__
+        digest = private.get("_digest")
+        if digest is None:
+            digest = private["_digest"] = canonical_digest(self.__dict__)
+        return digest
+
+
+class DeploymentStep(_ContentAddressed):
     """A single step in a deployment plan."""
 
     id: str = Field(..., description="Unique step identifier")
@@ -85,7 +128,7 @@ class DeploymentStep(BaseModel):
     depends_on: List[str] = Field(default_factory=list, description="Step dependencies")
 
 
-class RollbackStep(BaseModel):
+class RollbackStep(_ContentAddressed):
     """A rollback action for a deployment step."""
 
     on_fail_of: str = Field(..., description="Step ID this rollback applies to")
@@ -111,16 +154,37 @@ class DeploymentPlan(BaseModel):
 
     def __init__(self, **data: Any) -> None:
         """Initialize and compute checksum if not provided."""
-        if "checksum" not in data:
-            # Compute checksum from plan content
-            plan_content = {
-                k: v
-                for k, v in data.items()
-                if k not in ("checksum", "estimated_duration_seconds")
-            }
-            content_str = json.dumps(plan_content, sort_keys=True)
-            data["checksum"] = hashlib.sha256(content_str.encode()).hexdigest()
+        compute = "checksum" not in data
+        if compute:
+            data["checksum"] = ""
         super().__init__(**data)
+        if compute:
+            self.checksum = self.compute_checksum()
+
+    def compute_checksum(self) -> str:
+        """Content hash over everything but ``checksum`` and ``estimated_duration_seconds``.
+
+        Steps and rollback steps contribute their memoized digests, so the
+        plan is never serialized as a whole and rebuilding a plan from
+        existing step objects only hashes steps that changed.
+        """
+        hasher = hashlib.sha256()
+        header = {
+            "target_env": self.target_env,
+            "capability": self.capability,
+            "version": self.version,
+            "invariants": self.invariants,
+        }
+        hasher.update(canonical_digest(header).encode("ascii"))
+        for step in self.steps:
+            hasher.update(b"step:" + step.digest.encode("ascii"))
+        for rollback_step in self.rollback:
+            hasher.update(b"rollback:" + rollback_step.digest.encode("ascii"))
+        return hasher.hexdigest()
+
+    def step_digests(self) -> Dict[str, str]:
+        """Step ID -> content digest, for comparing two plans step by step."""
+        return {step.id: step.digest for step in self.steps}
 
 
 class ApplyStatus(str, Enum):
@@ -192,6 +256,32 @@ class DeploymentReport(BaseModel):
     errors: List[str] = Field(default_factory=list)
 
 
+class FleetReport(BaseModel):
+    """Aggregate report for a fleet of installers run together.
+
+    ``phase_durations`` are wall-clock times of each phase across the whole
+    fleet; ``installer_phase_durations`` break them down per installer.
+    """
+
+    id: str = Field(..., description="Unique fleet run ID")
+    environment: str
+    result: ApplyStatus = Field(..., description="SUCCESS if every installer succeeded, PARTIAL if some did")
+    started_at: datetime
+    completed_at: datetime
+    duration_sec: float
+    reports: Dict[str, DeploymentReport] = Field(
+        default_factory=dict, description="Per-capability deployment reports (installers that applied)"
+    )
+    errors: Dict[str, str] = Field(default_factory=dict, description="Capability -> first failure")
+    blocked: List[str] = Field(default_factory=list, description="Capabilities skipped because a dependency failed")
+    phase_durations: Dict[str, float] = Field(default_factory=dict)
+    installer_phase_durations: Dict[str, Dict[str, float]] = Field(default_factory=dict)
+    critical_path: List[str] = Field(
+        default_factory=list, description="Dependency chain with the longest total apply time"
+    )
+    critical_path_seconds: float = 0.0
+
+
 class RollbackResult(BaseModel):
     """Result of executing a rollback plan."""
 
@@ -0,0 +1,183 @@
+"""
+Project topology snapshot for warming Railway provider caches.
+
+A single nested GraphQL query returns a project's environments, services,
+service instances, latest deployments and domains, replacing the separate
+list/lookup queries the provider would otherwise issue per service.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+PROJECT_SNAPSHOT_QUERY = """
+    query ProjectSnapshot($projectId: String!) {
+        project(id: $projectId) {
+            id
+            name
+            environments {
+                edges {
+                    node {
+                        id
+                        name
+                    }
+                }
+            }
+            services(first: 100) {
+                edges {
+                    node {
+                        id
+                        name
+                        templateServiceId
+                        domains {
+                            serviceDomains {
+                                domain
+                            }
+                        }
+                        serviceInstances {
+                            edges {
+                                node {
+                                    id
+                                    environmentId
+                                    latestDeployment {
+                                        id
+                                        status
+                                        createdAt
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+"""
+
+
+def _nodes(connection: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Unwrap a GraphQL ``{ edges { node } }`` connection."""
+    edges = (connection or {}).get("edges") or []
+    return [edge.get("node") or {} for edge in edges]
+
+
+class ProjectSnapshot:
+    """Point-in-time view of a Railway project's topology.
+
+    Provides O(1) lookups by name and ID for environments and services, and
+    by (service ID, environment ID) for service instances.
+    """
+
+    def __init__(
+        self,
+        project_id: str,
+        *,
+        name: Optional[str] = None,
+        environments: Optional[Dict[str, str]] = None,
+        services: Optional[Dict[str, Dict[str, Any]]] = None,
+        instances: Optional[Dict[Tuple[str, str], Dict[str, Any]]] = None,
+        domains: Optional[Dict[str, List[str]]] = None,
+        fetched_at: Optional[float] = None,
+    ) -> None:
+        """Initialize snapshot.
+
+        Args:
+            project_id: Railway project ID
+            name: Project name
+            environments: Environment name -> environment ID
+            services: Service name -> service node (id, name, templateServiceId)
+            instances: (service ID, environment ID) -> service instance node
+            domains: Service ID -> public domains
+            fetched_at: Epoch seconds the snapshot was taken
+        """
+        self.project_id = project_id
+        self.name = name
+        self.environments = environments or {}
+        self.services = services or {}
+        self.instances = instances or {}
+        self.domains = domains or {}
+        self.fetched_at = fetched_at if fetched_at is not None else time.time()
+        self.variables: Dict[Tuple[str, str], Dict[str, str]] = {}
+        self._services_by_id = {svc["id"]: svc for svc in self.services.values() if svc.get("id")}
+
+    @classmethod
+    def from_response(cls, project_id: str, data: Dict[str, Any]) -> ProjectSnapshot:
+        """Build a snapshot from a ``PROJECT_SNAPSHOT_QUERY`` result.
+
+        Args:
+            project_id: Railway project ID
+            data: GraphQL ``data`` payload
+
+        Returns:
+            ProjectSnapshot instance
+        """
+        project = data.get("project") or {}
+        environments = {
+            node["name"]: node["id"]
+            for node in _nodes(project.get("environments"))
+            if node.get("name") and node.get("id")
+        }
+
+        services: Dict[str, Dict[str, Any]] = {}
+        instances: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        domains: Dict[str, List[str]] = {}
+        for node in _nodes(project.get("services")):
+            service_id = node.get("id")
+            if not service_id or not node.get("name"):
+                continue
+            services[node["name"]] = {
+                "id": service_id,
+                "name": node["name"],
+                "templateServiceId": node.get("templateServiceId"),
+            }
+            service_domains = ((node.get("domains") or {}).get("serviceDomains")) or []
+            domains[service_id] = [d["domain"] for d in service_domains if d.get("domain")]
+            for instance in _nodes(node.get("serviceInstances")):
+                env_id = instance.get("environmentId")
+                if env_id:
+                    instances[(service_id, env_id)] = instance
+
+        return cls(
+            project_id,
+            name=project.get("name"),
+            environments=environments,
+            services=services,
+            instances=instances,
+            domains=domains,
+        )
+
+    @property
+    def age_seconds(self) -> float:
+        """Seconds since the snapshot was taken."""
+        return time.time() - self.fetched_at
+
+    def environment_id(self, name: str) -> Optional[str]:
+        """Look up an environment ID by name."""
+        return self.environments.get(name)
+
+    def service_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        """Look up a service node by name."""
+        return self.services.get(name)
+
+    def service_by_id(self, service_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a service node by ID."""
+        return self._services_by_id.get(service_id)
+
+    def instance(self, service_id: str, environment_id: str) -> Optional[Dict[str, Any]]:
+        """Look up the service instance for a service/environment."""
+        return self.instances.get((service_id, environment_id))
+
+    def latest_deployment(self, service_id: str, environment_id: str) -> Optional[Dict[str, Any]]:
+        """Latest deployment of a service in an environment, if any."""
+        instance = self.instance(service_id, environment_id)
+        return (instance or {}).get("latestDeployment")
+
+    def domain(self, service_id: str) -> Optional[str]:
+        """First public domain of a service, if any."""
+        domains = self.domains.get(service_id) or []
+        return domains[0] if domains else None
+
+    def service_variables(self, service_id: str, environment_id: str) -> Optional[Dict[str, str]]:
+        """Variables captured for a service/environment (None if not prefetched)."""
+        return self.variables.get((service_id, environment_id))
@@ -0,0 +1,254 @@
+"""
+Railway GraphQL subscriptions over websockets.
+
+Implements the client side of the ``graphql-transport-ws`` protocol (the
+"graphql-ws" library protocol) so deployment status changes and log lines are
+pushed to us instead of being polled for. One socket multiplexes any number
+of subscriptions.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import websockets
+from websockets.asyncio.client import ClientConnection, connect
+
+from .railway import RailwayAPIError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WS_URL = "wss://backboard.railway.app/graphql/v2"
+GRAPHQL_TRANSPORT_WS = "graphql-transport-ws"
+
+DEPLOYMENT_STATUS_SUBSCRIPTION = """
+    subscription DeploymentStatus($id: String!) {
+        deployment(id: $id) {
+            id
+            status
+        }
+    }
+"""
+
+DEPLOYMENT_LOGS_SUBSCRIPTION = """
+    subscription DeploymentLogs($deploymentId: String!, $filter: String, $limit: Int) {
+        deploymentLogs(deploymentId: $deploymentId, filter: $filter, limit: $limit) {
+            message
+            severity
+            timestamp
+        }
+    }
+"""
+
+
+class SubscriptionError(RailwayAPIError):
+    """Raised when a subscription is rejected or its socket fails."""
+
+
+class _Closed:
+    """Queue sentinel marking the end of a subscription stream."""
+
+    def __init__(self, error: Optional[Exception] = None) -> None:
+        self.error = error
+
+
+class GraphQLSubscriptionClient:
+    """Multiplexing ``graphql-transport-ws`` client.
+
+    Usage::
+
+        async with client.subscribe(DEPLOYMENT_STATUS_SUBSCRIPTION, {"id": dep_id}) as updates:
+            async for data in updates:
+                ...
+
+    The socket is opened lazily on the first subscription and shared by all
+    later ones. If it drops, every open stream raises :class:`SubscriptionError`
+    and the next subscription reconnects.
+    """
+
+    def __init__(
+        self,
+        api_token: str,
+        url: Optional[str] = None,
+        *,
+        connect_timeout: float = 10.0,
+    ) -> None:
+        """Initialize subscription client.
+
+        Args:
+            api_token: Railway API token
+            url: Websocket endpoint (defaults to RAILWAY_WS_URL env var or Railway's endpoint)
+            connect_timeout: Seconds to wait for the socket and ``connection_ack``
+        """
+        self.api_token = api_token
+        self.url = url or os.getenv("RAILWAY_WS_URL", DEFAULT_WS_URL)
+        self.connect_timeout = connect_timeout
+        self._connection: Optional[ClientConnection] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._streams: Dict[str, asyncio.Queue] = {}
+        self._connect_lock = asyncio.Lock()
+        self._next_id = 0
+
+    @property
+    def connected(self) -> bool:
+        """Whether the socket is open and acknowledged."""
+        return self._connection is not None and self._reader is not None and not self._reader.done()
+
+    async def connect(self) -> None:
+        """Open the socket and complete the ``connection_init`` handshake.
+
+        Raises:
+            SubscriptionError: If the socket cannot be opened or is not acknowledged
+        """
+        async with self._connect_lock:
+            if self.connected:
+                return
+            try:
+                connection = await asyncio.wait_for(
+                    connect(
+                        self.url,
+                        subprotocols=[GRAPHQL_TRANSPORT_WS],
+                        additional_headers={"Authorization": f"Bearer {self.api_token}"},
+                    ),
+                    self.connect_timeout,
+                )
+                await connection.send(
+                    json.dumps(
+                        {
+                            "type": "connection_init",
+                            "payload": {"Authorization": f"Bearer {self.api_token}"},
+                        }
+                    )
+                )
+                while True:
+                    message = json.loads(await asyncio.wait_for(connection.recv(), self.connect_timeout))
+                    if message.get("type") == "connection_ack":
+                        break
+                    if message.get("type") == "ping":
+                        await connection.send(json.dumps({"type": "pong"}))
+                        continue
+                    await connection.close()
+                    raise SubscriptionError(f"Unexpected handshake message: {message}")
+            except (OSError, asyncio.TimeoutError, websockets.WebSocketException) as exc:
+                raise SubscriptionError(f"Subscription socket unavailable at {self.url}: {exc}") from exc
+
+            self._connection = connection
+            self._reader = asyncio.ensure_future(self._read_loop(connection))
+            logger.debug("Subscription socket connected to %s", self.url)
+
+    async def close(self) -> None:
+        """Close the socket and end every open stream."""
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            await connection.close()
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+            self._reader = None
+
+    async def _read_loop(self, connection: ClientConnection) -> None:
+        error: Optional[Exception] = None
+        try:
+            async for raw in connection:
+                message = json.loads(raw)
+                kind = message.get("type")
+                stream = self._streams.get(message.get("id", ""))
+                if kind == "ping":
+                    await connection.send(json.dumps({"type": "pong"}))
+                elif kind == "next" and stream is not None:
+                    stream.put_nowait(message.get("payload") or {})
+                elif kind == "error" and stream is not None:
+                    messages = [e.get("message", str(e)) for e in message.get("payload") or []]
+                    stream.put_nowait(_Closed(SubscriptionError(f"GraphQL errors: {'; '.join(messages)}")))
+                elif kind == "complete" and stream is not None:
+                    stream.put_nowait(_Closed())
+        except websockets.ConnectionClosed as exc:
+            error = SubscriptionError(f"Subscription socket closed: {exc}")
+        except Exception as exc:  # malformed frames end the connection for everyone
+            error = SubscriptionError(f"Subscription socket failed: {exc}")
+        finally:
+            if self._connection is connection:
+                self._connection = None
+            for stream in self._streams.values():
+                stream.put_nowait(_Closed(error or SubscriptionError("Subscription socket closed")))
+
+    @asynccontextmanager
+    async def subscribe(
+        self, query: str, variables: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[AsyncIterator[Dict[str, Any]]]:
+        """Start a subscription; the subscribe message is sent on entry.
+
+        Yields:
+            Async iterator of ``data`` payloads, ending when the server completes
+            the subscription
+
+        Raises:
+            SubscriptionError: On connection failure, GraphQL errors or a dropped socket
+        """
+        await self.connect()
+        self._next_id += 1
+        sub_id = str(self._next_id)
+        stream: asyncio.Queue = asyncio.Queue()
+        self._streams[sub_id] = stream
+        connection = self._connection
+        finished = False
+        try:
+            await connection.send(
+                json.dumps(
+                    {
+                        "id": sub_id,
+                        "type": "subscribe",
+                        "payload": {"query": query, "variables": variables or {}},
+                    }
+                )
+            )
+
+            async def _iterate() -> AsyncIterator[Dict[str, Any]]:
+                nonlocal finished
+                while True:
+                    item = await stream.get()
+                    if isinstance(item, _Closed):
+                        finished = True
+                        if item.error is not None:
+                            raise item.error
+                        return
+                    if item.get("errors"):
+                        messages = [e.get("message", str(e)) for e in item["errors"]]
+                        raise SubscriptionError(f"GraphQL errors: {'; '.join(messages)}")
+                    yield item.get("data") or {}
+
+            yield _iterate()
+        except websockets.WebSocketException as exc:
+            raise SubscriptionError(f"Subscription failed: {exc}") from exc
+        finally:
+            self._streams.pop(sub_id, None)
+            if not finished and connection is self._connection and connection is not None:
+                try:
+                    await connection.send(json.dumps({"id": sub_id, "type": "complete"}))
+                except websockets.WebSocketException:
+                    pass
+
+    async def deployment_status_updates(self, deployment_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the deployment node every time its status changes."""
+        async with self.subscribe(DEPLOYMENT_STATUS_SUBSCRIPTION, {"id": deployment_id}) as updates:
+            async for data in updates:
+                yield data.get("deployment") or {}
+
+    async def deployment_logs(
+        self,
+        deployment_id: str,
+        *,
+        filter: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield deployment log lines (``message``, ``severity``, ``timestamp``) as they arrive."""
+        variables = {"deploymentId": deployment_id, "filter": filter, "limit": limit}
+        async with self.subscribe(DEPLOYMENT_LOGS_SUBSCRIPTION, variables) as updates:
+            async for data in updates:
+                lines = data.get("deploymentLogs") or []
+                for line in [lines] if isinstance(lines, dict) else lines:
+                    yield line
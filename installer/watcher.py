@@ -0,0 +1,286 @@
+"""
+Multiplexed deployment watcher for the Railway provider.
+
+Instead of one polling loop per deployment, a single watcher tracks every
+pending deployment (or service instance) and checks all of the ones that are
+due in one batched GraphQL request per tick. Each target polls quickly right
+after it is registered and backs off while its status stays unchanged, so
+long builds cost few requests without delaying short ones.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from .graphql_batch import GraphQLOperation
+from .railway import (
+    DEPLOYMENT_FAILURE_STATUSES,
+    RailwayAPIError,
+    deployment_status_operation,
+    service_instance_operation,
+)
+
+if TYPE_CHECKING:
+    from .railway import RailwayProvider
+
+logger = logging.getLogger(__name__)
+
+# Statuses after which a deployment will not change again
+TERMINAL_STATUSES = DEPLOYMENT_FAILURE_STATUSES | {"SUCCESS"}
+
+
+class _WatchTarget:
+    """Bookkeeping for one watched deployment or service instance."""
+
+    def __init__(
+        self,
+        key: Tuple[str, ...],
+        operation: Callable[[], GraphQLOperation],
+        extract: Callable[[Any], Optional[Dict[str, Any]]],
+        deadline: float,
+        interval: float,
+        future: Future,
+    ) -> None:
+        self.key = key
+        self.operation = operation
+        self.extract = extract
+        self.deadline = deadline
+        self.interval = interval
+        self.next_poll = 0.0
+        self.last_status: Optional[str] = None
+        self.future = future
+
+
+class DeploymentWatcher:
+    """Tracks many deployments and polls them together.
+
+    ``watch_deployment`` / ``watch_service_instance`` return futures that
+    resolve with the deployment node (``{"id", "status", ...}``) once it
+    reaches a terminal status, or fail with :class:`RailwayAPIError` on
+    timeout or a non-transient API error. Futures for the same target are
+    shared, so concurrent waiters never add requests.
+
+    Polling runs on a daemon thread that exits when nothing is being watched.
+    """
+
+    def __init__(
+        self,
+        provider: RailwayProvider,
+        *,
+        min_interval: float = 2.0,
+        max_interval: float = 30.0,
+        backoff: float = 1.5,
+    ) -> None:
+        """Initialize watcher.
+
+        Args:
+            provider: Provider whose batcher sends the status queries
+            min_interval: Poll interval right after a target is added or its status changes
+            max_interval: Upper bound the interval backs off to while status is unchanged
+            backoff: Interval multiplier applied after each unchanged poll
+        """
+        self.provider = provider
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.backoff = max(1.0, backoff)
+        self._targets: Dict[Tuple[str, ...], _WatchTarget] = {}
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self.ticks = 0
+
+    def watch_deployment(
+        self,
+        deployment_id: str,
+        *,
+        timeout_seconds: float = 600,
+        callback: Optional[Callable[[Future], None]] = None,
+    ) -> Future:
+        """Watch a deployment until it reaches a terminal status.
+
+        Args:
+            deployment_id: Deployment ID
+            timeout_seconds: Fail the future after this long
+            callback: Called with the future once it resolves
+
+        Returns:
+            Future resolved with the deployment node
+        """
+        return self._watch(
+            ("deployment", deployment_id),
+            lambda: deployment_status_operation(deployment_id),
+            lambda value: value or None,
+            timeout_seconds,
+            callback,
+        )
+
+    def watch_service_instance(
+        self,
+        service_id: str,
+        environment_id: str,
+        *,
+        timeout_seconds: float = 600,
+        callback: Optional[Callable[[Future], None]] = None,
+    ) -> Future:
+        """Watch a service instance until its latest deployment is terminal.
+
+        Args:
+            service_id: Service ID
+            environment_id: Environment ID
+            timeout_seconds: Fail the future after this long
+            callback: Called with the future once it resolves
+
+        Returns:
+            Future resolved with the latest deployment node
+        """
+        return self._watch(
+            ("instance", service_id, environment_id),
+            lambda: service_instance_operation(service_id, environment_id),
+            lambda value: (value or {}).get("latestDeployment"),
+            timeout_seconds,
+            callback,
+        )
+
+    def _watch(
+        self,
+        key: Tuple[str, ...],
+        operation: Callable[[], GraphQLOperation],
+        extract: Callable[[Any], Optional[Dict[str, Any]]],
+        timeout_seconds: float,
+        callback: Optional[Callable[[Future], None]],
+    ) -> Future:
+        with self._condition:
+            target = self._targets.get(key)
+            if target is None:
+                target = _WatchTarget(
+                    key,
+                    operation,
+                    extract,
+                    time.monotonic() + timeout_seconds,
+                    self.min_interval,
+                    Future(),
+                )
+                self._targets[key] = target
+            else:
+                target.deadline = max(target.deadline, time.monotonic() + timeout_seconds)
+            future = target.future
+            self._ensure_running()
+            self._condition.notify_all()
+        if callback is not None:
+            future.add_done_callback(callback)
+        return future
+
+    def pending(self) -> int:
+        """Number of targets still being watched."""
+        with self._condition:
+            return len(self._targets)
+
+    def poll_once(self) -> float:
+        """Poll every due target in one batched request.
+
+        Targets due within ``min_interval`` ride along with the batch so
+        their next request is saved.
+
+        Returns:
+            Seconds until the next target is due (0 if none remain)
+        """
+        now = time.monotonic()
+        with self._condition:
+            targets = list(self._targets.values())
+        due = [t for t in targets if t.next_poll <= now + self.min_interval or t.deadline <= now]
+        if due and any(t.next_poll <= now or t.deadline <= now for t in due):
+            self.ticks += 1
+            results = self.provider.batcher.execute_many([t.operation() for t in due])
+            for target, result in zip(due, results):
+                self._update(target, result, now)
+
+        with self._condition:
+            if not self._targets:
+                return 0.0
+            next_due = min(min(t.next_poll, t.deadline) for t in self._targets.values())
+        return max(0.0, next_due - time.monotonic())
+
+    def _update(self, target: _WatchTarget, result: Any, now: float) -> None:
+        label = " ".join(target.key)
+        if isinstance(result, Exception):
+            if "not found" not in str(result).lower():
+                self._resolve(target, error=result)
+                return
+            deployment, status = None, None
+        else:
+            deployment = target.extract(result)
+            status = ((deployment or {}).get("status") or "").upper() or None
+
+        if status in TERMINAL_STATUSES:
+            if status == "SUCCESS":
+                logger.info("Watched %s completed successfully", label)
+            else:
+                logger.error("Watched %s finished with status: %s", label, status)
+            self._resolve(target, result=deployment)
+            return
+
+        if target.deadline <= now:
+            self._resolve(
+                target,
+                error=RailwayAPIError(f"Timed out waiting for {label} (last status: {status or 'unknown'})"),
+            )
+            return
+
+        if status != target.last_status:
+            target.interval = self.min_interval
+        else:
+            target.interval = min(self.max_interval, target.interval * self.backoff)
+        target.last_status = status
+        target.next_poll = now + target.interval
+        logger.debug("Watched %s status: %s (next check in %.1fs)", label, status, target.interval)
+
+    def _resolve(
+        self,
+        target: _WatchTarget,
+        *,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[Exception] = None,
+    ) -> None:
+        with self._condition:
+            self._targets.pop(target.key, None)
+        if error is not None:
+            target.future.set_exception(error)
+        else:
+            target.future.set_result(result)
+
+    def _ensure_running(self) -> None:
+        """Start the polling thread if it is not already running (caller holds the lock)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="deployment-watcher", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                delay = self.poll_once()
+            except Exception as exc:  # keep watching; per-target timeouts still apply
+                logger.warning("Deployment watcher poll failed: %s", exc)
+                delay = self.min_interval
+            with self._condition:
+                if not self._targets:
+                    self._thread = None
+                    return
+                # New targets wake the loop so they get their first (fast) poll promptly
+                self._condition.wait(timeout=delay)
+
+    def wait_all(self, futures: List[Future], timeout: Optional[float] = None) -> List[Any]:
+        """Block until every future resolves.
+
+        Returns:
+            Per-future deployment node, or the exception it failed with
+        """
+        results: List[Any] = []
+        for future in futures:
+            try:
+                results.append(future.result(timeout=timeout))
+            except Exception as exc:
+                results.append(exc)
+        return results
@@ -24,18 +24,27 @@ from .events import (
     AgentCompletedEvent,
     AgentInvokedEvent,
     BaseEvent,
+    BatchingPublisher,
     DeploymentCompletedEvent,
     DeploymentStartedEvent,
     EventBus,
+    EventCodec,
     EventType,
     FollowupRequiredEvent,
     FollowupSentEvent,
+    GzipStreamArchiver,
+    JSONCodec,
     MeetingCompletedEvent,
     MeetingScheduledEvent,
+    MsgpackCodec,
+    RetentionPolicy,
     SummaryGeneratedEvent,
     VoiceCallEndedEvent,
     VoiceCallStartedEvent,
     create_event_bus,
+    default_ordering_key,
+    get_codec,
+    register_codec,
 )
 from .health import (
     HealthCheck,
@@ -74,18 +83,27 @@ __all__ = [
     "AgentCompletedEvent",
     "AgentInvokedEvent",
     "BaseEvent",
+    "BatchingPublisher",
     "DeploymentCompletedEvent",
     "DeploymentStartedEvent",
     "EventBus",
+    "EventCodec",
     "EventType",
     "FollowupRequiredEvent",
     "FollowupSentEvent",
+    "GzipStreamArchiver",
+    "JSONCodec",
     "MeetingCompletedEvent",
     "MeetingScheduledEvent",
+    "MsgpackCodec",
+    "RetentionPolicy",
     "SummaryGeneratedEvent",
     "VoiceCallEndedEvent",
     "VoiceCallStartedEvent",
     "create_event_bus",
+    "default_ordering_key",
+    "get_codec",
+    "register_codec",
     # Health
     "HealthCheck",
     "HealthChecker",
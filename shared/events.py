@@ -7,14 +7,37 @@ using Redis Streams as the transport layer.
 
 from __future__ import annotations
 
+import asyncio
+import base64
+import gzip
+import inspect
 import json
 import logging
+import os
+import tempfile
+import time
 import uuid
+import zlib
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 from pydantic import BaseModel, Field
+from redis.exceptions import ResponseError
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None  # type: ignore[assignment]
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None  # type: ignore[assignment]
 
 logger = logging.getLogger(__name__)
 
@@ -192,23 +215,333 @@ EVENT_TYPE_REGISTRY: Dict[str, type[BaseEvent]] = {
 }
 
 
+class EventCodec(ABC):
+    """Serializes events into stream entry payloads.
+
+    The bus writes ``<name>/<version>`` into each entry's ``codec`` field and
+    readers decode with the codec of that name, so replicas on different
+    codecs interoperate as long as every reader knows every writer's codec.
+    Subclasses set ``name``; bump ``version`` when the payload layout
+    changes incompatibly.
+    """
+
+    name: str
+    version: int = 1
+
+    @abstractmethod
+    def encode(self, event: BaseEvent) -> bytes:
+        """Payload bytes for ``event``."""
+
+    @abstractmethod
+    def decode(self, data: bytes, event_class: type[BaseEvent]) -> BaseEvent:
+        """Rebuild an ``event_class`` instance from :meth:`encode` output."""
+
+
+class JSONCodec(EventCodec):
+    """JSON text; readable by replicas that predate codecs."""
+
+    name = "json"
+
+    def encode(self, event: BaseEvent) -> bytes:
+        return event.model_dump_json().encode("utf-8")
+
+    def decode(self, data: bytes, event_class: type[BaseEvent]) -> BaseEvent:
+        return event_class.model_validate_json(data)
+
+
+class MsgpackCodec(EventCodec):
+    """MessagePack; smaller and faster to parse than JSON (requires ``msgpack``)."""
+
+    name = "msgpack"
+
+    def __init__(self) -> None:
+        if msgpack is None:
+            raise ImportError("MsgpackCodec requires the 'msgpack' package (pip install 'budai[events]')")
+
+    def encode(self, event: BaseEvent) -> bytes:
+        return msgpack.packb(event.model_dump(mode="json"), use_bin_type=True)
+
+    def decode(self, data: bytes, event_class: type[BaseEvent]) -> BaseEvent:
+        return event_class.model_validate(msgpack.unpackb(data, raw=False))
+
+
+_CODEC_TYPES: Dict[str, Callable[[], EventCodec]] = {"json": JSONCodec, "msgpack": MsgpackCodec}
+_CODECS: Dict[str, EventCodec] = {}
+
+
+def register_codec(codec: EventCodec) -> None:
+    """Make a codec available to every EventBus for encoding and decoding."""
+    _CODECS[codec.name] = codec
+
+
+def get_codec(name: str) -> EventCodec:
+    """Codec registered under ``name``.
+
+    Raises:
+        ValueError: If no codec has that name
+        ImportError: If the codec's optional dependency is missing
+    """
+    if name not in _CODECS:
+        if name not in _CODEC_TYPES:
+            raise ValueError(f"Unknown event codec: {name}")
+        _CODECS[name] = _CODEC_TYPES[name]()
+    return _CODECS[name]
+
+
+class RetentionPolicy(BaseModel):
+    """How long entries of an event type are kept on the stream.
+
+    Unset limits fall back to the bus's ``default_retention`` (and are
+    unbounded there). Event types sharing a stream are trimmed by the most
+    permissive policy among them, so a chatty type with a short policy never
+    trims another type's entries early.
+    """
+
+    max_len: Optional[int] = Field(None, description="Approximate entries kept (XADD MAXLEN ~)")
+    max_age_seconds: Optional[float] = Field(None, description="Age after which entries are trimmed (MINID)")
+
+
+# Trimmed entries of a stream, oldest first, handed over before they are deleted
+StreamArchiver = Callable[[str, List[Tuple[bytes, Dict[bytes, bytes]]]], Union[None, Awaitable[None]]]
+
+
+class GzipStreamArchiver:
+    """Archives trimmed stream ranges as gzipped JSON-lines files.
+
+    Each call writes ``<directory>/<stream>/<first id>_<last id>.jsonl.gz``
+    with one ``{"id": ..., "fields": {...}}`` object per entry. Field values
+    that are not UTF-8 text are stored as ``{"base64": ...}``.
+    """
+
+    def __init__(self, directory: Path | str) -> None:
+        self.directory = Path(directory)
+
+    async def __call__(self, stream: str, entries: List[Tuple[bytes, Dict[bytes, bytes]]]) -> None:
+        await asyncio.to_thread(self._write, stream, entries)
+
+    @staticmethod
+    def _text(value: Any) -> Any:
+        if not isinstance(value, bytes):
+            return value
+        try:
+            return value.decode("utf-8")
+        except UnicodeDecodeError:
+            return {"base64": base64.b64encode(value).decode("ascii")}
+
+    def _write(self, stream: str, entries: List[Tuple[bytes, Dict[bytes, bytes]]]) -> None:
+        if not entries:
+            return
+        target_dir = self.directory / stream.replace(":", "_")
+        target_dir.mkdir(parents=True, exist_ok=True)
+        first, last = _as_str(entries[0][0]), _as_str(entries[-1][0])
+        fd, tmp_path = tempfile.mkstemp(dir=target_dir, prefix=".archive-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as handle:
+                for message_id, fields in entries:
+                    record = {
+                        "id": _as_str(message_id),
+                        "fields": {_as_str(key): self._text(value) for key, value in fields.items()},
+                    }
+                    handle.write(json.dumps(record).encode("utf-8") + b"\n")
+            os.replace(tmp_path, target_dir / f"{first}_{last}.jsonl.gz")
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+
+def default_ordering_key(event: BaseEvent) -> Optional[str]:
+    """Key whose events a concurrent consumer handles in stream order.
+
+    Events sharing a ``correlation_id`` (or, without one, a ``meeting_id``)
+    are handled one after another; events without either run freely.
+    """
+    return event.correlation_id or getattr(event, "meeting_id", None)
+
+
+def _type_name(event_type: Any) -> str:
+    """Event type as its wire value (``EventType`` members format as their name)."""
+    return event_type.value if isinstance(event_type, Enum) else str(event_type)
+
+
 class EventBus:
     """Simple event bus abstraction over Redis Streams.
 
     Provides publish/subscribe pattern for inter-service communication.
     Services can publish events and subscribe to event types they care about.
+
+    By default every event goes to the single ``budai:events`` stream. With
+    ``per_type_streams`` each event type gets its own stream
+    (``budai:events:<type>``), so consumers only read the types they handle,
+    and with ``partitions`` above 1 each stream is split into that many
+    hash partitions (``...:<n>``) by ``partition_key``. Events sharing a
+    partition key always land in the same partition, which keeps their
+    relative order.
     """
 
-    def __init__(self, redis_client: Any) -> None:
+    def __init__(
+        self,
+        redis_client: Any,
+        *,
+        retention: Optional[Dict[str, RetentionPolicy]] = None,
+        default_retention: Optional[RetentionPolicy] = None,
+        dead_letter_retention: Optional[RetentionPolicy] = None,
+        archiver: Optional[StreamArchiver] = None,
+        per_type_streams: bool = False,
+        partitions: int = 1,
+        partition_key: Callable[[BaseEvent], Optional[str]] = default_ordering_key,
+        codec: Union[str, EventCodec] = "json",
+        compress_threshold: Optional[int] = None,
+        reclaim_min_idle_ms: int = 300_000,
+        max_deliveries: int = 5,
+    ) -> None:
         """Initialize event bus with Redis client.
 
         Args:
             redis_client: Redis client (can be redis-py or aioredis)
+            retention: Event type -> retention policy
+            default_retention: Policy for event types without one (defaults to
+                100k entries / 7 days)
+            dead_letter_retention: Policy for ``dead_letter_stream`` (defaults to
+                ``default_retention``)
+            archiver: Receives trimmed entries before they are deleted; when
+                set, all trimming happens in :meth:`trim_streams` instead of on XADD
+            per_type_streams: Route each event type to its own stream
+            partitions: Hash partitions per stream
+            partition_key: Event -> partition key (events without one are spread by event_id)
+            codec: Codec (or registered codec name) used to encode published events;
+                any registered codec is decoded
+            compress_threshold: Payloads of at least this many bytes are zstd-compressed
+                (None disables compression; requires ``zstandard``)
+            reclaim_min_idle_ms: Pending entries idle this long are reclaimed by
+                :meth:`reclaim_pending`. An entry stays pending from its read until
+                the whole read has been handled, so this must exceed the longest
+                time a consumer spends on one read (``count`` events times the
+                slowest handler when handled sequentially); otherwise in-flight
+                events are handled twice
+            max_deliveries: Deliveries after which a failing entry is dead-lettered
+
+        Replicas that predate codecs only read uncompressed JSON entries, so
+        switch ``codec`` or enable compression once every consumer is upgraded.
+
+        Raises:
+            ValueError: If ``partitions`` is less than 1 or the codec is unknown
+            ImportError: If the codec or compression needs a missing package
         """
+        if partitions < 1:
+            raise ValueError("partitions must be at least 1")
+        self.codec = get_codec(codec) if isinstance(codec, str) else codec
+        if compress_threshold is not None and zstandard is None:
+            raise ImportError("Event compression requires the 'zstandard' package (pip install 'budai[events]')")
+        self.compress_threshold = compress_threshold
+        self._compressor = zstandard.ZstdCompressor() if compress_threshold is not None else None
+        self._decompressor: Optional[Any] = None
         self.redis = redis_client
+        self.retention: Dict[str, RetentionPolicy] = {
+            _type_name(event_type): policy for event_type, policy in (retention or {}).items()
+        }
+        self.default_retention = default_retention or RetentionPolicy(
+            max_len=100_000, max_age_seconds=7 * 24 * 3600
+        )
+        self.dead_letter_retention = dead_letter_retention
+        self.archiver = archiver
         self.stream_name = "budai:events"
         self.consumer_group = "budai-services"
+        # Entries that were delivered more than max_deliveries times end up here
+        self.dead_letter_stream = "budai:events:dead-letter"
+        self.max_deliveries = max_deliveries
+        # Pending entries idle this long are assumed lost with a crashed consumer
+        # or left by a failed handler
+        self.reclaim_min_idle_ms = reclaim_min_idle_ms
+        self.per_type_streams = per_type_streams
+        self.partitions = partitions
+        self.partition_key = partition_key
         self._handlers: Dict[str, List[Callable[[BaseEvent], None]]] = {}
+        # Types whose streams retention and reclaiming cover
+        self._known_types: Set[str] = {event_type.value for event_type in EventType}
+
+    def _stream(self, event_type: Optional[str], partition: int) -> str:
+        name = f"{self.stream_name}:{event_type}" if event_type is not None else self.stream_name
+        return f"{name}:{partition}" if self.partitions > 1 else name
+
+    def stream_for(self, event: BaseEvent) -> str:
+        """Stream an event is published to."""
+        event_type = _type_name(event.event_type)
+        self._known_types.add(event_type)
+        partition = 0
+        if self.partitions > 1:
+            key = self.partition_key(event) or event.event_id
+            partition = zlib.crc32(key.encode("utf-8")) % self.partitions
+        return self._stream(event_type if self.per_type_streams else None, partition)
+
+    def streams(
+        self,
+        event_types: Optional[Iterable[str]] = None,
+        *,
+        replica_index: int = 0,
+        replica_count: int = 1,
+    ) -> List[str]:
+        """Streams carrying ``event_types`` (every known type by default).
+
+        Partitions are dealt round-robin across ``replica_count`` replicas;
+        only those assigned to ``replica_index`` are returned.
+
+        Raises:
+            ValueError: If ``replica_index`` is outside ``range(replica_count)``
+        """
+        if not 0 <= replica_index < replica_count:
+            raise ValueError(f"replica_index must be in range({replica_count})")
+        if not self.per_type_streams:
+            types: List[Optional[str]] = [None]
+        elif event_types is None:
+            types = sorted(self._known_types | set(self._handlers) | set(self.retention))
+        else:
+            types = sorted({_type_name(event_type) for event_type in event_types})
+        partitions = [p for p in range(self.partitions) if p % replica_count == replica_index]
+        return [self._stream(event_type, partition) for event_type in types for partition in partitions]
+
+    def _stream_type(self, stream: str) -> Optional[str]:
+        """Event type a per-type stream carries (None for shared streams)."""
+        if not self.per_type_streams:
+            return None
+        return stream[len(self.stream_name) + 1 :].split(":", 1)[0]
+
+    def _stream_entry(self, event: BaseEvent) -> Dict[str, Union[str, bytes]]:
+        """Stream entry fields for an event."""
+        data = self.codec.encode(event)
+        codec = f"{self.codec.name}/{self.codec.version}"
+        if self._compressor is not None and len(data) >= self.compress_threshold:
+            data = self._compressor.compress(data)
+            codec += "+zstd"
+        return {
+            "event_type": _type_name(event.event_type),
+            "data": data,
+            "correlation_id": event.correlation_id or "",
+            "codec": codec,
+        }
+
+    def stream_retention(self, stream: str) -> RetentionPolicy:
+        """Effective retention of a stream: the most permissive policy of its event types."""
+        default = self.default_retention
+        event_type = self._stream_type(stream)
+        if stream == self.dead_letter_stream:
+            policies = [self.dead_letter_retention or default]
+        elif event_type is not None:
+            policies = [self.retention.get(event_type, default)]
+        else:
+            policies = [default, *self.retention.values()]
+        lengths = [default.max_len if p.max_len is None else p.max_len for p in policies]
+        ages = [default.max_age_seconds if p.max_age_seconds is None else p.max_age_seconds for p in policies]
+        return RetentionPolicy(
+            max_len=None if None in lengths else max(lengths),
+            max_age_seconds=None if None in ages else max(ages),
+        )
+
+    def _xadd_options(self, stream: str) -> Dict[str, Any]:
+        """XADD trimming arguments (none when an archiver must see entries first)."""
+        max_len = self.stream_retention(stream).max_len
+        if max_len is None or self.archiver is not None:
+            return {}
+        return {"maxlen": max_len, "approximate": True}
 
     async def publish(self, event: BaseEvent) -> str:
         """Publish an event to the bus.
@@ -219,18 +552,8 @@ class EventBus:
         Returns:
             Event ID (Redis stream message ID)
         """
-        event_data = event.model_dump()
-        event_json = json.dumps(event_data)
-
-        # Add to Redis stream
-        message_id = await self.redis.xadd(
-            self.stream_name,
-            {
-                "event_type": event.event_type,
-                "data": event_json,
-                "correlation_id": event.correlation_id or "",
-            },
-        )
+        stream = self.stream_for(event)
+        message_id = await self.redis.xadd(stream, self._stream_entry(event), **self._xadd_options(stream))
 
         logger.debug(
             "Published event %s (type=%s, correlation_id=%s)",
@@ -238,7 +561,113 @@ class EventBus:
             event.event_type,
             event.correlation_id,
         )
-        return str(message_id)
+        return _as_str(message_id)
+
+    async def publish_many(self, events: Iterable[BaseEvent]) -> List[str]:
+        """Publish several events in one pipelined round trip.
+
+        Entries are added in order. The pipeline is not transactional: if it
+        fails partway, some events may already be on the stream, so callers
+        that retry should expect duplicates.
+
+        Args:
+            events: Events to publish
+
+        Returns:
+            Redis stream message IDs, in the order of ``events``
+
+        Raises:
+            Exception: The first per-entry error reported by Redis
+        """
+        results = await self._xadd_pipelined(list(events))
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return [_as_str(result) for result in results]
+
+    async def _xadd_pipelined(self, events: List[BaseEvent]) -> List[Any]:
+        """XADD every event through one pipeline; failed entries come back as exceptions."""
+        if not events:
+            return []
+        pipe = self.redis.pipeline(transaction=False)
+        for event in events:
+            stream = self.stream_for(event)
+            pipe.xadd(stream, self._stream_entry(event), **self._xadd_options(stream))
+        results = await pipe.execute(raise_on_error=False)
+        logger.debug("Published %d events in one pipeline", len(events))
+        return list(results)
+
+    async def trim_streams(self, *, batch_size: int = 1000) -> int:
+        """Apply retention to every event stream and the dead-letter stream once.
+
+        Without an archiver, entries older than ``max_age_seconds`` are
+        trimmed with an approximate MINID (XADD already caps the length).
+        With one, entries beyond either limit are read oldest first, handed
+        to the archiver in batches and then trimmed exactly, so nothing is
+        dropped unarchived. Trimming never waits for consumers: entries that
+        are still pending are dropped like any other.
+
+        Args:
+            batch_size: Entries per archiver call
+
+        Returns:
+            Number of entries trimmed
+        """
+        trimmed = 0
+        for stream in [*self.streams(), self.dead_letter_stream]:
+            trimmed += await self._trim_stream(stream, batch_size)
+        return trimmed
+
+    async def _trim_stream(self, stream: str, batch_size: int) -> int:
+        policy = self.stream_retention(stream)
+        min_id: Optional[str] = None
+        if policy.max_age_seconds is not None:
+            min_id = f"{int((time.time() - policy.max_age_seconds) * 1000)}-0"
+
+        if self.archiver is None:
+            if min_id is None:
+                return 0
+            return int(await self.redis.xtrim(stream, minid=min_id, approximate=True) or 0)
+
+        excess = 0
+        if policy.max_len is not None:
+            excess = max(0, int(await self.redis.xlen(stream)) - policy.max_len)
+        trimmed = 0
+        while True:
+            batch = await self.redis.xrange(stream, "-", "+", count=batch_size) or []
+            expired = []
+            for message_id, fields in batch:
+                if trimmed + len(expired) < excess or (
+                    min_id is not None and _stream_id(message_id) < _stream_id(min_id)
+                ):
+                    expired.append((message_id, fields))
+                else:
+                    break
+            if not expired:
+                break
+            result = self.archiver(stream, expired)
+            if inspect.isawaitable(result):
+                await result
+            last_ms, last_seq = _stream_id(expired[-1][0])
+            trimmed += int(await self.redis.xtrim(stream, minid=f"{last_ms}-{last_seq + 1}", approximate=False) or 0)
+            if len(expired) < len(batch):
+                break
+        if trimmed:
+            logger.info("Trimmed %d entries from %s", trimmed, stream)
+        return trimmed
+
+    async def run_retention(self, interval: float = 300.0) -> None:
+        """Run :meth:`trim_streams` every ``interval`` seconds until cancelled.
+
+        One replica per deployment is enough; concurrent trimmers would hand
+        the same entries to the archiver more than once.
+        """
+        while True:
+            try:
+                await self.trim_streams()
+            except Exception as exc:
+                logger.exception("Error trimming event streams: %s", exc)
+            await asyncio.sleep(interval)
 
     def subscribe(self, event_type: str, handler: Callable[[BaseEvent], None]) -> None:
         """Subscribe to an event type.
@@ -247,54 +676,330 @@ class EventBus:
             event_type: Event type to subscribe to (e.g., EventType.MEETING_COMPLETED)
             handler: Callback function to handle events
         """
+        event_type = _type_name(event_type)
         if event_type not in self._handlers:
             self._handlers[event_type] = []
         self._handlers[event_type].append(handler)
         logger.info("Subscribed handler to event type: %s", event_type)
 
     async def start_consuming(
-        self, consumer_name: str, block_ms: int = 1000
+        self,
+        consumer_name: str,
+        block_ms: int = 1000,
+        *,
+        count: int = 10,
+        concurrency: int = 1,
+        ordering_key: Callable[[BaseEvent], Optional[str]] = default_ordering_key,
+        reclaim_interval: Optional[float] = 60.0,
+        replica_index: int = 0,
+        replica_count: int = 1,
     ) -> None:
-        """Start consuming events from the stream.
+        """Start consuming events from the bus.
+
+        The consumer reads the streams of the event types it subscribed to
+        (with ``per_type_streams``; otherwise the shared streams), limited to
+        the partitions assigned to ``replica_index`` of ``replica_count``.
+        Assignment is static: a replica's partitions wait for it while it is
+        down, so replicas should restart with the same index.
+
+        With ``concurrency`` above 1, the events of each read are handled in a
+        pool of up to that many concurrent handler calls: events with the same
+        ``ordering_key`` still run in stream order, and sync handlers run in a
+        thread pool so they don't block the event loop. Either way, once all of
+        a read's events have been handled, the ones whose handlers all
+        succeeded are acknowledged (one XACK per stream, pipelined). Events
+        with a failing handler stay pending.
+
+        Every ``reclaim_interval`` seconds the consumer also runs
+        :meth:`reclaim_pending`, taking over entries that a crashed consumer
+        left unacknowledged or whose handlers failed; handling a read must
+        take less than ``reclaim_min_idle_ms``.
 
         Args:
             consumer_name: Unique consumer name for this service instance
             block_ms: Milliseconds to block waiting for new events
+            count: Maximum messages per read
+            concurrency: Events handled at once (1 handles them sequentially)
+            ordering_key: Event -> key to serialize on (None: no ordering constraint)
+            reclaim_interval: Seconds between pending-entry reclaim passes (None disables them)
+            replica_index: This replica's position among the consumers of the group
+            replica_count: Number of replicas the partitions are spread across
+
+        Raises:
+            ValueError: If ``replica_index`` is outside ``range(replica_count)``
         """
-        # Create consumer group if it doesn't exist
-        try:
-            await self.redis.xgroup_create(
-                self.stream_name, self.consumer_group, id="0", mkstream=True
+        streams = self.streams(
+            self._handlers, replica_index=replica_index, replica_count=replica_count
+        )
+        if not streams:
+            logger.warning("Consumer %s has no streams to read (no subscriptions?)", consumer_name)
+            return
+
+        # Create consumer groups if they don't exist
+        for stream in streams:
+            try:
+                await self.redis.xgroup_create(stream, self.consumer_group, id="0", mkstream=True)
+                logger.info("Created consumer group %s on %s", self.consumer_group, stream)
+            except Exception:
+                # Group likely already exists
+                pass
+
+        logger.info(
+            "Starting event consumer: %s (%d streams, concurrency=%d)",
+            consumer_name,
+            len(streams),
+            concurrency,
+        )
+
+        executor: Optional[ThreadPoolExecutor] = None
+        semaphore: Optional[asyncio.Semaphore] = None
+        if concurrency > 1:
+            executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="event-handler")
+            semaphore = asyncio.Semaphore(concurrency)
+
+        reaper: Optional[asyncio.Task[None]] = None
+        if reclaim_interval is not None:
+            reaper = asyncio.create_task(
+                self._reap(streams, consumer_name, reclaim_interval, semaphore, executor, ordering_key),
+                name=f"event-reaper-{consumer_name}",
             )
-            logger.info("Created consumer group: %s", self.consumer_group)
-        except Exception:
-            # Group likely already exists
-            pass
 
-        logger.info("Starting event consumer: %s", consumer_name)
+        task = asyncio.current_task()
+        try:
+            while True:
+                # Before Python 3.12, asyncio.wait_for (which redis-py wraps socket
+                # writes in) can swallow a cancellation that races with the write
+                if task is not None and task.cancelling():
+                    raise asyncio.CancelledError
+
+                try:
+                    # Read new messages from the assigned streams
+                    messages = await self.redis.xreadgroup(
+                        self.consumer_group,
+                        consumer_name,
+                        {stream: ">" for stream in streams},
+                        count=count,
+                        block=block_ms,
+                    )
+
+                    if not messages:
+                        continue
+
+                    entries = [entry for _, stream_messages in messages for entry in stream_messages]
+                    failed = await self._handle_entries(entries, semaphore, executor, ordering_key)
+
+                    # Acknowledge the read at once; failed entries stay pending for the reaper
+                    await self._ack(
+                        {
+                            _as_str(stream): [
+                                message_id for message_id, _ in stream_messages if message_id not in failed
+                            ]
+                            for stream, stream_messages in messages
+                        }
+                    )
+
+                except Exception as exc:
+                    logger.exception("Error consuming events: %s", exc)
+        finally:
+            if reaper is not None:
+                reaper.cancel()
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _ack(self, message_ids: Dict[str, List[bytes]]) -> None:
+        """XACK entries, one command per stream in a single round trip."""
+        message_ids = {stream: ids for stream, ids in message_ids.items() if ids}
+        if len(message_ids) == 1:
+            [(stream, ids)] = message_ids.items()
+            await self.redis.xack(stream, self.consumer_group, *ids)
+        elif message_ids:
+            pipe = self.redis.pipeline(transaction=False)
+            for stream, ids in message_ids.items():
+                pipe.xack(stream, self.consumer_group, *ids)
+            await pipe.execute()
+
+    async def _reap(
+        self,
+        streams: List[str],
+        consumer_name: str,
+        interval: float,
+        semaphore: Optional[asyncio.Semaphore],
+        executor: Optional[ThreadPoolExecutor],
+        ordering_key: Callable[[BaseEvent], Optional[str]],
+    ) -> None:
+        """Background loop running :meth:`reclaim_pending` every ``interval`` seconds."""
+        while True:
+            try:
+                for stream in streams:
+                    await self._reclaim(stream, consumer_name, 100, semaphore, executor, ordering_key)
+            except Exception as exc:
+                logger.exception("Error reclaiming pending events: %s", exc)
+            await asyncio.sleep(interval)
+
+    async def reclaim_pending(
+        self, consumer_name: str, *, count: int = 100, streams: Optional[Iterable[str]] = None
+    ) -> int:
+        """Take over and handle entries stuck in the consumer group's pending list.
 
+        Entries idle for at least ``reclaim_min_idle_ms`` (typically left by a
+        consumer that crashed before acknowledging them) are claimed with
+        XAUTOCLAIM and handled again, with the delivery count in
+        ``event.metadata["delivery_count"]``; entries whose handlers fail again
+        stay pending. Entries delivered more than ``max_deliveries`` times are
+        moved to ``dead_letter_stream`` instead.
+
+        Args:
+            consumer_name: Consumer to claim the entries for
+            count: Entries claimed per XAUTOCLAIM call
+            streams: Streams to reclaim from (defaults to every stream of the bus)
+
+        Returns:
+            Number of entries claimed (redelivered or dead-lettered)
+        """
+        claimed = 0
+        for stream in self.streams() if streams is None else streams:
+            claimed += await self._reclaim(stream, consumer_name, count, None, None, default_ordering_key)
+        return claimed
+
+    async def _reclaim(
+        self,
+        stream: str,
+        consumer_name: str,
+        count: int,
+        semaphore: Optional[asyncio.Semaphore],
+        executor: Optional[ThreadPoolExecutor],
+        ordering_key: Callable[[BaseEvent], Optional[str]],
+    ) -> int:
+        claimed_total = 0
+        cursor: Any = "0-0"
         while True:
             try:
-                # Read new messages from stream
-                messages = await self.redis.xreadgroup(
+                response = await self.redis.xautoclaim(
+                    stream,
                     self.consumer_group,
                     consumer_name,
-                    {self.stream_name: ">"},
-                    count=10,
-                    block=block_ms,
+                    min_idle_time=self.reclaim_min_idle_ms,
+                    start_id=cursor,
+                    count=count,
+                )
+            except ResponseError as exc:
+                if str(exc).startswith("NOGROUP"):
+                    return claimed_total  # nobody has consumed this stream yet
+                raise
+            cursor, claimed = response[0], response[1]
+            if claimed:
+                claimed_total += len(claimed)
+                await self._redeliver(stream, claimed, semaphore, executor, ordering_key)
+            if _as_str(cursor) == "0-0":
+                break
+        if claimed_total:
+            logger.info("Reclaimed %d pending events from %s for %s", claimed_total, stream, consumer_name)
+        return claimed_total
+
+    async def _redeliver(
+        self,
+        stream: str,
+        claimed: List[Tuple[bytes, Optional[Dict[bytes, bytes]]]],
+        semaphore: Optional[asyncio.Semaphore],
+        executor: Optional[ThreadPoolExecutor],
+        ordering_key: Callable[[BaseEvent], Optional[str]],
+    ) -> None:
+        """Handle or dead-letter claimed entries, then acknowledge all but the failed ones."""
+        pipe = self.redis.pipeline(transaction=False)
+        for message_id, _ in claimed:
+            pipe.xpending_range(stream, self.consumer_group, message_id, message_id, 1)
+        pending = await pipe.execute()
+        deliveries = {
+            message_id: (rows[0]["times_delivered"] if rows else 1)
+            for (message_id, _), rows in zip(claimed, pending)
+        }
+
+        retry: List[Tuple[bytes, Dict[bytes, bytes]]] = []
+        dead: List[Tuple[bytes, Dict[bytes, bytes]]] = []
+        for message_id, message_data in claimed:
+            if message_data is None:
+                continue  # trimmed from the stream; nothing left to handle
+            if deliveries[message_id] > self.max_deliveries:
+                dead.append((message_id, message_data))
+            else:
+                retry.append((message_id, message_data))
+
+        if dead:
+            pipe = self.redis.pipeline(transaction=False)
+            for message_id, message_data in dead:
+                pipe.xadd(
+                    self.dead_letter_stream,
+                    {
+                        **message_data,
+                        "original_stream": stream,
+                        "original_id": message_id,
+                        "consumer_group": self.consumer_group,
+                        "delivery_count": str(deliveries[message_id]),
+                    },
+                    **self._xadd_options(self.dead_letter_stream),
+                )
+            await pipe.execute()
+            for message_id, _ in dead:
+                logger.error(
+                    "Moved event %s to %s after %d deliveries",
+                    _as_str(message_id),
+                    self.dead_letter_stream,
+                    deliveries[message_id],
                 )
 
-                if not messages:
-                    continue
+        failed = await self._handle_entries(retry, semaphore, executor, ordering_key, deliveries)
+        await self._ack({stream: [message_id for message_id, _ in claimed if message_id not in failed]})
 
-                for stream, stream_messages in messages:
-                    for message_id, message_data in stream_messages:
-                        await self._process_message(message_id, message_data)
-                        # Acknowledge message
-                        await self.redis.xack(self.stream_name, self.consumer_group, message_id)
+    async def _handle_entries(
+        self,
+        entries: List[Tuple[bytes, Dict[bytes, bytes]]],
+        semaphore: Optional[asyncio.Semaphore],
+        executor: Optional[ThreadPoolExecutor],
+        ordering_key: Callable[[BaseEvent], Optional[str]],
+        deliveries: Optional[Dict[bytes, int]] = None,
+    ) -> Set[bytes]:
+        """Handle stream entries, sequentially or (with a semaphore) concurrently.
 
+        Concurrent handling keeps stream order among events with the same
+        ordering key. ``deliveries`` maps redelivered entries to their delivery
+        count, exposed to handlers as ``event.metadata["delivery_count"]``.
+
+        Returns:
+            IDs of entries with at least one failed handler (malformed entries
+            are not retried and count as handled)
+        """
+        failed: Set[bytes] = set()
+        chains: Dict[Tuple[str, Any], List[Tuple[bytes, BaseEvent]]] = {}
+        for message_id, message_data in entries:
+            event = self._decode_message(message_id, message_data)
+            if event is None:
+                continue
+            if deliveries and message_id in deliveries:
+                event.metadata["delivery_count"] = deliveries[message_id]
+            if semaphore is None:
+                if not await self._dispatch(event):
+                    failed.add(message_id)
+                continue
+            try:
+                key = ordering_key(event)
             except Exception as exc:
-                logger.exception("Error consuming events: %s", exc)
+                logger.exception("Error computing ordering key for %s: %s", message_id, exc)
+                key = None
+            chain = ("key", key) if key is not None else ("message", message_id)
+            chains.setdefault(chain, []).append((message_id, event))
+
+        if not chains:
+            return failed
+        assert semaphore is not None
+
+        async def run_chain(events: List[Tuple[bytes, BaseEvent]]) -> None:
+            for message_id, event in events:
+                async with semaphore:
+                    if not await self._dispatch(event, executor):
+                        failed.add(message_id)
+
+        await asyncio.gather(*(run_chain(events) for events in chains.values()))
+        return failed
 
     async def _process_message(self, message_id: bytes, message_data: Dict[bytes, bytes]) -> None:
         """Process a single event message.
@@ -303,35 +1008,316 @@ class EventBus:
             message_id: Redis stream message ID
             message_data: Message data from stream
         """
+        event = self._decode_message(message_id, message_data)
+        if event is not None:
+            await self._dispatch(event)
+
+    def _decode_message(
+        self, message_id: bytes, message_data: Dict[bytes, bytes]
+    ) -> Optional[BaseEvent]:
+        """Deserialize a stream entry (None if it is malformed)."""
         try:
             event_type = message_data.get(b"event_type", b"").decode("utf-8")
-            event_json = message_data.get(b"data", b"").decode("utf-8")
+            data = message_data.get(b"data", b"")
 
-            if not event_type or not event_json:
+            if not event_type or not data:
                 logger.warning("Malformed event message: %s", message_id)
-                return
+                return None
+
+            # Entries written before codecs existed are plain JSON
+            spec = message_data.get(b"codec", b"json/1").decode("utf-8")
+            name_version, _, compression = spec.partition("+")
+            name, _, version = name_version.partition("/")
+            if compression == "zstd":
+                data = self._decompress(data)
+            elif compression:
+                raise ValueError(f"Unsupported compression '{compression}'")
+            codec = get_codec(name)
+            if int(version or 1) > codec.version:
+                raise ValueError(f"Codec {name} version {version} is newer than supported ({codec.version})")
 
-            # Deserialize event
             event_class = EVENT_TYPE_REGISTRY.get(event_type, BaseEvent)
-            event = event_class.model_validate_json(event_json)
-
-            # Call registered handlers
-            handlers = self._handlers.get(event_type, [])
-            for handler in handlers:
-                try:
-                    if asyncio.iscoroutinefunction(handler):
-                        await handler(event)
-                    else:
-                        handler(event)
-                except Exception as exc:
-                    logger.exception("Error in event handler for %s: %s", event_type, exc)
+            return codec.decode(data, event_class)
 
         except Exception as exc:
             logger.exception("Error processing message %s: %s", message_id, exc)
+            return None
 
+    def _decompress(self, data: bytes) -> bytes:
+        if zstandard is None:
+            raise ImportError("Reading compressed events requires the 'zstandard' package")
+        if self._decompressor is None:
+            self._decompressor = zstandard.ZstdDecompressor()
+        return self._decompressor.decompress(data)
 
-# For backwards compatibility with synchronous code
-import asyncio
+    async def _dispatch(self, event: BaseEvent, executor: Optional[ThreadPoolExecutor] = None) -> bool:
+        """Call the handlers registered for an event's type.
+
+        Sync handlers run in ``executor`` when one is given, otherwise inline.
+
+        Returns:
+            Whether every handler succeeded
+        """
+        succeeded = True
+        for handler in self._handlers.get(_type_name(event.event_type), []):
+            try:
+                if asyncio.iscoroutinefunction(handler):
+                    await handler(event)
+                elif executor is not None:
+                    await asyncio.get_running_loop().run_in_executor(executor, handler, event)
+                else:
+                    handler(event)
+            except Exception as exc:
+                logger.exception("Error in event handler for %s: %s", event.event_type, exc)
+                succeeded = False
+        return succeeded
+
+
+def _as_str(message_id: Any) -> str:
+    """Stream message ID as text (clients return bytes unless decode_responses is set)."""
+    return message_id.decode("utf-8") if isinstance(message_id, bytes) else str(message_id)
+
+
+def _stream_id(message_id: Any) -> Tuple[int, int]:
+    """Stream message ID as a comparable (milliseconds, sequence) pair."""
+    ms, _, seq = _as_str(message_id).partition("-")
+    return int(ms), int(seq or 0)
+
+
+class BatchingPublisher:
+    """Buffers events and publishes them to an EventBus in pipelined batches.
+
+    A batch is flushed when ``max_batch_size`` events are buffered or the
+    oldest buffered event has waited ``flush_interval`` seconds, whichever
+    comes first. At most ``max_buffered`` events are held: once the buffer is
+    full, :meth:`submit` waits for a flush to make room, so a slow or
+    unreachable Redis slows producers down instead of growing memory.
+
+    Delivery is at-least-once. Entries that fail are kept at the head of the
+    buffer and retried with backoff, and :meth:`close` drains the buffer
+    before returning. A retried pipeline may re-add entries that had already
+    been written, so consumers should tolerate duplicate event IDs.
+
+    Usage::
+
+        async with BatchingPublisher(bus) as publisher:
+            await publisher.submit(event)             # buffered, returns a future
+            message_id = await publisher.publish(event)  # waits for the flush
+    """
+
+    def __init__(
+        self,
+        bus: EventBus,
+        *,
+        max_batch_size: int = 100,
+        flush_interval: float = 0.05,
+        max_buffered: int = 10_000,
+        retry_backoff: float = 0.1,
+        max_retry_backoff: float = 5.0,
+    ) -> None:
+        """Initialize publisher.
+
+        Args:
+            bus: Event bus to publish through
+            max_batch_size: Events per pipeline
+            flush_interval: Seconds an event may wait in the buffer before a flush
+            max_buffered: Buffered events at which :meth:`submit` starts to wait
+            retry_backoff: Delay before retrying a failed flush
+            max_retry_backoff: Upper bound on the retry delay (doubles per failure)
+        """
+        self.bus = bus
+        self.max_batch_size = max(1, max_batch_size)
+        self.flush_interval = flush_interval
+        self.max_buffered = max(self.max_batch_size, max_buffered)
+        self.retry_backoff = retry_backoff
+        self.max_retry_backoff = max_retry_backoff
+        self._buffer: Deque[Tuple[BaseEvent, asyncio.Future[str]]] = deque()
+        self._changed: Optional[asyncio.Condition] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task[None]] = None
+        self._closed = False
+        self._failures = 0
+
+    async def __aenter__(self) -> BatchingPublisher:
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def _condition(self) -> asyncio.Condition:
+        # Created lazily so the publisher can be constructed outside a running loop
+        if self._changed is None:
+            self._changed = asyncio.Condition()
+            self._flush_lock = asyncio.Lock()
+        return self._changed
+
+    @property
+    def pending(self) -> int:
+        """Events buffered and not yet written to Redis."""
+        return len(self._buffer)
+
+    def start(self) -> None:
+        """Start the background flush task (called by ``async with``)."""
+        self._condition()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="event-publisher")
+
+    async def submit(self, event: BaseEvent) -> asyncio.Future[str]:
+        """Buffer an event, waiting for room if the buffer is full.
+
+        Returns:
+            Future resolving to the Redis stream message ID once the event is written
+
+        Raises:
+            RuntimeError: If the publisher is closed
+        """
+        return (await self._enqueue([event]))[0]
+
+    async def publish(self, event: BaseEvent) -> str:
+        """Buffer an event and wait until it has been written.
+
+        Returns:
+            Redis stream message ID
+        """
+        return await (await self.submit(event))
+
+    async def publish_many(self, events: Iterable[BaseEvent]) -> List[str]:
+        """Buffer several events and wait until all of them have been written.
+
+        Returns:
+            Redis stream message IDs, in the order of ``events``
+        """
+        futures = await self._enqueue(list(events))
+        return list(await asyncio.gather(*futures))
+
+    async def _enqueue(self, events: List[BaseEvent]) -> List[asyncio.Future[str]]:
+        condition = self._condition()
+        if self._task is None:
+            self.start()
+        loop = asyncio.get_running_loop()
+        futures: List[asyncio.Future[str]] = []
+        async with condition:
+            for event in events:
+                if self._closed:
+                    raise RuntimeError("BatchingPublisher is closed")
+                while len(self._buffer) >= self.max_buffered:
+                    condition.notify_all()  # make sure the flusher is awake to free space
+                    await condition.wait()
+                    if self._closed:
+                        raise RuntimeError("BatchingPublisher is closed")
+                future: asyncio.Future[str] = loop.create_future()
+                self._buffer.append((event, future))
+                futures.append(future)
+            condition.notify_all()
+        return futures
+
+    async def flush(self) -> None:
+        """Write every buffered event now.
+
+        Raises:
+            Exception: The Redis error if a batch could not be written; the
+                failed events stay buffered for the next flush
+        """
+        self._condition()
+        while self._buffer:
+            await self._flush_batch()
+
+    async def _flush_batch(self) -> None:
+        """Write up to ``max_batch_size`` events from the head of the buffer."""
+        condition = self._condition()
+        assert self._flush_lock is not None
+        async with self._flush_lock:
+            batch = [self._buffer[i] for i in range(min(self.max_batch_size, len(self._buffer)))]
+            if not batch:
+                return
+            try:
+                results = await self.bus._xadd_pipelined([event for event, _ in batch])
+            except Exception:
+                self._failures += 1
+                raise
+            retry: List[Tuple[BaseEvent, asyncio.Future[str]]] = []
+            first_error: Optional[Exception] = None
+            for (event, future), result in zip(batch, results):
+                if isinstance(result, Exception):
+                    retry.append((event, future))
+                    first_error = first_error or result
+                elif not future.done():
+                    future.set_result(_as_str(result))
+            async with condition:
+                for _ in batch:
+                    self._buffer.popleft()
+                self._buffer.extendleft(reversed(retry))
+                condition.notify_all()
+            if first_error is not None:
+                self._failures += 1
+                raise first_error
+            self._failures = 0
+
+    def _backoff(self) -> float:
+        return min(self.max_retry_backoff, self.retry_backoff * 2 ** max(0, self._failures - 1))
+
+    async def _run(self) -> None:
+        """Background loop: flush on size or age, retrying failures with backoff."""
+        condition = self._condition()
+        while True:
+            async with condition:
+                while not self._buffer and not self._closed:
+                    await condition.wait()
+                if not self._buffer:
+                    return
+                if len(self._buffer) < self.max_batch_size and not self._closed:
+                    # Give the batch time to fill; a full batch (or close) wakes us early
+                    try:
+                        await asyncio.wait_for(
+                            condition.wait_for(
+                                lambda: len(self._buffer) >= self.max_batch_size or self._closed
+                            ),
+                            self.flush_interval,
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+            try:
+                await self._flush_batch()
+            except Exception as exc:
+                delay = self._backoff()
+                logger.warning(
+                    "Event flush failed (%d buffered); retrying in %.2fs: %s",
+                    len(self._buffer),
+                    delay,
+                    exc,
+                )
+                await asyncio.sleep(delay)
+
+    async def close(self, timeout: Optional[float] = None) -> None:
+        """Stop accepting events and wait until every buffered event is written.
+
+        Args:
+            timeout: Seconds to keep retrying (None: until delivered)
+
+        Raises:
+            TimeoutError: If events were still undelivered after ``timeout``;
+                their futures fail with the same error
+        """
+        condition = self._condition()
+        async with condition:
+            self._closed = True
+            condition.notify_all()
+        if self._task is None:
+            self.start()
+        assert self._task is not None
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            undelivered = len(self._buffer)
+            error = TimeoutError(f"{undelivered} events not delivered before close timeout")
+            while self._buffer:
+                _, future = self._buffer.popleft()
+                if not future.done():
+                    future.set_exception(error)
+            logger.error("Closed event publisher with %d undelivered events", undelivered)
+            raise error from None
 
 
 def create_event_bus(redis_url: str) -> EventBus:
@@ -12,8 +12,8 @@ sys.path.insert(0, str(Path(__file__).resolve().parent))
 
 from installer.railway import RailwayProvider
 
-# Load credentials
-creds_file = '../credentials.json'
+# Load credentials (point RAILWAY_GRAPHQL_URL at benchmarks/fake_railway.py to run offline)
+creds_file = os.getenv("BUDAI_CREDENTIALS_FILE", '../credentials.json')
 print(f"Loading credentials from: {creds_file}")
 with open(creds_file) as f:
     creds = json.load(f)
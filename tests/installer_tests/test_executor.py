@@ -0,0 +1,244 @@
+"""Tests for installer.executor and PlanStepInstaller."""
+
+import threading
+import time
+
+import pytest
+
+from installer import PlanStepInstaller
+from installer.executor import PlanExecutor, StepTimeoutError, plan_graph
+from installer.graph import CycleError
+from installer.schemas import ApplyStatus, DeploymentPlan, DeploymentStep, RollbackStep
+
+pytestmark = pytest.mark.unit
+
+
+def make_plan(steps, rollback=()):
+    return DeploymentPlan(
+        target_env="dev",
+        capability="test",
+        version="1.0.0",
+        steps=list(steps),
+        rollback=list(rollback),
+    )
+
+
+def step(step_id, *depends_on, **fields):
+    return DeploymentStep(id=step_id, action=f"do-{step_id}", depends_on=list(depends_on), **fields)
+
+
+class Recorder:
+    """Step and rollback handler that records calls and fails on demand."""
+
+    def __init__(self, failures=None, sleep=None):
+        self.failures = dict(failures or {})
+        self.sleep = dict(sleep or {})
+        self.calls = []
+        self.rolled_back = []
+        self._lock = threading.Lock()
+
+    def run(self, plan_step):
+        with self._lock:
+            self.calls.append(plan_step.id)
+            remaining = self.failures.get(plan_step.id, 0)
+            if remaining:
+                self.failures[plan_step.id] = remaining - 1
+        if plan_step.id in self.sleep:
+            time.sleep(self.sleep[plan_step.id])
+        if remaining:
+            raise RuntimeError(f"{plan_step.id} failed")
+        return {f"{plan_step.id}_id": plan_step.id.upper()}
+
+    def rollback(self, rollback_step):
+        with self._lock:
+            self.rolled_back.append(rollback_step.on_fail_of)
+
+
+def executor(recorder, **kwargs):
+    kwargs.setdefault("backoff_seconds", 0.0)
+    return PlanExecutor(recorder.run, recorder.rollback, **kwargs)
+
+
+def test_runs_steps_in_dependency_order_and_collects_artifacts():
+    recorder = Recorder()
+    plan = make_plan([step("deploy", "build"), step("build"), step("verify", "deploy")])
+
+    result = executor(recorder).execute(plan)
+
+    assert result.status == ApplyStatus.SUCCESS
+    assert result.applied_steps == ["build", "deploy", "verify"]
+    assert recorder.calls == ["build", "deploy", "verify"]
+    assert result.artifacts == {"build_id": "BUILD", "deploy_id": "DEPLOY", "verify_id": "VERIFY"}
+
+
+def test_independent_steps_run_concurrently():
+    recorder = Recorder(sleep={"a": 0.3, "b": 0.3})
+    plan = make_plan([step("a"), step("b")])
+
+    started = time.monotonic()
+    result = executor(recorder, max_workers=2).execute(plan)
+
+    assert result.status == ApplyStatus.SUCCESS
+    assert time.monotonic() - started < 0.55
+
+
+def test_retriable_step_is_retried_until_it_succeeds():
+    recorder = Recorder(failures={"flaky": 2})
+    plan = make_plan([step("flaky")])
+
+    result = executor(recorder, max_attempts=3).execute(plan)
+
+    assert result.status == ApplyStatus.SUCCESS
+    assert recorder.calls == ["flaky", "flaky", "flaky"]
+
+
+def test_non_retriable_step_runs_once():
+    recorder = Recorder(failures={"once": 1})
+    plan = make_plan([step("once", retriable=False)])
+
+    result = executor(recorder, max_attempts=3).execute(plan)
+
+    assert result.status == ApplyStatus.FAILED
+    assert result.failed_step == "once"
+    assert recorder.calls == ["once"]
+
+
+def test_exhausted_retries_fail_and_roll_back_applied_steps_in_reverse_order():
+    recorder = Recorder(failures={"migrate": 5})
+    plan = make_plan(
+        [step("network"), step("database", "network"), step("migrate", "database")],
+        rollback=[
+            RollbackStep(on_fail_of="network", action="delete-network"),
+            RollbackStep(on_fail_of="database", action="drop-database"),
+            RollbackStep(on_fail_of="migrate", action="revert-migration"),
+        ],
+    )
+
+    result = executor(recorder, max_attempts=2).execute(plan)
+
+    assert result.status == ApplyStatus.ROLLED_BACK
+    assert result.failed_step == "migrate"
+    assert result.rollback_executed
+    assert recorder.calls.count("migrate") == 2
+    assert recorder.rolled_back == ["migrate", "database", "network"]
+
+
+def test_failure_without_rollback_steps_reports_failed():
+    recorder = Recorder(failures={"a": 1})
+
+    result = executor(recorder, max_attempts=1).execute(make_plan([step("a")]))
+
+    assert result.status == ApplyStatus.FAILED
+    assert not result.rollback_executed
+
+
+def test_failed_rollback_is_reported():
+    recorder = Recorder(failures={"b": 1})
+
+    def rollback(rollback_step):
+        raise RuntimeError("cannot undo")
+
+    plan = make_plan(
+        [step("a"), step("b", "a")],
+        rollback=[RollbackStep(on_fail_of="a", action="undo-a")],
+    )
+    result = PlanExecutor(recorder.run, rollback, max_attempts=1).execute(plan)
+
+    assert result.status == ApplyStatus.FAILED
+    assert "rollback: undo-a for a: cannot undo" in result.error_message
+
+
+def test_timed_out_step_is_not_retried():
+    recorder = Recorder(sleep={"slow": 1.5})
+    plan = make_plan(
+        [step("setup"), step("slow", "setup", timeout_seconds=1)],
+        rollback=[RollbackStep(on_fail_of="setup", action="teardown")],
+    )
+
+    result = executor(recorder, max_attempts=3).execute(plan)
+
+    assert result.status == ApplyStatus.ROLLED_BACK
+    assert result.failed_step == "slow"
+    assert "timed out after 1s" in result.error_message
+    assert recorder.calls == ["setup", "slow"]
+    assert recorder.rolled_back == ["setup"]
+
+
+def test_default_timeout_applies_to_steps_without_one():
+    recorder = Recorder(sleep={"slow": 0.5})
+
+    result = executor(recorder, default_timeout_seconds=0.1).execute(make_plan([step("slow")]))
+
+    assert result.status == ApplyStatus.FAILED
+    assert result.failed_step == "slow"
+
+
+def test_only_runs_selected_steps_and_treats_others_as_applied():
+    recorder = Recorder()
+    plan = make_plan([step("a"), step("b", "a"), step("c", "b")])
+
+    result = executor(recorder).execute(plan, only=["c"])
+
+    assert result.applied_steps == ["c"]
+    assert recorder.calls == ["c"]
+
+
+def test_only_rejects_unknown_steps():
+    with pytest.raises(ValueError, match="Unknown step"):
+        executor(Recorder()).execute(make_plan([step("a")]), only=["missing"])
+
+
+def test_plan_graph_validates_step_references():
+    with pytest.raises(ValueError, match="Duplicate step IDs"):
+        plan_graph(make_plan([step("a"), step("a")]))
+    with pytest.raises(ValueError, match="unknown step"):
+        plan_graph(make_plan([step("a", "missing")]))
+    with pytest.raises(CycleError):
+        plan_graph(make_plan([step("a", "b"), step("b", "a")]))
+
+
+def test_step_timeout_error_carries_step_details():
+    error = StepTimeoutError("deploy", 2.5)
+
+    assert isinstance(error, TimeoutError)
+    assert (error.step_id, error.timeout_seconds) == ("deploy", 2.5)
+
+
+class _Installer(PlanStepInstaller):
+    def describe_requirements(self, env):
+        raise NotImplementedError
+
+    def validate_permissions(self, creds, env):
+        raise NotImplementedError
+
+    def plan(self, spec, env):
+        raise NotImplementedError
+
+    def verify(self, env):
+        raise NotImplementedError
+
+
+def test_plan_step_installer_requires_step_handlers():
+    with pytest.raises(TypeError):
+        _Installer("test", "1.0.0")
+
+
+def test_plan_step_installer_applies_and_rolls_back_through_its_handlers():
+    executed, undone = [], []
+
+    class Installer(_Installer):
+        step_retry_backoff_seconds = 0.0
+
+        def execute_step(self, plan_step, creds):
+            executed.append((plan_step.id, creds["token"]))
+
+        def execute_rollback_step(self, rollback_step, creds):
+            undone.append(rollback_step.on_fail_of)
+
+    plan = make_plan([step("a")], rollback=[RollbackStep(on_fail_of="a", action="undo-a")])
+    installer = Installer("test", "1.0.0")
+
+    assert installer.apply(plan, {"token": "t"}).status == ApplyStatus.SUCCESS
+    assert installer.rollback(plan, {"token": "t"}).status == ApplyStatus.SUCCESS
+    assert executed == [("a", "t")]
+    assert undone == ["a"]
@@ -0,0 +1,83 @@
+"""Tests for installer.graph."""
+
+import pytest
+
+from installer.graph import CycleError, DependencyGraph
+
+pytestmark = pytest.mark.unit
+
+
+def test_waves_group_nodes_by_dependency_depth():
+    graph = DependencyGraph.from_dependencies(
+        {
+            "api": ["orchestrator", "redis"],
+            "orchestrator": ["redis"],
+            "redis": [],
+            "frontend": ["api"],
+            "worker": ["redis"],
+        }
+    )
+
+    assert graph.waves() == [["redis"], ["orchestrator", "worker"], ["api"], ["frontend"]]
+    assert graph.topological_order() == ["redis", "orchestrator", "worker", "api", "frontend"]
+
+
+def test_waves_keep_insertion_order_for_independent_nodes():
+    graph = DependencyGraph.from_dependencies({"c": [], "a": [], "b": []})
+
+    assert graph.waves() == [["c", "a", "b"]]
+
+
+def test_nodes_restricts_graph_and_drops_outside_edges():
+    graph = DependencyGraph.from_dependencies(
+        {"api": ["orchestrator"], "orchestrator": [], "voice": ["api"]},
+        nodes=["voice", "api"],
+    )
+
+    assert graph.nodes == ["voice", "api"]
+    assert graph.dependencies("api") == []
+    assert graph.waves() == [["api"], ["voice"]]
+
+
+def test_descendants_and_ancestors_are_transitive():
+    graph = DependencyGraph.from_dependencies({"a": [], "b": ["a"], "c": ["b"], "d": []})
+
+    assert graph.descendants("a") == {"b", "c"}
+    assert graph.ancestors("c") == {"a", "b"}
+    assert graph.dependents("a") == ["b"]
+
+
+def test_from_dependencies_rejects_cycles():
+    with pytest.raises(CycleError) as excinfo:
+        DependencyGraph.from_dependencies({"a": ["b"], "b": ["c"], "c": ["a"], "d": []})
+
+    cycle = excinfo.value.cycle
+    assert cycle[0] == cycle[-1]
+    assert set(cycle) == {"a", "b", "c"}
+    assert "Dependency cycle detected" in str(excinfo.value)
+
+
+def test_waves_raise_on_cycle_added_after_construction():
+    graph = DependencyGraph.from_dependencies({"a": [], "b": ["a"]})
+    graph.add_edge("a", "b")
+
+    assert graph.find_cycle() is not None
+    with pytest.raises(CycleError):
+        graph.waves()
+
+
+def test_self_dependency_is_a_cycle():
+    graph = DependencyGraph()
+    graph.add_edge("a", "a")
+
+    assert graph.find_cycle() == ["a", "a"]
+
+
+def test_subgraph_keeps_edges_between_selected_nodes():
+    graph = DependencyGraph.from_dependencies({"a": [], "b": ["a"], "c": ["b"]})
+
+    sub = graph.subgraph(["a", "c"])
+
+    assert sub.nodes == ["a", "c"]
+    assert sub.dependencies("c") == []
+    assert graph.subgraph(["b", "c"]).waves() == [["b"], ["c"]]
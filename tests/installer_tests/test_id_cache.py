@@ -0,0 +1,123 @@
+"""Tests for installer.id_cache."""
+
+import pytest
+
+from installer.id_cache import RailwayIDCache, default_cache_dir
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return RailwayIDCache(tmp_path / "railway-ids.json", default_ttl=60)
+
+
+def test_entries_survive_a_new_instance(cache):
+    cache.set_environments("proj", {"production": "env-1"})
+    cache.set_services("proj", {"budai-api": {"id": "svc-1"}})
+
+    reopened = RailwayIDCache(cache.path, default_ttl=60)
+
+    assert reopened.get_environment_id("proj", "production") == "env-1"
+    assert reopened.get_services("proj") == {"budai-api": {"id": "svc-1"}}
+    assert reopened.get_environment_id("other", "production") is None
+
+
+def test_expired_entries_are_misses(cache):
+    cache.set_environments("proj", {"production": "env-1"}, ttl=-1)
+    cache.set_services("proj", {"budai-api": {"id": "svc-1"}}, ttl=-1)
+
+    assert cache.get_environment_id("proj", "production") is None
+    assert cache.get_services("proj") is None
+
+
+def test_default_ttl_applies_without_explicit_ttl(tmp_path):
+    expired = RailwayIDCache(tmp_path / "ids.json", default_ttl=0)
+    expired.set_environments("proj", {"production": "env-1"})
+
+    assert expired.get_environment_id("proj", "production") is None
+
+
+def test_default_ttl_from_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv("RAILWAY_ID_CACHE_TTL", "12.5")
+
+    assert RailwayIDCache(tmp_path / "ids.json").default_ttl == 12.5
+
+
+def test_default_path_uses_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("BUDAI_DEPLOY_CACHE_DIR", str(tmp_path))
+
+    assert default_cache_dir() == tmp_path
+    assert RailwayIDCache().path == tmp_path / "railway-ids.json"
+
+
+def test_fingerprints_do_not_expire(cache):
+    cache.set_fingerprint("proj", "production", "api", "abc")
+
+    assert cache.get_fingerprint("proj", "production", "api") == "abc"
+    assert cache.get_fingerprint("proj", "staging", "api") is None
+
+
+def test_forget_fingerprint_drops_one_service(cache):
+    cache.set_fingerprint("proj", "production", "api", "abc")
+    cache.set_fingerprint("proj", "production", "worker", "def")
+
+    cache.forget_fingerprint("proj", "production", "api")
+    cache.forget_fingerprint("proj", "production", "missing")
+
+    assert cache.get_fingerprint("proj", "production", "api") is None
+    assert cache.get_fingerprint("proj", "production", "worker") == "def"
+
+
+def test_forget_service_drops_listing_and_its_fingerprints_only(cache):
+    cache.set_services("proj", {"api": {"id": "svc-1"}, "worker": {"id": "svc-2"}})
+    cache.set_environments("proj", {"production": "env-1"})
+    cache.set_fingerprint("proj", "production", "api", "abc")
+    cache.set_fingerprint("proj", "production", "worker", "def")
+
+    cache.forget_service("proj", "svc-1")
+
+    assert cache.get_services("proj") is None
+    assert cache.get_environment_id("proj", "production") == "env-1"
+    assert cache.get_fingerprint("proj", "production", "api") is None
+    assert cache.get_fingerprint("proj", "production", "worker") == "def"
+
+
+def test_forget_environment_drops_its_fingerprints_only(cache):
+    cache.set_environments("proj", {"production": "env-1", "staging": "env-2"})
+    cache.set_services("proj", {"api": {"id": "svc-1"}})
+    cache.set_fingerprint("proj", "production", "api", "abc")
+    cache.set_fingerprint("proj", "staging", "api", "def")
+
+    cache.forget_environment("proj", "env-1")
+
+    assert cache.get_environment_id("proj", "production") is None
+    assert cache.get_environment_id("proj", "staging") == "env-2"
+    assert cache.get_services("proj") == {"api": {"id": "svc-1"}}
+    assert cache.get_fingerprint("proj", "production", "api") is None
+    assert cache.get_fingerprint("proj", "staging", "api") == "def"
+
+
+def test_invalidate_by_kind_and_project(cache):
+    cache.set_environments("proj", {"production": "env-1"})
+    cache.set_services("proj", {"api": {"id": "svc-1"}})
+    cache.set_environments("other", {"production": "env-9"})
+
+    cache.invalidate("proj", "services")
+    assert cache.get_services("proj") is None
+    assert cache.get_environment_id("proj", "production") == "env-1"
+
+    cache.invalidate("proj")
+    assert cache.get_environment_id("proj", "production") is None
+    assert cache.get_environment_id("other", "production") == "env-9"
+
+    cache.clear()
+    assert cache.get_environment_id("other", "production") is None
+
+
+def test_unreadable_file_is_treated_as_empty(cache):
+    cache.path.write_text("{not json")
+
+    assert cache.get_environment_id("proj", "production") is None
+    cache.set_environments("proj", {"production": "env-1"})
+    assert cache.get_environment_id("proj", "production") == "env-1"
@@ -0,0 +1,102 @@
+"""Tests for installer.journal."""
+
+import json
+import os
+import stat
+
+import pytest
+
+from installer.journal import (
+    COMPLETED,
+    DEPLOY_TRIGGERED,
+    SERVICE_CREATED,
+    VARIABLES_APPLIED,
+    JournalError,
+    RunJournal,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def test_resumed_journal_keeps_completed_steps_and_ids(tmp_path):
+    journal = RunJournal.create("proj-1", "production", run_id="run-1", directory=tmp_path)
+    journal.record("api", SERVICE_CREATED, service_id="svc-api", created=True, fingerprint="abc")
+    journal.record("api", VARIABLES_APPLIED)
+    journal.set_infrastructure("redis", {"redis_url": "redis://internal:6379"})
+    journal.set_status("interrupted")
+
+    resumed = RunJournal.load("run-1", directory=tmp_path)
+
+    assert (resumed.project_id, resumed.environment, resumed.status) == ("proj-1", "production", "interrupted")
+    assert resumed.completed("api", SERVICE_CREATED)
+    assert resumed.completed("api", VARIABLES_APPLIED)
+    assert not resumed.completed("api", DEPLOY_TRIGGERED)
+    assert not resumed.completed("worker", SERVICE_CREATED)
+    entry = resumed.service("api")
+    assert (entry["service_id"], entry["created"], entry["fingerprint"]) == ("svc-api", True, "abc")
+    assert resumed.get_infrastructure("redis") == {"redis_url": "redis://internal:6379"}
+
+
+def test_resumed_journal_continues_recording(tmp_path):
+    RunJournal.create("proj-1", "dev", run_id="run-1", directory=tmp_path).record("api", SERVICE_CREATED)
+
+    resumed = RunJournal.load("run-1", directory=tmp_path)
+    resumed.record("api", COMPLETED)
+
+    assert RunJournal.load("run-1", directory=tmp_path).completed("api", COMPLETED)
+
+
+def test_reset_service_forgets_progress(tmp_path):
+    journal = RunJournal.create("proj-1", "dev", directory=tmp_path)
+    journal.record("api", SERVICE_CREATED, service_id="svc-api")
+
+    journal.reset_service("api")
+
+    assert journal.service("api") == {"steps": {}}
+    assert RunJournal.load(journal.run_id, directory=tmp_path).service("api") == {"steps": {}}
+
+
+def test_service_returns_a_copy(tmp_path):
+    journal = RunJournal.create("proj-1", "dev", directory=tmp_path)
+    journal.record("api", SERVICE_CREATED)
+
+    journal.service("api")["steps"].clear()
+
+    assert journal.completed("api", SERVICE_CREATED)
+
+
+def test_record_rejects_unknown_steps(tmp_path):
+    journal = RunJournal.create("proj-1", "dev", directory=tmp_path)
+
+    with pytest.raises(ValueError, match="Unknown journal step"):
+        journal.record("api", "launched")
+
+
+def test_load_missing_or_corrupt_journal_raises(tmp_path):
+    with pytest.raises(JournalError, match="No run journal"):
+        RunJournal.load("missing", directory=tmp_path)
+
+    (tmp_path / "broken.json").write_text("{not json")
+    with pytest.raises(JournalError, match="Unreadable"):
+        RunJournal.load("broken", directory=tmp_path)
+
+    (tmp_path / "renamed.json").write_text(json.dumps({"run_id": "other"}))
+    with pytest.raises(JournalError, match="does not describe"):
+        RunJournal.load("renamed", directory=tmp_path)
+
+
+def test_journal_is_owner_only(tmp_path):
+    journal = RunJournal.create("proj-1", "dev", directory=tmp_path)
+
+    assert stat.S_IMODE(os.stat(journal.path).st_mode) == 0o600
+
+
+def test_list_runs_newest_first(tmp_path):
+    RunJournal.create("proj-1", "dev", run_id="20250101-000000-aaaaaa", directory=tmp_path)
+    RunJournal.create("proj-1", "dev", run_id="20250102-000000-bbbbbb", directory=tmp_path).set_status("succeeded")
+    (tmp_path / "garbage.json").write_text("{")
+
+    runs = RunJournal.list_runs(tmp_path)
+
+    assert [run["run_id"] for run in runs] == ["20250102-000000-bbbbbb", "20250101-000000-aaaaaa"]
+    assert runs[0]["status"] == "succeeded"
@@ -0,0 +1,110 @@
+"""Tests for installer.plan_diff."""
+
+import pytest
+
+from installer.plan_diff import diff_plans
+from installer.schemas import DeploymentPlan, DeploymentStep, RollbackStep
+
+pytestmark = pytest.mark.unit
+
+
+def make_plan(steps, *, version="1.0.0", target_env="dev", capability="test", rollback=()):
+    return DeploymentPlan(
+        target_env=target_env,
+        capability=capability,
+        version=version,
+        steps=list(steps),
+        rollback=list(rollback),
+    )
+
+
+def step(step_id, *depends_on, **params):
+    return DeploymentStep(id=step_id, action=f"do-{step_id}", params=params, depends_on=list(depends_on))
+
+
+BASE_STEPS = [
+    step("network"),
+    step("database", "network", size="small"),
+    step("api", "database"),
+    step("worker", "network"),
+]
+
+
+def test_identical_plans_are_empty():
+    diff = diff_plans(make_plan(BASE_STEPS), make_plan(BASE_STEPS))
+
+    assert diff.is_empty
+    assert diff.to_apply == []
+    assert diff.unchanged == ["network", "database", "worker", "api"]
+    assert diff.render().startswith("No changes")
+
+
+def test_changed_step_pulls_in_its_dependents():
+    new_steps = [s if s.id != "database" else step("database", "network", size="large") for s in BASE_STEPS]
+
+    diff = diff_plans(make_plan(BASE_STEPS), make_plan(new_steps))
+
+    assert diff.changed == ["database"]
+    assert diff.affected == ["api"]
+    assert diff.unchanged == ["network", "worker"]
+    assert diff.to_apply == ["database", "api"]
+    assert not diff.header_changed
+
+
+def test_added_and_removed_steps():
+    new_steps = [s for s in BASE_STEPS if s.id != "worker"] + [step("cache", "network")]
+
+    diff = diff_plans(make_plan(BASE_STEPS), make_plan(new_steps))
+
+    assert diff.added == ["cache"]
+    assert diff.removed == ["worker"]
+    assert diff.changed == []
+    assert diff.to_apply == ["cache"]
+    rendered = diff.render()
+    assert "  + cache" in rendered
+    assert "  - worker" in rendered
+
+
+def test_no_previous_plan_applies_everything():
+    diff = diff_plans(None, make_plan(BASE_STEPS))
+
+    assert diff.old_checksum is None
+    assert diff.header_changed
+    assert diff.added == ["network", "database", "worker", "api"]
+    assert diff.to_apply == diff.added
+
+
+def test_plan_for_another_environment_shares_no_steps():
+    diff = diff_plans(make_plan(BASE_STEPS, target_env="staging"), make_plan(BASE_STEPS))
+
+    assert diff.added == ["network", "database", "worker", "api"]
+    assert diff.removed == ["network", "database", "worker", "api"]
+    assert diff.header_changed
+
+
+def test_version_bump_changes_header_only():
+    diff = diff_plans(make_plan(BASE_STEPS), make_plan(BASE_STEPS, version="1.0.1"))
+
+    assert not diff.is_empty
+    assert diff.header_changed
+    assert diff.to_apply == []
+
+
+def test_rollback_change_is_reported():
+    old = make_plan(BASE_STEPS, rollback=[RollbackStep(on_fail_of="database", action="drop")])
+    new = make_plan(BASE_STEPS, rollback=[RollbackStep(on_fail_of="database", action="restore")])
+
+    diff = diff_plans(old, new)
+
+    assert diff.rollback_changed
+    assert diff.to_apply == []
+    assert "rollback steps" in diff.render()
+
+
+def test_step_copied_with_update_is_detected_as_changed():
+    old = make_plan(BASE_STEPS)
+    new_steps = [s.model_copy(update={"action": "redo"}) if s.id == "worker" else s for s in BASE_STEPS]
+
+    diff = diff_plans(old, make_plan(new_steps))
+
+    assert diff.changed == ["worker"]
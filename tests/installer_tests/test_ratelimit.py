@@ -0,0 +1,188 @@
+"""Tests for installer.ratelimit."""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from installer.ratelimit import (
+    AdaptiveRateLimiter,
+    FileTokenBucketRateLimiter,
+    TokenBucketRateLimiter,
+    create_rate_limiter_from_env,
+    parse_retry_after,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def test_parse_retry_after_seconds_and_http_date():
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after("-3") == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 25 < parse_retry_after(format_datetime(retry_at, usegmt=True)) <= 30
+
+
+class TestTokenBucket:
+    def test_burst_then_sustained_rate(self):
+        limiter = TokenBucketRateLimiter(rate=10, burst=2)
+
+        assert limiter.reserve() == 0.0
+        assert limiter.reserve() == 0.0
+        assert limiter.reserve() == pytest.approx(0.1, abs=0.02)
+        assert limiter.reserve() == pytest.approx(0.2, abs=0.02)
+
+    def test_throttle_drains_bucket_and_honours_retry_after(self):
+        limiter = TokenBucketRateLimiter(rate=100, burst=5)
+
+        limiter.record_throttle(retry_after=2.0)
+
+        assert limiter.reserve() == pytest.approx(2.0, abs=0.05)
+        assert limiter.metrics()["throttled_responses"] == 1.0
+
+    def test_set_rate_changes_refill(self):
+        limiter = TokenBucketRateLimiter(rate=10, burst=1)
+        limiter.reserve()
+
+        limiter.set_rate(2)
+
+        assert limiter.rate == 2
+        assert limiter.reserve() == pytest.approx(0.5, abs=0.05)
+
+    def test_acquire_records_waits(self):
+        limiter = TokenBucketRateLimiter(rate=50, burst=1)
+
+        limiter.acquire()
+        waited = limiter.acquire()
+
+        metrics = limiter.metrics()
+        assert waited > 0
+        assert metrics["requests"] == 2.0
+        assert metrics["delayed_requests"] == 1.0
+
+    @pytest.mark.parametrize("kwargs", [{"rate": 0}, {"rate": 1, "burst": 0.5}])
+    def test_rejects_invalid_configuration(self, kwargs):
+        with pytest.raises(ValueError):
+            TokenBucketRateLimiter(**kwargs)
+
+    def test_back_off_cuts_once_per_window(self):
+        limiter = TokenBucketRateLimiter(rate=8, burst=1)
+
+        assert limiter.back_off(0.5, 0.1, retry_after=1.0) == 4
+        assert limiter.back_off(0.5, 0.1, retry_after=1.0) is None
+        assert limiter.rate == 4
+
+
+class TestFileTokenBucket:
+    def test_instances_share_one_budget(self, tmp_path):
+        path = tmp_path / "railway.lock"
+        first = FileTokenBucketRateLimiter(path, rate=10, burst=2)
+        second = FileTokenBucketRateLimiter(path, rate=10, burst=2)
+
+        assert first.reserve() == 0.0
+        assert second.reserve() == 0.0
+        assert first.reserve() == pytest.approx(0.1, abs=0.02)
+
+    def test_retry_after_pauses_every_instance(self, tmp_path):
+        path = tmp_path / "railway.lock"
+        first = FileTokenBucketRateLimiter(path, rate=100, burst=5)
+        second = FileTokenBucketRateLimiter(path, rate=100, burst=5)
+
+        first.record_throttle(retry_after=3.0)
+
+        assert second.reserve() == pytest.approx(3.0, abs=0.05)
+        assert second.metrics()["blocked_seconds_remaining"] > 2.9
+
+    def test_rate_and_back_off_window_are_shared(self, tmp_path):
+        path = tmp_path / "railway.lock"
+        first = FileTokenBucketRateLimiter(path, rate=8)
+        second = FileTokenBucketRateLimiter(path, rate=8)
+
+        assert first.back_off(0.5, 0.1, retry_after=1.0) == 4
+        assert second.back_off(0.5, 0.1, retry_after=1.0) is None
+        assert second.rate == 4
+
+    def test_rate_reverts_after_idle_period(self, tmp_path):
+        limiter = FileTokenBucketRateLimiter(tmp_path / "railway.lock", rate=8, rate_reset_after=0.0)
+        limiter.set_rate(2)
+
+        time.sleep(0.01)
+
+        assert limiter.rate == 8
+
+    def test_corrupt_state_file_is_reset(self, tmp_path):
+        path = tmp_path / "railway.lock"
+        path.write_text("{garbage")
+        limiter = FileTokenBucketRateLimiter(path, rate=10, burst=1)
+
+        assert limiter.reserve() == 0.0
+
+
+class TestAdaptive:
+    def test_concurrent_throttles_cut_rate_once(self):
+        limiter = AdaptiveRateLimiter(TokenBucketRateLimiter(rate=8, burst=1), min_rate=0.5)
+
+        threads = [threading.Thread(target=limiter.record_throttle, args=(1.0,)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        metrics = limiter.metrics()
+        assert limiter.rate == 4
+        assert metrics["rate_decreases"] == 1.0
+        assert metrics["throttled_responses"] == 8.0
+
+    def test_rate_never_drops_below_min_rate(self):
+        inner = TokenBucketRateLimiter(rate=1, burst=1)
+        limiter = AdaptiveRateLimiter(inner, min_rate=0.4, decrease_factor=0.5)
+
+        for _ in range(3):
+            inner._backoff_until = 0.0  # start a new congestion window
+            limiter.record_throttle()
+
+        assert limiter.rate == 0.4
+
+    def test_clean_streak_restores_rate_up_to_max(self):
+        inner = TokenBucketRateLimiter(rate=2, burst=1)
+        limiter = AdaptiveRateLimiter(inner, max_rate=4, increase_step=1, increase_after=3)
+
+        for _ in range(12):
+            limiter.record_success()
+
+        assert limiter.rate == 4
+        assert limiter.metrics()["rate_increases"] == 2.0
+
+    def test_throttle_resets_clean_streak(self):
+        limiter = AdaptiveRateLimiter(TokenBucketRateLimiter(rate=4, burst=1), increase_after=3)
+        limiter.record_success()
+        limiter.record_success()
+
+        limiter.record_throttle()
+
+        assert limiter.metrics()["clean_streak"] == 0.0
+
+    def test_rejects_invalid_decrease_factor(self):
+        with pytest.raises(ValueError):
+            AdaptiveRateLimiter(TokenBucketRateLimiter(rate=1), decrease_factor=1.0)
+
+
+def test_create_rate_limiter_from_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("RAILWAY_API_RATE", "3")
+    monkeypatch.setenv("RAILWAY_API_BURST", "2")
+    monkeypatch.setenv("RAILWAY_API_RATE_LIMIT_FILE", str(tmp_path / "railway.lock"))
+    monkeypatch.delenv("RAILWAY_API_ADAPTIVE", raising=False)
+
+    limiter = create_rate_limiter_from_env()
+
+    assert isinstance(limiter, AdaptiveRateLimiter)
+    assert isinstance(limiter.inner, FileTokenBucketRateLimiter)
+    assert (limiter.rate, limiter.max_rate, limiter.inner.burst) == (3.0, 3.0, 2.0)
+
+    monkeypatch.setenv("RAILWAY_API_ADAPTIVE", "0")
+    monkeypatch.delenv("RAILWAY_API_RATE_LIMIT_FILE")
+    assert isinstance(create_rate_limiter_from_env(), TokenBucketRateLimiter)
@@ -0,0 +1,161 @@
+"""Tests for shared.events.BatchingPublisher."""
+
+import asyncio
+
+import pytest
+
+from shared.events import BaseEvent, BatchingPublisher, EventBus
+
+pytestmark = pytest.mark.unit
+
+
+class RecordingBus(EventBus):
+    """EventBus whose pipeline records writes and fails on demand instead of calling Redis."""
+
+    def __init__(self):
+        super().__init__(None)
+        self.batches = []
+        self.written = []
+        # event_id -> times its XADD should still fail
+        self.entry_failures = {}
+        self.pipeline_failures = 0
+
+    async def _xadd_pipelined(self, events):
+        self.batches.append([event.event_id for event in events])
+        if self.pipeline_failures:
+            self.pipeline_failures -= 1
+            raise ConnectionError("redis unavailable")
+        results = []
+        for event in events:
+            if self.entry_failures.get(event.event_id):
+                self.entry_failures[event.event_id] -= 1
+                results.append(RuntimeError(f"XADD failed for {event.event_id}"))
+                continue
+            self.written.append(event.event_id)
+            results.append(f"{len(self.written)}-0".encode())
+        return results
+
+
+def make_events(count):
+    return [BaseEvent(event_type="test.event", event_id=f"e{i}") for i in range(count)]
+
+
+async def test_full_batch_is_flushed_without_waiting_for_interval():
+    bus = RecordingBus()
+    async with BatchingPublisher(bus, max_batch_size=3, flush_interval=60) as publisher:
+        ids = await asyncio.wait_for(publisher.publish_many(make_events(3)), 1)
+
+    assert ids == ["1-0", "2-0", "3-0"]
+    assert bus.batches == [["e0", "e1", "e2"]]
+
+
+async def test_partial_batch_is_flushed_after_interval():
+    bus = RecordingBus()
+    async with BatchingPublisher(bus, max_batch_size=100, flush_interval=0.05) as publisher:
+        message_id = await asyncio.wait_for(publisher.publish(make_events(1)[0]), 1)
+
+    assert message_id == "1-0"
+    assert bus.batches == [["e0"]]
+
+
+async def test_explicit_flush_writes_in_batches():
+    bus = RecordingBus()
+    publisher = BatchingPublisher(bus, max_batch_size=2, flush_interval=60)
+    futures = [await publisher.submit(event) for event in make_events(5)]
+
+    await publisher.flush()
+
+    assert publisher.pending == 0
+    assert [future.result() for future in futures] == ["1-0", "2-0", "3-0", "4-0", "5-0"]
+    assert bus.written == ["e0", "e1", "e2", "e3", "e4"]
+    await publisher.close()
+
+
+async def test_failed_entries_alone_are_retried_so_nothing_is_written_twice():
+    bus = RecordingBus()
+    bus.entry_failures = {"e1": 2}
+    async with BatchingPublisher(
+        bus, max_batch_size=3, flush_interval=0.01, retry_backoff=0.01
+    ) as publisher:
+        ids = await asyncio.wait_for(publisher.publish_many(make_events(3)), 1)
+
+    assert bus.batches == [["e0", "e1", "e2"], ["e1"], ["e1"]]
+    assert bus.written == ["e0", "e2", "e1"]
+    assert ids == ["1-0", "3-0", "2-0"]
+
+
+async def test_failed_entries_stay_at_head_of_buffer():
+    bus = RecordingBus()
+    bus.entry_failures = {"e0": 1}
+    publisher = BatchingPublisher(bus, max_batch_size=2, flush_interval=60)
+    for event in make_events(3):
+        await publisher.submit(event)
+
+    with pytest.raises(RuntimeError, match="XADD failed for e0"):
+        await publisher.flush()
+    assert publisher.pending == 2
+
+    await publisher.flush()
+
+    assert bus.batches == [["e0", "e1"], ["e0", "e2"]]
+    assert bus.written == ["e1", "e0", "e2"]
+    await publisher.close()
+
+
+async def test_pipeline_failure_is_retried_with_backoff():
+    bus = RecordingBus()
+    bus.pipeline_failures = 2
+    async with BatchingPublisher(
+        bus, max_batch_size=2, flush_interval=0.01, retry_backoff=0.01
+    ) as publisher:
+        ids = await asyncio.wait_for(publisher.publish_many(make_events(2)), 1)
+
+    assert ids == ["1-0", "2-0"]
+    assert len(bus.batches) == 3
+    assert bus.written == ["e0", "e1"]
+
+
+async def test_full_buffer_makes_submit_wait_for_a_flush():
+    bus = RecordingBus()
+    bus.pipeline_failures = 1
+    publisher = BatchingPublisher(
+        bus, max_batch_size=2, max_buffered=2, flush_interval=60, retry_backoff=0.05
+    )
+    events = make_events(3)
+    await publisher.submit(events[0])
+    await publisher.submit(events[1])
+
+    third = asyncio.ensure_future(publisher.submit(events[2]))
+    await asyncio.sleep(0.02)
+    assert not third.done()
+
+    await asyncio.wait_for(third, 1)
+    await publisher.close()
+    assert bus.written == ["e0", "e1", "e2"]
+
+
+async def test_close_drains_buffer_and_rejects_new_events():
+    bus = RecordingBus()
+    publisher = BatchingPublisher(bus, max_batch_size=100, flush_interval=60)
+    futures = [await publisher.submit(event) for event in make_events(3)]
+
+    await asyncio.wait_for(publisher.close(), 1)
+
+    assert all(future.done() for future in futures)
+    assert bus.written == ["e0", "e1", "e2"]
+    with pytest.raises(RuntimeError, match="closed"):
+        await publisher.submit(make_events(1)[0])
+
+
+async def test_close_timeout_fails_undelivered_events():
+    bus = RecordingBus()
+    bus.pipeline_failures = 1_000
+    publisher = BatchingPublisher(bus, flush_interval=0.01, retry_backoff=0.01, max_retry_backoff=0.01)
+    future = await publisher.submit(make_events(1)[0])
+
+    with pytest.raises(TimeoutError, match="1 events not delivered"):
+        await publisher.close(timeout=0.1)
+
+    with pytest.raises(TimeoutError):
+        future.result()
+    assert publisher.pending == 0
@@ -0,0 +1,148 @@
+"""Tests for the event codecs in shared.events."""
+
+from datetime import datetime
+
+import pytest
+
+from shared import events
+from shared.events import (
+    BaseEvent,
+    EventBus,
+    EventCodec,
+    JSONCodec,
+    MsgpackCodec,
+    SummaryGeneratedEvent,
+    get_codec,
+    register_codec,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def summary_event(**overrides):
+    fields = {
+        "meeting_id": "m-1",
+        "summary": "Discussed the launch plan. " * 40,
+        "action_items": [{"owner": "ana", "task": "ship"}],
+        "risks": ["scope creep"],
+        "correlation_id": "corr-1",
+        "metadata": {"nested": {"values": [1, 2.5, None, True]}},
+        "timestamp": datetime(2025, 1, 2, 3, 4, 5, 678000),
+    }
+    fields.update(overrides)
+    return SummaryGeneratedEvent(**fields)
+
+
+def entry_bytes(entry):
+    """Stream entry fields as a Redis client returns them."""
+    return {
+        key.encode(): value if isinstance(value, bytes) else value.encode()
+        for key, value in entry.items()
+    }
+
+
+@pytest.mark.parametrize("codec", [JSONCodec(), MsgpackCodec()], ids=["json", "msgpack"])
+def test_codec_round_trip(codec):
+    event = summary_event()
+
+    decoded = codec.decode(codec.encode(event), SummaryGeneratedEvent)
+
+    assert decoded == event
+
+
+def test_msgpack_is_smaller_than_json():
+    event = summary_event()
+
+    assert len(MsgpackCodec().encode(event)) < len(JSONCodec().encode(event))
+
+
+@pytest.mark.parametrize("codec", ["json", "msgpack"])
+@pytest.mark.parametrize("compress_threshold", [None, 0, 1_000_000])
+def test_bus_round_trips_stream_entries(codec, compress_threshold):
+    bus = EventBus(None, codec=codec, compress_threshold=compress_threshold)
+    event = summary_event()
+
+    entry = bus._stream_entry(event)
+    compressed = compress_threshold == 0
+
+    assert entry["codec"] == f"{codec}/1" + ("+zstd" if compressed else "")
+    assert entry["event_type"] == "summary.generated"
+    assert entry["correlation_id"] == "corr-1"
+    assert bus._decode_message(b"1-0", entry_bytes(entry)) == event
+
+
+def test_compression_shrinks_large_payloads():
+    plain = EventBus(None)._stream_entry(summary_event())["data"]
+    compressed = EventBus(None, compress_threshold=0)._stream_entry(summary_event())["data"]
+
+    assert len(compressed) < len(plain)
+
+
+def test_reader_decodes_any_registered_codec():
+    writer = EventBus(None, codec="msgpack", compress_threshold=0)
+    reader = EventBus(None, codec="json")
+    event = summary_event()
+
+    assert reader._decode_message(b"1-0", entry_bytes(writer._stream_entry(event))) == event
+
+
+def test_entries_without_codec_field_are_json():
+    event = summary_event()
+    legacy = {b"event_type": b"summary.generated", b"data": event.to_json().encode()}
+
+    assert EventBus(None)._decode_message(b"1-0", legacy) == event
+
+
+def test_unknown_event_types_decode_as_base_event():
+    event = BaseEvent(event_type="custom.thing", metadata={"k": "v"})
+    entry = EventBus(None)._stream_entry(event)
+
+    decoded = EventBus(None)._decode_message(b"1-0", entry_bytes(entry))
+
+    assert type(decoded) is BaseEvent
+    assert decoded == event
+
+
+@pytest.mark.parametrize(
+    "codec_field",
+    [b"json/2", b"nope/1", b"json/1+lz4"],
+    ids=["newer-version", "unknown-codec", "unknown-compression"],
+)
+def test_undecodable_entries_are_dropped(codec_field):
+    entry = entry_bytes(EventBus(None)._stream_entry(summary_event()))
+    entry[b"codec"] = codec_field
+
+    assert EventBus(None)._decode_message(b"1-0", entry) is None
+
+
+def test_malformed_entries_are_dropped():
+    assert EventBus(None)._decode_message(b"1-0", {b"event_type": b"summary.generated"}) is None
+
+
+def test_get_codec_rejects_unknown_names():
+    with pytest.raises(ValueError, match="Unknown event codec"):
+        get_codec("nope")
+    with pytest.raises(ValueError):
+        EventBus(None, codec="nope")
+
+
+def test_registered_codec_is_used_for_encoding_and_decoding(monkeypatch):
+    class ReversedJSONCodec(EventCodec):
+        name = "test-reversed-json"
+        version = 3
+
+        def encode(self, event):
+            return event.model_dump_json().encode()[::-1]
+
+        def decode(self, data, event_class):
+            return event_class.model_validate_json(data[::-1])
+
+    monkeypatch.setattr(events, "_CODECS", dict(events._CODECS))
+    register_codec(ReversedJSONCodec())
+    bus = EventBus(None, codec="test-reversed-json")
+    event = summary_event()
+
+    entry = bus._stream_entry(event)
+
+    assert entry["codec"] == "test-reversed-json/3"
+    assert EventBus(None)._decode_message(b"1-0", entry_bytes(entry)) == event